@@ -51,6 +51,9 @@ class Settings(BaseSettings):
     profit_loss_csv: str = "./data/profit_loss.csv"
     other_income_expense_csv: str = "./data/other_income_expense.csv"
 
+    # Report Viewer: Excel -> Univer converter ("openpyxl" or "streaming")
+    excel_converter: str = "openpyxl"
+
     # Cache Configuration
     enable_cache: bool = True
     cache_ttl: int = 3600  # seconds (1 hour)
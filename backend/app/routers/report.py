@@ -9,7 +9,9 @@ from pathlib import Path
 
 from app.models.auth import UserInfo
 from app.routers.auth import get_current_user
+from app.config import settings
 from app.services.excel_to_univer import excel_to_univer_converter
+from app.services.excel_to_univer_stream import streaming_excel_to_univer_converter
 
 logger = logging.getLogger(__name__)
 
@@ -99,7 +101,9 @@ async def view_pregenerated_report(
         logger.info(f"No cache found for '{filename}', starting conversion.")
         
         # Convert the Excel file to a Univer snapshot
-        snapshot = excel_to_univer_converter.convert_file_to_snapshot(file_path)
+        converter = (streaming_excel_to_univer_converter if settings.excel_converter == "streaming"
+                     else excel_to_univer_converter)
+        snapshot = converter.convert_file_to_snapshot(file_path)
 
         # Store the converted snapshot in the cache
         workbook_cache[cache_key] = snapshot
@@ -5,7 +5,8 @@ preserving styles, merged cells, and formatting.
 """
 
 import logging
-from typing import Dict, Any, Optional
+from collections import Counter
+from typing import Dict, Any, Hashable, Optional
 from pathlib import Path
 import openpyxl
 from openpyxl.workbook import Workbook
@@ -27,6 +28,46 @@ class ExcelToUniverConverter:
         self.styles_registry: Dict[str, str] = {}
         self.next_style_id: int = 0
         self.workbook: Optional[Workbook] = None
+        # Univer style id per workbook style (openpyxl style_id), so each xf is converted once
+        self.style_ids: Dict[Hashable, Optional[str]] = {}
+        # Aggregated instead of logged per cell: cell counts and number format conversions
+        self.stats: Counter = Counter()
+        self.number_formats: Dict[str, str] = {}
+
+    def _reset(self):
+        """Clears the per-workbook registries and counters."""
+        self.styles_registry = {}
+        self.next_style_id = 0
+        self.style_ids = {}
+        self.stats = Counter()
+        self.number_formats = {}
+
+    def _log_stats(self, file_path: Path):
+        """Logs the aggregated conversion counters of one workbook."""
+        logger.info(
+            f"{file_path.name}: {self.stats['cells']} cells "
+            f"({self.stats['styled_cells']} styled, {self.stats['formatted_numbers']} formatted numbers, "
+            f"{self.stats['small_or_percent_numbers']} percentages / |value| < 1), "
+            f"{len(self.style_ids)} workbook styles -> {len(self.styles_registry)} Univer styles"
+        )
+        for original_pattern, pattern in self.number_formats.items():
+            logger.debug(f"Number format: '{original_pattern}' -> '{pattern}'")
+
+    def _count_number(self, value, number_format: str):
+        """Counts a numeric cell with a special number format."""
+        if number_format and number_format != 'General':
+            self.stats['formatted_numbers'] += 1
+            if '%' in number_format or abs(value) < 1:
+                self.stats['small_or_percent_numbers'] += 1
+
+    def _cell_style_id(self, cell: Cell) -> Optional[str]:
+        """
+        Returns the Univer style ID of a cell, converting its workbook style only once.
+        """
+        key = cell.style_id if cell.has_style else None
+        if key not in self.style_ids:
+            self.style_ids[key] = self._register_style(self._convert_cell_style(cell))
+        return self.style_ids[key]
 
     def _register_style(self, style_definition: Dict[str, Any]) -> Optional[str]:
         """
@@ -252,8 +293,7 @@ class ExcelToUniverConverter:
                 base = '0.' + '0' * decimal_count
                 pattern = f'{base};[Red]({base})'
 
-            # Log for debugging
-            logger.info(f"Number format: '{original_pattern}' -> '{pattern}'")
+            self.number_formats[original_pattern] = pattern
 
             style_def['n'] = {'pattern': pattern}
 
@@ -288,10 +328,7 @@ class ExcelToUniverConverter:
                         else:
                             univer_cell['v'] = cell.value
 
-                        # Debug log for numbers with special formats
-                        if cell.number_format and cell.number_format != 'General':
-                            if '%' in cell.number_format or abs(cell.value) < 1:
-                                logger.info(f"Number cell: value={cell.value}, format={cell.number_format}, coord={cell.coordinate}")
+                        self._count_number(cell.value, cell.number_format)
 
                     elif cell.data_type == 'f':
                         univer_cell['t'] = 2  # Formula result is usually number
@@ -310,11 +347,12 @@ class ExcelToUniverConverter:
                     univer_cell['v'] = ''
                     univer_cell['t'] = 1  # String type (empty)
 
-                # Style - always check for style
-                style_def = self._convert_cell_style(cell)
-                style_id = self._register_style(style_def)
+                # Style - converted once per workbook style
+                style_id = self._cell_style_id(cell)
                 if style_id:
                     univer_cell['s'] = style_id
+                    self.stats['styled_cells'] += 1
+                self.stats['cells'] += 1
 
                 # Only add cell if it has content or style
                 if univer_cell:
@@ -404,8 +442,7 @@ class ExcelToUniverConverter:
                     univer_cell['t'] = 1
 
                 # Add style
-                style_def = self._convert_cell_style(top_cell)
-                style_id = self._register_style(style_def)
+                style_id = self._cell_style_id(top_cell)
                 if style_id:
                     univer_cell['s'] = style_id
 
@@ -442,8 +479,7 @@ class ExcelToUniverConverter:
             logger.error(f"Failed to load workbook {file_path}: {e}")
             raise
 
-        self.styles_registry = {}
-        self.next_style_id = 0
+        self._reset()
 
         snapshot_sheets = {}
         snapshot_sheet_order = []
@@ -463,6 +499,7 @@ class ExcelToUniverConverter:
             "styles": self._build_styles_object(),
         }
 
+        self._log_stats(file_path)
         logger.info(f"Finished full conversion for {file_path}. Converted {len(snapshot_sheet_order)} sheets.")
         return snapshot
 
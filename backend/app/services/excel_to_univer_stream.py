@@ -0,0 +1,469 @@
+"""
+Streaming Excel to Univer JSON Converter
+Builds the same Univer snapshot as ExcelToUniverConverter without loading the
+workbook into openpyxl: styles.xml and every sheet XML are read with iterparse
+and cellData / mergeData / columnData / styles are emitted directly.
+
+openpyxl's full load creates a Cell (plus StyleArray) for every cell of the
+combined report workbooks; here a sheet costs one small tuple per non-empty
+cell, and each distinct style (cellXfs entry) is converted once.
+
+Parity with ExcelToUniverConverter (tests/test_excel_to_univer_stream.py):
+- values as openpyxl reads them with data_only=True (cached formula results,
+  shared / inline strings, booleans, errors, date-formatted numbers)
+- cell styles resolved through openpyxl's own style objects (Font, PatternFill,
+  Border, Alignment), so colors and number formats convert identically
+- merged ranges behave as after openpyxl's load: cells other than the top-left
+  lose their value and style, edge cells take the top-left cell's borders
+- column dimensions keyed by the first column of each <col min max> group
+"""
+
+import logging
+import posixpath
+import zipfile
+from copy import copy
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from xml.etree.ElementTree import fromstring, iterparse
+
+from openpyxl.cell.text import Text
+from openpyxl.reader.strings import read_string_table
+from openpyxl.styles import Border
+from openpyxl.styles.cell_style import StyleArray
+from openpyxl.styles.numbers import BUILTIN_FORMATS, BUILTIN_FORMATS_MAX_SIZE
+from openpyxl.styles.stylesheet import Stylesheet
+from openpyxl.utils.cell import coordinate_to_tuple
+from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900, from_excel, from_ISO8601
+from openpyxl.utils.indexed_list import IndexedList
+from openpyxl.workbook import Workbook
+from openpyxl.worksheet.cell_range import CellRange, MultiCellRange
+
+from app.services.excel_to_univer import ExcelToUniverConverter
+
+logger = logging.getLogger(__name__)
+
+NS_MAIN = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+NS_REL = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+NS_PKG_REL = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+ROW_TAG = NS_MAIN + 'row'
+CELL_TAG = NS_MAIN + 'c'
+VALUE_TAG = NS_MAIN + 'v'
+INLINE_STRING_TAG = NS_MAIN + 'is'
+COL_TAG = NS_MAIN + 'col'
+MERGE_CELL_TAG = NS_MAIN + 'mergeCell'
+SHEET_FORMAT_TAG = NS_MAIN + 'sheetFormatPr'
+
+DEFAULT_COLUMN_WIDTH = 13  # openpyxl ColumnDimension width when <col> has none
+
+# (value, data_type, style) of one cell; style is a StyleArray as a tuple
+CellEntry = Tuple[Any, str, Tuple[int, ...]]
+
+
+def _xml_bool(value: Optional[str]) -> bool:
+    """Boolean attribute the way openpyxl's Bool descriptor reads it"""
+    if value is None:
+        return False
+    return value not in ('false', 'f', '0')
+
+
+def _cast_number(value: str):
+    if '.' in value or 'E' in value or 'e' in value:
+        return float(value)
+    return int(value)
+
+
+class _CellStyle:
+    """Style view of one cell, shaped like the openpyxl Cell attributes _convert_cell_style reads"""
+
+    __slots__ = ('has_style', 'font', 'fill', 'border', 'alignment', 'number_format')
+
+    def __init__(self, has_style, font, fill, border, alignment, number_format):
+        self.has_style = has_style
+        self.font = font
+        self.fill = fill
+        self.border = border
+        self.alignment = alignment
+        self.number_format = number_format
+
+
+class _WorkbookStyles:
+    """styles.xml as openpyxl binds it to a workbook (apply_stylesheet)"""
+
+    def __init__(self, stylesheet: Optional[Stylesheet]):
+        self._cell_number_formats: Dict[Tuple[int, ...], str] = {}
+        if stylesheet is not None and stylesheet.cell_styles:
+            self.fonts = IndexedList(stylesheet.fonts)
+            self.fills = IndexedList(stylesheet.fills)
+            self.borders = IndexedList(stylesheet.borders)
+            self.alignments = stylesheet.alignments
+            self.protections = stylesheet.protections
+            self.number_formats = stylesheet.number_formats
+            self.cell_styles = stylesheet.cell_styles
+            self.date_formats = stylesheet.date_formats
+            self.timedelta_formats = stylesheet.timedelta_formats
+        else:
+            defaults = Workbook()
+            self.fonts = defaults._fonts
+            self.fills = defaults._fills
+            self.borders = defaults._borders
+            self.alignments = defaults._alignments
+            self.protections = defaults._protections
+            self.number_formats = defaults._number_formats
+            self.cell_styles = defaults._cell_styles
+            self.date_formats = defaults._date_formats
+            self.timedelta_formats = defaults._timedelta_formats
+
+    @classmethod
+    def read(cls, archive: zipfile.ZipFile) -> '_WorkbookStyles':
+        try:
+            source = archive.read('xl/styles.xml')
+        except KeyError:
+            return cls(None)
+        return cls(Stylesheet.from_tree(fromstring(source)))
+
+    def number_format(self, style: Tuple[int, ...]) -> str:
+        num_fmt_id = StyleArray(style).numFmtId
+        if num_fmt_id < BUILTIN_FORMATS_MAX_SIZE:
+            return BUILTIN_FORMATS.get(num_fmt_id, 'General')
+        return self.number_formats[num_fmt_id - BUILTIN_FORMATS_MAX_SIZE]
+
+    def cell_number_format(self, style: Tuple[int, ...]) -> str:
+        """number_format() looked up once per style"""
+        if style not in self._cell_number_formats:
+            self._cell_number_formats[style] = self.number_format(style)
+        return self._cell_number_formats[style]
+
+    def cell_style(self, style: Tuple[int, ...]) -> _CellStyle:
+        array = StyleArray(style)
+        return _CellStyle(
+            has_style=any(array),
+            font=self.fonts[array.fontId],
+            fill=self.fills[array.fillId],
+            border=self.borders[array.borderId],
+            alignment=self.alignments[array.alignmentId],
+            number_format=self.number_format(style),
+        )
+
+    def with_border(self, style: Tuple[int, ...], border: Border) -> Tuple[int, ...]:
+        array = StyleArray(style)
+        array.borderId = self.borders.add(border)
+        return tuple(array)
+
+    def with_protection(self, style: Tuple[int, ...], protection) -> Tuple[int, ...]:
+        array = StyleArray(style)
+        array.protectionId = self.protections.add(protection)
+        return tuple(array)
+
+
+class _SheetXml:
+    """The parts of one worksheet XML the Univer sheet is built from"""
+
+    def __init__(self):
+        self.cells: Dict[Tuple[int, int], CellEntry] = {}
+        self.blank: set = set()  # <c> elements without value or style (not in cellData)
+        self.max_row = 0
+        self.max_column = 0
+        self.hidden_rows: List[int] = []
+        self.column_dimensions: Dict[int, Dict[str, str]] = {}
+        self.default_col_width: Optional[float] = None
+        self.merges: List[str] = []
+
+    def touch(self, row: int, column: int):
+        """A cell exists at (row, column) — counts for max_row / max_column like openpyxl's _cells"""
+        if row > self.max_row:
+            self.max_row = row
+        if column > self.max_column:
+            self.max_column = column
+
+
+class StreamingExcelToUniverConverter(ExcelToUniverConverter):
+    """
+    Converts an .xlsx file to a Univer snapshot by stream-parsing its XML parts.
+    """
+
+    # --- Workbook parts --------------------------------------------------------
+
+    @staticmethod
+    def _sheet_parts(archive: zipfile.ZipFile) -> Tuple[List[Tuple[str, str]], bool]:
+        """[(sheet name, XML part)] in workbook order, and whether dates use the 1904 epoch"""
+        names = set(archive.namelist())
+        rels = fromstring(archive.read('xl/_rels/workbook.xml.rels'))
+        targets = {rel.get('Id'): rel.get('Target') for rel in rels.iter(NS_PKG_REL + 'Relationship')}
+        workbook = fromstring(archive.read('xl/workbook.xml'))
+
+        properties = workbook.find(NS_MAIN + 'workbookPr')
+        date1904 = properties is not None and _xml_bool(properties.get('date1904'))
+
+        sheets = []
+        for sheet in workbook.iter(NS_MAIN + 'sheet'):
+            target = targets.get(sheet.get(NS_REL + 'id'), '')
+            part = target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join('xl', target))
+            if part in names and '/worksheets/' in '/' + part:
+                sheets.append((sheet.get('name'), part))
+        return sheets, date1904
+
+    @staticmethod
+    def _shared_strings(archive: zipfile.ZipFile) -> List[str]:
+        if 'xl/sharedStrings.xml' not in archive.namelist():
+            return []
+        with archive.open('xl/sharedStrings.xml') as source:
+            return read_string_table(source)
+
+    # --- Sheet XML -------------------------------------------------------------
+
+    def _read_sheet(self, archive: zipfile.ZipFile, part: str, styles: _WorkbookStyles,
+                    shared_strings: List[str], epoch) -> _SheetXml:
+        """iterparse one worksheet part (cells are cleared as soon as they are read)"""
+        sheet = _SheetXml()
+        cell_styles = styles.cell_styles
+        date_formats = styles.date_formats
+        row_counter = 0
+        col_counter = 0
+
+        with archive.open(part) as source:
+            for event, element in iterparse(source, events=('start', 'end')):
+                tag = element.tag
+                if event == 'start':
+                    if tag == ROW_TAG:
+                        r = element.get('r')
+                        row_counter = int(float(r)) if r is not None else row_counter + 1
+                        col_counter = 0
+                        if _xml_bool(element.get('hidden')):
+                            sheet.hidden_rows.append(row_counter)
+                    continue
+
+                if tag == CELL_TAG:
+                    coordinate = element.get('r')
+                    if coordinate:
+                        row, column = coordinate_to_tuple(coordinate)
+                        col_counter = column
+                    else:
+                        col_counter += 1
+                        row, column = row_counter, col_counter
+                    sheet.touch(row, column)
+
+                    data_type = element.get('t', 'n')
+                    style_id = int(element.get('s', 0) or 0)
+                    style = tuple(cell_styles[style_id])
+                    value = None if data_type == 'inlineStr' else (element.findtext(VALUE_TAG) or None)
+
+                    if value is not None:
+                        if data_type == 'n':
+                            value = _cast_number(value)
+                            if style_id in date_formats:
+                                data_type = 'd'
+                                try:
+                                    value = from_excel(value, epoch,
+                                                       timedelta=style_id in styles.timedelta_formats)
+                                except (OverflowError, ValueError):
+                                    data_type, value = 'e', '#VALUE!'
+                        elif data_type == 's':
+                            value = shared_strings[int(value)]
+                        elif data_type == 'b':
+                            value = bool(int(value))
+                        elif data_type == 'str':
+                            data_type = 's'
+                        elif data_type == 'd':
+                            value = from_ISO8601(value)
+                    elif data_type == 'inlineStr':
+                        child = element.find(INLINE_STRING_TAG)
+                        if child is not None:
+                            data_type = 's'
+                            value = Text.from_tree(child).content
+
+                    if value is not None or any(style):
+                        sheet.cells[(row, column)] = (value, data_type, style)
+                    else:
+                        sheet.blank.add((row, column))
+                    element.clear()
+
+                elif tag == ROW_TAG:
+                    element.clear()
+                elif tag == COL_TAG:
+                    # openpyxl keys a <col min max> group by its first column only
+                    sheet.column_dimensions[int(element.get('min'))] = dict(element.attrib)
+                elif tag == MERGE_CELL_TAG:
+                    sheet.merges.append(element.get('ref'))
+                elif tag == SHEET_FORMAT_TAG:
+                    width = element.get('defaultColWidth')
+                    sheet.default_col_width = float(width) if width is not None else None
+        return sheet
+
+    def _apply_merges(self, sheet: _SheetXml, styles: _WorkbookStyles):
+        """Merged ranges as openpyxl's load leaves them (MergedCellRange + _clean_merge_range)"""
+        empty = tuple(StyleArray())
+
+        def border_of(entry: Optional[CellEntry]) -> Border:
+            return styles.borders[StyleArray(entry[2] if entry else empty).borderId]
+
+        for ref in sheet.merges:
+            merged = CellRange(ref)
+            top_left = (merged.min_row, merged.min_col)
+            sheet.touch(*top_left)
+            start = sheet.cells.get(top_left) or (None, 'n', empty)
+
+            # top-left cell takes the right / bottom border of the bottom-right cell
+            bottom_right = (merged.max_row, merged.max_col)
+            end = sheet.cells.get(bottom_right)
+            if bottom_right == top_left:
+                end = start
+            elif end is None and bottom_right in sheet.blank:
+                end = (None, 'n', empty)
+            if end is not None:
+                end_border = border_of(end)
+                border = border_of(start) + Border(right=end_border.right, bottom=end_border.bottom)
+                start = (start[0], start[1], styles.with_border(start[2], border))
+
+            # every other cell becomes an empty, unstyled MergedCell
+            cells = {coord: (None, 'n', empty) for coord in merged.cells}
+            cells[top_left] = start
+
+            start_border = border_of(start)
+            for name in ('top', 'left', 'right', 'bottom'):
+                side = getattr(start_border, name)
+                if side and side.style is None:
+                    continue
+                border = Border(**{name: side})
+                for coord in getattr(merged, name):
+                    value, data_type, style = cells[coord]
+                    edge = styles.borders[StyleArray(style).borderId] + border
+                    cells[coord] = (value, data_type, styles.with_border(style, edge))
+
+            protection = copy(styles.protections[StyleArray(cells[top_left][2]).protectionId])
+            for coord, (value, data_type, style) in cells.items():
+                style = styles.with_protection(style, protection)
+                sheet.touch(*coord)
+                if value is not None or any(style):
+                    sheet.cells[coord] = (value, data_type, style)
+                else:
+                    sheet.cells.pop(coord, None)
+
+    # --- Univer sheet ----------------------------------------------------------
+
+    def _style_id(self, style: Tuple[int, ...], styles: _WorkbookStyles) -> Optional[str]:
+        """Univer style id of a StyleArray, converted and registered once per workbook"""
+        if style not in self.style_ids:
+            self.style_ids[style] = self._register_style(self._convert_cell_style(styles.cell_style(style)))
+        return self.style_ids[style]
+
+    def _univer_sheet(self, name: str, sheet: _SheetXml, styles: _WorkbookStyles) -> Dict[str, Any]:
+        cell_data: Dict[str, Dict[str, Any]] = {}
+        for (row, column) in sorted(sheet.cells):
+            value, data_type, style = sheet.cells[(row, column)]
+            univer_cell: Dict[str, Any] = {}
+            if value is not None:
+                if data_type == 'n':
+                    univer_cell['t'] = 2
+                    if value == 0:
+                        univer_cell['v'] = ""
+                        univer_cell['t'] = 1
+                    else:
+                        univer_cell['v'] = value
+                    self._count_number(value, styles.cell_number_format(style))
+                elif data_type == 'b':
+                    univer_cell['t'] = 4
+                    univer_cell['v'] = value
+                else:
+                    univer_cell['t'] = 1
+                    univer_cell['v'] = str(value)
+            else:
+                univer_cell['v'] = ''
+                univer_cell['t'] = 1
+
+            style_id = self._style_id(style, styles)
+            if style_id:
+                univer_cell['s'] = style_id
+                self.stats['styled_cells'] += 1
+            self.stats['cells'] += 1
+            cell_data.setdefault(str(row - 1), {})[str(column - 1)] = univer_cell
+
+        row_data = {str(row - 1): {"hd": 0} for row in sheet.hidden_rows}
+
+        max_row = sheet.max_row or 1
+        max_col = sheet.max_column or 1
+        col_data = {}
+        for col_idx in range(1, max_col + 1):
+            col_dict = {}
+            dimension = sheet.column_dimensions.get(col_idx)
+            if dimension is not None:
+                width = float(dimension.get('width', DEFAULT_COLUMN_WIDTH))
+                if width:
+                    col_dict["w"] = width * 7.5
+                if _xml_bool(dimension.get('hidden')):
+                    col_dict["hd"] = 0
+            else:
+                col_dict["w"] = (sheet.default_col_width or 8.43) * 7.5
+            if col_dict:
+                col_data[str(col_idx - 1)] = col_dict
+
+        # Same order as openpyxl's worksheet.merged_cells.ranges
+        merges = []
+        for merged in MultiCellRange([CellRange(ref) for ref in sheet.merges]).ranges:
+            merges.append({
+                "startRow": merged.min_row - 1,
+                "endRow": merged.max_row - 1,
+                "startColumn": merged.min_col - 1,
+                "endColumn": merged.max_col - 1,
+            })
+            row_cells = cell_data.setdefault(str(merged.min_row - 1), {})
+            row_cells.setdefault(str(merged.min_col - 1), {'v': '', 't': 1})
+
+        return {
+            "id": f"sheet_{name.replace(' ', '_')}",
+            "name": name,
+            "cellData": cell_data,
+            "rowData": row_data,
+            "columnData": col_data,
+            "mergeData": merges,
+            "rowCount": max_row,
+            "columnCount": max_col,
+            "defaultRowHeight": 25,
+            "defaultColumnWidth": 64,
+            "zoomRatio": 1,
+            "showGridlines": 1,
+        }
+
+    def convert_file_to_snapshot(self, file_path: Path) -> Dict[str, Any]:
+        """
+        Stream-parses an Excel file and converts it to a Univer snapshot.
+        """
+        logger.info(f"Starting streaming conversion of Excel file: {file_path}")
+
+        self._reset()
+
+        snapshot_sheets = {}
+        snapshot_sheet_order = []
+
+        try:
+            with zipfile.ZipFile(file_path) as archive:
+                styles = _WorkbookStyles.read(archive)
+                sheet_parts, date1904 = self._sheet_parts(archive)
+                epoch = CALENDAR_MAC_1904 if date1904 else CALENDAR_WINDOWS_1900
+                shared_strings = self._shared_strings(archive)
+
+                for name, part in sheet_parts:
+                    sheet = self._read_sheet(archive, part, styles, shared_strings, epoch)
+                    self._apply_merges(sheet, styles)
+                    sheet_json = self._univer_sheet(name, sheet, styles)
+                    snapshot_sheets[sheet_json['id']] = sheet_json
+                    snapshot_sheet_order.append(sheet_json['id'])
+        except (zipfile.BadZipFile, KeyError) as e:
+            logger.error(f"Failed to read workbook {file_path}: {e}")
+            raise
+
+        snapshot = {
+            "id": f"workbook-{file_path.stem}",
+            "name": file_path.name,
+            "sheetOrder": snapshot_sheet_order,
+            "sheets": snapshot_sheets,
+            "styles": self._build_styles_object(),
+        }
+
+        self._log_stats(file_path)
+        logger.info(f"Finished streaming conversion for {file_path}. Converted {len(snapshot_sheet_order)} sheets.")
+        return snapshot
+
+
+# Create a global instance of the converter
+streaming_excel_to_univer_converter = StreamingExcelToUniverConverter()
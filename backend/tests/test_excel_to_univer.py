@@ -0,0 +1,52 @@
+"""
+Tests for ExcelToUniverConverter
+"""
+
+import pytest
+from openpyxl import Workbook
+from openpyxl.styles import Font
+
+from app.services.excel_to_univer import ExcelToUniverConverter
+
+
+@pytest.fixture
+def styled_workbook(tmp_path):
+    """100 rows sharing three cell styles"""
+    wb = Workbook()
+    ws = wb.active
+    for row in range(1, 101):
+        ws.cell(row, 1, f"row {row}").font = Font(bold=True)
+        ws.cell(row, 2, row / 1000).number_format = "0.00%"
+        ws.cell(row, 3, row * 1000.5).number_format = "#,##0.00"
+    path = tmp_path / "styled.xlsx"
+    wb.save(path)
+    return path
+
+
+@pytest.mark.unit
+class TestExcelToUniverConverter:
+    """Test cases for ExcelToUniverConverter"""
+
+    def test_style_converted_once_per_workbook_style(self, styled_workbook, monkeypatch):
+        """Each workbook style is converted once, not once per cell"""
+        converter = ExcelToUniverConverter()
+        calls = []
+        convert = converter._convert_cell_style
+        monkeypatch.setattr(converter, "_convert_cell_style", lambda cell: calls.append(cell) or convert(cell))
+
+        snapshot = converter.convert_file_to_snapshot(styled_workbook)
+
+        assert len(calls) == len(converter.style_ids) == 3
+        assert len(snapshot["styles"]) == 3
+        cells = snapshot["sheets"]["sheet_Sheet"]["cellData"]
+        assert len({cells[str(row)]["1"]["s"] for row in range(100)}) == 1
+
+    def test_number_cells_counted(self, styled_workbook):
+        """Per-cell number logging is replaced by aggregated counters"""
+        converter = ExcelToUniverConverter()
+        converter.convert_file_to_snapshot(styled_workbook)
+
+        assert converter.stats["cells"] == 300
+        assert converter.stats["formatted_numbers"] == 200
+        assert converter.stats["small_or_percent_numbers"] == 100
+        assert converter.number_formats == {"0.00%": "0.00%;[Red](0.00%)", "#,##0.00": "#,##0.00;[Red](#,##0.00)"}
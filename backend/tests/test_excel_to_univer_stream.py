@@ -0,0 +1,106 @@
+"""
+Parity tests: StreamingExcelToUniverConverter vs ExcelToUniverConverter (openpyxl)
+"""
+
+import os
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from openpyxl import Workbook
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+
+from app.services.excel_to_univer import ExcelToUniverConverter
+from app.services.excel_to_univer_stream import StreamingExcelToUniverConverter
+
+# Generated reports to compare as well (report_generator/output by default)
+REPORTS_DIR = Path(os.environ.get(
+    "REPORTS_DIR", Path(__file__).resolve().parents[2] / "report_generator" / "output"))
+REPORT_FILES = sorted(REPORTS_DIR.glob("*.xlsx")) if REPORTS_DIR.is_dir() else []
+
+
+def assert_same_snapshot(file_path: Path):
+    expected = ExcelToUniverConverter().convert_file_to_snapshot(file_path)
+    actual = StreamingExcelToUniverConverter().convert_file_to_snapshot(file_path)
+    assert actual["sheetOrder"] == expected["sheetOrder"]
+    for sheet_id in expected["sheetOrder"]:
+        for key, value in expected["sheets"][sheet_id].items():
+            assert actual["sheets"][sheet_id][key] == value, f"{sheet_id}: {key}"
+    assert actual == expected
+
+
+@pytest.fixture
+def report_like_workbook(tmp_path):
+    """Two sheets with the features the report generator writes"""
+    thin = Side(style="thin")
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "ต้นทุน MTH"
+    ws["A1"] = "รายงานผลดำเนินงาน ประจำเดือน ตุลาคม 2568"
+    ws["A1"].font = Font(name="TH SarabunPSK", sz=16, bold=True)
+    ws.merge_cells("A1:F1")
+    ws["A3"] = "รายละเอียด"
+    ws["A3"].fill = PatternFill("solid", fgColor="FF4472C4")
+    ws["A3"].border = Border(top=thin, bottom=thin, left=thin, right=thin)
+    ws["A3"].alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+    ws["B3"] = "styled, then merged away"
+    ws["B3"].font = Font(italic=True)
+    ws.merge_cells("A3:C4")
+    ws["F4"].border = Border(right=Side(style="medium", color="FFFF0000"))
+    ws.merge_cells("D3:F4")
+
+    for row in range(5, 40):
+        ws.cell(row, 1, f"รายการ {row}")
+        for col in range(2, 7):
+            cell = ws.cell(row, col, (row * col) % 7 * 1234.5)
+            cell.number_format = "#,##0.00;[Red](#,##0.00)" if col < 6 else "0.00%"
+    ws["B40"] = 0
+    ws["C40"] = True
+    ws["D40"] = "#N/A"
+    ws["E40"] = datetime(2025, 10, 31)
+    ws["F40"].fill = PatternFill("solid", fgColor="FFFFFF00")
+    ws["A41"] = "=SUM(B5:B39)"
+
+    ws.column_dimensions["A"].width = 45
+    ws.column_dimensions.group("B", "C", hidden=True)
+    ws.row_dimensions[6].hidden = True
+
+    other = wb.create_sheet("หมวดบัญชี YTD")
+    other["A1"] = "blank sheet except for one cell"
+    wb.create_sheet("Empty")
+
+    path = tmp_path / "Report_TEST_202510.xlsx"
+    wb.save(path)
+    return path
+
+
+@pytest.mark.unit
+class TestStreamingExcelToUniverConverter:
+    """StreamingExcelToUniverConverter must produce the openpyxl converter's snapshot"""
+
+    def test_parity_generated_workbook(self, report_like_workbook):
+        """Values, styles, merges, dimensions on a generated workbook"""
+        assert_same_snapshot(report_like_workbook)
+
+    def test_merged_cells_follow_openpyxl(self, report_like_workbook):
+        """Cells inside a merge lose value/style; the top-left cell is always present"""
+        snapshot = StreamingExcelToUniverConverter().convert_file_to_snapshot(report_like_workbook)
+        sheet = snapshot["sheets"]["sheet_ต้นทุน_MTH"]
+
+        assert {"startRow": 2, "endRow": 3, "startColumn": 0, "endColumn": 2} in sheet["mergeData"]
+        assert sheet["cellData"]["2"]["0"]["v"] == "รายละเอียด"
+        merged_away = sheet["cellData"]["2"]["1"]
+        assert merged_away["v"] == ""
+        assert "it" not in snapshot["styles"].get(merged_away.get("s"), {})
+
+    def test_styles_registered_once(self, report_like_workbook):
+        """Each distinct style definition gets one id"""
+        snapshot = StreamingExcelToUniverConverter().convert_file_to_snapshot(report_like_workbook)
+        definitions = [tuple(sorted(map(str, style.items()))) for style in snapshot["styles"].values()]
+        assert len(definitions) == len(set(definitions))
+
+    @pytest.mark.slow
+    @pytest.mark.parametrize("file_path", REPORT_FILES, ids=[f.name for f in REPORT_FILES])
+    def test_parity_report_files(self, file_path):
+        """Every generated report (skipped when there is no report output)"""
+        assert_same_snapshot(file_path)
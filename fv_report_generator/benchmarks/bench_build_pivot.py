@@ -0,0 +1,134 @@
+"""Benchmark aggregator.build_pivot against the row-wise reference in tests/rowwise_pivot.py.
+
+Usage:
+    python benchmarks/bench_build_pivot.py --csv-file "/path/to/TRN_FV_Datawarehouse_Y2568(P14).csv"
+    python benchmarks/bench_build_pivot.py --synthetic-rows 600000     # no CSV at hand
+
+Each period found in the CSV (full-year extract = 12+ TIME_KEYs) is pivoted
+with both implementations; results must match within --tolerance.
+
+Timings are reported end to end (the reference canonicalizes row by row) and
+for the aggregation stage alone (both fed aggregator._work_frame, i.e. period
+filter + label canonicalization).
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# Before src: src puts report_generator (with its own tests package) on sys.path
+from tests.rowwise_pivot import build_pivot_rowwise, pivot_rowwise  # noqa: E402
+from src import aggregator  # noqa: E402
+from src.data_loader import load_fv_csv  # noqa: E402
+
+
+def synthetic_extract(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Full-year warehouse-shaped extract (13 periods, 8 BUs, ~40 SGs, ~600 products)."""
+    rng = np.random.default_rng(seed)
+    sections = [f"{i:02d}.กลุ่มบัญชี {i}" for i in range(1, 11)] + ["33.%กำไรส่วนเกิน"]
+    sub1 = [f"{i:02d}.รายการย่อย {i} :" for i in range(1, 9)]
+    sub2 = [None] + [f"{i:02d}.รายการ {i}" for i in range(1, 15)]
+    bus = [f"{i}.กลุ่มธุรกิจ {i}" for i in range(1, 9)]
+    sgs = [f"{b + 1}.{s} กลุ่มบริการ {b}-{s}" for b in range(8) for s in range(1, 6)]
+    sgs.append("4.5 กลุ่มบริการ SATELLITE")
+    products = [f"{k:018d}" for k in range(181030000, 181030600)]
+
+    sg_idx = rng.integers(0, len(sgs), n_rows)
+    df = pd.DataFrame({
+        "TIME_KEY": 202500 + rng.integers(1, 14, n_rows),
+        "GROUP": np.array(sections, dtype=object)[rng.integers(0, len(sections), n_rows)],
+        "SUB_GROUP1": np.array(sub1, dtype=object)[rng.integers(0, len(sub1), n_rows)],
+        "SUB_GROUP2": np.array(sub2, dtype=object)[rng.integers(0, len(sub2), n_rows)],
+        "BU": np.array(bus, dtype=object)[np.minimum(sg_idx // 5, 7)],
+        "SERVICE_GROUP": np.array(sgs, dtype=object)[sg_idx],
+        "PRODUCT_KEY": np.array(products, dtype=object)[rng.integers(0, len(products), n_rows)],
+        "PRODUCT_NAME": "บริการ",
+        "VALUE": np.round(rng.normal(0, 1e6, n_rows), 2),
+    })
+    df.loc[rng.random(n_rows) < 0.05, "VALUE"] = 0.0
+    return df
+
+
+def _has_nan(key: tuple) -> bool:
+    return any(isinstance(part, tuple) and _has_nan(part) or part != part for part in key)
+
+
+def compare(new: dict, ref: dict, tolerance: float) -> float:
+    """Return max |diff|; raise if key sets differ.
+
+    The row-wise version also emits keys with NaN parts (pandas maps the
+    None of a missing SUB_GROUP/SG to NaN, which is truthy). NaN never
+    compares equal, so nothing can look those keys up; they are ignored.
+    """
+    ref = {k: v for k, v in ref.items() if not _has_nan(k)}
+    if new.keys() != ref.keys():
+        missing = len(ref.keys() - new.keys())
+        extra = len(new.keys() - ref.keys())
+        raise AssertionError(f"key sets differ: {missing} missing, {extra} extra")
+    max_diff = max((abs(new[k] - ref[k]) for k in ref), default=0.0)
+    if max_diff > tolerance:
+        raise AssertionError(f"max |diff| {max_diff} > {tolerance}")
+    return max_diff
+
+
+def _timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--csv-file", type=Path, help="Full-year FV warehouse extract")
+    ap.add_argument("--encoding", default="tis-620")
+    ap.add_argument("--synthetic-rows", type=int, default=300_000,
+                    help="Rows of synthetic data when --csv-file is not given")
+    ap.add_argument("--tolerance", type=float, default=1e-6)
+    args = ap.parse_args()
+
+    if args.csv_file:
+        df = load_fv_csv(args.csv_file, encoding=args.encoding)
+        source = args.csv_file.name
+    else:
+        df = synthetic_extract(args.synthetic_rows)
+        source = f"synthetic ({args.synthetic_rows:,} rows)"
+
+    periods = sorted(df["TIME_KEY"].dropna().unique().tolist())
+    print(f"{source}: {len(df):,} rows, {len(periods)} periods")
+    print(f"{'':>28} {'---------- end to end ----------':>32} {'------ aggregation only ------':>32}")
+    print(f"{'period':>8} {'rows':>9} {'cells':>9} "
+          f"{'row-wise s':>11} {'grouped s':>10} {'speedup':>9} "
+          f"{'row-wise s':>11} {'grouped s':>10} {'speedup':>9} {'max diff':>10}")
+
+    totals = np.zeros(4)
+    for period in periods:
+        n = int((df["TIME_KEY"] == period).sum())
+        ref, t_ref = _timed(build_pivot_rowwise, df, period_key=period)
+        new, t_new = _timed(aggregator.build_pivot, df, period_key=period)
+        max_diff = compare(new, ref, args.tolerance)
+
+        work = aggregator._work_frame(df[df["TIME_KEY"] == period])
+        _, a_ref = _timed(pivot_rowwise, work)
+        _, a_new = _timed(aggregator._pivot_grouped, work)
+
+        times = np.array([t_ref, t_new, a_ref, a_new])
+        totals += times
+        print(f"{period:>8} {n:>9,} {len(new):>9,} " + _format_times(times) + f" {max_diff:>10.2e}")
+
+    print(f"{'total':>8} {len(df):>9,} {'':>9} " + _format_times(totals))
+    return 0
+
+
+def _format_times(times: np.ndarray) -> str:
+    t_ref, t_new, a_ref, a_new = times
+    return (f"{t_ref:>11.3f} {t_new:>10.3f} {t_ref / t_new:>8.1f}x "
+            f"{a_ref:>11.3f} {a_new:>10.3f} {a_ref / a_new:>8.1f}x")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
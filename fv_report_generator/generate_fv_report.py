@@ -12,11 +12,22 @@ Usage:
         --output output/Report_FV_P14.xlsx \\
         --reconcile
 
-    # Generate + run invariant-only check (no .xlsx needed)
+    # P1..P14 from one CSV, pivoted once, 4 worker processes
     python generate_fv_report.py \\
         --csv-file /path/to/TRN_FV_Datawarehouse_Y2568(P14).csv \\
-        --reconcile-invariants
+        --periods 1-14 --output-dir output/ --workers 4
 
+    # Full-history extract larger than memory: read in 500k-row chunks
+    python generate_fv_report.py \\
+        --csv-file /path/to/TRN_FV_Datawarehouse_Y2568(P14).csv \\
+        --periods 1-14 --stream --chunk-size 500000
+
+    # Generate without the (default) invariant checks
+    python generate_fv_report.py \\
+        --csv-file /path/to/TRN_FV_Datawarehouse_Y2568(P14).csv \\
+        --no-invariants
+
+Invariant checks (2-4) run on every generation unless --no-invariants.
 Verification layers when --reconcile is used:
   1. Cell-by-cell: every data cell in .xlsx vs pivot recomputed from CSV
   2. Invariant A:  GRAND_TOTAL == Σ BU_TOTAL == Σ SG_TOTAL == Σ PRODUCT
@@ -29,11 +40,14 @@ import logging
 import re
 import sys
 from pathlib import Path
+from typing import List, Optional, Tuple
 
+from src.aggregator import build_hierarchy
 from src.config import FVConfig
 from src.data_loader import load_fv_csv
 from src.reconciler import reconcile, reconcile_business_rules, reconcile_invariants
-from src.report_builder import generate_report
+from src.report_builder import generate_period_reports, generate_report, write_period_reports
+from src.streaming import stream_fv_csv
 
 
 _PERIOD_FROM_NAME = re.compile(r"Y(\d{4}).*?\(P?(\d{1,2})\)", re.IGNORECASE)
@@ -66,6 +80,53 @@ def _period_label(year_be: int, period: int) -> str:
     return f"ประจำเดือน ธันวาคม  {year_be}   (ก่อนผู้สอบบัญชีรับรอง_งวด {period})"
 
 
+def _period_config(period_key: int, year_be: Optional[int] = None) -> FVConfig:
+    if year_be is None:
+        year_be = period_key // 100 + 543
+    return FVConfig(
+        period_year_be=year_be,
+        period_label=_period_label(year_be, period_key % 100),
+    )
+
+
+def period_ranges(spec: str, default_year_ce: Optional[int] = None) -> Optional[List[Tuple[int, int]]]:
+    """Turn a --periods spec into inclusive (first, last) TIME_KEY ranges; None for 'all'.
+
+    Items are comma-separated, each a TIME_KEY (202514), a period number
+    (14, needs a year from the filename or --period-key) or an inclusive
+    range of either ('1-14', '202501-202514').
+    """
+    if spec.strip().lower() == "all":
+        return None
+
+    def to_key(token: str) -> int:
+        n = int(token)
+        if n >= 100:
+            return n
+        if default_year_ce is None:
+            raise ValueError(f"period {n} needs a year (use full TIME_KEYs or --period-key)")
+        return default_year_ce * 100 + n
+
+    ranges = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        lo, _, hi = item.partition("-")
+        lo_key = to_key(lo)
+        ranges.append((lo_key, to_key(hi) if hi else lo_key))
+    return ranges
+
+
+def parse_periods(spec: str, available, default_year_ce: Optional[int] = None) -> List[int]:
+    """Expand a --periods spec (see period_ranges) into sorted TIME_KEYs present in the CSV."""
+    available = sorted(int(pk) for pk in available)
+    ranges = period_ranges(spec, default_year_ce)
+    if ranges is None:
+        return available
+    return [pk for pk in available if any(lo <= pk <= hi for lo, hi in ranges)]
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Generate the FV (Fixed/Variable cost) report from a data-warehouse CSV.",
@@ -92,10 +153,16 @@ def main():
         action="store_true",
         dest="reconcile_invariants",
         help=(
-            "Run invariant checks on the aggregation pipeline only (no .xlsx needed). "
-            "Checks hierarchy totals, raw CSV sums, and percent formula."
+            "Run invariant checks on the aggregation pipeline (default; kept for "
+            "compatibility). Checks hierarchy totals, raw CSV sums, and percent formula."
         ),
     )
+    parser.add_argument(
+        "--no-invariants",
+        action="store_true",
+        dest="no_invariants",
+        help="Skip the invariant checks that otherwise run on every generation.",
+    )
     parser.add_argument(
         "--reconcile-rules",
         action="store_true",
@@ -105,7 +172,38 @@ def main():
             "CM = Revenue − Variable Cost per column."
         ),
     )
+    parser.add_argument(
+        "--reconcile-from-file",
+        action="store_true",
+        dest="reconcile_from_file",
+        help=(
+            "Cell and business-rule checks re-read the saved .xlsx (end-to-end) "
+            "instead of the values recorded from the cells as they were written."
+        ),
+    )
     parser.add_argument("--sheet", default="Report_FV", help="Output sheet name (default: Report_FV)")
+    parser.add_argument(
+        "--periods",
+        help=(
+            "Generate many periods from one CSV pivot: 'all', '1-14', "
+            "'202501-202514' or a comma list. Overrides --period-key."
+        ),
+    )
+    parser.add_argument("--output-dir", type=Path, help="--periods: directory for per-period files (default: output)")
+    parser.add_argument(
+        "--one-workbook",
+        action="store_true",
+        help="--periods: write one workbook (--output) with a sheet per period",
+    )
+    parser.add_argument("--workers", type=int, default=1,
+                        help="--periods: worker processes for per-period files (default: 1)")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Read the CSV in chunks into partial pivots instead of loading it whole",
+    )
+    parser.add_argument("--chunk-size", type=int, default=200_000, dest="chunk_size",
+                        help="--stream: CSV rows per chunk (default: 200000)")
     parser.add_argument("-v", "--verbose", action="store_true")
     args = parser.parse_args()
 
@@ -119,6 +217,11 @@ def main():
         log.error("CSV not found: %s", args.csv_file)
         return 1
 
+    if args.stream:
+        return _main_stream(args, log)
+    if args.periods:
+        return _main_multi_period(args, log)
+
     period_key = args.period_key
     year_be = None
     if period_key is None:
@@ -134,45 +237,189 @@ def main():
     if args.output is None:
         args.output = Path("output") / f"Report_FV_P{period_num}.xlsx"
 
-    config = FVConfig(
-        period_year_be=year_be,
-        period_label=_period_label(year_be, period_num),
-    )
+    config = _period_config(period_key, year_be)
 
     log.info("loading CSV %s", args.csv_file)
     df = load_fv_csv(args.csv_file, encoding=args.encoding)
     log.info("  %d rows", len(df))
 
+    # Layout (BU/SG/product, section/sub-group) built once for report + checks
+    hierarchy = build_hierarchy(df, period_key=period_key)
+
     log.info("generating report (period_key=%s)", period_key)
-    out_path, pivot = generate_report(
+    out_path, pivot, grid = generate_report(
         df, args.output, config, period_key=period_key, sheet_name=args.sheet,
+        hierarchy=hierarchy,
     )
     log.info("done: %s", out_path)
 
+    failed = _run_checks(args, log, df, config, period_key, out_path, args.sheet,
+                         hierarchy, pivot, grid)
+    return 1 if failed else 0
+
+
+def _main_multi_period(args, log) -> int:
+    """--periods: pivot the CSV once, then write every requested period."""
+    _, year_be = infer_period_key(args.csv_file)
+    default_year_ce = None
+    if args.period_key is not None:
+        default_year_ce = args.period_key // 100
+    elif year_be is not None:
+        default_year_ce = year_be - 543 if year_be >= 2400 else year_be
+
+    log.info("loading CSV %s", args.csv_file)
+    df = load_fv_csv(args.csv_file, encoding=args.encoding)
+    log.info("  %d rows", len(df))
+
+    try:
+        period_keys = parse_periods(args.periods, df["TIME_KEY"].dropna().unique(), default_year_ce)
+    except ValueError as e:
+        log.error("--periods %s: %s", args.periods, e)
+        return 1
+    if not period_keys:
+        log.error("--periods %s matched no TIME_KEY", args.periods)
+        return 1
+    log.info("generating %d periods: %s", len(period_keys), ", ".join(map(str, period_keys)))
+
+    multi_year = len({pk // 100 for pk in period_keys}) > 1
+    output_dir = args.output_dir or Path("output")
+
+    def output_for(pk: int) -> Path:
+        year = f"Y{pk // 100 + 543}_" if multi_year else ""
+        return output_dir / f"Report_FV_{year}P{pk % 100}.xlsx"
+
+    combined_path = None
+    if args.one_workbook:
+        combined_path = args.output or output_dir / (
+            f"Report_FV_P{period_keys[0] % 100}-P{period_keys[-1] % 100}.xlsx"
+        )
+
+    reports = generate_period_reports(
+        df, period_keys,
+        config_for=_period_config,
+        output_for=None if combined_path else output_for,
+        combined_path=combined_path,
+        sheet_name=args.sheet,
+        workers=args.workers,
+    )
+
     failed = False
+    for pk, report in reports.items():
+        log.info("done: %s [%s] (period_key=%s)", report.output_path, report.sheet_name, pk)
+        if _run_checks(args, log, df, report.config, pk, report.output_path,
+                       report.sheet_name, report.hierarchy, report.pivot, report.grid):
+            failed = True
+    return 1 if failed else 0
+
+
+def _main_stream(args, log) -> int:
+    """--stream: chunked read into partial pivots; the CSV is never held whole."""
+    period_key, year_be = infer_period_key(args.csv_file)
+    if args.period_key is not None:
+        period_key = args.period_key
+    default_year_ce = period_key // 100 if period_key is not None else None
+
+    if args.periods:
+        try:
+            ranges = period_ranges(args.periods, default_year_ce)
+        except ValueError as e:
+            log.error("--periods %s: %s", args.periods, e)
+            return 1
+    elif period_key is not None:
+        ranges = [(period_key, period_key)]
+    else:
+        log.error("Could not infer --period-key from filename %s; pass it explicitly.", args.csv_file.name)
+        return 1
+
+    log.info("streaming CSV %s (chunks of %d rows)", args.csv_file, args.chunk_size)
+    extract = stream_fv_csv(args.csv_file, period_ranges=ranges,
+                            encoding=args.encoding, chunksize=args.chunk_size)
+    period_keys = extract.period_keys
+    log.info("  %d rows read, %d periods", extract.rows_read, len(period_keys))
+    if not period_keys:
+        log.error("no rows matched the requested period(s)")
+        return 1
+
+    output_dir = args.output_dir or Path("output")
+    multi_year = len({pk // 100 for pk in period_keys}) > 1
+    combined_path = None
+    if not args.periods:
+        # Single period: same output name and label as the in-memory path
+        output = args.output or Path("output") / f"Report_FV_P{period_keys[0] % 100}.xlsx"
+
+        def output_for(pk: int) -> Path:
+            return output
+
+        def config_for(pk: int) -> FVConfig:
+            return _period_config(pk, year_be)
+    else:
+        def output_for(pk: int) -> Path:
+            year = f"Y{pk // 100 + 543}_" if multi_year else ""
+            return output_dir / f"Report_FV_{year}P{pk % 100}.xlsx"
+        config_for = _period_config
+        if args.one_workbook:
+            combined_path = args.output or output_dir / (
+                f"Report_FV_P{period_keys[0] % 100}-P{period_keys[-1] % 100}.xlsx"
+            )
+
+    reports = write_period_reports(
+        extract.pivots, extract.hierarchies, period_keys,
+        config_for=config_for,
+        output_for=None if combined_path else output_for,
+        combined_path=combined_path,
+        sheet_name=args.sheet,
+        workers=args.workers,
+    )
+
+    failed = False
+    for pk, report in reports.items():
+        log.info("done: %s [%s] (period_key=%s)", report.output_path, report.sheet_name, pk)
+        if _run_checks(args, log, None, report.config, pk, report.output_path,
+                       report.sheet_name, report.hierarchy, report.pivot, report.grid,
+                       section_sums=extract.section_sums[pk]):
+            failed = True
+    return 1 if failed else 0
+
+
+def _run_checks(args, log, df, config, period_key, out_path, sheet_name,
+                hierarchy, pivot, grid, section_sums=None) -> bool:
+    """Run the verification layers selected on the command line; True if any failed.
+
+    Cell and business-rule checks read the values DataWriter recorded from the
+    worksheet cells it wrote (`grid`), or with --reconcile-from-file the saved
+    .xlsx re-read once. Streamed runs pass df=None with the raw per-section
+    sums collected while reading (`section_sums`).
+    """
+    failed = False
+    if args.reconcile_from_file:
+        grid = None  # reconcile() / reconcile_business_rules() load the saved sheet
 
     # ------------------------------------------------------------------
     # Invariant checks — run before cell check so CSV bugs surface first
     # ------------------------------------------------------------------
-    if args.reconcile or args.reconcile_invariants:
+    if args.reconcile or args.reconcile_invariants or not args.no_invariants:
         log.info("running invariant checks on aggregation pipeline…")
-        inv = reconcile_invariants(df, period_key=period_key)
+        inv = reconcile_invariants(df, period_key=period_key, pivot=pivot,
+                                   section_sums=section_sums)
         if inv.ok:
             log.info("  [invariants] OK — %d checks passed", inv.checks_run)
         else:
             failed = True
             log.warning("  [invariants] %d violation(s) in %d checks:",
                         len(inv.violations), inv.checks_run)
-            for v in inv.violations:
+            for v in inv.violations[:20]:
                 log.warning("    [%s] %s: got=%.4f expected=%.4f diff=%+.4f",
                             v.layer, v.description, v.got, v.expected, v.diff)
+            if len(inv.violations) > 20:
+                log.warning("    … and %d more", len(inv.violations) - 20)
 
     # ------------------------------------------------------------------
-    # Cell-by-cell check — requires the .xlsx to exist
+    # Cell-by-cell check — on the written cells (or the saved file, see above)
     # ------------------------------------------------------------------
     if args.reconcile:
         log.info("reconciling output %s against source CSV (cell-by-cell)…", out_path)
-        result = reconcile(out_path, df, config, period_key=period_key, sheet_name=args.sheet)
+        result = reconcile(out_path, df, config, period_key=period_key, sheet_name=sheet_name,
+                           hierarchy=hierarchy, pivot=pivot, grid=grid)
         if result.mismatches:
             failed = True
             log.warning("  [cell-check] %d cell mismatches (of %d checked)",
@@ -188,12 +435,13 @@ def main():
                      result.cells_checked)
 
     # ------------------------------------------------------------------
-    # Business-rule check — reads xlsx directly, trusts neither pivot nor CSV
+    # Business-rule check — on the written cells, trusts neither pivot nor CSV
     # ------------------------------------------------------------------
     if args.reconcile or args.reconcile_rules:
         log.info("running business-rule checks on .xlsx…")
         br = reconcile_business_rules(
-            out_path, df, config, period_key=period_key, sheet_name=args.sheet
+            out_path, df, config, period_key=period_key, sheet_name=sheet_name,
+            hierarchy=hierarchy, grid=grid,
         )
         if br.skipped_sections:
             log.warning("  [biz-rules] skipped — sections not found: %s",
@@ -210,7 +458,7 @@ def main():
                 if v.detail:
                     log.warning("      %s", v.detail)
 
-    return 1 if failed else 0
+    return failed
 
 
 if __name__ == "__main__":
@@ -6,15 +6,20 @@ This is data-driven: the row hierarchy and column hierarchy come from CSV
 contents, not from a fixed template. The output shape matches what the old
 pivoter.py emitted, so reconciler.py keeps working.
 
-Helpers `enumerate_*` are exposed so the column/row builders can walk the
-unique BU / SG / SUBSG / PRODUCT / SECTION / SUB_GROUP combinations directly.
+`build_hierarchy()` walks the unique BU / SG / SUBSG / PRODUCT and
+SECTION / SUB_GROUP combinations once per (df, period_key); the column/row
+builders and the invariant checker all consume the resulting `Hierarchy`.
+The older `enumerate_*` helpers answer one question per call (each re-filters
+the whole frame) and are kept for ad-hoc use.
 """
 from collections import OrderedDict, defaultdict
-from typing import List, Optional, Tuple
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
-from .normalizer import canonical, canonical_product_key
+from .normalizer import canonical, canonical_product_key, map_unique
 from .satellite_split import is_split_sg, subsg_for
 
 
@@ -35,6 +40,60 @@ def _strip_period(text: Optional[str]) -> Optional[str]:
     return s
 
 
+# Pivot levels: (key columns, columns that must be truthy for a row to count).
+# Rows roll up section → sub1 → sub2; columns roll up
+# GRAND_TOTAL → BU → SG → SUBSG (split SGs only) → PRODUCT.
+_ROW_LEVELS = (
+    (("section",), ()),
+    (("section", "sub1"), ("sub1",)),
+    (("section", "sub1", "sub2"), ("sub1", "sub2")),
+)
+_COL_LEVELS = (
+    ("GRAND_TOTAL", (), ()),
+    ("BU_TOTAL", ("bu",), ("bu",)),
+    ("SG_TOTAL", ("bu", "sg"), ("bu", "sg")),
+    ("SUBSG_TOTAL", ("bu", "sg", "subsg"), ("bu", "sg", "split")),
+    ("PRODUCT", ("bu", "sg", "subsg", "pkey"), ("bu", "sg", "pkey")),
+)
+_KEY_COLUMNS = ("section", "sub1", "sub2", "bu", "sg", "pkey")
+
+
+def _work_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Canonical key columns + value for every summable, non-zero CSV row."""
+    is_percent = map_unique(
+        df["GROUP"],
+        lambda x: isinstance(x, str) and x.lstrip().startswith(_PERCENT_GROUP_PREFIX),
+        na_value=False,
+    ).astype(bool)
+    value = df["VALUE"].astype(float).fillna(0.0)
+    # Percentage-group rows are not summable; zero rows add no keys.
+    keep = (~is_percent & (value != 0.0)).to_numpy()
+    df = df[keep]
+
+    work = pd.DataFrame({
+        "section": map_unique(df["GROUP"], canonical),
+        "sub1": map_unique(df["SUB_GROUP1"], lambda x: canonical(_strip_period(x)), na_value=None),
+        "sub2": map_unique(df["SUB_GROUP2"], canonical, na_value=None),
+        "bu": map_unique(df["BU"], canonical),
+        "sg": map_unique(df["SERVICE_GROUP"], canonical, na_value=None),
+        "pkey": map_unique(df["PRODUCT_KEY"], canonical_product_key),
+        "value": value.to_numpy()[keep],
+    })
+    if "TIME_KEY" in df.columns:
+        work["period"] = df["TIME_KEY"].to_numpy()
+    return work
+
+
+def _factorize(values) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return (codes, labels, truthy) where labels[-1] is None for missing codes."""
+    codes, uniques = pd.factorize(values)
+    labels = np.empty(len(uniques) + 1, dtype=object)
+    labels[:-1] = list(uniques)
+    labels[-1] = None
+    truthy = np.array([bool(x) for x in labels], dtype=bool)
+    return codes, labels, truthy
+
+
 def build_pivot(
     df: pd.DataFrame,
     period_key: Optional[int] = None,
@@ -48,58 +107,123 @@ def build_pivot(
         ("SG_TOTAL", bu_canonical, sg_canonical)
         ("SUBSG_TOTAL", bu_canonical, sg_canonical, subsg_canonical)
         ("PRODUCT", bu_canonical, sg_canonical, subsg_canonical, pkey_canonical)
+
+    Key columns are factorized to integer codes and the CSV is reduced once to
+    its distinct key combinations; each (row level, col level) pair is then a
+    single groupby over that reduced frame.
     """
     if period_key is not None:
         df = df[df["TIME_KEY"] == period_key]
+    return _pivot_grouped(_work_frame(df))
 
-    work = pd.DataFrame({
-        "section_raw": df["GROUP"],
-        "sub1_raw": df["SUB_GROUP1"],
-        "sub2_raw": df["SUB_GROUP2"],
-        "section": df["GROUP"].map(canonical),
-        "sub1": df["SUB_GROUP1"].map(lambda x: canonical(_strip_period(x)) if pd.notna(x) else None),
-        "sub2": df["SUB_GROUP2"].map(lambda x: canonical(x) if pd.notna(x) else None),
-        "bu": df["BU"].map(canonical),
-        "sg": df["SERVICE_GROUP"].map(lambda x: canonical(x) if pd.notna(x) else None),
-        "pkey": df["PRODUCT_KEY"].map(canonical_product_key),
-        "value": df["VALUE"].astype(float).fillna(0.0),
-    })
 
-    totals = defaultdict(float)
-    for row in work.itertuples(index=False):
-        # Skip percentage-group rows — they are not summable.
-        section_raw = row.section_raw
-        if isinstance(section_raw, str) and section_raw.lstrip().startswith(_PERCENT_GROUP_PREFIX):
-            continue
+def build_period_pivots(
+    df: pd.DataFrame,
+    period_keys: Optional[Iterable[int]] = None,
+) -> Dict[int, dict]:
+    """build_pivot() for many periods at once: {period_key: pivot}.
 
-        value = row.value
-        if value == 0.0:
-            continue
+    Labels are canonicalized once for the whole extract; TIME_KEY then acts
+    as one more key dimension, so each period's roll-up only touches its own
+    rows. `period_keys=None` means every TIME_KEY in the CSV.
+    """
+    if period_keys is not None:
+        keys = [int(pk) for pk in period_keys]
+        df = df[df["TIME_KEY"].isin(keys)]
+    else:
+        keys = sorted(int(pk) for pk in df["TIME_KEY"].dropna().unique())
+    return _pivots_by_period(_work_frame(df), keys)
 
-        section, sub1, sub2 = row.section, row.sub1, row.sub2
-        row_keys = [(section, None, None)]
-        if sub1:
-            row_keys.append((section, sub1, None))
-        if sub1 and sub2:
-            row_keys.append((section, sub1, sub2))
 
-        bu, sg, pkey = row.bu, row.sg, row.pkey
-        col_keys: List[tuple] = [("GRAND_TOTAL",)]
-        if bu:
-            col_keys.append(("BU_TOTAL", bu))
-        if bu and sg:
-            col_keys.append(("SG_TOTAL", bu, sg))
-            subsg = subsg_for(sg, pkey) if pkey else sg
-            if subsg != sg:
-                col_keys.append(("SUBSG_TOTAL", bu, sg, subsg))
-            if pkey:
-                col_keys.append(("PRODUCT", bu, sg, subsg, pkey))
+def partial_sums(df: pd.DataFrame) -> pd.DataFrame:
+    """VALUE summed per (period, canonical keys) for one slice of the CSV.
+
+    Partial sums of separate chunks combine with merge_partial_sums() and
+    roll up with pivots_from_partial_sums(); the result equals
+    build_period_pivots() over the whole file.
+    """
+    return _regroup(_work_frame(df))
+
+
+def merge_partial_sums(parts: List[pd.DataFrame]) -> pd.DataFrame:
+    """Combine partial_sums() frames into one (one row per distinct key)."""
+    return _regroup(pd.concat(parts, ignore_index=True))
+
+
+def pivots_from_partial_sums(partial: pd.DataFrame, period_keys: Iterable[int]) -> Dict[int, dict]:
+    """{period_key: pivot} from merged partial sums."""
+    return _pivots_by_period(partial, [int(pk) for pk in period_keys])
+
+
+def _regroup(work: pd.DataFrame) -> pd.DataFrame:
+    return (
+        work.groupby(["period", *_KEY_COLUMNS], dropna=False, sort=False)["value"]
+        .sum()
+        .reset_index()
+    )
+
+
+def _pivots_by_period(work: pd.DataFrame, period_keys: List[int]) -> Dict[int, dict]:
+    pivots: Dict[int, dict] = {pk: {} for pk in period_keys}
+    for pk, part in work.groupby("period", sort=True):
+        if int(pk) in pivots:
+            pivots[int(pk)] = _pivot_grouped(part)
+    return pivots
+
+
+def _pivot_grouped(work: pd.DataFrame) -> dict:
+    """Roll a work frame (see _work_frame) up to every (row level, col level) pair."""
+    if work.empty:
+        return {}
+
+    codes, labels, truthy = {}, {}, {}
+    for name in _KEY_COLUMNS:
+        codes[name], labels[name], truthy[name] = _factorize(work[name].to_numpy(dtype=object))
+
+    fine = (
+        pd.DataFrame({**codes, "value": work["value"].to_numpy()})
+        .groupby(list(_KEY_COLUMNS), sort=False)["value"].sum()
+        .reset_index()
+    )
+
+    # Sub-SG per distinct (SG, PRODUCT_KEY); only split SGs differ from SG.
+    pairs = fine[["sg", "pkey"]].drop_duplicates()
+    sg_labels, pkey_labels = labels["sg"], labels["pkey"]
+    pairs["subsg_label"] = [
+        subsg_for(sg_labels[s], pkey_labels[p]) if truthy["pkey"][p] else sg_labels[s]
+        for s, p in zip(pairs["sg"], pairs["pkey"])
+    ]
+    fine = fine.merge(pairs, on=["sg", "pkey"], how="left")
+    codes_subsg, labels["subsg"], _ = _factorize(fine["subsg_label"].to_numpy(dtype=object))
+    fine["subsg"] = codes_subsg
+
+    masks = {name: truthy[name][fine[name].to_numpy()] for name in _KEY_COLUMNS}
+    masks["split"] = fine["subsg_label"].to_numpy(dtype=object) != sg_labels[fine["sg"].to_numpy()]
+
+    totals = {}
+    for row_cols, row_required in _ROW_LEVELS:
+        for col_tag, col_cols, col_required in _COL_LEVELS:
+            mask = np.ones(len(fine), dtype=bool)
+            for name in row_required + col_required:
+                mask &= masks[name]
+            if not mask.any():
+                continue
+
+            by = list(row_cols + col_cols)
+            grouped = fine.loc[mask].groupby(by, sort=False)["value"].sum()
+            index = grouped.index.to_frame(index=False)
 
-        for rk in row_keys:
-            for ck in col_keys:
-                totals[(rk, ck)] += value
+            row_parts = [labels[name][index[name].to_numpy()].tolist() for name in row_cols]
+            row_parts += [[None] * len(index)] * (3 - len(row_cols))
+            col_parts = [[col_tag] * len(index)]
+            col_parts += [labels[name][index[name].to_numpy()].tolist() for name in col_cols]
 
-    return dict(totals)
+            totals.update(zip(
+                zip(zip(*row_parts), zip(*col_parts)),
+                grouped.to_numpy().tolist(),
+            ))
+
+    return totals
 
 
 # --- Enumeration helpers ------------------------------------------------------
@@ -196,5 +320,157 @@ def enumerate_sub_groups(
     return grouped
 
 
+# --- One-pass layout hierarchy -------------------------------------------------
+
+@dataclass
+class Hierarchy:
+    """Sorted report layout for one (df, period_key).
+
+    Column side: BU → SG → (sub-SG for split SGs) → products.
+    Row side: section → sub1 → sub2.
+    Each list matches what the corresponding `enumerate_*` helper returns.
+    """
+    bus: List[str] = field(default_factory=list)
+    sgs: Dict[str, List[str]] = field(default_factory=dict)
+    products: Dict[Tuple[str, str], List[Tuple[str, str]]] = field(default_factory=dict)
+    sections: List[str] = field(default_factory=list)
+    sub_groups: Dict[str, "OrderedDict[str, List[str]]"] = field(default_factory=dict)
+
+    def sgs_for(self, bu: str) -> List[str]:
+        return self.sgs.get(bu, [])
+
+    def products_for(
+        self,
+        bu: str,
+        sg: str,
+        subsg_canon: Optional[str] = None,
+    ) -> List[Tuple[str, str]]:
+        """[(product_key_raw, product_name)] for (BU, SG), optionally one sub-SG only."""
+        products = self.products.get((bu, sg), [])
+        if subsg_canon is None:
+            return products
+        sg_c = canonical(sg)
+        return [
+            (pkey, pname) for pkey, pname in products
+            if subsg_for(sg_c, canonical_product_key(pkey)) == subsg_canon
+        ]
+
+    def sub_groups_for(self, section_raw: str) -> "OrderedDict[str, List[str]]":
+        return self.sub_groups.get(section_raw, OrderedDict())
+
+
+_LAYOUT_COL_KEYS = ("BU", "SERVICE_GROUP", "PRODUCT_KEY", "PRODUCT_NAME")
+_LAYOUT_ROW_KEYS = ("GROUP", "SUB_GROUP1", "SUB_GROUP2")
+
+
+def build_hierarchy(df: pd.DataFrame, period_key: Optional[int] = None) -> Hierarchy:
+    """Collect the whole layout hierarchy in one pass over `df`.
+
+    The period filter runs once; every level is then read from the distinct
+    key combinations (a few hundred tuples) instead of re-filtering the frame
+    per BU / SG / section.
+    """
+    if period_key is not None:
+        df = df[df["TIME_KEY"] == period_key]
+    return _hierarchy_from_keys(
+        df[list(_LAYOUT_COL_KEYS)].drop_duplicates(),
+        df[list(_LAYOUT_ROW_KEYS)].drop_duplicates(),
+    )
+
+
+def build_period_hierarchies(
+    df: pd.DataFrame,
+    period_keys: Optional[Iterable[int]] = None,
+) -> Dict[int, Hierarchy]:
+    """build_hierarchy() for many periods from one distinct-key pass: {period_key: Hierarchy}."""
+    if period_keys is not None:
+        keys = [int(pk) for pk in period_keys]
+        df = df[df["TIME_KEY"].isin(keys)]
+    else:
+        keys = sorted(int(pk) for pk in df["TIME_KEY"].dropna().unique())
+    col_keys, row_keys = layout_key_frames(df)
+    return period_hierarchies(col_keys, row_keys, keys)
+
+
+def layout_key_frames(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Distinct (TIME_KEY + column layout) and (TIME_KEY + row layout) key rows of `df`."""
+    return (
+        df[["TIME_KEY", *_LAYOUT_COL_KEYS]].drop_duplicates(),
+        df[["TIME_KEY", *_LAYOUT_ROW_KEYS]].drop_duplicates(),
+    )
+
+
+def period_hierarchies(
+    col_keys: pd.DataFrame,
+    row_keys: pd.DataFrame,
+    period_keys: Iterable[int],
+) -> Dict[int, Hierarchy]:
+    """Hierarchies per period from distinct layout key rows (see layout_key_frames)."""
+    col_parts = {int(pk): part for pk, part in col_keys.groupby("TIME_KEY", sort=False)}
+    row_parts = {int(pk): part for pk, part in row_keys.groupby("TIME_KEY", sort=False)}
+    return {
+        pk: _hierarchy_from_keys(
+            col_parts.get(pk, col_keys.iloc[:0])[list(_LAYOUT_COL_KEYS)],
+            row_parts.get(pk, row_keys.iloc[:0])[list(_LAYOUT_ROW_KEYS)],
+        )
+        for pk in period_keys
+    }
+
+
+def _hierarchy_from_keys(col_keys: pd.DataFrame, row_keys: pd.DataFrame) -> Hierarchy:
+    """Build a Hierarchy from distinct layout key rows (in CSV order)."""
+    h = Hierarchy()
+    # Dicts (not sets) keep first-appearance order, so labels that share a
+    # sort key ('01.X' vs '1.X') tie-break exactly like Series.unique().
+
+    # Column side — distinct (BU, SG, PRODUCT_KEY, PRODUCT_NAME)
+    sgs: Dict[str, dict] = {}
+    products: Dict[Tuple[str, str], dict] = defaultdict(dict)
+    for bu, sg, pkey, pname in col_keys.itertuples(index=False, name=None):
+        if pd.isna(bu):
+            continue
+        sgs.setdefault(bu, {})
+        if pd.isna(sg):
+            continue
+        sgs[bu][sg] = None
+        if pd.isna(pkey):
+            continue
+        # Mixed int/str PRODUCT_KEYs collapse onto their string form
+        pkey_s = str(pkey).strip()
+        pname_key = None if pd.isna(pname) else pname
+        products[(bu, sg)].setdefault((pkey_s, pname_key), None)
+
+    h.bus = sorted(sgs, key=_sort_key)
+    for bu in h.bus:
+        h.sgs[bu] = sorted(sgs[bu], key=_sort_key)
+    for bu_sg, pairs in products.items():
+        ordered = sorted(pairs, key=lambda pair: pair[0])
+        h.products[bu_sg] = [
+            (pkey_s, str(pname).strip() if pname is not None else "")
+            for pkey_s, pname in ordered
+        ]
+
+    # Row side — distinct (GROUP, SUB_GROUP1, SUB_GROUP2)
+    sub1s: Dict[str, dict] = {}
+    sub2s: Dict[Tuple[str, str], dict] = defaultdict(dict)
+    for section, sub1, sub2 in row_keys.itertuples(index=False, name=None):
+        if pd.isna(section) or str(section).lstrip().startswith(_PERCENT_GROUP_PREFIX):
+            continue
+        sub1s.setdefault(section, {})
+        if pd.isna(sub1):
+            continue
+        sub1s[section][sub1] = None
+        if not pd.isna(sub2):
+            sub2s[(section, sub1)][sub2] = None
+
+    h.sections = sorted(sub1s, key=_sort_key)
+    for section in h.sections:
+        grouped: "OrderedDict[str, List[str]]" = OrderedDict()
+        for s1 in sorted(sub1s[section], key=_sort_key):
+            grouped[s1] = sorted(sub2s.get((section, s1), ()), key=_sort_key)
+        h.sub_groups[section] = grouped
+    return h
+
+
 def is_subsg_split(sg_raw: str) -> bool:
     return is_split_sg(canonical(sg_raw))
@@ -74,11 +74,19 @@ def _subsg_display_name(subsg_raw: str) -> str:
 
 
 def build_columns(
-    df: pd.DataFrame,
+    df: Optional[pd.DataFrame],
     config,
     period_key: Optional[int] = None,
+    hierarchy: Optional[aggregator.Hierarchy] = None,
 ) -> List[ColumnDef]:
-    """Build the full ColumnDef sequence for the report."""
+    """Build the full ColumnDef sequence for the report.
+
+    Pass a prebuilt `hierarchy` (from aggregator.build_hierarchy) to share
+    one layout pass with row_builder / reconciler; `df` is then unused and
+    may be None.
+    """
+    if hierarchy is None:
+        hierarchy = aggregator.build_hierarchy(df, period_key=period_key)
     cols: List[ColumnDef] = []
 
     # 1) Label
@@ -98,8 +106,7 @@ def build_columns(
     ))
 
     # 3) Per BU
-    bus = aggregator.enumerate_bus(df, period_key=period_key)
-    for bu in bus:
+    for bu in hierarchy.bus:
         bu_color = config.bu_color(bu)
         cols.append(ColumnDef(
             col_type="bu_total",
@@ -109,23 +116,21 @@ def build_columns(
             color=bu_color,
         ))
 
-        sgs = aggregator.enumerate_sgs(df, bu, period_key=period_key)
-        for sg in sgs:
+        for sg in hierarchy.sgs_for(bu):
             if is_split_sg(canonical(sg)):
-                cols.extend(_build_split_sg_columns(df, bu, sg, bu_color, config, period_key))
+                cols.extend(_build_split_sg_columns(hierarchy, bu, sg, bu_color, config))
             else:
-                cols.extend(_build_flat_sg_columns(df, bu, sg, bu_color, config, period_key))
+                cols.extend(_build_flat_sg_columns(hierarchy, bu, sg, bu_color, config))
 
     return cols
 
 
 def _build_flat_sg_columns(
-    df: pd.DataFrame,
+    hierarchy: aggregator.Hierarchy,
     bu: str,
     sg: str,
     bu_color: str,
     config,
-    period_key: Optional[int],
 ) -> List[ColumnDef]:
     out: List[ColumnDef] = []
     out.append(ColumnDef(
@@ -137,7 +142,7 @@ def _build_flat_sg_columns(
         width=config.data_col_width,
         color=bu_color,
     ))
-    products = aggregator.enumerate_products(df, bu, sg, period_key=period_key)
+    products = hierarchy.products_for(bu, sg)
     for pkey, pname in products:
         out.append(ColumnDef(
             col_type="product",
@@ -154,12 +159,11 @@ def _build_flat_sg_columns(
 
 
 def _build_split_sg_columns(
-    df: pd.DataFrame,
+    hierarchy: aggregator.Hierarchy,
     bu: str,
     sg: str,
     bu_color: str,
     config,
-    period_key: Optional[int],
 ) -> List[ColumnDef]:
     """Emit summary + sub-SG groups for a split SG (e.g., 4.5)."""
     out: List[ColumnDef] = []
@@ -190,9 +194,7 @@ def _build_split_sg_columns(
             color=bu_color,
         ))
         # Products under this sub-SG
-        products = aggregator.enumerate_products(
-            df, bu, sg, period_key=period_key, subsg_canon=subsg_c,
-        )
+        products = hierarchy.products_for(bu, sg, subsg_canon=subsg_c)
         for pkey, pname in products:
             out.append(ColumnDef(
                 col_type="product",
@@ -4,6 +4,7 @@ direct pandas read_csv with Thai encoding fallbacks.
 """
 import sys
 from pathlib import Path
+from typing import Iterator, Tuple
 
 import pandas as pd
 
@@ -26,13 +27,51 @@ def load_fv_csv(csv_path: Path, encoding: str = "tis-620") -> pd.DataFrame:
     """Load an FV data-warehouse CSV with Thai encoding fallbacks."""
     csv_path = Path(csv_path)
     if _RGLoader is not None:
-        return _RGLoader(encoding=encoding).load_csv(csv_path)
+        return _integral_product_keys(_RGLoader(encoding=encoding).load_csv(csv_path))
 
     last_err = None
     for enc in (encoding, *_FALLBACK_ENCODINGS):
         try:
             df = pd.read_csv(csv_path, encoding=enc)
-            return df.dropna(how="all")
+            return _integral_product_keys(df.dropna(how="all"))
         except UnicodeDecodeError as e:
             last_err = e
     raise last_err or UnicodeDecodeError("unknown", b"", 0, 1, "failed")
+
+
+def fv_csv_encodings(encoding: str = "tis-620") -> Tuple[str, ...]:
+    """Encodings to try, in order, for an FV CSV (requested one first)."""
+    return tuple(dict.fromkeys((encoding, *_FALLBACK_ENCODINGS)))
+
+
+def iter_fv_csv_chunks(
+    csv_path: Path,
+    encoding: str = "tis-620",
+    chunksize: int = 200_000,
+) -> Iterator[pd.DataFrame]:
+    """Yield an FV CSV in chunks of `chunksize` rows using a single encoding.
+
+    A UnicodeDecodeError can surface at any chunk; callers that accumulate
+    state should restart with the next entry of fv_csv_encodings().
+    """
+    with pd.read_csv(Path(csv_path), encoding=encoding, chunksize=chunksize) as reader:
+        for chunk in reader:
+            yield _integral_product_keys(chunk.dropna(how="all"))
+
+
+def _integral_product_keys(df: pd.DataFrame) -> pd.DataFrame:
+    """Undo the int → float upcast pandas applies to PRODUCT_KEY when a key is blank.
+
+    Numeric keys would otherwise read as '181030004.0' — and, in chunked
+    reads, only in the chunks that happen to contain a blank key.
+    """
+    if "PRODUCT_KEY" not in df.columns or df["PRODUCT_KEY"].dtype.kind != "f":
+        return df
+    keys = df["PRODUCT_KEY"]
+    present = keys.notna()
+    if not (keys[present] % 1 == 0).all():
+        return df
+    fixed = keys.astype(object)
+    fixed[present] = keys[present].astype("int64").astype(object)
+    return df.assign(PRODUCT_KEY=fixed)
+
@@ -6,18 +6,27 @@ percentages under GROUP "33." that are not summable).
 """
 from typing import Optional
 
+import numpy as np
+
 from .normalizer import canonical
 
 
-_REVENUE_KEY = (canonical("01.รายได้"), None, None)
-_CM_KEY = (canonical("03.กำไรส่วนเกิน [CONTRIBUTION MARGIN] (1) (2)"), None, None)
+REVENUE_KEY = (canonical("01.รายได้"), None, None)
+CM_KEY = (canonical("03.กำไรส่วนเกิน [CONTRIBUTION MARGIN] (1) (2)"), None, None)
 PERCENT_ROW_KEY = (canonical("%กำไรส่วนเกิน (3)/(1)"), None, None)
 
 
 def percent_value(pivot: dict, col_key: tuple) -> Optional[float]:
     """Return contribution-margin / revenue for a column, or None if undefined."""
-    revenue = pivot.get((_REVENUE_KEY, col_key))
-    cm = pivot.get((_CM_KEY, col_key))
+    revenue = pivot.get((REVENUE_KEY, col_key))
+    cm = pivot.get((CM_KEY, col_key))
     if not revenue:
         return None
     return (cm or 0.0) / revenue
+
+
+def percent_values(revenue: np.ndarray, cm: np.ndarray) -> np.ndarray:
+    """Vector form of percent_value(): cm / revenue per column, NaN where revenue is 0."""
+    out = np.full(np.shape(revenue), np.nan)
+    np.divide(cm, revenue, out=out, where=np.asarray(revenue) != 0)
+    return out
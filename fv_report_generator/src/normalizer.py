@@ -4,8 +4,16 @@ Label normalizer — convert CSV and template labels to a common canonical form.
 CSV uses prefixes like "01.", "02." and suffixes like "... :" on SUB_GROUP1.
 Template uses human formatting like "    - label" for items, "label - Variable Cost" for groups.
 We normalize both to a shared canonical key so we can match row/column identities.
+
+Both normalizers are memoized (bounded LRU) because builders and the reconciler
+canonicalize the same few hundred labels over and over; `map_unique` applies a
+normalizer once per distinct value of a column and broadcasts back by code.
 """
 import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
 
 
 _NUMERIC_PREFIX = re.compile(r"^\s*\d+(?:\.\d+)*\.?\s*")
@@ -17,11 +25,20 @@ _NON_WORD = re.compile(r"[^\w\u0E00-\u0E7F]+", re.UNICODE)
 _WHITESPACE = re.compile(r"\s+")
 
 
+# Distinct labels/product keys in a warehouse extract are in the low thousands.
+_CACHE_SIZE = 16384
+
+
 def canonical(text):
     """Normalize a Thai/English label so CSV and template variants compare equal."""
     if text is None:
         return ""
-    s = str(text).replace("\xa0", " ")
+    return _canonical_str(str(text))
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _canonical_str(text: str) -> str:
+    s = text.replace("\xa0", " ")
     s = _NUMERIC_PREFIX.sub("", s)
     s = _COST_SUFFIX.sub("", s)
     s = _NON_WORD.sub(" ", s)
@@ -33,6 +50,37 @@ def canonical_product_key(key):
     """Strip leading zeros, whitespace, and newlines from a product key."""
     if key is None:
         return ""
-    s = str(key).strip().replace("\n", "").replace("\xa0", "")
+    return _canonical_product_key_str(str(key))
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _canonical_product_key_str(key: str) -> str:
+    s = key.strip().replace("\n", "").replace("\xa0", "")
     s = s.lstrip("0")
     return s
+
+
+_PASS_MISSING = object()
+
+
+def map_unique(values: pd.Series, func, na_value=_PASS_MISSING) -> pd.Series:
+    """Apply `func` once per distinct value of `values` and broadcast back.
+
+    Equivalent to `values.map(func)` but costs one call per unique value
+    instead of one per row. Missing values (None/NaN) are passed to `func`
+    as-is unless `na_value` is given, in which case they map to `na_value`
+    (e.g. `na_value=None` for "missing stays missing").
+    """
+    codes, uniques = pd.factorize(values)
+    mapped = np.empty(len(uniques) + 1, dtype=object)
+    mapped[:-1] = [func(u) for u in uniques]
+    mapped[-1] = None if na_value is _PASS_MISSING else na_value
+    result = mapped[codes]
+
+    if na_value is _PASS_MISSING:
+        missing = codes == -1
+        if missing.any():
+            is_none = np.equal(values.to_numpy(dtype=object)[missing], None)
+            result[missing] = np.where(is_none, func(None), func(np.nan))
+
+    return pd.Series(result, index=values.index, dtype=object)
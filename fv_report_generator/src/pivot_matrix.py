@@ -0,0 +1,149 @@
+"""
+Pivot matrix — the {(row_key, col_key): float} pivot as an aligned
+row × column array plus a parent-index vector over the columns.
+
+Column hierarchy (parent of each col_key):
+    BU_TOTAL(bu)                    → GRAND_TOTAL
+    SG_TOTAL(bu, sg)                → BU_TOTAL(bu)
+    SUBSG_TOTAL(bu, sg, subsg)      → SG_TOTAL(bu, sg)
+    PRODUCT(bu, sg, subsg, pkey)    → SUBSG_TOTAL(bu, sg, subsg) for split SGs,
+                                      SG_TOTAL(bu, sg) otherwise
+
+With that, "parent == Σ children" for every row and every parent column is
+one np.add.at segment sum, which is how reconcile_invariants() checks it.
+(A split SG's children are its SUBSG_TOTAL columns plus any product that
+maps to no sub-SG.)
+
+aligned_values() lays the same pivot out in report order (RowDef ×
+ColumnDef) for DataWriter.
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Column level per col_key tag (depth in the column hierarchy)
+COL_LEVELS = {"GRAND_TOTAL": 0, "BU_TOTAL": 1, "SG_TOTAL": 2, "SUBSG_TOTAL": 3, "PRODUCT": 4}
+
+
+def parent_col_key(col_key: tuple) -> Optional[tuple]:
+    """The col_key one level up, or None for GRAND_TOTAL."""
+    tag = col_key[0]
+    if tag == "BU_TOTAL":
+        return ("GRAND_TOTAL",)
+    if tag == "SG_TOTAL":
+        return ("BU_TOTAL", col_key[1])
+    if tag == "SUBSG_TOTAL":
+        return ("SG_TOTAL", col_key[1], col_key[2])
+    if tag == "PRODUCT":
+        _, bu, sg, subsg, _ = col_key
+        if subsg != sg:
+            return ("SUBSG_TOTAL", bu, sg, subsg)
+        return ("SG_TOTAL", bu, sg)
+    return None
+
+
+@dataclass
+class PivotMatrix:
+    row_keys: List[tuple]
+    col_keys: List[tuple]
+    values: np.ndarray          # len(row_keys) × len(col_keys); 0.0 where the pivot has no cell
+    col_parent: np.ndarray      # parent column index per column, -1 for GRAND_TOTAL
+    col_level: np.ndarray       # COL_LEVELS value per column
+
+    @classmethod
+    def from_pivot(
+        cls,
+        pivot: dict,
+        row_keys: Optional[Sequence[tuple]] = None,
+        col_keys: Optional[Sequence[tuple]] = None,
+    ) -> "PivotMatrix":
+        """Materialize `pivot` as a dense matrix.
+
+        Rows / columns default to every key in the pivot (first-seen order);
+        parents implied by a column are always added so each column has one.
+        Cells whose row or column is not in the requested order are ignored.
+        """
+        if row_keys is None or col_keys is None:
+            seen_rows: Dict[tuple, None] = {}
+            seen_cols: Dict[tuple, None] = {}
+            for rk, ck in pivot:
+                seen_rows[rk] = None
+                seen_cols[ck] = None
+            row_keys = list(seen_rows) if row_keys is None else row_keys
+            col_keys = list(seen_cols) if col_keys is None else col_keys
+
+        cols: Dict[tuple, int] = {}
+        for ck in col_keys:
+            while ck is not None and ck not in cols:
+                cols[ck] = len(cols)
+                ck = parent_col_key(ck)
+        rows = {rk: i for i, rk in enumerate(row_keys)}
+
+        values = np.zeros((len(rows), len(cols)))
+        r_idx, c_idx, vals = [], [], []
+        for (rk, ck), value in pivot.items():
+            r = rows.get(rk)
+            c = cols.get(ck)
+            if r is not None and c is not None:
+                r_idx.append(r)
+                c_idx.append(c)
+                vals.append(value)
+        if vals:
+            values[np.array(r_idx), np.array(c_idx)] = vals
+
+        col_list = list(cols)
+        parents = [parent_col_key(ck) for ck in col_list]
+        col_parent = np.array([-1 if p is None else cols[p] for p in parents], dtype=np.intp)
+        col_level = np.array([COL_LEVELS.get(ck[0], -1) for ck in col_list], dtype=np.intp)
+        return cls(list(rows), col_list, values, col_parent, col_level)
+
+    def row_index(self, row_key: tuple) -> Optional[int]:
+        try:
+            return self.row_keys.index(row_key)
+        except ValueError:
+            return None
+
+    def children_sum(self):
+        """Σ of every column into its parent column.
+
+        Returns (parent column indices, rows × parents array of child sums)
+        for the columns that have at least one child.
+        """
+        child = np.flatnonzero(self.col_parent >= 0)
+        if child.size == 0:
+            return np.empty(0, dtype=np.intp), np.zeros((len(self.row_keys), 0))
+        parents, inverse = np.unique(self.col_parent[child], return_inverse=True)
+        sums = np.zeros((parents.size, len(self.row_keys)))
+        np.add.at(sums, inverse, self.values[:, child].T)
+        return parents, sums.T
+
+
+def aligned_values(
+    pivot: dict,
+    row_keys: Sequence[Optional[tuple]],
+    col_keys: Sequence[Optional[tuple]],
+) -> np.ndarray:
+    """Pivot values laid out exactly in the given row × column order.
+
+    Keys may repeat (each position gets the cell); None keys (label
+    columns) and cells the pivot lacks are NaN. The pivot is scanned once
+    into a matrix of the distinct keys, which is then gathered to the
+    requested order — so writers read a row slice instead of hashing a
+    (row_key, col_key) tuple per cell.
+    """
+    rows: Dict[tuple, int] = {}
+    cols: Dict[tuple, int] = {}
+    # Position -1 selects the trailing all-NaN row / column of `dense`
+    row_pos = [-1 if rk is None else rows.setdefault(rk, len(rows)) for rk in row_keys]
+    col_pos = [-1 if ck is None else cols.setdefault(ck, len(cols)) for ck in col_keys]
+
+    dense = np.full((len(rows) + 1, len(cols) + 1), np.nan)
+    for (rk, ck), value in pivot.items():
+        r = rows.get(rk)
+        if r is not None:
+            c = cols.get(ck)
+            if c is not None:
+                dense[r, c] = value
+    return dense[np.ix_(np.array(row_pos, dtype=np.intp), np.array(col_pos, dtype=np.intp))]
+
@@ -1,17 +1,23 @@
 """
-Reconciler — verify the generated .xlsx against the source CSV.
+Reconciler — verify the generated report against the source CSV.
+
+The written values come as a ValueGrid (value_grid.py): either the grid
+DataWriter recorded from the cells it wrote (generate_report(), the default
+CLI path — checks what landed in each worksheet cell before saving), or the
+saved .xlsx re-read with ValueGrid.from_sheet (grid=None, CLI
+--reconcile-from-file — end-to-end through the file on disk).
 
 Two independent verification paths:
 
-1. reconcile() — cell-by-cell comparison of the .xlsx against the pivot
-   recomputed from build_pivot().  Catches writer bugs, lost cells,
-   column-map drift, and rounding regressions end-to-end.
+1. reconcile() — cell-by-cell comparison of the written values against the
+   pivot.  Catches writer bugs, lost cells, column-map drift, and rounding
+   regressions; with the file re-read, also anything lost in saving.
 
 2. reconcile_invariants() — checks structural consistency of build_pivot()
    itself, without trusting its logic.  Catches aggregation bugs that
    reconcile() would miss because both sides use the same code path.
 
-   Layer A — Hierarchical totals:
+   Layer A — Hierarchical totals (every pivot row, see pivot_matrix.py):
        GRAND_TOTAL         == sum(BU_TOTAL for every BU)
        BU_TOTAL[bu]        == sum(SG_TOTAL for every SG in that BU)
        SG_TOTAL[bu,sg]     == sum(PRODUCT  for every product in that SG/subSG)
@@ -32,12 +38,13 @@ ground-truth file. The CSV itself is the source of truth.
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple
 
-import openpyxl
+import numpy as np
 import pandas as pd
 
 from . import aggregator, column_builder, derived, row_builder
-from .normalizer import canonical, canonical_product_key
-from .satellite_split import SATELLITE_GROUPS, is_split_sg, subsg_for
+from .normalizer import canonical
+from .pivot_matrix import PivotMatrix
+from .value_grid import ValueGrid
 
 
 # ---------------------------------------------------------------------------
@@ -57,15 +64,6 @@ class ReconcileResult:
         return not self.mismatches
 
 
-def _to_float(value) -> Optional[float]:
-    if value is None or value == "":
-        return None
-    try:
-        return float(value)
-    except (TypeError, ValueError):
-        return None
-
-
 def reconcile(
     output_path,
     df: pd.DataFrame,
@@ -73,67 +71,86 @@ def reconcile(
     period_key: Optional[int] = None,
     sheet_name: str = "Report_FV",
     tolerance: float = 0.01,
+    hierarchy: Optional[aggregator.Hierarchy] = None,
+    pivot: Optional[dict] = None,
+    grid: Optional[ValueGrid] = None,
 ) -> ReconcileResult:
-    """Compare every non-label data cell in `output_path` to the pivot recomputed from `df`."""
-    pivot = aggregator.build_pivot(df, period_key=period_key)
-    columns = column_builder.build_columns(df, config, period_key=period_key)
-    rows = row_builder.build_rows(df, config, period_key=period_key)
+    """Compare every non-label data cell of the report to the pivot (recomputed from `df` if not given).
+
+    `grid` is what generate_report() returned: the values recorded from the
+    worksheet cells as written, before saving. Without `grid` the saved
+    `output_path` is loaded once in read-only, values-only mode.
+    """
+    if hierarchy is None:
+        hierarchy = aggregator.build_hierarchy(df, period_key=period_key)
+    if pivot is None:
+        pivot = aggregator.build_pivot(df, period_key=period_key)
+    columns = column_builder.build_columns(df, config, period_key=period_key, hierarchy=hierarchy)
+    rows = row_builder.build_rows(df, config, period_key=period_key, hierarchy=hierarchy)
+    if grid is None:
+        grid = _load_grid(output_path, sheet_name, config, rows, columns)
 
-    wb = openpyxl.load_workbook(output_path, data_only=True)
-    if sheet_name not in wb.sheetnames:
-        raise KeyError(f"sheet {sheet_name!r} not found in {output_path}; available: {wb.sheetnames}")
-    ws = wb[sheet_name]
+    data_cols = [
+        (col_offset, col) for col_offset, col in enumerate(columns)
+        if col.col_type != "label" and col.col_key is not None
+    ]
+    col_offsets = np.array([col_offset for col_offset, _ in data_cols], dtype=int)
+
+    # Looked up cell by cell in the pivot, independently of the writer's
+    # aligned matrix. Treat None and 0 as equivalent (writer formats 0 as blank).
+    percents = [derived.percent_value(pivot, col.col_key) for _, col in data_cols]
+    expected = np.zeros((len(rows), len(data_cols)))
+    for r, rd in enumerate(rows):
+        if rd.row_type == "percent":
+            values = percents
+        else:
+            values = [pivot.get((rd.row_key, col.col_key)) for _, col in data_cols]
+        expected[r] = [0.0 if value is None else value for value in values]
+    actual = _grid_block(grid, config, len(rows), col_offsets)
 
     result = ReconcileResult()
+    result.cells_checked = expected.size
+    diff = actual - expected
+    for r, c in zip(*np.nonzero(np.abs(diff) > tolerance)):
+        col = data_cols[c][1]
+        result.mismatches.append((
+            rows[r].display_label,
+            col.display_name or repr(col.col_key),
+            float(actual[r, c]),
+            float(expected[r, c]),
+            float(diff[r, c]),
+        ))
+    return result
 
-    for row_offset, rd in enumerate(rows):
-        xl_row = config.data_start_row + row_offset
-        for col_offset, col in enumerate(columns):
-            xl_col = config.label_col + col_offset
-            if col.col_type == "label":
-                continue
 
-            ck = col.col_key
-            if ck is None:
-                continue
+def _load_grid(output_path, sheet_name: str, config, rows, columns) -> ValueGrid:
+    """Read the report's data area once (read-only, values-only)."""
+    return ValueGrid.from_sheet(
+        output_path, sheet_name,
+        first_row=config.data_start_row, first_col=config.label_col,
+        n_rows=len(rows), n_cols=len(columns),
+    )
 
-            # Expected value
-            if rd.row_type == "percent":
-                expected = derived.percent_value(pivot, ck)
-            else:
-                expected = pivot.get((rd.row_key, ck))
-
-            actual = _to_float(ws.cell(xl_row, xl_col).value)
-
-            # Treat None and 0 as equivalent (writer formats 0 as blank).
-            exp_f = expected if expected is not None else 0.0
-            act_f = actual if actual is not None else 0.0
-
-            result.cells_checked += 1
-            diff = act_f - exp_f
-            if abs(diff) > tolerance:
-                result.mismatches.append((
-                    rd.display_label,
-                    col.display_name or repr(ck),
-                    act_f,
-                    exp_f,
-                    diff,
-                ))
-    return result
+
+def _grid_block(grid: ValueGrid, config, n_rows: int, col_offsets: np.ndarray) -> np.ndarray:
+    """Zero-filled values for the report rows × the given column offsets."""
+    r0 = config.data_start_row - grid.first_row
+    c0 = config.label_col - grid.first_col
+    return np.nan_to_num(grid.values[r0:r0 + n_rows, c0 + col_offsets], nan=0.0)
 
 
 # ---------------------------------------------------------------------------
-# Business-rule checker — reads directly from .xlsx, trusts neither pivot
-# nor CSV.  Verifies accounting identities on the numbers that actually
-# landed in the spreadsheet.
+# Business-rule checker — trusts neither pivot nor CSV.  Verifies accounting
+# identities on the written values (the writer's grid, or the saved .xlsx
+# re-read when no grid is given).
 # ---------------------------------------------------------------------------
 
 @dataclass
 class BusinessRuleViolation:
     rule: str           # e.g. 'CM = Revenue − Variable Cost'
     col_display: str    # column header
-    got: float          # value found in xlsx
-    expected: float     # value computed from other xlsx cells
+    got: float          # written value
+    expected: float     # value computed from other written cells
     diff: float
     detail: str = ""    # human-readable breakdown (Revenue=…, VarCost=…)
 
@@ -169,12 +186,15 @@ def reconcile_business_rules(
     period_key: Optional[int] = None,
     sheet_name: str = "Report_FV",
     tolerance: float = 0.01,
+    hierarchy: Optional[aggregator.Hierarchy] = None,
+    grid: Optional[ValueGrid] = None,
 ) -> BusinessRuleResult:
-    """Verify accounting identities by reading values directly from the .xlsx.
+    """Verify accounting identities on the written cell values.
 
-    Does NOT use build_pivot() or the raw CSV for the actual numbers —
-    it reads whatever ended up in each cell of the Excel file and checks
-    that the numbers are self-consistent.
+    Does NOT use build_pivot() or the raw CSV for the actual numbers — it
+    checks that the values in the report cells are self-consistent. `grid` is
+    the value grid generate_report() recorded from the worksheet cells it
+    wrote; without it the saved sheet is loaded once (read-only).
 
     Row rules — P&L chain (per column):
         Rule 1: CM (03)     = Revenue (01) − Variable Cost (02)
@@ -187,20 +207,17 @@ def reconcile_business_rules(
         Rule 6: BU_TOTAL    == Σ SG_TOTAL  (for every section row, per BU)
         Rule 7: SG_TOTAL    == Σ PRODUCT   (for every section row, per SG)
     """
-    columns = column_builder.build_columns(df, config, period_key=period_key)
-    rows = row_builder.build_rows(df, config, period_key=period_key)
-
-    wb = openpyxl.load_workbook(output_path, data_only=True)
-    if sheet_name not in wb.sheetnames:
-        raise KeyError(
-            f"sheet {sheet_name!r} not found in {output_path}; "
-            f"available: {wb.sheetnames}"
-        )
-    ws = wb[sheet_name]
+    if hierarchy is None:
+        hierarchy = aggregator.build_hierarchy(df, period_key=period_key)
+    columns = column_builder.build_columns(df, config, period_key=period_key, hierarchy=hierarchy)
+    rows = row_builder.build_rows(df, config, period_key=period_key, hierarchy=hierarchy)
+
+    if grid is None:
+        grid = _load_grid(output_path, sheet_name, config, rows, columns)
     result = BusinessRuleResult()
 
     def _cell(xl_row: int, xl_col: int) -> float:
-        return _to_float(ws.cell(xl_row, xl_col).value) or 0.0
+        return grid.cell(xl_row, xl_col) or 0.0
 
     def _check_rule(rule: str, col_display: str, got: float, expected: float,
                     detail: str = "") -> None:
@@ -418,17 +435,24 @@ def _raw_section_sums(df: pd.DataFrame, period_key: Optional[int]) -> Dict[str,
     with the percent-group prefix ("33.") are excluded because they are not
     summable (pre-computed per-product percentages).
     """
-    _PERCENT_PREFIX = "33."
-    sub = df.copy()
     if period_key is not None:
-        sub = sub[sub["TIME_KEY"] == period_key]
-    sub = sub[sub["VALUE"].notna()].copy()
-    sub["VALUE"] = sub["VALUE"].astype(float)
+        df = df[df["TIME_KEY"] == period_key]
+    return raw_section_sums_by_period(df.assign(TIME_KEY=0)).get(0, {})
+
+
+def raw_section_sums_by_period(df: pd.DataFrame) -> Dict[int, Dict[str, float]]:
+    """{TIME_KEY: {GROUP: Σ VALUE}} with the same rules as _raw_section_sums().
+
+    Partial results of CSV chunks add up key by key (see streaming.py).
+    """
+    _PERCENT_PREFIX = "33."
+    sub = df[df["VALUE"].notna()]
     # Exclude percent-group rows
     sub = sub[~sub["GROUP"].astype(str).str.lstrip().str.startswith(_PERCENT_PREFIX)]
-    sums: Dict[str, float] = (
-        sub.groupby("GROUP")["VALUE"].sum().to_dict()
-    )
+    sums: Dict[int, Dict[str, float]] = {}
+    grouped = sub["VALUE"].astype(float).groupby([sub["TIME_KEY"], sub["GROUP"]]).sum()
+    for (pk, group), value in grouped.items():
+        sums.setdefault(int(pk), {})[group] = float(value)
     return sums
 
 
@@ -436,9 +460,14 @@ def reconcile_invariants(
     df: pd.DataFrame,
     period_key: Optional[int] = None,
     tolerance: float = 0.01,
+    pivot: Optional[dict] = None,
+    section_sums: Optional[Dict[str, float]] = None,
 ) -> InvariantResult:
     """Check structural consistency of build_pivot() independent of its logic.
 
+    The pivot is laid out as a PivotMatrix (rows × columns + parent index per
+    column), so each layer is one vectorized comparison over every row.
+
     Parameters
     ----------
     df:
@@ -448,143 +477,97 @@ def reconcile_invariants(
         Same period filter used when generating the report.
     tolerance:
         Absolute difference threshold to flag a violation.
+    pivot:
+        The pivot generate_report() used; rebuilt from `df` when omitted.
+    section_sums:
+        Raw Σ VALUE per GROUP for Layer B (streamed builds collect these while
+        reading); computed from `df` when omitted. With both `pivot` and
+        `section_sums` given, `df` may be None.
 
     Returns
     -------
     InvariantResult with a list of violations and a checks_run counter.
     """
-    pivot = aggregator.build_pivot(df, period_key=period_key)
+    if pivot is None:
+        pivot = aggregator.build_pivot(df, period_key=period_key)
+    matrix = PivotMatrix.from_pivot(pivot)
     result = InvariantResult()
 
-    def _p(key: tuple) -> float:
-        return pivot.get(key, 0.0)
-
-    def _check(layer: str, description: str, got: float, expected: float) -> None:
-        result.checks_run += 1
+    def _check(layer: str, got: np.ndarray, expected: np.ndarray, describe) -> None:
+        """Compare two aligned arrays; describe(i) names violation i."""
+        result.checks_run += got.size
         diff = got - expected
-        if abs(diff) > tolerance:
+        for i in np.flatnonzero(np.abs(diff) > tolerance):
             result.violations.append(InvariantViolation(
                 layer=layer,
-                description=description,
-                got=got,
-                expected=expected,
-                diff=diff,
+                description=describe(i),
+                got=float(got.flat[i]),
+                expected=float(expected.flat[i]),
+                diff=float(diff.flat[i]),
             ))
 
     # ------------------------------------------------------------------
-    # Layer A — Hierarchical totals
+    # Layer A — Hierarchical totals: every parent column == Σ its children
+    #   GRAND_TOTAL == Σ BU_TOTAL, BU_TOTAL == Σ SG_TOTAL,
+    #   SG_TOTAL == Σ PRODUCT (split SG: Σ SUBSG_TOTAL), SUBSG_TOTAL == Σ PRODUCT
     # ------------------------------------------------------------------
 
-    bus = aggregator.enumerate_bus(df, period_key=period_key)
-
-    # A1: GRAND_TOTAL == sum of all BU_TOTAL
-    grand_total = _p(("GRAND_TOTAL",))
-    bu_total_sum = sum(_p(("BU_TOTAL", canonical(bu))) for bu in bus)
-    _check("A_hierarchy", "GRAND_TOTAL == Σ BU_TOTAL", grand_total, bu_total_sum)
+    parents, child_sums = matrix.children_sum()
+    if parents.size:
+        n_parents = parents.size
 
-    for bu in bus:
-        bu_c = canonical(bu)
-        bu_val = _p(("BU_TOTAL", bu_c))
-        sgs = aggregator.enumerate_sgs(df, bu, period_key=period_key)
+        def _describe_a(i: int) -> str:
+            r, p = divmod(int(i), n_parents)
+            ck = matrix.col_keys[parents[p]]
+            return f"{_col_label(ck)} == Σ children @ row {matrix.row_keys[r]}"
 
-        # A2: BU_TOTAL == sum of its SG_TOTAL
-        sg_sum = sum(_p(("SG_TOTAL", bu_c, canonical(sg))) for sg in sgs)
-        _check("A_hierarchy", f"BU_TOTAL[{bu}] == Σ SG_TOTAL", bu_val, sg_sum)
-
-        for sg in sgs:
-            sg_c = canonical(sg)
-            sg_val = _p(("SG_TOTAL", bu_c, sg_c))
-
-            products = aggregator.enumerate_products(df, bu, sg, period_key=period_key)
-            if not products:
-                continue
-
-            # A3a: If SG is flat — SG_TOTAL == sum of its PRODUCT columns
-            if not is_split_sg(sg_c):
-                prod_sum = sum(
-                    _p(("PRODUCT", bu_c, sg_c,
-                        subsg_for(sg_c, canonical_product_key(pkey)),
-                        canonical_product_key(pkey)))
-                    for pkey, _ in products
-                )
-                _check(
-                    "A_hierarchy",
-                    f"SG_TOTAL[{bu}/{sg}] == Σ PRODUCT",
-                    sg_val,
-                    prod_sum,
-                )
-            else:
-                # A3b: Split SG — SG_TOTAL == sum of SUBSG_TOTAL
-                subsg_names = [g["name"] for g in SATELLITE_GROUPS.values()]
-                subsg_sum = sum(
-                    _p(("SUBSG_TOTAL", bu_c, sg_c, canonical(subsg)))
-                    for subsg in subsg_names
-                )
-                _check(
-                    "A_hierarchy",
-                    f"SG_TOTAL[{bu}/{sg}] == Σ SUBSG_TOTAL",
-                    sg_val,
-                    subsg_sum,
-                )
-                # A3c: each SUBSG_TOTAL == sum of its products
-                for subsg in subsg_names:
-                    subsg_c = canonical(subsg)
-                    subsg_val = _p(("SUBSG_TOTAL", bu_c, sg_c, subsg_c))
-                    sub_products = aggregator.enumerate_products(
-                        df, bu, sg, period_key=period_key, subsg_canon=subsg_c
-                    )
-                    sub_prod_sum = sum(
-                        _p(("PRODUCT", bu_c, sg_c, subsg_c, canonical_product_key(pkey)))
-                        for pkey, _ in sub_products
-                    )
-                    _check(
-                        "A_hierarchy",
-                        f"SUBSG_TOTAL[{bu}/{sg}/{subsg}] == Σ PRODUCT",
-                        subsg_val,
-                        sub_prod_sum,
-                    )
+        _check("A_hierarchy", matrix.values[:, parents], child_sums, _describe_a)
 
     # ------------------------------------------------------------------
     # Layer B — Raw CSV cross-check (independent simple groupby)
     # ------------------------------------------------------------------
 
-    raw_sums = _raw_section_sums(df, period_key)
-    for group_raw, raw_val in raw_sums.items():
-        row_key = (canonical(group_raw), None, None)
-        pivot_val = _p((row_key, ("GRAND_TOTAL",)))
+    raw_sums = section_sums if section_sums is not None else _raw_section_sums(df, period_key)
+    if raw_sums:
+        groups = list(raw_sums)
+        grand = matrix.col_keys.index(("GRAND_TOTAL",)) if ("GRAND_TOTAL",) in matrix.col_keys else None
+        row_of = {rk: i for i, rk in enumerate(matrix.row_keys)}
+        pivot_vals = np.zeros(len(groups))
+        if grand is not None:
+            for i, group_raw in enumerate(groups):
+                r = row_of.get((canonical(group_raw), None, None))
+                if r is not None:
+                    pivot_vals[i] = matrix.values[r, grand]
         _check(
             "B_raw_csv",
-            f"GRAND_TOTAL for GROUP '{group_raw}'",
-            pivot_val,
-            raw_val,
+            pivot_vals,
+            np.array([raw_sums[g] for g in groups], dtype=float),
+            lambda i: f"GRAND_TOTAL for GROUP '{groups[i]}'",
         )
 
     # ------------------------------------------------------------------
     # Layer C — Derived percent row formula
     # ------------------------------------------------------------------
 
-    # Build list of non-label col_keys from pivot keys
-    col_keys_seen = set()
-    for (row_key_part, ck) in pivot.keys():
-        if ck is not None:
-            col_keys_seen.add(ck)
-
-    _REV_KEY = derived._REVENUE_KEY
-    _CM_KEY = derived._CM_KEY
-
-    for ck in col_keys_seen:
-        revenue = _p((_REV_KEY, ck))
-        cm = _p((_CM_KEY, ck))
-        if not revenue:
-            continue  # undefined percent — skip
-        expected_pct = cm / revenue
-        # derived.percent_value recomputes the same — verify it matches directly
-        got_pct = derived.percent_value(pivot, ck) or 0.0
+    rev_row = matrix.row_index(derived.REVENUE_KEY)
+    cm_row = matrix.row_index(derived.CM_KEY)
+    if rev_row is not None:
+        revenue = matrix.values[rev_row]
+        cm = matrix.values[cm_row] if cm_row is not None else np.zeros_like(revenue)
+        defined = np.flatnonzero(revenue != 0)  # undefined percent — skip
+        got_pct = derived.percent_values(revenue, cm)[defined]
+        expected_pct = cm[defined] / revenue[defined]
         _check(
             "C_percent",
-            f"%กำไรส่วนเกิน for col {ck}",
             got_pct,
             expected_pct,
+            lambda i: f"%กำไรส่วนเกิน for col {matrix.col_keys[defined[i]]}",
         )
 
     return result
+
+
+def _col_label(col_key: tuple) -> str:
+    """'SG_TOTAL[bu/sg]' style name for a pivot col_key."""
+    tag, *parts = col_key
+    return f"{tag}[{'/'.join(parts)}]" if parts else tag
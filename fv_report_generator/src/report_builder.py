@@ -1,13 +1,17 @@
 """Orchestrator — coordinate aggregator, builders, and writers to emit one .xlsx."""
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 import pandas as pd
 from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
 
 from . import aggregator, column_builder, row_builder
 from .config import FVConfig
+from .value_grid import ValueGrid
 from .writers.cell_formatter import CellFormatter
 from .writers.column_header_writer import ColumnHeaderWriter
 from .writers.data_writer import DataWriter
@@ -22,21 +26,34 @@ def generate_report(
     config: FVConfig,
     period_key: Optional[int] = None,
     sheet_name: str = "Report_FV",
-) -> Path:
-    """Build the FV report workbook from CSV data."""
+    hierarchy: Optional[aggregator.Hierarchy] = None,
+) -> Tuple[Path, dict, ValueGrid]:
+    """Build the FV report workbook from CSV data.
+
+    `hierarchy` (aggregator.build_hierarchy) is built here when omitted;
+    pass it in to share the layout pass with the reconcilers.
+
+    Returns (output_path, pivot, grid); `grid` holds the values written to
+    the data area so reconcile() can check cells without re-reading the file.
+    """
     pivot = aggregator.build_pivot(df, period_key=period_key)
     log.info("pivot: %d (row, col) cells", len(pivot))
 
-    columns = column_builder.build_columns(df, config, period_key=period_key)
+    if hierarchy is None:
+        hierarchy = aggregator.build_hierarchy(df, period_key=period_key)
+
+    columns = column_builder.build_columns(df, config, period_key=period_key, hierarchy=hierarchy)
     log.info("columns: %d", len(columns))
 
-    rows = row_builder.build_rows(df, config, period_key=period_key)
+    rows = row_builder.build_rows(df, config, period_key=period_key, hierarchy=hierarchy)
     log.info("rows: %d", len(rows))
 
-    wb = Workbook()
-    ws = wb.active
-    ws.title = sheet_name
+    output_path, grid = _write_workbook(columns, rows, pivot, config, output_path, sheet_name)
+    return output_path, pivot, grid
 
+
+def _write_sheet(ws, columns, rows, pivot: dict, config: FVConfig) -> ValueGrid:
+    """Write headers, data cells and freeze panes for one report sheet; return the value grid."""
     formatter = CellFormatter(config)
     header_writer = HeaderWriter(config, formatter)
     column_header_writer = ColumnHeaderWriter(config, formatter)
@@ -45,16 +62,136 @@ def generate_report(
     # Column headers + widths first (so HeaderWriter knows last_col for merging)
     last_col = column_header_writer.write(ws, columns, start_xl_col=config.label_col)
     header_writer.write(ws, last_col=last_col)
-    data_writer.write(ws, columns, rows, pivot, start_xl_col=config.label_col)
+    grid = ValueGrid.empty(len(rows), len(columns), config.data_start_row, config.label_col)
+    data_writer.write(ws, columns, rows, pivot, start_xl_col=config.label_col, grid=grid)
 
     # Freeze panes: just below header rows, just after grand_total column
     freeze_row = config.data_start_row
     grand_col = config.label_col + 2  # label + grand_total = 2 cols, freeze AFTER grand_total
-    from openpyxl.utils import get_column_letter
     ws.freeze_panes = f"{get_column_letter(grand_col)}{freeze_row}"
+    return grid
+
 
+def _save(wb: Workbook, output_path: Path) -> Path:
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
     wb.save(output_path)
     log.info("saved %s (%.1f KB)", output_path, output_path.stat().st_size / 1024)
-    return output_path, pivot
+    return output_path
+
+
+def _write_workbook(columns, rows, pivot: dict, config: FVConfig,
+                    output_path: Path, sheet_name: str) -> Tuple[Path, ValueGrid]:
+    """Write a single-sheet workbook (module-level so worker processes can run it)."""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = sheet_name
+    grid = _write_sheet(ws, columns, rows, pivot, config)
+    return _save(wb, output_path), grid
+
+
+# --- Multi-period generation ---------------------------------------------------
+
+@dataclass
+class PeriodReport:
+    """One period written by generate_period_reports()."""
+    period_key: int
+    output_path: Path
+    sheet_name: str
+    config: FVConfig
+    pivot: dict
+    hierarchy: aggregator.Hierarchy
+    grid: Optional[ValueGrid] = None
+
+
+def period_sheet_name(sheet_name: str, period_key: int) -> str:
+    """Sheet name for one period inside a combined workbook, e.g. 'Report_FV_P14'."""
+    return f"{sheet_name}_P{period_key % 100:02d}"[:31]
+
+
+def generate_period_reports(
+    df: pd.DataFrame,
+    period_keys: Iterable[int],
+    config_for: Callable[[int], FVConfig],
+    output_for: Optional[Callable[[int], Path]] = None,
+    combined_path: Optional[Path] = None,
+    sheet_name: str = "Report_FV",
+    workers: int = 1,
+) -> Dict[int, PeriodReport]:
+    """Build reports for many periods of one warehouse CSV.
+
+    The CSV is canonicalized and pivoted once with TIME_KEY as an extra key
+    (aggregator.build_period_pivots / build_period_hierarchies); only the
+    workbook writing is per period.
+
+    Exactly one output mode applies:
+    - `output_for(period_key)` → one workbook per period; with `workers > 1`
+      the workbooks are written in parallel worker processes.
+    - `combined_path` → one workbook with a sheet per period (written
+      sequentially; openpyxl workbooks cannot be shared across processes).
+    """
+    period_keys = [int(pk) for pk in period_keys]
+    return write_period_reports(
+        aggregator.build_period_pivots(df, period_keys),
+        aggregator.build_period_hierarchies(df, period_keys),
+        period_keys, config_for,
+        output_for=output_for, combined_path=combined_path,
+        sheet_name=sheet_name, workers=workers,
+    )
+
+
+def write_period_reports(
+    pivots: Dict[int, dict],
+    hierarchies: Dict[int, aggregator.Hierarchy],
+    period_keys: Iterable[int],
+    config_for: Callable[[int], FVConfig],
+    output_for: Optional[Callable[[int], Path]] = None,
+    combined_path: Optional[Path] = None,
+    sheet_name: str = "Report_FV",
+    workers: int = 1,
+) -> Dict[int, PeriodReport]:
+    """Write period reports from prebuilt pivots / hierarchies.
+
+    Same output modes as generate_period_reports(); used directly by the
+    streaming build (streaming.stream_fv_csv), which never holds the CSV.
+    """
+    if (output_for is None) == (combined_path is None):
+        raise ValueError("pass exactly one of output_for / combined_path")
+
+    period_keys = [int(pk) for pk in period_keys]
+    reports: Dict[int, PeriodReport] = {}
+    jobs: List[tuple] = []
+    for pk in period_keys:
+        config = config_for(pk)
+        hierarchy = hierarchies[pk]
+        # The builders read only the hierarchy when one is given
+        columns = column_builder.build_columns(None, config, period_key=pk, hierarchy=hierarchy)
+        rows = row_builder.build_rows(None, config, period_key=pk, hierarchy=hierarchy)
+        log.info("period %s: %d cells, %d columns, %d rows", pk, len(pivots[pk]), len(columns), len(rows))
+        if not pivots[pk]:
+            log.warning("period %s: no data in CSV", pk)
+
+        if combined_path is not None:
+            path, sheet = Path(combined_path), period_sheet_name(sheet_name, pk)
+        else:
+            path, sheet = Path(output_for(pk)), sheet_name
+        reports[pk] = PeriodReport(pk, path, sheet, config, pivots[pk], hierarchy)
+        jobs.append((columns, rows, pivots[pk], config, path, sheet))
+
+    if combined_path is not None:
+        wb = Workbook()
+        wb.remove(wb.active)
+        for pk, (columns, rows, pivot, config, _, sheet) in zip(period_keys, jobs):
+            reports[pk].grid = _write_sheet(wb.create_sheet(sheet), columns, rows, pivot, config)
+        _save(wb, combined_path)
+    elif workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+            # map() keeps period order and re-raises worker errors here
+            written = list(executor.map(_write_workbook, *zip(*jobs)))
+        for pk, (_, grid) in zip(period_keys, written):
+            reports[pk].grid = grid
+    else:
+        for pk, job in zip(period_keys, jobs):
+            _, reports[pk].grid = _write_workbook(*job)
+
+    return reports
@@ -110,15 +110,21 @@ def _is_expense_subheader(sub1_raw: str, parent_code: str) -> bool:
 
 
 def build_rows(
-    df: pd.DataFrame,
+    df: Optional[pd.DataFrame],
     config,
     period_key: Optional[int] = None,
+    hierarchy: Optional[aggregator.Hierarchy] = None,
 ) -> List[RowDef]:
-    """Walk CSV hierarchy and emit RowDef sequence."""
+    """Walk CSV hierarchy and emit RowDef sequence.
+
+    Pass a prebuilt `hierarchy` to reuse the layout pass from column_builder
+    (`df` may then be None).
+    """
+    if hierarchy is None:
+        hierarchy = aggregator.build_hierarchy(df, period_key=period_key)
     rows: List[RowDef] = []
-    sections = aggregator.enumerate_sections(df, period_key=period_key)
 
-    for section_raw in sections:
+    for section_raw in hierarchy.sections:
         code = _section_code(section_raw)
         section_canonical = canonical(section_raw)
         section_display = _section_display(section_raw, code)
@@ -146,7 +152,7 @@ def build_rows(
             continue
 
         # Walk sub_group1 / sub_group2
-        sub_groups = aggregator.enumerate_sub_groups(df, section_raw, period_key=period_key)
+        sub_groups = hierarchy.sub_groups_for(section_raw)
         for sub1_raw, sub2_list in sub_groups.items():
             sub1_label = _sub1_display(sub1_raw, code)
             sub1_is_subheader = _is_expense_subheader(sub1_raw, code)
@@ -0,0 +1,126 @@
+"""
+Streaming build — pivot an FV warehouse CSV chunk by chunk.
+
+load_fv_csv() + build_pivot() hold the whole extract in memory. For
+full-history extracts stream_fv_csv() reads the file in chunks instead and
+keeps only what the report needs:
+
+- partial pivot sums per (period, canonical keys)   → aggregator.partial_sums
+- distinct layout keys (BU/SG/product, GROUP/SUB)   → aggregator.layout_key_frames
+- raw Σ VALUE per GROUP for invariant layer B       → reconciler.raw_section_sums_by_period
+
+Each chunk is filtered by period first (the "33." percent group is dropped
+inside partial_sums). Partials are re-merged whenever they grow past
+`compact_rows`, so memory stays bounded by the number of distinct keys,
+not by the file size.
+"""
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from . import aggregator
+from .data_loader import fv_csv_encodings, iter_fv_csv_chunks
+from .reconciler import raw_section_sums_by_period
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class StreamedExtract:
+    """Everything report generation and the invariant checks need, per period."""
+    pivots: Dict[int, dict] = field(default_factory=dict)
+    hierarchies: Dict[int, aggregator.Hierarchy] = field(default_factory=dict)
+    section_sums: Dict[int, Dict[str, float]] = field(default_factory=dict)
+    rows_read: int = 0
+    encoding: Optional[str] = None
+
+    @property
+    def period_keys(self) -> List[int]:
+        return sorted(self.pivots)
+
+
+class _Accumulator:
+    def __init__(self, compact_rows: int):
+        self.compact_rows = compact_rows
+        self.sums: List[pd.DataFrame] = []
+        self.col_keys: List[pd.DataFrame] = []
+        self.row_keys: List[pd.DataFrame] = []
+        self.section_sums: Dict[int, Dict[str, float]] = {}
+        self.rows_read = 0
+        self._pending = 0
+
+    def add(self, chunk: pd.DataFrame) -> None:
+        self.sums.append(aggregator.partial_sums(chunk))
+        col_keys, row_keys = aggregator.layout_key_frames(chunk)
+        self.col_keys.append(col_keys)
+        self.row_keys.append(row_keys)
+        for pk, groups in raw_section_sums_by_period(chunk).items():
+            totals = self.section_sums.setdefault(pk, {})
+            for group, value in groups.items():
+                totals[group] = totals.get(group, 0.0) + value
+
+        self._pending += len(self.sums[-1]) + len(col_keys) + len(row_keys)
+        if self._pending > self.compact_rows:
+            self.compact()
+
+    def compact(self) -> None:
+        """Merge partials so each list holds one frame of distinct keys."""
+        if len(self.sums) > 1:
+            self.sums = [aggregator.merge_partial_sums(self.sums)]
+        # concat keeps chunk order, so first-appearance tie-breaking matches a full read
+        if len(self.col_keys) > 1:
+            self.col_keys = [pd.concat(self.col_keys, ignore_index=True).drop_duplicates()]
+        if len(self.row_keys) > 1:
+            self.row_keys = [pd.concat(self.row_keys, ignore_index=True).drop_duplicates()]
+        self._pending = sum(len(f) for f in (*self.sums, *self.col_keys, *self.row_keys))
+
+
+def stream_fv_csv(
+    csv_path: Path,
+    period_ranges: Optional[Sequence[Tuple[int, int]]] = None,
+    encoding: str = "tis-620",
+    chunksize: int = 200_000,
+    compact_rows: int = 1_000_000,
+) -> StreamedExtract:
+    """Read an FV CSV in chunks and build pivots + layout for the selected periods.
+
+    `period_ranges` is a list of inclusive (first, last) TIME_KEY ranges;
+    None keeps every period. Periods with no rows are not in the result.
+    """
+    last_err: Optional[UnicodeDecodeError] = None
+    for enc in fv_csv_encodings(encoding):
+        acc = _Accumulator(compact_rows)
+        try:
+            for chunk in iter_fv_csv_chunks(csv_path, encoding=enc, chunksize=chunksize):
+                acc.rows_read += len(chunk)
+                if period_ranges is not None:
+                    keep = pd.Series(False, index=chunk.index)
+                    for lo, hi in period_ranges:
+                        keep |= chunk["TIME_KEY"].between(lo, hi)
+                    chunk = chunk[keep]
+                if not chunk.empty:
+                    acc.add(chunk)
+        except UnicodeDecodeError as e:
+            log.warning("decode failed with %s, trying next encoding", enc)
+            last_err = e
+            continue
+        return _finish(acc, enc)
+    raise last_err or UnicodeDecodeError("unknown", b"", 0, 1, "failed")
+
+
+def _finish(acc: _Accumulator, encoding: str) -> StreamedExtract:
+    acc.compact()
+    extract = StreamedExtract(rows_read=acc.rows_read, encoding=encoding)
+    if not acc.col_keys:
+        return extract
+
+    col_keys, row_keys = acc.col_keys[0], acc.row_keys[0]
+    period_keys = sorted(int(pk) for pk in col_keys["TIME_KEY"].dropna().unique())
+    extract.hierarchies = aggregator.period_hierarchies(col_keys, row_keys, period_keys)
+    extract.pivots = aggregator.pivots_from_partial_sums(acc.sums[0], period_keys)
+    extract.section_sums = {pk: acc.section_sums.get(pk, {}) for pk in period_keys}
+    log.info("streamed %d rows (%s) → %d periods", acc.rows_read, encoding, len(period_keys))
+    return extract
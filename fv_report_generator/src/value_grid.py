@@ -0,0 +1,86 @@
+"""
+Value grid — the numeric data area of a report sheet as a NumPy array.
+
+DataWriter records every data cell it writes (record(): the cell's own row /
+column and the value left in it), so generate_report() can hand the written
+values straight to the reconcilers. For an existing .xlsx the same grid is
+loaded once in read-only, values-only mode; every check then reads from the
+array instead of calling ws.cell() per lookup.
+
+values[r, c] holds the cell at (first_row + r, first_col + c); empty, text
+and label cells are NaN.
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import openpyxl
+
+
+@dataclass
+class ValueGrid:
+    values: np.ndarray
+    first_row: int
+    first_col: int
+
+    @classmethod
+    def empty(cls, n_rows: int, n_cols: int, first_row: int, first_col: int) -> "ValueGrid":
+        return cls(np.full((n_rows, n_cols), np.nan), first_row, first_col)
+
+    @classmethod
+    def from_sheet(
+        cls,
+        path,
+        sheet_name: str,
+        first_row: int,
+        first_col: int,
+        n_rows: int,
+        n_cols: int,
+    ) -> "ValueGrid":
+        """Load the data area of `sheet_name` in one read-only, values-only pass."""
+        grid = cls.empty(n_rows, n_cols, first_row, first_col)
+        if n_rows == 0 or n_cols == 0:
+            return grid
+        wb = openpyxl.load_workbook(Path(path), read_only=True, data_only=True)
+        try:
+            if sheet_name not in wb.sheetnames:
+                raise KeyError(f"sheet {sheet_name!r} not found in {path}; available: {wb.sheetnames}")
+            ws = wb[sheet_name]
+            for r, row in enumerate(ws.iter_rows(
+                min_row=first_row, max_row=first_row + n_rows - 1,
+                min_col=first_col, max_col=first_col + n_cols - 1,
+                values_only=True,
+            )):
+                for c, value in enumerate(row):
+                    grid.values[r, c] = _to_number(value)
+        finally:
+            wb.close()
+        return grid
+
+    def record(self, cell) -> None:
+        """Store a written openpyxl cell's value at its own position (ignored outside the grid)."""
+        r, c = cell.row - self.first_row, cell.column - self.first_col
+        if 0 <= r < self.values.shape[0] and 0 <= c < self.values.shape[1]:
+            self.values[r, c] = _to_number(cell.value)
+
+    def cell(self, xl_row: int, xl_col: int) -> Optional[float]:
+        """Value at a 1-indexed sheet position, or None if empty / outside the grid."""
+        r, c = xl_row - self.first_row, xl_col - self.first_col
+        if not (0 <= r < self.values.shape[0] and 0 <= c < self.values.shape[1]):
+            return None
+        value = self.values[r, c]
+        return None if np.isnan(value) else float(value)
+
+    def zero_filled(self) -> np.ndarray:
+        """Copy of the values with empty cells as 0.0 (the writer renders 0 as blank)."""
+        return np.nan_to_num(self.values, nan=0.0)
+
+
+def _to_number(value) -> float:
+    if value is None or value == "" or isinstance(value, bool):
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
@@ -1,14 +1,20 @@
 """
 Data writer — write each RowDef's label + data cells.
 
-For percent rows, value = pivot[(CM, col_key)] / pivot[(REVENUE, col_key)].
-For all other rows, value = pivot.get((row_key, col_key)).
+The pivot is first laid out as a row × column matrix in RowDef / ColumnDef
+order (pivot_matrix.aligned_values), so each row reads one slice.
+For percent rows, value = CM / REVENUE for every column in one vector division.
+For all other rows, value = the pivot cell (None where the pivot has none).
 """
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+import numpy as np
 
 from .. import derived
 from ..column_builder import ColumnDef
+from ..pivot_matrix import aligned_values
 from ..row_builder import RowDef
+from ..value_grid import ValueGrid
 
 
 class DataWriter:
@@ -23,11 +29,22 @@ class DataWriter:
         rows: List[RowDef],
         pivot: Dict,
         start_xl_col: int,
+        grid: Optional[ValueGrid] = None,
     ) -> int:
-        """Write all data rows; return next available row number (1-indexed)."""
+        """Write all data rows; return next available row number (1-indexed).
+
+        If `grid` is given, every data cell is recorded in it from the written
+        cell itself (cell.row / cell.column / cell.value), so the reconcilers
+        see what landed where — not the matrix it was meant to hold.
+        """
+        matrix = self.cell_values(columns, rows, pivot)
+
+        col_keys = [col.col_key for col in columns]
         cur_row = self.config.data_start_row
 
-        for rd in rows:
+        for row_idx, rd in enumerate(rows):
+            is_percent = rd.row_type == "percent"
+            row_values = matrix[row_idx].tolist()
             for col_idx, col in enumerate(columns):
                 xl_col = start_xl_col + col_idx
                 cell = ws.cell(cur_row, xl_col)
@@ -38,19 +55,35 @@ class DataWriter:
                     )
                     continue
 
-                ck = col.col_key
-                if ck is None:
+                if col_keys[col_idx] is None:
                     continue
 
-                if rd.row_type == "percent":
-                    val = derived.percent_value(pivot, ck)
+                val = row_values[col_idx]
+                if val != val:  # NaN: no pivot cell / percent undefined
+                    # Sub-section header rows often have no direct value (they are bold sub-headers)
+                    val = None
+                if is_percent:
                     self.formatter.format_percent(cell, val, bold=rd.is_bold, color=rd.color)
                 else:
-                    val = pivot.get((rd.row_key, ck))
-                    if val is None:
-                        # Sub-section header rows often have no direct value (they are bold sub-headers)
-                        self.formatter.format_number(cell, None, bold=rd.is_bold, color=rd.color)
-                    else:
-                        self.formatter.format_number(cell, val, bold=rd.is_bold, color=rd.color)
+                    self.formatter.format_number(cell, val, bold=rd.is_bold, color=rd.color)
+                if grid is not None:
+                    grid.record(cell)
             cur_row += 1
         return cur_row
+
+    @staticmethod
+    def cell_values(columns: List[ColumnDef], rows: List[RowDef], pivot: Dict) -> np.ndarray:
+        """len(rows) × len(columns) values to write; NaN for blank / label cells."""
+        row_keys = [rd.row_key for rd in rows]
+        matrix = aligned_values(
+            pivot,
+            [*row_keys, derived.REVENUE_KEY, derived.CM_KEY],
+            [col.col_key for col in columns],
+        )
+        # percent_value(): no revenue → undefined, no CM → 0
+        revenue, cm = np.nan_to_num(matrix[-2]), np.nan_to_num(matrix[-1])
+        matrix = matrix[:-2]
+        percent_rows = [i for i, rd in enumerate(rows) if rd.row_type == "percent"]
+        if percent_rows:
+            matrix[percent_rows] = derived.percent_values(revenue, cm)
+        return matrix
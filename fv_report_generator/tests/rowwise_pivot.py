@@ -0,0 +1,91 @@
+"""Row-wise reference for aggregator.build_pivot (one dict fan-out per CSV row).
+
+Used by test_pivoter.py and benchmarks/bench_build_pivot.py to check and time
+the grouped pivot; not part of the report generator. The frame is built as the
+original build_pivot did — canonical() / canonical_product_key() per row, percent
+group and zero rows skipped in the loop — so nothing but the normalizers is
+shared with aggregator.
+"""
+from collections import defaultdict
+from typing import List, Optional
+
+import pandas as pd
+
+from src.normalizer import canonical, canonical_product_key
+from src.satellite_split import subsg_for
+
+_PERCENT_GROUP_PREFIX = "33."
+
+
+def _strip_period(text):
+    s = str(text).strip()
+    if s.endswith(":"):
+        s = s[:-1].rstrip()
+    return s
+
+
+def reference_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Canonical key columns + value per CSV row (every row, in CSV order)."""
+    return pd.DataFrame({
+        "section_raw": df["GROUP"],
+        "section": df["GROUP"].map(canonical),
+        "sub1": df["SUB_GROUP1"].map(lambda x: canonical(_strip_period(x)) if pd.notna(x) else None),
+        "sub2": df["SUB_GROUP2"].map(lambda x: canonical(x) if pd.notna(x) else None),
+        "bu": df["BU"].map(canonical),
+        "sg": df["SERVICE_GROUP"].map(lambda x: canonical(x) if pd.notna(x) else None),
+        "pkey": df["PRODUCT_KEY"].map(canonical_product_key),
+        "value": df["VALUE"].astype(float).fillna(0.0),
+    })
+
+
+def build_pivot_rowwise(
+    df: pd.DataFrame,
+    period_key: Optional[int] = None,
+) -> dict:
+    """Same contract as aggregator.build_pivot."""
+    if period_key is not None:
+        df = df[df["TIME_KEY"] == period_key]
+    return pivot_rowwise(reference_frame(df))
+
+
+def pivot_rowwise(work: pd.DataFrame) -> dict:
+    """Fan each row out to up to 3 row keys x 5 column keys.
+
+    Takes reference_frame() or aggregator._work_frame() output (the latter has
+    no section_raw: percent and zero rows are already dropped).
+    """
+    has_raw = "section_raw" in work.columns
+    totals = defaultdict(float)
+    for row in work.itertuples(index=False):
+        # Skip percentage-group rows — they are not summable.
+        section_raw = row.section_raw if has_raw else None
+        if isinstance(section_raw, str) and section_raw.lstrip().startswith(_PERCENT_GROUP_PREFIX):
+            continue
+        value = row.value
+        if value == 0.0:
+            continue
+
+        section, sub1, sub2 = row.section, row.sub1, row.sub2
+        row_keys = [(section, None, None)]
+        if sub1:
+            row_keys.append((section, sub1, None))
+        if sub1 and sub2:
+            row_keys.append((section, sub1, sub2))
+
+        bu, sg, pkey = row.bu, row.sg, row.pkey
+        col_keys: List[tuple] = [("GRAND_TOTAL",)]
+        if bu:
+            col_keys.append(("BU_TOTAL", bu))
+        if bu and sg:
+            col_keys.append(("SG_TOTAL", bu, sg))
+            subsg = subsg_for(sg, pkey) if pkey else sg
+            if subsg != sg:
+                col_keys.append(("SUBSG_TOTAL", bu, sg, subsg))
+            if pkey:
+                col_keys.append(("PRODUCT", bu, sg, subsg, pkey))
+
+        for rk in row_keys:
+            for ck in col_keys:
+                totals[(rk, ck)] += value
+
+    return dict(totals)
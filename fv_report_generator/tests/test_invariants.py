@@ -0,0 +1,60 @@
+"""Vectorized invariant checks over the pivot matrix."""
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.aggregator import build_pivot  # noqa: E402
+from src.normalizer import canonical  # noqa: E402
+from src.pivot_matrix import PivotMatrix, aligned_values  # noqa: E402
+from src.reconciler import reconcile_invariants  # noqa: E402
+
+from tests.test_pivoter import _edge_case_df, _fixture_df  # noqa: E402
+
+
+def test_consistent_pivot_passes_every_layer():
+    result = reconcile_invariants(_fixture_df(), period_key=202514)
+    assert result.ok, result.summary()
+    assert result.checks_run > 0
+
+
+def test_children_sum_follows_column_hierarchy():
+    matrix = PivotMatrix.from_pivot(build_pivot(_fixture_df(), period_key=202514))
+    parents, sums = matrix.children_sum()
+    assert ("GRAND_TOTAL",) in [matrix.col_keys[p] for p in parents]
+    assert (sums == matrix.values[:, parents]).all()
+
+
+def test_aligned_values_follow_requested_order():
+    pivot = build_pivot(_fixture_df(), period_key=202514)
+    (rk, ck), value = next(iter(pivot.items()))
+    missing_row = ("no such row", None, None)
+
+    values = aligned_values(pivot, [missing_row, rk, rk], [None, ck, ck])
+    assert values.shape == (3, 3)
+    assert (values[1:, 1:] == value).all()
+    assert np.isnan(values[0]).all() and np.isnan(values[:, 0]).all()
+
+
+def test_corrupted_product_cell_is_reported_against_its_sg():
+    df = _fixture_df()
+    pivot = build_pivot(df, period_key=202514)
+    bu = canonical("1.กลุ่มธุรกิจ HARD INFRASTRUCTURE")
+    sg = canonical("1.1 กลุ่มบริการท่อร้อยสาย")
+    revenue = (canonical("01.รายได้"), None, None)
+    pivot[(revenue, ("PRODUCT", bu, sg, sg, "181030004"))] += 5.0
+
+    result = reconcile_invariants(df, period_key=202514, pivot=pivot)
+    assert [v.layer for v in result.violations] == ["A_hierarchy"]
+    assert result.violations[0].description.startswith(f"SG_TOTAL[{bu}/{sg}]")
+    assert result.violations[0].diff == -5.0
+
+
+def test_value_outside_every_sg_column_is_reported():
+    # Edge-case CSV has a row with BU but no SERVICE_GROUP: it lands in
+    # BU_TOTAL but in no SG column of the report.
+    result = reconcile_invariants(_edge_case_df(), period_key=202514)
+    assert len(result.violations) == 1
+    assert result.violations[0].description.startswith("BU_TOTAL[")
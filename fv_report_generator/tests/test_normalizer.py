@@ -45,3 +45,32 @@ def test_empty_inputs():
     assert canonical(None) == ""
     assert canonical("") == ""
     assert canonical_product_key(None) == ""
+
+
+def test_map_unique_matches_series_map():
+    import numpy as np
+    import pandas as pd
+
+    from src.normalizer import map_unique
+
+    values = pd.Series(["01.รายได้", None, "1. รายได้", np.nan, "01.รายได้", 4.5], index=[5, 3, 9, 1, 0, 7])
+    mapped = map_unique(values, canonical)
+    assert mapped.tolist() == [canonical(v) for v in values]
+    assert mapped.index.tolist() == values.index.tolist()
+
+    kept_missing = map_unique(values, canonical, na_value=None)
+    assert kept_missing.tolist() == ["รายได้", None, "รายได้", None, "รายได้", ""]
+
+
+def test_normalizers_are_memoized():
+    from src.normalizer import _canonical_product_key_str, _canonical_str
+
+    canonical("01.รายได้ memo")
+    hits = _canonical_str.cache_info().hits
+    assert canonical("01.รายได้ memo") == "รายได้ memo"
+    assert _canonical_str.cache_info().hits == hits + 1
+
+    canonical_product_key(" 000181030004")
+    hits = _canonical_product_key_str.cache_info().hits
+    assert canonical_product_key(" 000181030004") == "181030004"
+    assert _canonical_product_key_str.cache_info().hits == hits + 1
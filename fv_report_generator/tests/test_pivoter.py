@@ -78,3 +78,120 @@ def test_pivot_includes_sub2_for_expenses():
     assert p[((section, None, None), ("GRAND_TOTAL",))] == pytest.approx(-30.0)
     assert p[((section, sub1, None), ("GRAND_TOTAL",))] == pytest.approx(-30.0)
     assert p[((section, sub1, sub2), ("GRAND_TOTAL",))] == pytest.approx(-30.0)
+
+
+def _edge_case_df():
+    base = dict(TIME_KEY=202514, SUB_GROUP2=None, BU="4.กลุ่มธุรกิจ FIXED LINE & BROADBAND",
+                PRODUCT_NAME="x", ALLIE="N")
+    rows = [
+        # split SG: products land in different sub-SGs
+        dict(base, GROUP="01.รายได้", SUB_GROUP1="04.รายได้กลุ่มธุรกิจ FIXED LINE :",
+             SERVICE_GROUP="4.5 กลุ่มบริการ SATELLITE", PRODUCT_KEY="000102010401", VALUE=10.0),
+        dict(base, GROUP="01.รายได้", SUB_GROUP1="04.รายได้กลุ่มธุรกิจ FIXED LINE :",
+             SERVICE_GROUP="4.5 กลุ่มบริการ SATELLITE", PRODUCT_KEY="000102010409", VALUE=20.0),
+        # cancelling values keep their keys (sum 0.0)
+        dict(base, GROUP="01.รายได้", SUB_GROUP1="04.รายได้กลุ่มธุรกิจ FIXED LINE :",
+             SERVICE_GROUP="4.1 กลุ่มบริการ FIXED", PRODUCT_KEY="7", VALUE=5.0),
+        dict(base, GROUP="01.รายได้", SUB_GROUP1="04.รายได้กลุ่มธุรกิจ FIXED LINE :",
+             SERVICE_GROUP="4.1 กลุ่มบริการ FIXED", PRODUCT_KEY="7", VALUE=-5.0),
+        # zero-only product adds no keys
+        dict(base, GROUP="01.รายได้", SUB_GROUP1="04.รายได้กลุ่มธุรกิจ FIXED LINE :",
+             SERVICE_GROUP="4.1 กลุ่มบริการ FIXED", PRODUCT_KEY="8", VALUE=0.0),
+        # percent group is not summed
+        dict(base, GROUP="33.%กำไรส่วนเกิน", SUB_GROUP1=None,
+             SERVICE_GROUP="4.1 กลุ่มบริการ FIXED", PRODUCT_KEY="7", VALUE=0.5),
+        # no SG / no product: only GRAND_TOTAL and BU_TOTAL
+        dict(base, GROUP="06.รายได้อื่น", SUB_GROUP1=None, SERVICE_GROUP=None,
+             PRODUCT_KEY=None, VALUE=3.0),
+    ]
+    return pd.concat([_fixture_df(), pd.DataFrame(rows)], ignore_index=True)
+
+
+def _without_nan_keys(pivot):
+    # The row-wise reference turns a missing SUB_GROUP/SG into NaN (truthy),
+    # emitting keys nothing can look up; the grouped pivot treats it as missing.
+    def has_nan(key):
+        return any(has_nan(p) if isinstance(p, tuple) else p != p for p in key)
+    return {k: v for k, v in pivot.items() if not has_nan(k)}
+
+
+def test_grouped_pivot_matches_rowwise_reference():
+    from tests.rowwise_pivot import build_pivot_rowwise
+
+    df = _edge_case_df()
+    p = build_pivot(df, period_key=202514)
+    ref = _without_nan_keys(build_pivot_rowwise(df, period_key=202514))
+
+    assert p.keys() == ref.keys()
+    for key, value in ref.items():
+        assert p[key] == pytest.approx(value)
+
+    fixed = canonical("4.1 กลุ่มบริการ FIXED")
+    bu = canonical("4.กลุ่มธุรกิจ FIXED LINE & BROADBAND")
+    revenue = (canonical("01.รายได้"), None, None)
+    assert p[(revenue, ("PRODUCT", bu, fixed, fixed, "7"))] == 0.0
+    assert (revenue, ("PRODUCT", bu, fixed, fixed, "8")) not in p
+    assert not any(k[0][0].startswith(canonical("33.%กำไรส่วนเกิน")) for k in p)
+
+
+def test_hierarchy_matches_enumerate_helpers():
+    from src import aggregator
+
+    df = _edge_case_df()
+    h = aggregator.build_hierarchy(df, period_key=202514)
+
+    assert h.bus == aggregator.enumerate_bus(df, period_key=202514)
+    for bu in h.bus:
+        assert h.sgs_for(bu) == aggregator.enumerate_sgs(df, bu, period_key=202514)
+        for sg in h.sgs_for(bu):
+            assert h.products_for(bu, sg) == aggregator.enumerate_products(
+                df, bu, sg, period_key=202514)
+    assert h.sections == aggregator.enumerate_sections(df, period_key=202514)
+    for section in h.sections:
+        assert h.sub_groups_for(section) == aggregator.enumerate_sub_groups(
+            df, section, period_key=202514)
+
+
+def test_period_pivots_match_single_period_builds():
+    from src import aggregator
+
+    df = _edge_case_df()
+    pivots = aggregator.build_period_pivots(df, [202513, 202514, 202599])
+    hierarchies = aggregator.build_period_hierarchies(df, [202513, 202514, 202599])
+
+    for pk in (202513, 202514):
+        single = aggregator.build_pivot(df, period_key=pk)
+        assert pivots[pk].keys() == single.keys()
+        for key, value in single.items():
+            assert pivots[pk][key] == pytest.approx(value)
+        assert hierarchies[pk] == aggregator.build_hierarchy(df, period_key=pk)
+    assert pivots[202599] == {}
+    assert hierarchies[202599] == aggregator.Hierarchy()
+
+
+def test_streamed_csv_matches_full_load(tmp_path):
+    from src import aggregator
+    from src.data_loader import load_fv_csv
+    from src.reconciler import raw_section_sums_by_period
+    from src.streaming import stream_fv_csv
+
+    csv_path = tmp_path / "fv.csv"
+    _edge_case_df().to_csv(csv_path, index=False, encoding="utf-8")
+    df = load_fv_csv(csv_path, encoding="utf-8")
+
+    # chunks of 2 rows, compacted on nearly every chunk
+    extract = stream_fv_csv(csv_path, encoding="utf-8", chunksize=2, compact_rows=3)
+    keys = extract.period_keys
+    assert extract.rows_read == len(df)
+    assert keys == sorted(int(pk) for pk in df["TIME_KEY"].unique())
+
+    pivots = aggregator.build_period_pivots(df, keys)
+    for pk in keys:
+        assert extract.pivots[pk].keys() == pivots[pk].keys()
+        for key, value in pivots[pk].items():
+            assert extract.pivots[pk][key] == pytest.approx(value)
+    assert extract.hierarchies == aggregator.build_period_hierarchies(df, keys)
+    assert extract.section_sums == raw_section_sums_by_period(df)
+
+    only = stream_fv_csv(csv_path, period_ranges=[(202514, 202514)], encoding="utf-8", chunksize=2)
+    assert only.period_keys == [202514]
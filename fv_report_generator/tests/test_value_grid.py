@@ -0,0 +1,101 @@
+"""Value grid: written values in memory vs. the same sheet re-read from disk."""
+import sys
+from pathlib import Path
+
+import numpy as np
+import openpyxl
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.config import FVConfig  # noqa: E402
+from src.reconciler import reconcile, reconcile_business_rules  # noqa: E402
+from src.report_builder import generate_report  # noqa: E402
+from src.value_grid import ValueGrid  # noqa: E402
+from src.writers.data_writer import DataWriter  # noqa: E402
+
+from tests.test_pivoter import _edge_case_df  # noqa: E402
+
+
+def test_from_sheet_reads_numbers_only(tmp_path):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "S"
+    ws.cell(3, 2, "label")
+    ws.cell(3, 3, 1.5)
+    ws.cell(4, 3, "-")
+    ws.cell(4, 4, -2)
+    path = tmp_path / "grid.xlsx"
+    wb.save(path)
+
+    grid = ValueGrid.from_sheet(path, "S", first_row=3, first_col=2, n_rows=2, n_cols=3)
+    assert grid.values.shape == (2, 3)
+    assert grid.cell(3, 2) is None
+    assert grid.cell(3, 3) == 1.5
+    assert grid.cell(4, 3) is None
+    assert grid.cell(4, 4) == -2.0
+    assert grid.cell(99, 99) is None
+
+
+def test_in_memory_reconcile_matches_file_reconcile(tmp_path):
+    df = _edge_case_df()
+    config = FVConfig(period_year_be=2568, period_label="test")
+    out, pivot, grid = generate_report(df, tmp_path / "r.xlsx", config, period_key=202514)
+
+    in_memory = reconcile(out, df, config, period_key=202514, pivot=pivot, grid=grid)
+    from_file = reconcile(out, df, config, period_key=202514)
+    assert in_memory.cells_checked == from_file.cells_checked > 0
+    assert not in_memory.mismatches and not from_file.mismatches
+
+    rules_mem = reconcile_business_rules(out, df, config, period_key=202514, grid=grid)
+    rules_file = reconcile_business_rules(out, df, config, period_key=202514)
+    assert rules_mem.checks_run == rules_file.checks_run
+    assert len(rules_mem.violations) == len(rules_file.violations)
+
+    # A cell that differs from the pivot is reported
+    r, c = np.argwhere(~np.isnan(grid.values))[0]
+    grid.values[r, c] += 1.0
+    tampered = reconcile(out, df, config, period_key=202514, pivot=pivot, grid=grid)
+    assert len(tampered.mismatches) == 1
+
+
+def test_grid_records_cells_where_they_were_written(tmp_path, monkeypatch):
+    df = _edge_case_df()
+    config = FVConfig(period_year_be=2568, period_label="test")
+    out, pivot, grid = generate_report(df, tmp_path / "r.xlsx", config, period_key=202514)
+    saved = ValueGrid.from_sheet(out, "Report_FV", grid.first_row, grid.first_col, *grid.values.shape)
+    np.testing.assert_array_equal(grid.values, saved.values)
+
+    # A writer that puts the data one column to the right fails the in-memory check
+    write = DataWriter.write
+    monkeypatch.setattr(
+        DataWriter, "write",
+        lambda self, ws, columns, rows, pivot, start_xl_col, grid=None:
+            write(self, ws, columns, rows, pivot, start_xl_col + 1, grid),
+    )
+    out, pivot, grid = generate_report(df, tmp_path / "shifted.xlsx", config, period_key=202514)
+    assert reconcile(out, df, config, period_key=202514, pivot=pivot, grid=grid).mismatches
+
+
+def test_reconcile_does_not_trust_the_writer_layout(tmp_path, monkeypatch):
+    import src.writers.data_writer as data_writer
+
+    df = _edge_case_df()
+    config = FVConfig(period_year_be=2568, period_label="test")
+    aligned_values = data_writer.aligned_values
+    monkeypatch.setattr(
+        data_writer, "aligned_values",
+        lambda *args, **kwargs: np.roll(aligned_values(*args, **kwargs), 1, axis=0),
+    )
+    out, pivot, grid = generate_report(df, tmp_path / "rows.xlsx", config, period_key=202514)
+    assert reconcile(out, df, config, period_key=202514, pivot=pivot, grid=grid).mismatches
+    assert reconcile(out, df, config, period_key=202514).mismatches
+
+    monkeypatch.undo()
+    cell_values = DataWriter.cell_values
+    monkeypatch.setattr(
+        DataWriter, "cell_values",
+        staticmethod(lambda columns, rows, pivot: np.roll(cell_values(columns, rows, pivot), 1, axis=1)),
+    )
+    out, pivot, grid = generate_report(df, tmp_path / "cols.xlsx", config, period_key=202514)
+    assert reconcile(out, df, config, period_key=202514, pivot=pivot, grid=grid).mismatches
+    assert reconcile(out, df, config, period_key=202514).mismatches
@@ -2,9 +2,17 @@
 Common Size Row Configuration
 กำหนดว่าบรรทัดไหนควรมี Common Size
 
-Common Size จะคำนวณเฉพาะบรรทัดที่อยู่ในลิสต์นี้เท่านั้น
+โหมดการทำงาน (RESTRICT_COMMON_SIZE_ROWS):
+- False (default): ทุกบรรทัดมี Common Size ยกเว้นบรรทัด "สัดส่วนต่อรายได้"
+- True: Common Size จะคำนวณเฉพาะบรรทัดที่อยู่ในลิสต์นี้เท่านั้น
 """
 
+# Feature toggle - set to True to limit Common Size to the rows listed below
+RESTRICT_COMMON_SIZE_ROWS = False
+
+# Ratio rows never have Common Size (they are already a percentage)
+RATIO_ROW_MARKER = "สัดส่วนต่อรายได้"
+
 # COSTTYPE: บรรทัดที่ควรมี Common Size
 COMMON_SIZE_ROWS_COSTTYPE = {
     "รายได้รวม",
@@ -45,6 +53,12 @@ def should_have_common_size(label: str, report_type: str) -> bool:
     Returns:
         True if should have common size
     """
+    if not label or RATIO_ROW_MARKER in label:
+        return False
+
+    if not RESTRICT_COMMON_SIZE_ROWS:
+        return True
+
     if report_type == "COSTTYPE":
         return label in COMMON_SIZE_ROWS_COSTTYPE
     elif report_type == "GLGROUP":
@@ -46,7 +46,7 @@ logging.basicConfig(
 )
 
 from src.data_loader import CSVLoader, DataProcessor
-from src.report_generator import ReportBuilder, ReportConfig
+from src.report_generator import ReportBuilder, ReportConfig, ManifestStore
 from config.settings import settings
 
 
@@ -94,21 +94,19 @@ def find_csv_file(data_dir: Path, report_type: str, period_type: str, month: Opt
     return files[0]
 
 
-def load_remark_file(csv_path: Path, period_type: str = None) -> str:
+def find_remark_file(csv_path: Path) -> Optional[Path]:
     """
-    Load remark file if exists
+    Find remark file for a CSV file
     
     Strategy:
     1. Try to find remark file matching CSV date suffix (e.g., remark_20251031.txt)
     2. If not found, try remark_*.txt pattern and use the most recent one
-    3. Return empty string if no remark file exists
     
     Args:
         csv_path: Path to CSV file (used to extract date suffix and directory)
-        period_type: Period type (MTH/YTD) - not currently used but kept for compatibility
     
     Returns:
-        Remark content as string, or empty string if not found
+        Path to remark file, or None if not found
     """
     data_dir = csv_path.parent
     
@@ -121,14 +119,31 @@ def load_remark_file(csv_path: Path, period_type: str = None) -> str:
     if date_suffix and date_suffix.isdigit():
         remark_file = data_dir / f"remark_{date_suffix}.txt"
         if remark_file.exists():
-            return _read_remark_file(remark_file)
+            return remark_file
     
     # Strategy 2: Find any remark_*.txt file (use most recent)
     remark_files = sorted(data_dir.glob("remark_*.txt"), reverse=True)
     if remark_files:
-        return _read_remark_file(remark_files[0])
+        return remark_files[0]
     
-    return ""
+    return None
+
+
+def load_remark_file(csv_path: Path, period_type: str = None) -> str:
+    """
+    Load remark file if exists (see find_remark_file for lookup strategy)
+    
+    Args:
+        csv_path: Path to CSV file (used to extract date suffix and directory)
+        period_type: Period type (MTH/YTD) - not currently used but kept for compatibility
+    
+    Returns:
+        Remark content as string, or empty string if not found
+    """
+    remark_file = find_remark_file(csv_path)
+    if remark_file is None:
+        return ""
+    return _read_remark_file(remark_file)
 
 
 def _read_remark_file(remark_file: Path) -> str:
@@ -151,6 +166,45 @@ def _read_remark_file(remark_file: Path) -> str:
     return ""
 
 
+def default_output_path(
+    df,
+    output_dir: Path,
+    report_type: str,
+    period_type: str,
+    detail_level: str
+) -> Path:
+    """
+    Build the standard output path PL_{type}_{period}_{detail}_{time_key}.xlsx
+
+    Args:
+        df: Processed dataframe (TIME_KEY is taken from the first row)
+        output_dir: Output directory
+        report_type: Report type (COSTTYPE or GLGROUP)
+        period_type: Period type (MTH or YTD)
+        detail_level: Detail level (BU_ONLY, BU_SG, BU_SG_PRODUCT)
+
+    Returns:
+        Output file path
+    """
+    # ใหม่: ดึงค่า TIME_KEY จากข้อมูล
+    if 'TIME_KEY' in df.columns and not df.empty:
+        # ดึงค่าจากแถวแรก (iloc[0]) มาแปลงเป็น string และตัดช่องว่าง
+        # แปลงเป็น int ก่อนเพื่อกำจัด .0 (กรณี pandas แปลงเป็น float)
+        time_key_value = df['TIME_KEY'].iloc[0]
+        try:
+            # Try to convert to int to remove decimal point
+            time_key = str(int(float(time_key_value)))
+        except (ValueError, TypeError):
+            # Fallback to string conversion if not numeric
+            time_key = str(time_key_value).strip()
+    else:
+        # Fallback: ถ้าไม่มี column TIME_KEY หรือไม่มีข้อมูล ให้ใช้เวลาปัจจุบันเหมือนเดิม
+        time_key = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    filename = f"PL_{report_type}_{period_type}_{detail_level}_{time_key}.xlsx"
+    return Path(output_dir) / filename
+
+
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(
@@ -227,6 +281,22 @@ def main():
         action='store_true',
         help='Disable Common Size columns'
     )
+    parser.add_argument(
+        '--prune-zero',
+        action='store_true',
+        help='Drop product columns and detail rows whose values are all zero (listed in remarks)'
+    )
+    parser.add_argument(
+        '--value-sidecar',
+        choices=['npz', 'parquet'],
+        help='Also save every written data cell next to the report '
+             '(<report>.values.npz / .parquet) for reconciliation'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Regenerate even if the output is up to date with its build manifest'
+    )
     parser.add_argument(
         '--encoding',
         default='tis-620',
@@ -263,19 +333,7 @@ def main():
 
         logging.info(f"\n📄 CSV File: {csv_path.name}")
 
-        # 2. Load CSV data
-        logging.info(f"\n📥 Loading data...")
-        csv_loader = CSVLoader(encoding=args.encoding)
-        df = csv_loader.load_csv(csv_path)
-        logging.info(f"   ✅ Loaded {len(df):,} rows")
-
-        # 3. Process data
-        logging.info(f"\n⚙️  Processing data...")
-        data_processor = DataProcessor()
-        df = data_processor.process_data(df)
-        logging.info(f"   ✅ Data processed")
-
-        # 4. Create report configuration
+        # 2. Create report configuration
         logging.info(f"\n📋 Report Configuration:")
         logging.info(f"   Type: {args.report_type}")
         logging.info(f"   Period: {args.period}")
@@ -293,52 +351,67 @@ def main():
             report_type=args.report_type,
             period_type=args.period,
             detail_level=args.detail_level,
-            include_common_size=include_common_size
+            include_common_size=include_common_size,
+            prune_zero_activity=args.prune_zero,
+            value_sidecar=args.value_sidecar
         )
         
         if config.include_common_size:
             logging.info(f"   Common Size: Enabled")
+        if config.prune_zero_activity:
+            logging.info(f"   Zero-activity pruning: Enabled")
+        if config.value_sidecar:
+            logging.info(f"   Value sidecar: {config.value_sidecar}")
+
+        # 3. Check build manifest - skip if inputs are unchanged
+        remark_path = find_remark_file(csv_path)
+        manifest_store = ManifestStore(args.output.parent if args.output else args.output_dir)
+        fingerprint = manifest_store.fingerprint(csv_path, remark_path, config, args.encoding)
+        up_to_date, recorded_output = manifest_store.is_up_to_date(csv_path, config, fingerprint)
+        if up_to_date and not args.force and (args.output is None or args.output == recorded_output):
+            logging.info(f"\n⏭️  Up to date (use --force to regenerate): {recorded_output}")
+            return 0
+
+        # 4. Load CSV data
+        logging.info(f"\n📥 Loading data...")
+        csv_loader = CSVLoader(encoding=args.encoding)
+        df = csv_loader.load_csv(csv_path)
+        logging.info(f"   ✅ Loaded {len(df):,} rows")
 
-        # 5. Determine output path
+        # 5. Process data
+        logging.info(f"\n⚙️  Processing data...")
+        data_processor = DataProcessor()
+        df = data_processor.process_data(df)
+        logging.info(f"   ✅ Data processed")
+
+        # 6. Determine output path
         if args.output:
             output_path = args.output
         else:
             args.output_dir.mkdir(parents=True, exist_ok=True)
-            # timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            # ใหม่: ดึงค่า TIME_KEY จากข้อมูล
-            if 'TIME_KEY' in df.columns and not df.empty:
-                # ดึงค่าจากแถวแรก (iloc[0]) มาแปลงเป็น string และตัดช่องว่าง
-                # แปลงเป็น int ก่อนเพื่อกำจัด .0 (กรณี pandas แปลงเป็น float)
-                time_key_value = df['TIME_KEY'].iloc[0]
-                try:
-                    # Try to convert to int to remove decimal point
-                    time_key = str(int(float(time_key_value)))
-                except (ValueError, TypeError):
-                    # Fallback to string conversion if not numeric
-                    time_key = str(time_key_value).strip()
-            else:
-                # Fallback: ถ้าไม่มี column TIME_KEY หรือไม่มีข้อมูล ให้ใช้เวลาปัจจุบันเหมือนเดิม
-                time_key = datetime.now().strftime("%Y%m%d_%H%M%S")
-
-            filename = f"PL_{args.report_type}_{args.period}_{args.detail_level}_{time_key}.xlsx"
-            output_path = args.output_dir / filename
+            output_path = default_output_path(
+                df, args.output_dir, args.report_type, args.period, args.detail_level
+            )
 
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # 6. Load remark file
-        remark_content = load_remark_file(csv_path)
+        # 7. Load remark file
+        remark_content = _read_remark_file(remark_path) if remark_path else ""
         if remark_content:
-            # Extract date suffix from CSV filename for display
-            csv_stem = csv_path.stem
-            date_suffix = csv_stem.split('_')[-1] if csv_stem else ''
-            logging.info(f"\n📝 Loaded remarks from: remark_{date_suffix}.txt")
+            logging.info(f"\n📝 Loaded remarks from: {remark_path.name}")
 
-        # 7. Generate report
+        # 8. Generate report
         logging.info(f"\n🔨 Generating Excel report...")
         builder = ReportBuilder(config)
         result_path = builder.generate_report(df, output_path, remark_content)
+        manifest_store.record(csv_path, config, fingerprint, result_path)
+        if not builder.prune_result.is_empty():
+            logging.info(
+                f"   ✂️  Pruned {len(builder.prune_result.columns)} product columns, "
+                f"{len(builder.prune_result.rows)} detail rows"
+            )
 
-        # 8. Success!
+        # 9. Success!
         file_size = result_path.stat().st_size / 1024  # KB
 
         logging.info(f"\n✅ Report generated successfully!")
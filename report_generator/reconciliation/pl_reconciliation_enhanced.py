@@ -19,6 +19,8 @@ from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 from enum import Enum
 
+from recon_core import ReconSession, load_workbook_grids, parse_amount
+
 # ==========================================
 # Configuration Classes
 # ==========================================
@@ -76,20 +78,9 @@ class FileConfig:
 # ==========================================
 
 def parse_thai_number(text) -> float:
-    """แปลงข้อความตัวเลขภาษาไทยให้เป็น Float"""
-    if pd.isna(text):
-        return 0.0
-    text = str(text).strip()
-    if text == '-' or text == '':
-        return 0.0
-    # จัดการวงเล็บแทนค่าลบ
-    if '(' in text and ')' in text:
-        text = '-' + text.replace('(', '').replace(')', '')
-    text = text.replace(',', '')
-    try:
-        return float(text)
-    except ValueError:
-        return 0.0
+    """แปลงข้อความตัวเลขภาษาไทยให้เป็น Float (วงเล็บ = ค่าลบ, อ่านไม่ได้ = 0)"""
+    value = parse_amount(text, trailing_minus=False)
+    return 0.0 if value is None else value
 
 def detect_label_col(df: pd.DataFrame) -> int:
     """ค้นหา column ที่มี 'รายละเอียด' ใน DataFrame (คล้าย ExcelSheetReader._detect_label_column)"""
@@ -162,46 +153,66 @@ def get_text_val(lines: List[str], keywords: List[str], column_index: int = 0) -
 # Data Loading Functions
 # ==========================================
 
-def load_excel_sheets(file_path: str, sheets: Dict[str, str]) -> Dict[str, pd.DataFrame]:
+def load_excel_sheets(file_path: str, sheets: Dict[str, str],
+                      session: Optional[ReconSession] = None) -> Dict[str, pd.DataFrame]:
     """
     โหลด Sheet ทั้งหมดจากไฟล์ Excel
 
     Args:
         file_path: path ของไฟล์ Excel
         sheets: dictionary ของ sheet names
+        session: ถ้าระบุ จะอ่านผ่าน ReconSession (ไฟล์เดียวกันอ่านครั้งเดียว)
 
     Returns:
         dictionary ของ DataFrames
     """
     print(f"กำลังอ่านข้อมูลจากไฟล์ Excel: {file_path}")
     result = {}
+    # เปิดไฟล์ครั้งเดียว (read-only, values only) แล้วอ่านทุก sheet ที่ต้องใช้
+    try:
+        if session is not None:
+            grids = session.workbook(file_path)
+        else:
+            grids = load_workbook_grids(file_path, sheets.values(), missing_ok=True)
+    except Exception as e:
+        print(f"  ✗ ไม่สามารถเปิดไฟล์: {e}")
+        return {key: None for key in sheets}
     for key, sheet_name in sheets.items():
-        try:
-            df = pd.read_excel(file_path, sheet_name=sheet_name, header=None)
-            result[key] = df
-            print(f"  ✓ โหลด sheet '{sheet_name}' สำเร็จ ({len(df)} rows)")
-        except Exception as e:
-            print(f"  ✗ ไม่สามารถโหลด sheet '{sheet_name}': {e}")
+        if sheet_name not in grids:
+            print(f"  ✗ ไม่สามารถโหลด sheet '{sheet_name}': ไม่พบ sheet")
             result[key] = None
+            continue
+        if session is not None:
+            df = session.frame(file_path, sheet_name)
+        else:
+            df = grids[sheet_name].to_frame()
+        result[key] = df
+        print(f"  ✓ โหลด sheet '{sheet_name}' สำเร็จ ({len(df)} rows)")
     return result
 
-def load_csv_source(file_path: str) -> pd.DataFrame:
+def load_csv_source(file_path: str, session: Optional[ReconSession] = None) -> pd.DataFrame:
     """โหลดไฟล์ CSV แหล่งข้อมูล"""
     print(f"กำลังอ่านข้อมูลจากไฟล์ CSV: {file_path}")
     try:
-        df = pd.read_csv(file_path, encoding='cp874')
+        if session is not None:
+            df = session.read_csv(file_path)
+        else:
+            df = pd.read_csv(file_path, encoding='cp874')
         print(f"  ✓ โหลดสำเร็จ ({len(df)} rows)")
         return df
     except Exception as e:
         print(f"  ✗ ไม่สามารถโหลดไฟล์: {e}")
         return None
 
-def load_text_file(file_path: str) -> List[str]:
+def load_text_file(file_path: str, session: Optional[ReconSession] = None) -> List[str]:
     """โหลดไฟล์ Text งบการเงิน"""
     print(f"กำลังอ่านข้อมูลจากไฟล์ Text: {file_path}")
     try:
-        with open(file_path, 'r', encoding='cp874') as f:
-            lines = f.readlines()
+        if session is not None:
+            lines = session.text_lines(file_path)
+        else:
+            with open(file_path, 'r', encoding='cp874') as f:
+                lines = f.readlines()
         print(f"  ✓ โหลดสำเร็จ ({len(lines)} lines)")
         return lines
     except Exception as e:
@@ -241,16 +252,17 @@ class ReconciliationResult:
 class ReconciliationEngine:
     """Engine สำหรับการตรวจสอบความสอดคล้อง"""
 
-    def __init__(self, config: FileConfig, validation_mode: ValidationMode = ValidationMode.ENHANCED):
+    def __init__(self, config: FileConfig, validation_mode: ValidationMode = ValidationMode.ENHANCED,
+                 session: Optional[ReconSession] = None):
         self.config = config
         self.validation_mode = validation_mode
         self.results: List[ReconciliationResult] = []
 
-        # Load ข้อมูลทั้งหมด
-        self.excel_sheets = load_excel_sheets(config.report_excel, config.sheets)
-        self.source_cost_df = load_csv_source(config.source_cost_csv)
-        self.source_gl_df = load_csv_source(config.source_gl_csv)
-        self.stmt_lines = load_text_file(config.financial_stmt_txt)
+        # Load ข้อมูลทั้งหมด (ผ่าน session ถ้ามี — MTH/YTD ใช้ไฟล์งบการเงินเดียวกัน อ่านครั้งเดียว)
+        self.excel_sheets = load_excel_sheets(config.report_excel, config.sheets, session)
+        self.source_cost_df = load_csv_source(config.source_cost_csv, session)
+        self.source_gl_df = load_csv_source(config.source_gl_csv, session)
+        self.stmt_lines = load_text_file(config.financial_stmt_txt, session)
 
     def extract_values(self) -> Dict[str, float]:
         """
@@ -676,13 +688,16 @@ Examples:
     print(f"Validation Mode: {validation_mode.value.upper()}".center(100))
     print("="*100)
 
+    # ไฟล์ที่ใช้ร่วมกันระหว่างสองงวดอ่านครั้งเดียวผ่าน session
+    session = ReconSession(args.date, data_dir, report_dir, company=company)
+
     # ตรวจสอบรายเดือน (MTH)
-    engine_mth = ReconciliationEngine(config_mth, validation_mode)
+    engine_mth = ReconciliationEngine(config_mth, validation_mode, session)
     engine_mth.run_all_checks()
     engine_mth.print_results()
 
     # ตรวจสอบสะสม (YTD)
-    engine_ytd = ReconciliationEngine(config_ytd, validation_mode)
+    engine_ytd = ReconciliationEngine(config_ytd, validation_mode, session)
     engine_ytd.run_all_checks()
     engine_ytd.print_results()
 
@@ -0,0 +1,19 @@
+"""Shared building blocks for the reconciliation scripts in this folder."""
+from .csv_totals import CsvTotals
+from .fingerprint import ResultCache
+from .label_index import LabelIndex
+from .results import (EXPORT_FORMATS, TOLERANCE, CheckResult, ResultStore, export_format, results_frame,
+                      write_xlsx)
+from .runner import ReconUnit, UnitOutcome, merge_results, print_unit_timings, run_units
+from .session import CSV_TYPES, PERIODS, ReconSession
+from .sources import parse_amount, read_csv_auto_encoding
+from .workbook_grid import SheetGrid, load_sheet_grid, load_workbook_grids
+
+__all__ = [
+    'CsvTotals', 'LabelIndex', 'ResultCache',
+    'EXPORT_FORMATS', 'TOLERANCE', 'CheckResult', 'ResultStore', 'export_format', 'results_frame', 'write_xlsx',
+    'ReconUnit', 'UnitOutcome', 'merge_results', 'print_unit_timings', 'run_units',
+    'CSV_TYPES', 'PERIODS', 'ReconSession',
+    'parse_amount', 'read_csv_auto_encoding',
+    'SheetGrid', 'load_sheet_grid', 'load_workbook_grids',
+]
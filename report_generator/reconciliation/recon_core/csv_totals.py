@@ -0,0 +1,65 @@
+"""
+CSV totals — the CSV side of a reconciliation, reduced once.
+
+The checks compare Excel cells against Σ VALUE of CSV rows selected by
+GROUP (exact name or prefix such as '01.รายได้') and one dimension
+(BU, SERVICE_GROUP, PRODUCT_KEY). Instead of re-filtering the whole CSV per
+(service group × check), CsvTotals sums VALUE once per distinct
+(GROUP, BU, SERVICE_GROUP, PRODUCT_KEY) and answers every lookup from that
+small table; a GROUP prefix is classified once over the distinct GROUP
+values, not per row.
+"""
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+KEY_COLUMNS = ('BU', 'SERVICE_GROUP', 'PRODUCT_KEY')
+
+
+class CsvTotals:
+    """Σ VALUE per (GROUP, BU, SERVICE_GROUP, PRODUCT_KEY), with cached roll-ups
+
+    PRODUCT_KEY is compared as stripped text (the Excel product row holds
+    keys as text), so 101 and ' 101' land on the same key.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        keys = [df['GROUP']]
+        for col in KEY_COLUMNS:
+            if col not in df.columns:
+                continue
+            if col == 'PRODUCT_KEY':
+                keys.append(df[col].astype(str).str.strip())
+            else:
+                keys.append(df[col])
+        self._sums: pd.Series = (
+            df['VALUE'].astype(float)
+            .groupby(keys, sort=False, dropna=False).sum()
+        )
+        self._by: Dict[Tuple[str, ...], Dict] = {}
+        self._by_prefix: Dict[Tuple[str, Optional[str]], Dict] = {}
+
+    def by(self, *keys: str) -> Dict:
+        """{(GROUP, *key values): total} — e.g. by('BU') → {(group, bu): total}; by() → {group: total}"""
+        if keys not in self._by:
+            grouped = self._sums.groupby(level=['GROUP', *keys], sort=False).sum()
+            self._by[keys] = grouped.to_dict()
+        return self._by[keys]
+
+    def by_prefix(self, prefix: str, key: Optional[str] = None) -> Dict:
+        """{key value: Σ VALUE over every GROUP starting with `prefix`}; key=None → {None: total}"""
+        cache_key = (prefix, key)
+        if cache_key not in self._by_prefix:
+            groups = self._sums.index.get_level_values('GROUP')
+            distinct = pd.Index(groups.unique())
+            matched = distinct[distinct.astype(str).str.startswith(prefix)]
+            selected = self._sums[groups.isin(matched)]
+            if key is None:
+                self._by_prefix[cache_key] = {None: float(selected.sum())}
+            else:
+                self._by_prefix[cache_key] = selected.groupby(level=key, sort=False).sum().to_dict()
+        return self._by_prefix[cache_key]
+
+    def prefix_total(self, prefix: str, key: Optional[str] = None, value=None) -> float:
+        """Σ VALUE for GROUP prefix `prefix` and `key` == `value` (0.0 when no row matches)"""
+        return self.by_prefix(prefix, key).get(value, 0.0)
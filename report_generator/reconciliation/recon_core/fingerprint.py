@@ -0,0 +1,121 @@
+"""
+Input fingerprints and the per-unit result cache for incremental runs.
+
+A unit's fingerprint covers everything its checks read:
+- CSV files: SHA-256 of the file bytes
+- workbook sheets: SHA-256 of the sheet's XML part plus xl/sharedStrings.xml
+  (cell text lives there, so a label change anywhere re-checks every sheet —
+  conservative, but a sheet whose numbers and text are unchanged keeps its hash
+  when another sheet of the workbook is regenerated)
+- TOLERANCE and the check-suite version: a hash of the unit function's source
+  file and of recon_core, so editing a check invalidates its cached results
+
+ResultCache keeps one JSON file per unit (fingerprint, captured output, result
+columns); run_units(..., cache=) reuses a unit whose fingerprint is unchanged.
+"""
+import hashlib
+import inspect
+import json
+import posixpath
+import re
+import zipfile
+from pathlib import Path
+from typing import Callable, Dict, Optional, Union
+from xml.etree import ElementTree
+
+from .results import ResultStore
+
+PathLike = Union[str, Path]
+
+_NS_MAIN = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_NS_REL = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_NS_PKG_REL = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+CORE_DIR = Path(__file__).resolve().parent
+
+
+def digest(*parts) -> str:
+    """SHA-256 over JSON-encoded `parts` (str / numbers / lists)"""
+    return hashlib.sha256(json.dumps(parts, ensure_ascii=False, default=str).encode('utf-8')).hexdigest()
+
+
+def file_digest(path: PathLike) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def sheet_digests(path: PathLike) -> Dict[str, str]:
+    """{sheet name: SHA-256 of its XML part + shared strings} of an .xlsx file"""
+    with zipfile.ZipFile(path) as zf:
+        names = set(zf.namelist())
+        shared = zf.read('xl/sharedStrings.xml') if 'xl/sharedStrings.xml' in names else b''
+        rels = ElementTree.fromstring(zf.read('xl/_rels/workbook.xml.rels'))
+        targets = {rel.get('Id'): rel.get('Target') for rel in rels.iter(_NS_PKG_REL + 'Relationship')}
+        workbook = ElementTree.fromstring(zf.read('xl/workbook.xml'))
+        digests = {}
+        for sheet in workbook.iter(_NS_MAIN + 'sheet'):
+            target = targets.get(sheet.get(_NS_REL + 'id'), '')
+            part = target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join('xl', target))
+            if part not in names:
+                continue
+            h = hashlib.sha256(zf.read(part))
+            h.update(shared)
+            digests[sheet.get('name')] = h.hexdigest()
+    return digests
+
+
+_suite_versions: Dict[str, str] = {}
+
+
+def suite_version(func: Callable) -> str:
+    """Hash of the source of `func`'s module and of recon_core (the check suite)"""
+    source = inspect.getsourcefile(func) or ''
+    if source not in _suite_versions:
+        h = hashlib.sha256()
+        for path in [Path(source), *sorted(CORE_DIR.glob('*.py'))]:
+            if path.is_file():
+                h.update(path.read_bytes())
+        _suite_versions[source] = h.hexdigest()
+    return _suite_versions[source]
+
+
+class ResultCache:
+    """Cached outcome per unit name in `directory` (one JSON file per unit)"""
+
+    def __init__(self, directory: PathLike, reuse: bool = True):
+        self.directory = Path(directory)
+        self.reuse = reuse  # False: only (re)write the cache, never read it
+
+    def _path(self, name: str) -> Path:
+        return self.directory / '{}.json'.format(re.sub(r'[^\w.-]+', '_', name))
+
+    def load(self, name: str, fingerprint: str) -> Optional[dict]:
+        """{'results': ResultStore (marked reused), 'output': str, 'seconds': float} if cached for `fingerprint`"""
+        if not self.reuse:
+            return None
+        path = self._path(name)
+        try:
+            entry = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+        if entry.get('fingerprint') != fingerprint:
+            return None
+        return {'results': ResultStore.from_columns(entry['columns'], reused=True),
+                'output': entry['output'], 'seconds': entry['seconds']}
+
+    def save(self, name: str, fingerprint: str, results: ResultStore, output: str, seconds: float):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entry = {'fingerprint': fingerprint, 'output': output, 'seconds': seconds,
+                 'columns': results.columns()}
+        text = json.dumps(entry, ensure_ascii=False, default=_json_scalar)
+        self._path(name).write_text(text, encoding='utf-8')
+
+
+def _json_scalar(value):
+    """numpy scalars (np.int64 / np.bool_ …) as Python values"""
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
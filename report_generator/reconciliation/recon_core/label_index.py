@@ -0,0 +1,55 @@
+"""
+Label index — row labels of one report sheet, read once.
+
+reconcile_* scripts look rows up by keyword sets (all keywords must appear
+in the label, first match wins). Scanning the label column for every
+(service group × check) made each lookup O(rows); the index keeps the
+labels in sheet order plus a cache per keyword set, so repeated lookups
+are O(1).
+"""
+from typing import Dict, Generic, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar('T')
+
+
+class LabelIndex(Generic[T]):
+    """Labels (stripped, in sheet order) → a value per label (row index, parsed row, ...)"""
+
+    def __init__(self, items: Iterable[Tuple[str, T]]):
+        self._items: List[Tuple[str, T]] = list(items)
+        self._exact: Dict[str, T] = {}
+        for label, value in self._items:
+            self._exact.setdefault(label, value)
+        self._found: Dict[Tuple[str, ...], Optional[T]] = {}
+
+    @classmethod
+    def from_sheet(cls, ws, label_col: int, first_row: int) -> 'LabelIndex[int]':
+        """Index the label column from `first_row` down: label → row number"""
+        items = []
+        for row_idx, (val,) in enumerate(
+                ws.iter_rows(min_row=first_row, max_row=ws.max_row,
+                             min_col=label_col, max_col=label_col, values_only=True),
+                start=first_row):
+            if val is not None:
+                items.append((str(val).strip(), row_idx))
+        return cls(items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def items(self) -> List[Tuple[str, T]]:
+        return list(self._items)
+
+    def get(self, label: str) -> Optional[T]:
+        """Value of the first row whose label is exactly `label` (after strip)"""
+        return self._exact.get(label.strip())
+
+    def find(self, keywords: Sequence[str]) -> Optional[T]:
+        """Value of the first row whose label contains every keyword (cached per keyword set)"""
+        key = tuple(keywords)
+        if key not in self._found:
+            self._found[key] = next(
+                (value for label, value in self._items if all(kw in label for kw in key)),
+                None,
+            )
+        return self._found[key]
@@ -0,0 +1,279 @@
+"""
+Check results — the row type every reconciliation check family emits, and
+the column store they are collected in.
+
+Check functions append CheckResult objects (or call ResultStore.add) to the
+`results` they are given. ResultStore keeps the fields column-wise, so a
+product-level run with tens of thousands of checks computes diff / pass /
+status as arrays, summarises per category with one groupby and writes the
+export workbook in write-only mode instead of cell by cell.
+"""
+import argparse
+import importlib.util
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Union
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+
+TOLERANCE = 0.001  # ยอมรับผลต่างไม่เกิน 0.001 บาท (floating point)
+
+
+@dataclass
+class CheckResult:
+    category: str
+    check_name: str
+    source_label: str
+    source_value: float
+    target_label: str
+    target_value: float
+    tolerance: float = TOLERANCE
+
+    @property
+    def diff(self) -> float:
+        return self.source_value - self.target_value
+
+    @property
+    def passed(self) -> bool:
+        return abs(self.diff) <= self.tolerance
+
+    @property
+    def status(self) -> str:
+        return "PASS" if self.passed else "FAIL"
+
+
+EXPORT_FORMATS = ('xlsx', 'csv', 'parquet')
+PARQUET_ENGINES = ('pyarrow', 'fastparquet')
+
+FIELDS = ('category', 'check_name', 'source_label', 'source_value',
+          'target_label', 'target_value', 'tolerance')
+STORE_COLUMNS = (*FIELDS, 'reused')  # reused: taken from an incremental-run cache
+
+# Export column → store field / computed column
+EXPORT_COLUMNS = {
+    'Category': 'category',
+    'Check': 'check_name',
+    'Source Label': 'source_label',
+    'Source Value': 'source_value',
+    'Target Label': 'target_label',
+    'Target Value': 'target_value',
+    'Difference': 'diff',
+    'Status': 'status',
+}
+
+
+def export_format(fmt: str) -> str:
+    """argparse type of --results-format: 'parquet' fails at argument parsing without an engine
+
+    (instead of an ImportError at export, after the whole run)
+    """
+    if fmt == 'parquet' and not any(importlib.util.find_spec(engine) for engine in PARQUET_ENGINES):
+        raise argparse.ArgumentTypeError(
+            "parquet ต้องติดตั้ง pyarrow หรือ fastparquet (pip install pyarrow) — หรือใช้ xlsx / csv")
+    return fmt
+
+
+class ResultStore:
+    """CheckResult fields held column-wise; pass / fail computed as arrays
+
+    Drop-in for the `results` list of the check functions: append(CheckResult),
+    extend(), len() and iteration (yields CheckResult) work as on a list.
+    """
+
+    def __init__(self, results: Iterable[CheckResult] = ()):
+        self._columns: Dict[str, list] = {name: [] for name in STORE_COLUMNS}
+        self._arrays: Optional[Dict[str, np.ndarray]] = None
+        self.extend(results)
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, list], reused: bool = False) -> 'ResultStore':
+        """Store from columns() output; reused=True marks every result as cached"""
+        store = cls()
+        for name in FIELDS:
+            store._columns[name] = list(columns[name])
+        store._columns['reused'] = [reused] * len(store._columns['category'])
+        return store
+
+    def columns(self) -> Dict[str, list]:
+        """The CheckResult fields as plain lists (JSON / pickle friendly)"""
+        return {name: list(self._columns[name]) for name in FIELDS}
+
+    # --- Collecting --------------------------------------------------------
+
+    def add(self, category: str, check_name: str, source_label: str, source_value: float,
+            target_label: str, target_value: float, tolerance: float = TOLERANCE):
+        """Record one check without building a CheckResult"""
+        columns = self._columns
+        columns['category'].append(category)
+        columns['check_name'].append(check_name)
+        columns['source_label'].append(source_label)
+        columns['source_value'].append(source_value)
+        columns['target_label'].append(target_label)
+        columns['target_value'].append(target_value)
+        columns['tolerance'].append(tolerance)
+        columns['reused'].append(False)
+        self._arrays = None
+
+    def append(self, result: CheckResult):
+        self.add(result.category, result.check_name, result.source_label, result.source_value,
+                 result.target_label, result.target_value, result.tolerance)
+
+    def extend(self, results: Iterable[CheckResult]):
+        if isinstance(results, ResultStore):
+            for name in STORE_COLUMNS:
+                self._columns[name].extend(results._columns[name])
+            self._arrays = None
+            return
+        for result in results:
+            self.append(result)
+
+    def __len__(self) -> int:
+        return len(self._columns['category'])
+
+    def __iter__(self) -> Iterator[CheckResult]:
+        for row in zip(*(self._columns[name] for name in FIELDS)):
+            yield CheckResult(*row)
+
+    # --- Columns -------------------------------------------------------------
+
+    def _array(self, name: str) -> np.ndarray:
+        if self._arrays is None:
+            columns = self._columns
+            source = np.asarray(columns['source_value'], dtype=float)
+            target = np.asarray(columns['target_value'], dtype=float)
+            diff = source - target
+            passed = np.abs(diff) <= np.asarray(columns['tolerance'], dtype=float)
+            self._arrays = {
+                'source_value': source,
+                'target_value': target,
+                'diff': diff,
+                'passed': passed,
+                'status': np.where(passed, 'PASS', 'FAIL').astype(object),
+            }
+        if name in self._arrays:
+            return self._arrays[name]
+        return np.asarray(self._columns[name], dtype=object)
+
+    @property
+    def diff(self) -> np.ndarray:
+        return self._array('diff')
+
+    @property
+    def passed(self) -> np.ndarray:
+        return self._array('passed')
+
+    @property
+    def status(self) -> np.ndarray:
+        return self._array('status')
+
+    @property
+    def n_passed(self) -> int:
+        return int(self.passed.sum())
+
+    @property
+    def n_failed(self) -> int:
+        return len(self) - self.n_passed
+
+    def failed(self) -> 'ResultStore':
+        """The failed checks, in order"""
+        store = ResultStore()
+        keep = np.flatnonzero(~self.passed)
+        for name in STORE_COLUMNS:
+            column = self._columns[name]
+            store._columns[name] = [column[i] for i in keep]
+        return store
+
+    # --- Summaries / export ----------------------------------------------------
+
+    @property
+    def n_reused(self) -> int:
+        return sum(self._columns['reused'])
+
+    def frame(self) -> pd.DataFrame:
+        """Results as the 'All Checks' export table (+ 'Reused' when any result came from the cache)"""
+        if not len(self):
+            return pd.DataFrame()
+        frame = pd.DataFrame({column: self._array(name) for column, name in EXPORT_COLUMNS.items()})
+        if self.n_reused:
+            frame['Reused'] = np.where(self._columns['reused'], 'cached', '')
+        return frame
+
+    def summary(self) -> Dict[str, int]:
+        passed = self.n_passed
+        return {'passed': passed, 'failed': len(self) - passed, 'total': len(self)}
+
+    def summary_by_category(self) -> pd.DataFrame:
+        """Passed / Failed / Total / Pass Rate per category (first-seen order)"""
+        passed = pd.Series(self.passed, dtype=int)
+        grouped = passed.groupby(pd.Series(self._columns['category'], dtype=object), sort=False)
+        table = pd.DataFrame({'Passed': grouped.sum(), 'Total': grouped.size()})
+        table.insert(1, 'Failed', table['Total'] - table['Passed'])
+        table['Pass Rate'] = table['Passed'] / table['Total'] * 100
+        table.index.name = 'Category'
+        return table.reset_index()
+
+    def to_csv(self, path: Union[str, Path]) -> Path:
+        path = Path(path)
+        self.frame().to_csv(path, index=False, encoding='utf-8-sig')
+        return path
+
+    def to_parquet(self, path: Union[str, Path]) -> Path:
+        path = Path(path)
+        self.frame().to_parquet(path, index=False)  # ImportError without pyarrow / fastparquet
+        return path
+
+    def to_xlsx(self, path: Union[str, Path], summary: Dict[str, object],
+                by_category: bool = False) -> Path:
+        """Summary (one row) / All Checks / Failed Checks [/ one sheet per category]"""
+        frame = self.frame()
+        sheets = {'Summary': pd.DataFrame([summary]), 'All Checks': frame}
+        if len(frame):
+            failed = frame[~self.passed]
+            if len(failed):
+                sheets['Failed Checks'] = failed
+            if by_category:
+                for category, rows in frame.groupby('Category', sort=False):
+                    name = category[:31].replace('/', '_').replace('\\', '_')
+                    n = 1
+                    while name in sheets:  # truncated names can collide
+                        name = '{}{}'.format(category[:31 - len(str(n))], n)
+                        n += 1
+                    sheets[name] = rows
+        return write_xlsx(path, sheets)
+
+    def export(self, path: Union[str, Path], summary: Dict[str, object], fmt: str = 'xlsx',
+               by_category: bool = False) -> Path:
+        """Write the results as `fmt` ('xlsx', 'csv' or 'parquet') at `path` with that suffix
+
+        csv / parquet hold the 'All Checks' table only (fastest for large runs).
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format {fmt!r} (expected one of {EXPORT_FORMATS})")
+        path = Path(path).with_suffix('.' + fmt)
+        if fmt == 'csv':
+            return self.to_csv(path)
+        if fmt == 'parquet':
+            return self.to_parquet(path)
+        return self.to_xlsx(path, summary, by_category)
+
+
+def write_xlsx(path: Union[str, Path], sheets: Dict[str, pd.DataFrame]) -> Path:
+    """DataFrames to one workbook, header row + values, via openpyxl write-only mode"""
+    path = Path(path)
+    wb = Workbook(write_only=True)
+    for name, frame in sheets.items():
+        ws = wb.create_sheet(name)
+        ws.append([str(c) for c in frame.columns])
+        for row in frame.itertuples(index=False, name=None):
+            ws.append([None if isinstance(v, float) and v != v else v for v in row])
+    wb.save(str(path))
+    return path
+
+
+def results_frame(results: Iterable[CheckResult]) -> pd.DataFrame:
+    """Results as the 'All Checks' export table"""
+    if not isinstance(results, ResultStore):
+        results = ResultStore(results)
+    return results.frame()
@@ -0,0 +1,123 @@
+"""
+Unit runner — run independent reconciliation units on a process pool.
+
+A unit is one (workbook, sheet(s), CSV) slice of a reconciliation: a
+picklable module-level function plus its arguments, returning a ResultStore
+(or a list of CheckResult). The arguments can be given lazily as `load`, a
+callable run in this process only when the unit actually has to run.
+run_units() runs the units in worker processes (or in-process with
+workers=1) and returns their outcomes in the order given, so merging
+`outcome.results` yields the same results as running the units one after
+another. Console output of each unit is captured and replayed in that same
+order; timings are kept per unit for print_unit_timings().
+
+Incremental runs: a unit with a `fingerprint` (see fingerprint.py) and a
+ResultCache is only run when no cached outcome matches its fingerprint, the
+check-suite version and TOLERANCE; a matching outcome is reused (its results
+are marked reused, its output is replayed) and its `load` is never called, so
+a fully cached run reads no CSV or workbook.
+"""
+import contextlib
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Callable, Iterable, List, Optional, Sequence
+
+from .fingerprint import ResultCache, digest, suite_version
+from .results import TOLERANCE, ResultStore
+
+
+@dataclass
+class ReconUnit:
+    name: str                      # e.g. 'MTH COSTTYPE' — used in the timing table
+    func: Callable[..., Iterable]  # module-level (picklable); returns ResultStore / List[CheckResult]
+    args: tuple = ()
+    fingerprint: str = ''          # digest of the unit's inputs; '' = never cached
+    load: Optional[Callable[[], tuple]] = None  # builds `args` for a cache miss (not pickled)
+
+
+@dataclass
+class UnitOutcome:
+    name: str
+    results: ResultStore = field(default_factory=ResultStore)
+    output: str = ''
+    seconds: float = 0.0
+    reused: bool = False
+
+
+def _run_unit(unit: ReconUnit) -> UnitOutcome:
+    buffer = io.StringIO()
+    buffer.write("\n{0}\n{1}\n{0}\n".format('=' * 60, unit.name))
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(buffer):
+        results = unit.func(*unit.args)
+    if not isinstance(results, ResultStore):
+        results = ResultStore(results)
+    return UnitOutcome(unit.name, results, buffer.getvalue(), time.perf_counter() - start)
+
+
+def _cache_key(unit: ReconUnit) -> str:
+    return digest(unit.fingerprint, suite_version(unit.func), TOLERANCE)
+
+
+def run_units(units: Sequence[ReconUnit], workers: Optional[int] = None,
+              cache: Optional[ResultCache] = None) -> List[UnitOutcome]:
+    """Run `units` (workers: default CPU count, 1 = no pool); outcomes come back in unit order
+
+    Each unit's captured output is printed as soon as it and every unit before
+    it have finished, so the console reads the same as a sequential run.
+    With `cache`, units whose fingerprint is unchanged are reused instead of
+    run (without calling their `load`), and every run unit with a fingerprint
+    is written to the cache.
+    """
+    keys = {i: _cache_key(unit) for i, unit in enumerate(units) if cache is not None and unit.fingerprint}
+    cached = {}
+    for i, key in keys.items():
+        entry = cache.load(units[i].name, key)
+        if entry is not None:
+            cached[i] = UnitOutcome(units[i].name, entry['results'], entry['output'], 0.0, reused=True)
+    pending = [unit if unit.load is None else replace(unit, args=unit.load(), load=None)
+               for i, unit in enumerate(units) if i not in cached]
+
+    workers = min(workers or os.cpu_count() or 1, max(len(pending), 1))
+    outcomes: List[UnitOutcome] = []
+    with contextlib.ExitStack() as stack:
+        if workers > 1:
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+            # map() yields in submission order and re-raises worker errors here
+            fresh = executor.map(_run_unit, pending)
+        else:
+            fresh = map(_run_unit, pending)
+        for i, unit in enumerate(units):
+            if i in cached:
+                outcome = cached[i]
+                print(outcome.output, end='')
+                print("  (reused: inputs unchanged since the cached run)")
+            else:
+                outcome = next(fresh)
+                print(outcome.output, end='')
+                if i in keys:
+                    cache.save(unit.name, keys[i], outcome.results, outcome.output, outcome.seconds)
+            outcomes.append(outcome)
+    return outcomes
+
+
+def merge_results(outcomes: Sequence[UnitOutcome]) -> ResultStore:
+    """All results, in unit order"""
+    merged = ResultStore()
+    for outcome in outcomes:
+        merged.extend(outcome.results)
+    return merged
+
+
+def print_unit_timings(outcomes: Sequence[UnitOutcome], wall_seconds: float) -> None:
+    """Per-unit time and check count; Σ unit time vs wall time shows the pool's effect"""
+    width = max((len(o.name) for o in outcomes), default=4)
+    print("\n  Unit timing:")
+    for o in outcomes:
+        print("    {:<{w}}  {:>7.2f}s  {:>5} checks{}".format(
+            o.name, o.seconds, len(o.results), '  (reused)' if o.reused else '', w=width))
+    busy = sum(o.seconds for o in outcomes)
+    print("    {:<{w}}  {:>7.2f}s  (wall {:.2f}s)".format('Σ units', busy, wall_seconds, w=width))
@@ -0,0 +1,202 @@
+"""
+Reconciliation session — the inputs of one reconciliation date, each read once.
+
+A date's reconciliation reads four P&L CSVs (COSTTYPE / GLGROUP × MTH / YTD)
+and the combined MTH and YTD report workbooks. Every check family (totals,
+BU, SG, product, EBIT/EBITDA, cross-sheet, statement tie-out) works from the
+same files, so ReconSession loads each file on first use and caches it
+together with what is derived from it:
+
+    csv(key)                      DataFrame (VALUE as float)
+    totals(key)                   CsvTotals — Σ VALUE per (GROUP, BU, SG, PRODUCT_KEY)
+    workbook(period | path)       {sheet: SheetGrid}, one read-only pass per file
+    layout(period, sheet, build)  build(grid), e.g. SheetLayout / ExcelSheetReader
+    frame(period | path, sheet)   the sheet as pd.read_excel(header=None) returns it
+    text_lines(path)              a text export (financial statement)
+    value_sidecar(period | path)  cells written by report_generator (None without a sidecar)
+    fingerprint(csv_keys, sheets) digest of CSV bytes + sheet XML (incremental runs)
+
+File names follow the report_generator conventions for `date`
+(TRN_PL_{TYPE}_{company}_{PERIOD}_TABLE_{date}.csv, Report_{company}[_YTD]_{YYYYMM}.xlsx).
+"""
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, TypeVar, Union
+
+import pandas as pd
+
+from .csv_totals import CsvTotals
+from .fingerprint import digest, file_digest, sheet_digests
+from .sources import read_csv_auto_encoding
+from .value_sidecar import find_sidecar, load_value_sidecar
+from .workbook_grid import SheetGrid, load_workbook_grids
+
+PERIODS = ('MTH', 'YTD')
+CSV_TYPES = ('COSTTYPE', 'GLGROUP')
+
+T = TypeVar('T')
+PathLike = Union[str, Path]
+
+
+class ReconSession:
+    """Files of one reconciliation date plus everything loaded / derived from them"""
+
+    def __init__(self, date: str, data_dir: PathLike, report_dir: PathLike, company: str = 'NT',
+                 excel_mth: Optional[str] = None, excel_ytd: Optional[str] = None):
+        self.date = date
+        self.date_obj = datetime.strptime(date, '%Y%m%d')  # ValueError if not YYYYMMDD
+        self.month = self.date_obj.strftime('%Y%m')
+        self.company = company
+
+        data_dir, report_dir = Path(data_dir), Path(report_dir)
+        self.csv_files: Dict[str, Path] = {
+            f'{csv_type}_{period}': data_dir / f'TRN_PL_{csv_type}_{company}_{period}_TABLE_{date}.csv'
+            for csv_type in CSV_TYPES for period in PERIODS
+        }
+        self.excel_files: Dict[str, Path] = {
+            'MTH': report_dir / (excel_mth or f'Report_{company}_{self.month}.xlsx'),
+            'YTD': report_dir / (excel_ytd or f'Report_{company}_YTD_{self.month}.xlsx'),
+        }
+
+        self._csv: Dict[Path, pd.DataFrame] = {}
+        self._totals: Dict[str, CsvTotals] = {}
+        self._workbooks: Dict[Path, Dict[str, SheetGrid]] = {}
+        self._layouts: Dict[Tuple, object] = {}
+        self._frames: Dict[Tuple[Path, str], pd.DataFrame] = {}
+        self._text: Dict[Tuple[Path, str], List[str]] = {}
+        self._sidecars: Dict[Path, Optional[pd.DataFrame]] = {}
+        self._digests: Dict[Path, object] = {}
+
+    @classmethod
+    def from_args(cls, args, data_dir: PathLike, report_dir: PathLike) -> 'ReconSession':
+        """From the scripts' --date / --company / --excel-mth / --excel-ytd arguments"""
+        return cls(args.date, data_dir, report_dir, company=args.company,
+                   excel_mth=getattr(args, 'excel_mth', None),
+                   excel_ytd=getattr(args, 'excel_ytd', None))
+
+    def missing_files(self) -> List[Path]:
+        return [path for path in (*self.csv_files.values(), *self.excel_files.values())
+                if not path.exists()]
+
+    # --- CSV ---------------------------------------------------------------
+
+    def read_csv(self, path: PathLike) -> pd.DataFrame:
+        """A P&L CSV (encoding auto-detected, VALUE as float), read once per file"""
+        path = Path(path).resolve()
+        if path not in self._csv:
+            df = read_csv_auto_encoding(path)
+            if 'VALUE' in df.columns:
+                df['VALUE'] = df['VALUE'].astype(float)
+            self._csv[path] = df
+        return self._csv[path]
+
+    def csv(self, key: str) -> pd.DataFrame:
+        """CSV by key, e.g. 'COSTTYPE_MTH'"""
+        return self.read_csv(self.csv_files[key])
+
+    def totals(self, key: str) -> CsvTotals:
+        if key not in self._totals:
+            self._totals[key] = CsvTotals(self.csv(key))
+        return self._totals[key]
+
+    # --- Workbooks -----------------------------------------------------------
+
+    def _excel_path(self, period_or_path: PathLike) -> Path:
+        if period_or_path in self.excel_files:
+            return self.excel_files[period_or_path].resolve()
+        return Path(period_or_path).resolve()
+
+    def workbook(self, period_or_path: PathLike) -> Dict[str, SheetGrid]:
+        """Every sheet of a workbook ('MTH', 'YTD' or a path), read once"""
+        path = self._excel_path(period_or_path)
+        if path not in self._workbooks:
+            self._workbooks[path] = load_workbook_grids(path)
+        return self._workbooks[path]
+
+    def sheet(self, period_or_path: PathLike, sheet_name: str) -> SheetGrid:
+        return self.workbook(period_or_path)[sheet_name]
+
+    def layout(self, period_or_path: PathLike, sheet_name: str, build: Callable[[SheetGrid], T]) -> T:
+        """build(grid) for one sheet, cached per (workbook, sheet, build)"""
+        key = (self._excel_path(period_or_path), sheet_name, build)
+        if key not in self._layouts:
+            self._layouts[key] = build(self.sheet(period_or_path, sheet_name))
+        return self._layouts[key]
+
+    def frame(self, period_or_path: PathLike, sheet_name: str) -> pd.DataFrame:
+        """A sheet as a 0-indexed DataFrame (pd.read_excel(header=None) shape)"""
+        key = (self._excel_path(period_or_path), sheet_name)
+        if key not in self._frames:
+            self._frames[key] = self.sheet(period_or_path, sheet_name).to_frame()
+        return self._frames[key]
+
+    def value_sidecar(self, period_or_path: PathLike) -> Optional[pd.DataFrame]:
+        """The workbook's value sidecar (see value_sidecar.py), None if it was not written"""
+        path = self._excel_path(period_or_path)
+        if path not in self._sidecars:
+            sidecar = find_sidecar(path)
+            self._sidecars[path] = None if sidecar is None else load_value_sidecar(sidecar)
+        return self._sidecars[path]
+
+    # --- Fingerprints ----------------------------------------------------------
+
+    def fingerprint(self, csv_keys: Sequence[str] = (),
+                    sheets: Sequence[Tuple[PathLike, str]] = ()) -> str:
+        """Digest of the given CSVs (file bytes) and (period | path, sheet) XML parts"""
+        parts = []
+        for key in csv_keys:
+            path = self.csv_files[key].resolve()
+            if path not in self._digests:
+                self._digests[path] = file_digest(path)
+            parts.append([key, self._digests[path]])
+        for period_or_path, sheet_name in sheets:
+            path = self._excel_path(period_or_path)
+            if path not in self._digests:
+                self._digests[path] = sheet_digests(path)
+            parts.append([sheet_name, self._digests[path].get(sheet_name)])
+        return digest(*parts)
+
+    # --- Text exports --------------------------------------------------------
+
+    def text_lines(self, path: PathLike, encoding: str = 'cp874') -> List[str]:
+        key = (Path(path).resolve(), encoding)
+        if key not in self._text:
+            with open(key[0], 'r', encoding=encoding) as f:
+                self._text[key] = f.readlines()
+        return self._text[key]
+
+    # --- Checks on the inputs themselves --------------------------------------
+
+    def period_warnings(self, loaded_only: bool = False) -> List[str]:
+        """CSV TIME_KEY and Excel 'ประจำเดือน' header vs the session month
+
+        loaded_only: check only files already read (incremental runs, where
+        units whose inputs are unchanged read nothing)
+        """
+        warnings = []
+        for key, path in self.csv_files.items():
+            if loaded_only and path.resolve() not in self._csv:
+                continue
+            df = self.csv(key)
+            if 'TIME_KEY' in df.columns:
+                for tk in df['TIME_KEY'].astype(str).unique():
+                    if not tk.startswith(self.month):
+                        warnings.append("CSV {}: TIME_KEY={} ไม่ตรงกับงวด {}".format(
+                            key, tk, self.month))
+                        break
+
+        for period in self.excel_files:
+            if loaded_only and self._excel_path(period) not in self._workbooks:
+                continue
+            try:
+                first = next(iter(self.workbook(period).values()))
+            except Exception:
+                continue
+            # Scan first few rows / columns of the first sheet for the period header
+            found = first.find_text('ประจำเดือน', max_row=9, max_col=5)
+            if found is not None:
+                header_text = str(first.value(*found))
+                if self.month not in header_text:
+                    warnings.append("Excel {} header: '{}' - ตรวจสอบว่าตรงกับงวด {} หรือไม่".format(
+                        period, header_text.strip(), self.month))
+        return warnings
@@ -0,0 +1,46 @@
+"""
+Source readers — CSV encoding fallback and Thai amount parsing shared by
+the reconciliation scripts.
+"""
+from pathlib import Path
+from typing import Optional, Union
+
+import pandas as pd
+
+CSV_ENCODINGS = ('utf-8', 'cp874', 'tis-620', 'latin-1')
+
+
+def read_csv_auto_encoding(filepath: Union[str, Path]) -> pd.DataFrame:
+    """Read CSV with auto-detection of encoding (TIS-620/cp874/utf-8)"""
+    for enc in CSV_ENCODINGS:
+        try:
+            df = pd.read_csv(filepath, encoding=enc)
+            # Verify by checking that column names are readable
+            if 'TIME_KEY' in df.columns or 'GROUP' in df.columns:
+                return df
+        except (UnicodeDecodeError, UnicodeError):
+            continue
+    raise ValueError(f"Cannot read {filepath} with any known encoding")
+
+
+def parse_amount(text, parentheses: bool = True, trailing_minus: bool = True) -> Optional[float]:
+    """Parse an amount as printed in reports / text exports; None when it is not a number
+
+    '1,234.50' → 1234.5; '(1,234.50)' → -1234.5 (parentheses=True);
+    '1,234.50-' → -1234.5 (trailing_minus=True — text-report style);
+    None / NaN / '' / '-' → None.
+    """
+    if text is None or (not isinstance(text, str) and pd.isna(text)):
+        return None
+    s = str(text).strip()
+    if s in ('', '-'):
+        return None
+    if parentheses and '(' in s and ')' in s:
+        s = '-' + s.replace('(', '').replace(')', '')
+    s = s.replace(',', '')
+    if trailing_minus and s.endswith('-'):
+        s = '-' + s[:-1]
+    try:
+        return float(s)
+    except ValueError:
+        return None
@@ -0,0 +1,133 @@
+"""
+Value sidecar — the cells report_generator wrote, without parsing the xlsx.
+
+With --value-sidecar, report_generator saves next to each workbook a table of
+every data cell it wrote (src/report_generator/core/value_sidecar.py):
+sheet, xl_row, xl_col, the plan row (row_key, label, row_kind, group,
+sub_groups, service_group_filter), the column (col_type, bu, service_group,
+product_key), value and is_percentage. report_concat merges the variant
+sidecars for Report_NT_*.xlsx.
+
+File naming / reading (find_sidecar, load_value_sidecar) and the BU key rule
+(normalize_bu_name) come from report_generator's src/recon_shared.py, so
+reader and writer cannot drift apart. That module depends on numpy / pandas
+only and is imported on first use, not with recon_core: scripts that never
+read a sidecar do not touch sys.path or load anything from report_generator.
+This module adds:
+csv_expected() joins DATA-row cells against the CSV per (GROUP, SUB_GROUP,
+SERVICE_GROUP filter) selection — no header search or label matching.
+spot_check() compares a sample of sidecar cells with the workbook itself.
+"""
+import importlib
+import sys
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .workbook_grid import SheetGrid
+
+REPORT_GENERATOR_DIR = Path(__file__).resolve().parents[2]
+
+# Column type → CSV columns that select the cell's total
+LEVEL_KEYS = {
+    'grand_total': (),
+    'bu_total': ('BU',),
+    'sg_total': ('BU', 'SERVICE_GROUP'),
+    'sg': ('BU', 'SERVICE_GROUP'),
+    'product': ('BU', 'SERVICE_GROUP', 'PRODUCT_KEY'),
+}
+CELL_KEYS = {'BU': 'bu', 'SERVICE_GROUP': 'service_group', 'PRODUCT_KEY': 'product_key'}
+CSV_KEYS = ('GROUP', 'SUB_GROUP', 'BU', 'SERVICE_GROUP', 'PRODUCT_KEY')
+
+
+def _shared():
+    """report_generator's src/recon_shared.py (imported once, on first use)"""
+    if str(REPORT_GENERATOR_DIR) not in sys.path:
+        sys.path.insert(0, str(REPORT_GENERATOR_DIR))
+    return importlib.import_module('src.recon_shared')
+
+
+def find_sidecar(workbook_path) -> Optional[Path]:
+    """Existing sidecar of a workbook (any format), None if there is none"""
+    return _shared().find_sidecar(workbook_path)
+
+
+def load_value_sidecar(path) -> pd.DataFrame:
+    """Read a sidecar written by report_generator --value-sidecar"""
+    return _shared().load_value_sidecar(path)
+
+
+def _csv_sums(df: pd.DataFrame, product_service_groups: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """Σ VALUE per (GROUP, SUB_GROUP, BU, SERVICE_GROUP, PRODUCT_KEY) with keys as report text"""
+    keys = pd.DataFrame({col: df[col].astype(str) for col in CSV_KEYS})
+    unique_bu = keys['BU'].unique()
+    keys['BU'] = keys['BU'].map(dict(zip(unique_bu, map(_shared().normalize_bu_name, unique_bu))))
+    keys['PRODUCT_KEY'] = keys['PRODUCT_KEY'].str.strip()
+    if product_service_groups:
+        moved = keys['PRODUCT_KEY'].map(product_service_groups)
+        keys['SERVICE_GROUP'] = moved.fillna(keys['SERVICE_GROUP'])
+    keys['VALUE'] = pd.to_numeric(df['VALUE'], errors='coerce').fillna(0.0)
+    return keys.groupby(list(CSV_KEYS), sort=False).VALUE.sum().reset_index()
+
+
+def _key_index(frame: pd.DataFrame, columns) -> pd.Index:
+    """Index over one column, MultiIndex over several (the shape groupby gives)"""
+    columns = list(columns)
+    if len(columns) == 1:
+        return pd.Index(frame[columns[0]])
+    return pd.MultiIndex.from_frame(frame[columns])
+
+
+def csv_expected(cells: pd.DataFrame, df: pd.DataFrame,
+                 product_service_groups: Optional[Dict[str, str]] = None) -> pd.Series:
+    """CSV total for each sidecar cell (aligned with `cells`); NaN where not comparable
+
+    Comparable cells: DATA rows (GROUP known, not a percentage) in grand total,
+    BU, service-group and product columns. A column key that never occurs in
+    the CSV is left NaN; a known key without rows for the selection expects 0.
+
+    product_service_groups ({PRODUCT_KEY: SERVICE_GROUP}) re-assigns products
+    the way report_generator does (SATELLITE split) before summing.
+    """
+    expected = pd.Series(np.nan, index=cells.index)
+    judged = cells[(cells['row_kind'] == 'data') & (cells['group'] != '')
+                   & ~cells['is_percentage'].astype(bool) & cells['col_type'].isin(list(LEVEL_KEYS))]
+    if judged.empty:
+        return expected
+
+    sums = _csv_sums(df, product_service_groups)
+    known = {keys: _key_index(sums, keys).unique() for keys in set(LEVEL_KEYS.values()) if keys}
+
+    selections = judged.groupby(['group', 'sub_groups', 'service_group_filter'], sort=False)
+    for (group, sub_groups, sg_filter), selected in selections:
+        rows = sums[sums['GROUP'] == group]
+        if sub_groups:
+            rows = rows[rows['SUB_GROUP'].isin(sub_groups.split('|'))]
+        if sg_filter:
+            rows = rows[rows['SERVICE_GROUP'] == sg_filter]
+        for col_type, level in selected.groupby('col_type', sort=False):
+            keys = LEVEL_KEYS[col_type]
+            if not keys:
+                expected[level.index] = rows['VALUE'].sum()
+                continue
+            cell_keys = _key_index(level, [CELL_KEYS[k] for k in keys])
+            totals = rows.groupby(list(keys), sort=False).VALUE.sum()
+            values = totals.reindex(cell_keys).to_numpy(dtype=float)
+            exists = cell_keys.isin(known[keys])
+            expected[level.index] = np.where(np.isnan(values) & exists, 0.0, values)
+    return expected
+
+
+def spot_check(cells: pd.DataFrame, grid: SheetGrid, sample: Optional[int] = 200,
+               seed: int = 0) -> pd.DataFrame:
+    """Sidecar cells (a random `sample`, None = all) with the workbook's value as 'excel_value'"""
+    if sample is not None and len(cells) > sample:
+        cells = cells.sample(sample, random_state=seed).sort_index()
+    rows = cells['xl_row'].to_numpy(dtype=int) - 1
+    cols = cells['xl_col'].to_numpy(dtype=int) - 1
+    inside = (rows < grid.max_row) & (cols < grid.max_column)
+    excel = np.full(len(cells), np.nan)
+    excel[inside] = grid.numbers[rows[inside], cols[inside]]
+    return cells.assign(excel_value=excel)
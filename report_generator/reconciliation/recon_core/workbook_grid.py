@@ -0,0 +1,153 @@
+"""
+Workbook grid — every sheet of a report workbook as a values-only 2D array.
+
+The reconciliation tools used to open the same report several ways
+(openpyxl full mode + ws.cell() per lookup, pd.read_excel per sheet). A full
+openpyxl load builds a Cell object with styles for every cell, and read-only
+ws.cell() re-scans the sheet XML on each call. load_workbook_grids() opens
+the file once in read-only, values-only mode and streams each sheet into
+
+- SheetGrid.values   object array (raw cell values, None for empty cells)
+- SheetGrid.numbers  float array (float(value), NaN where that fails)
+
+SheetGrid keeps the small part of the worksheet API the scripts use
+(cell(row=, column=).value, iter_rows(values_only=True), max_row,
+max_column, title), so functions written against a worksheet accept a grid
+unchanged. Rows / columns are 1-indexed as in openpyxl.
+"""
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+HEADER_TEXT = 'รายละเอียด'
+
+
+class GridCell(NamedTuple):
+    value: object
+
+
+_EMPTY = GridCell(None)
+
+
+def _to_float(value) -> float:
+    if value is None:
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class SheetGrid:
+    """Values of one sheet (rows × columns, 1-indexed accessors)"""
+
+    def __init__(self, title: str, values: np.ndarray):
+        self.title = title
+        self.values = values
+        self._numbers: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_rows(cls, title: str, rows: Iterable[tuple]) -> 'SheetGrid':
+        rows = [tuple(r) for r in rows]
+        # read-only sheets may yield ragged rows; drop trailing empty rows
+        while rows and all(v is None for v in rows[-1]):
+            rows.pop()
+        n_cols = max((len(r) for r in rows), default=0)
+        values = np.full((len(rows), n_cols), None, dtype=object)
+        for i, row in enumerate(rows):
+            values[i, :len(row)] = row
+        return cls(title, values)
+
+    @property
+    def max_row(self) -> int:
+        return self.values.shape[0]
+
+    @property
+    def max_column(self) -> int:
+        return self.values.shape[1]
+
+    @property
+    def numbers(self) -> np.ndarray:
+        """float(value) per cell, NaN for empty / non-numeric cells (built on first use)"""
+        if self._numbers is None:
+            to_float = np.frompyfunc(_to_float, 1, 1)
+            self._numbers = to_float(self.values).astype(float)
+        return self._numbers
+
+    def value(self, row: int, column: int):
+        """Cell value at (row, column), None outside the used range"""
+        if 1 <= row <= self.max_row and 1 <= column <= self.max_column:
+            return self.values[row - 1, column - 1]
+        return None
+
+    def cell(self, row: int, column: int) -> GridCell:
+        """Worksheet-compatible accessor: grid.cell(row=r, column=c).value"""
+        if 1 <= row <= self.max_row and 1 <= column <= self.max_column:
+            return GridCell(self.values[row - 1, column - 1])
+        return _EMPTY
+
+    def iter_rows(self, min_row: int = 1, max_row: Optional[int] = None,
+                  min_col: int = 1, max_col: Optional[int] = None,
+                  values_only: bool = True) -> Iterator[tuple]:
+        """Worksheet-compatible row iterator (values only); bounds past the grid yield None"""
+        if not values_only:
+            raise ValueError('SheetGrid holds values only')
+        max_row = self.max_row if max_row is None else max_row
+        max_col = self.max_column if max_col is None else max_col
+        for row in range(min_row, max_row + 1):
+            yield tuple(self.value(row, col) for col in range(min_col, max_col + 1))
+
+    def find_text(self, text: str, max_row: int = 15, max_col: int = 10) -> Optional[Tuple[int, int]]:
+        """(row, column) of the first cell containing `text`, scanning row by row"""
+        block = self.values[:max_row, :max_col]
+        for r, c in zip(*np.nonzero(block != None)):  # noqa: E711 — element-wise
+            if text in str(block[r, c]):
+                return int(r) + 1, int(c) + 1
+        return None
+
+    def header_cell(self) -> Optional[Tuple[int, int]]:
+        """(header_row, label_col) — position of the 'รายละเอียด' header, if any"""
+        return self.find_text(HEADER_TEXT)
+
+    def to_frame(self) -> pd.DataFrame:
+        """The grid as pd.read_excel(header=None) returns it: 0-indexed, NaN for empty
+        cells, trailing empty columns dropped"""
+        used = np.flatnonzero((self.values != None).any(axis=0))  # noqa: E711
+        values = self.values[:, :used[-1] + 1 if used.size else 0].copy()
+        values[pd.isna(values)] = np.nan
+        return pd.DataFrame(values).infer_objects()
+
+
+def load_workbook_grids(path: Union[str, Path], sheets: Optional[Iterable[str]] = None,
+                        missing_ok: bool = False) -> Dict[str, SheetGrid]:
+    """Open `path` once (read-only, cached values) and read the given sheets (default: all)
+
+    Returns {sheet name: SheetGrid} in the requested order. A requested sheet
+    that does not exist raises KeyError like wb[name], or is left out of the
+    result with missing_ok=True.
+    """
+    wb = openpyxl.load_workbook(str(path), read_only=True, data_only=True)
+    try:
+        names = list(wb.sheetnames) if sheets is None else list(sheets)
+        if missing_ok:
+            names = [name for name in names if name in wb.sheetnames]
+        grids = {}
+        for name in names:
+            ws = wb[name]
+            grids[name] = SheetGrid.from_rows(name, ws.iter_rows(values_only=True))
+        return grids
+    finally:
+        wb.close()
+
+
+def load_sheet_grid(path: Union[str, Path], sheet: Optional[str] = None) -> SheetGrid:
+    """Read one sheet (default: the active sheet, like wb.active) as a SheetGrid"""
+    wb = openpyxl.load_workbook(str(path), read_only=True, data_only=True)
+    try:
+        ws = wb.active if sheet is None else wb[sheet]
+        return SheetGrid.from_rows(ws.title, ws.iter_rows(values_only=True))
+    finally:
+        wb.close()
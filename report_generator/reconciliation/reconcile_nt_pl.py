@@ -12,16 +12,21 @@ NT P&L Reconciliation Script
 5. Internal: พันธมิตร + ไม่รวมพันธมิตร = รวมทั้งสิ้น
 """
 
+import numpy as np
 import pandas as pd
-import openpyxl
 import json
 import re
 import argparse
+import time
+from functools import partial
 from pathlib import Path
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 from datetime import datetime
 
+from recon_core import (EXPORT_FORMATS, PERIODS, CheckResult, CsvTotals, LabelIndex, ReconSession, ReconUnit,
+                        ResultCache, ResultStore, SheetGrid, export_format, merge_results, print_unit_timings,
+                        run_units)
+
 # ==========================================
 # PATH CONFIGURATION
 # ==========================================
@@ -30,8 +35,6 @@ DATA_DIR = SCRIPT_DIR / 'data'
 REPORT_DIR = SCRIPT_DIR / 'report'
 OUTPUT_DIR = SCRIPT_DIR / 'output'
 
-TOLERANCE = 0.001  # ยอมรับผลต่างไม่เกิน 0.001 บาท (floating point)
-
 
 def parse_args():
     """Parse command line arguments"""
@@ -45,152 +48,36 @@ def parse_args():
                         help='ชื่อไฟล์ Excel report MTH (ถ้าไม่ระบุจะใช้ Report_{company}_{YYYYMM}.xlsx)')
     parser.add_argument('--excel-ytd', type=str, default=None,
                         help='ชื่อไฟล์ Excel report YTD (ถ้าไม่ระบุจะใช้ Report_{company}_YTD_{YYYYMM}.xlsx)')
+    parser.add_argument('--workers', '-j', type=int, default=None,
+                        help='จำนวน worker process (default: จำนวน CPU, 1 = ไม่ใช้ pool)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='ใช้ผลตรวจเดิมของ unit ที่ CSV / sheet ไม่เปลี่ยน (cache ที่ output/.recon_cache)')
+    parser.add_argument('--results-format', choices=EXPORT_FORMATS, type=export_format, default='xlsx',
+                        help='รูปแบบไฟล์ผลตรวจ (default: xlsx; csv / parquet เร็วกว่าสำหรับผลจำนวนมาก)')
     return parser.parse_args()
 
-
-def build_file_config(args):
-    """Build file paths from --date argument"""
-    try:
-        date_obj = datetime.strptime(args.date, '%Y%m%d')
-    except ValueError:
-        print("❌ รูปแบบวันที่ไม่ถูกต้อง: {} (ใช้ YYYYMMDD)".format(args.date))
-        return None
-
-    month = date_obj.strftime('%Y%m')
-    company = args.company
-
-    # CSV filenames (auto-generate from date)
-    csv_filenames = {
-        'COSTTYPE_MTH': 'TRN_PL_COSTTYPE_{}_MTH_TABLE_{}.csv'.format(company, args.date),
-        'COSTTYPE_YTD': 'TRN_PL_COSTTYPE_{}_YTD_TABLE_{}.csv'.format(company, args.date),
-        'GLGROUP_MTH':  'TRN_PL_GLGROUP_{}_MTH_TABLE_{}.csv'.format(company, args.date),
-        'GLGROUP_YTD':  'TRN_PL_GLGROUP_{}_YTD_TABLE_{}.csv'.format(company, args.date),
-    }
-
-    # Excel filenames (auto or user-specified)
-    excel_mth = args.excel_mth or 'Report_{}_{}.xlsx'.format(company, month)
-    excel_ytd = args.excel_ytd or 'Report_{}_YTD_{}.xlsx'.format(company, month)
-    excel_filenames = {'MTH': excel_mth, 'YTD': excel_ytd}
-
-    output_filename = 'reconciliation_report_{}.xlsx'.format(month)
-
-    return {
-        'date_obj': date_obj,
-        'month': month,
-        'company': company,
-        'csv_filenames': csv_filenames,
-        'excel_filenames': excel_filenames,
-        'output_filename': output_filename,
-    }
-
-
-def validate_period(csv_data, excel_files, expected_month):
-    """Validate that CSV and Excel are for the same period"""
-    warnings = []
-
-    # Check CSV TIME_KEY
-    for key, df in csv_data.items():
-        if 'TIME_KEY' in df.columns:
-            time_keys = df['TIME_KEY'].astype(str).unique()
-            for tk in time_keys:
-                if not tk.startswith(expected_month):
-                    warnings.append("CSV {}: TIME_KEY={} ไม่ตรงกับงวด {}".format(
-                        key, tk, expected_month))
-                    break
-
-    # Check Excel header for period text
-    for period, path in excel_files.items():
-        try:
-            wb = openpyxl.load_workbook(str(path), data_only=True, read_only=True)
-            ws = wb[wb.sheetnames[0]]
-            found = False
-            for row_idx in range(1, 10):
-                for col_idx in range(1, 6):
-                    val = ws.cell(row=row_idx, column=col_idx).value
-                    if val and 'ประจำเดือน' in str(val):
-                        header_text = str(val)
-                        if expected_month not in header_text:
-                            warnings.append("Excel {} header: '{}' - ตรวจสอบว่าตรงกับงวด {} หรือไม่".format(
-                                period, header_text.strip(), expected_month))
-                        found = True
-                        break
-                if found:
-                    break
-            wb.close()
-        except Exception:
-            pass
-
-    return warnings
-
 # ==========================================
-# Data Classes
+# CSV Aggregation
 # ==========================================
 
-@dataclass
-class CheckResult:
-    category: str
-    check_name: str
-    source_label: str
-    source_value: float
-    target_label: str
-    target_value: float
-    tolerance: float = TOLERANCE
+def _totals(df) -> CsvTotals:
+    return df if isinstance(df, CsvTotals) else CsvTotals(df)
 
-    @property
-    def diff(self) -> float:
-        return self.source_value - self.target_value
+def aggregate_csv_totals(df) -> Dict[str, float]:
+    """Aggregate CSV (DataFrame or CsvTotals) by GROUP → total VALUE"""
+    return _totals(df).by()
 
-    @property
-    def passed(self) -> bool:
-        return abs(self.diff) <= self.tolerance
+def aggregate_csv_by_bu(df) -> Dict[Tuple[str, str], float]:
+    """Aggregate CSV (DataFrame or CsvTotals) by (GROUP, BU) → VALUE"""
+    return _totals(df).by('BU')
 
-    @property
-    def status(self) -> str:
-        return "PASS" if self.passed else "FAIL"
-
-# ==========================================
-# CSV Reader
-# ==========================================
+def aggregate_csv_by_service_group(df) -> Dict[Tuple[str, str, str], float]:
+    """Aggregate CSV (DataFrame or CsvTotals) by (GROUP, BU, SERVICE_GROUP) → VALUE"""
+    return _totals(df).by('BU', 'SERVICE_GROUP')
 
-def read_csv_auto_encoding(filepath: str) -> pd.DataFrame:
-    """Read CSV with auto-detection of encoding (TIS-620/cp874/utf-8)"""
-    for enc in ['utf-8', 'cp874', 'tis-620', 'latin-1']:
-        try:
-            df = pd.read_csv(filepath, encoding=enc)
-            # Verify by checking that column names are readable
-            if 'TIME_KEY' in df.columns or 'GROUP' in df.columns:
-                return df
-        except (UnicodeDecodeError, UnicodeError):
-            continue
-    raise ValueError(f"Cannot read {filepath} with any known encoding")
-
-def aggregate_csv_totals(df: pd.DataFrame) -> Dict[str, float]:
-    """Aggregate CSV by GROUP → total VALUE"""
-    result = {}
-    for group, grp_df in df.groupby('GROUP'):
-        result[group] = grp_df['VALUE'].astype(float).sum()
-    return result
-
-def aggregate_csv_by_bu(df: pd.DataFrame) -> Dict[Tuple[str, str], float]:
-    """Aggregate CSV by (GROUP, BU) → VALUE"""
-    result = {}
-    for (group, bu), grp_df in df.groupby(['GROUP', 'BU']):
-        result[(group, bu)] = grp_df['VALUE'].astype(float).sum()
-    return result
-
-def aggregate_csv_by_service_group(df: pd.DataFrame) -> Dict[Tuple[str, str, str], float]:
-    """Aggregate CSV by (GROUP, BU, SERVICE_GROUP) → VALUE"""
-    result = {}
-    for (group, bu, sg), grp_df in df.groupby(['GROUP', 'BU', 'SERVICE_GROUP']):
-        result[(group, bu, sg)] = grp_df['VALUE'].astype(float).sum()
-    return result
-
-def aggregate_csv_by_product(df: pd.DataFrame) -> Dict[Tuple[str, str], float]:
-    """Aggregate CSV by (GROUP, PRODUCT_KEY) → VALUE"""
-    result = {}
-    for (group, pk), grp_df in df.groupby(['GROUP', 'PRODUCT_KEY']):
-        result[(group, str(pk))] = grp_df['VALUE'].astype(float).sum()
-    return result
+def aggregate_csv_by_product(df) -> Dict[Tuple[str, str], float]:
+    """Aggregate CSV (DataFrame or CsvTotals) by (GROUP, PRODUCT_KEY) → VALUE"""
+    return _totals(df).by('PRODUCT_KEY')
 
 # ==========================================
 # Excel Reader - Dynamic Structure Detection
@@ -199,9 +86,9 @@ def aggregate_csv_by_product(df: pd.DataFrame) -> Dict[Tuple[str, str], float]:
 class ExcelSheetReader:
     """Read and parse NT P&L Excel report sheet with dynamic structure detection"""
 
-    def __init__(self, ws, sheet_name: str):
+    def __init__(self, ws: SheetGrid, sheet_name: Optional[str] = None):
         self.ws = ws
-        self.sheet_name = sheet_name
+        self.sheet_name = sheet_name or ws.title
         self.max_row = ws.max_row
         self.max_col = ws.max_column
 
@@ -213,15 +100,14 @@ class ExcelSheetReader:
         self.data_start_row = self._find_data_start_row()
         self.header_info = self._parse_headers()
         self.row_data = self._parse_rows()
+        # label → parsed row; keyword lookups are cached per keyword set
+        self.labels = LabelIndex(self.row_data.items())
 
     def _detect_label_column(self):
         """Find the column containing 'รายละเอียด' header"""
-        for row_idx in range(1, 16):
-            for col_idx in range(1, 11):
-                val = self.ws.cell(row=row_idx, column=col_idx).value
-                if val and 'รายละเอียด' in str(val):
-                    self.label_col = col_idx
-                    return
+        found = self.ws.header_cell()
+        if found is not None:
+            self.label_col = found[1]
 
     def _find_data_start_row(self) -> int:
         """Find the first data row (looking for '1' + 'รายได้' in label column)"""
@@ -308,6 +194,8 @@ class ExcelSheetReader:
         """Parse all data rows with their labels and values"""
         rows = {}
         data_col_start = self.label_col + 1  # data starts after label column
+        # float(value) per cell, NaN where it is empty / not a number
+        numbers = self.ws.numbers[:, data_col_start - 1:min(self.max_col, 249)]
         for row_idx in range(self.data_start_row, self.max_row + 1):
             label = self.ws.cell(row=row_idx, column=self.label_col).value
             if label is None:
@@ -316,14 +204,9 @@ class ExcelSheetReader:
             if not label or label.startswith('หมายเหตุ') or label.startswith('คำนวณ'):
                 continue
 
-            row_values = {}
-            for col_idx in range(data_col_start, min(self.max_col + 1, 250)):
-                val = self.ws.cell(row=row_idx, column=col_idx).value
-                if val is not None:
-                    try:
-                        row_values[col_idx] = float(val)
-                    except (ValueError, TypeError):
-                        pass
+            row = numbers[row_idx - 1]
+            row_values = {int(c) + data_col_start: float(row[c])
+                          for c in np.flatnonzero(~np.isnan(row))}
 
             rows[label] = {
                 'row_idx': row_idx,
@@ -335,10 +218,8 @@ class ExcelSheetReader:
 
     def get_total_value(self, label_keywords: List[str]) -> Optional[float]:
         """Get the 'รวมทั้งสิ้น' value for a row matching keywords"""
-        for label, data in self.row_data.items():
-            if all(kw in label for kw in label_keywords):
-                return data['total']
-        return None
+        data = self.labels.find(label_keywords)
+        return None if data is None else data['total']
 
     def get_bu_value(self, label_keywords: List[str], bu_csv_name: str) -> Optional[float]:
         """Get value for a specific BU column"""
@@ -346,22 +227,20 @@ class ExcelSheetReader:
         if bu_col is None:
             return None
 
-        for label, data in self.row_data.items():
-            if all(kw in label for kw in label_keywords):
-                return data['values'].get(bu_col)
-        return None
+        data = self.labels.find(label_keywords)
+        return None if data is None else data['values'].get(bu_col)
 
     def get_alliance_values(self, label_keywords: List[str]) -> Tuple[Optional[float], Optional[float]]:
         """Get (พันธมิตร, ไม่รวมพันธมิตร) values for a row"""
         a_col = self.header_info['alliance_col']
         na_col = self.header_info['non_alliance_col']
 
-        for label, data in self.row_data.items():
-            if all(kw in label for kw in label_keywords):
-                a_val = data['values'].get(a_col) if a_col else None
-                na_val = data['values'].get(na_col) if na_col else None
-                return (a_val, na_val)
-        return (None, None)
+        data = self.labels.find(label_keywords)
+        if data is None:
+            return (None, None)
+        a_val = data['values'].get(a_col) if a_col else None
+        na_val = data['values'].get(na_col) if na_col else None
+        return (a_val, na_val)
 
 # ==========================================
 # Key Row Mappings
@@ -400,11 +279,11 @@ GLGROUP_ROW_MAP = [
 
 class PLReconciler:
     def __init__(self):
-        self.results: List[CheckResult] = []
+        self.results = ResultStore()
 
     def reconcile_csv_vs_excel_totals(
         self,
-        csv_df: pd.DataFrame,
+        csv_df: Union[pd.DataFrame, CsvTotals],
         excel_reader: ExcelSheetReader,
         csv_type: str,  # 'COSTTYPE' or 'GLGROUP'
         period_label: str,  # 'MTH' or 'YTD'
@@ -443,7 +322,7 @@ class PLReconciler:
 
     def reconcile_csv_vs_excel_by_bu(
         self,
-        csv_df: pd.DataFrame,
+        csv_df: Union[pd.DataFrame, CsvTotals],
         excel_reader: ExcelSheetReader,
         csv_type: str,
         period_label: str,
@@ -652,9 +531,8 @@ class PLReconciler:
 
     def print_results(self):
         """Print all results grouped by category"""
-        passed = sum(1 for r in self.results if r.passed)
-        failed = sum(1 for r in self.results if not r.passed)
-        total = len(self.results)
+        summary = self.results.summary()
+        passed, failed, total = summary['passed'], summary['failed'], summary['total']
 
         print(f"\n{'='*120}")
         print(f"{'NT P&L Reconciliation Report':^120}")
@@ -678,181 +556,170 @@ class PLReconciler:
         print(f"Summary: {passed} PASSED / {failed} FAILED / {total} Total checks")
         print(f"{'='*120}\n")
 
-        return {'passed': passed, 'failed': failed, 'total': total}
+        return summary
 
     def to_dataframe(self) -> pd.DataFrame:
         """Convert results to DataFrame for export"""
-        records = []
-        for r in self.results:
-            records.append({
-                'Category': r.category,
-                'Check': r.check_name,
-                'Source Label': r.source_label,
-                'Source Value': r.source_value,
-                'Target Label': r.target_label,
-                'Target Value': r.target_value,
-                'Difference': r.diff,
-                'Status': r.status,
-            })
-        return pd.DataFrame(records)
+        return self.results.frame()
 
 # ==========================================
 # Main Execution
 # ==========================================
 
-def main():
-    args = parse_args()
-    config = build_file_config(args)
-    if config is None:
-        return
-
-    date_obj = config['date_obj']
-    month = config['month']
-
-    print("\n📅 วันที่ข้อมูล: {}".format(date_obj.strftime('%d/%m/%Y')))
-    print("🏢 บริษัท: {}".format(config['company']))
+def reconcile_csv_unit(csv_totals: CsvTotals, reader: ExcelSheetReader, csv_type: str,
+                       period: str, sheet_name: str) -> ResultStore:
+    """CSV vs Excel checks of one (period, CSV) against its กลุ่มธุรกิจ sheet"""
+    reconciler = PLReconciler()
+    reconciler.reconcile_csv_vs_excel_totals(csv_totals, reader, csv_type, period, sheet_name)
+    reconciler.reconcile_csv_vs_excel_by_bu(csv_totals, reader, csv_type, period, sheet_name)
+    return reconciler.results
 
-    csv_files = {key: DATA_DIR / fname for key, fname in config['csv_filenames'].items()}
-    excel_files = {key: REPORT_DIR / fname for key, fname in config['excel_filenames'].items()}
 
-    # ตรวจว่าไฟล์มีอยู่จริง
-    for key, path in {**csv_files, **excel_files}.items():
-        if not path.exists():
-            print("❌ ไม่พบไฟล์: {}".format(path))
-            if 'Report' in str(path):
-                print("   กรุณา copy จาก report_generator/output/ มาไว้ใน report/")
-                print("   หรือระบุชื่อไฟล์ด้วย --excel-mth / --excel-ytd")
-            return
+def reconcile_sheets_unit(readers: Dict[str, ExcelSheetReader], period: str,
+                          sheets: Dict[str, str]) -> ResultStore:
+    """Excel-only checks of one period (readers keyed like SHEETS)"""
+    reconciler = PLReconciler()
 
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    output_path = OUTPUT_DIR / config['output_filename']
-
-    # Sheet names
-    SHEETS = {
-        'cost_biz': 'ต้นทุน_กลุ่มธุรกิจ',
-        'cost_sg': 'ต้นทุน_กลุ่มบริการ',
-        'cost_svc': 'ต้นทุน_บริการ',
-        'gl_biz': 'หมวดบัญชี_กลุ่มธุรกิจ',
-        'gl_sg': 'หมวดบัญชี_กลุ่มบริการ',
-        'gl_svc': 'หมวดบัญชี_บริการ',
-    }
-
-    # Load CSV files
-    print("\nLoading CSV files...")
-    csv_data = {}
-    for key, path in csv_files.items():
-        print(f"  Reading {key}: {path.name}")
-        csv_data[key] = read_csv_auto_encoding(str(path))
-        csv_data[key]['VALUE'] = csv_data[key]['VALUE'].astype(float)
-        print(f"    -> {len(csv_data[key])} rows loaded")
-
-    # Validate period
-    period_warnings = validate_period(csv_data, excel_files, month)
-    if period_warnings:
+    # 3. Cross-sheet consistency
+    levels = [
+        ('กลุ่มธุรกิจ', 'cost_biz', 'gl_biz'),
+        ('กลุ่มบริการ', 'cost_sg', 'gl_sg'),
+        ('บริการ', 'cost_svc', 'gl_svc'),
+    ]
+    for level_name, cost_key, gl_key in levels:
+        reconciler.reconcile_cross_sheet(readers[cost_key], readers[gl_key], period, level_name)
+
+    # 4. Column-Total: sum(BU columns) = รวมทั้งสิ้น
+    for sheet_key in ['cost_biz', 'gl_biz']:
+        reconciler.check_column_total(readers[sheet_key], period, sheets[sheet_key])
+
+    # 5. Alliance check on sheets that have it
+    for sheet_key in ['cost_biz', 'gl_biz', 'cost_sg', 'gl_sg']:
+        reconciler.check_alliance_consistency(readers[sheet_key], period, sheets[sheet_key])
+    return reconciler.results
+
+
+# Sheet names
+SHEETS = {
+    'cost_biz': 'ต้นทุน_กลุ่มธุรกิจ',
+    'cost_sg': 'ต้นทุน_กลุ่มบริการ',
+    'cost_svc': 'ต้นทุน_บริการ',
+    'gl_biz': 'หมวดบัญชี_กลุ่มธุรกิจ',
+    'gl_sg': 'หมวดบัญชี_กลุ่มบริการ',
+    'gl_svc': 'หมวดบัญชี_บริการ',
+}
+
+
+def _csv_unit_args(session: ReconSession, csv_type: str, period: str, sheet_key: str) -> tuple:
+    """reconcile_csv_unit arguments; the parsed sheet comes from the session (one workbook read)"""
+    return (session.totals(f'{csv_type}_{period}'),
+            session.layout(period, SHEETS[sheet_key], ExcelSheetReader),
+            csv_type, period, SHEETS[sheet_key])
+
+
+def _sheets_unit_args(session: ReconSession, period: str) -> tuple:
+    """reconcile_sheets_unit arguments"""
+    readers = {key: session.layout(period, name, ExcelSheetReader) for key, name in SHEETS.items()}
+    return readers, period, SHEETS
+
+
+def build_units(session: ReconSession) -> List[ReconUnit]:
+    """One unit per (period, CSV) and one per period for the sheet-only checks
+
+    Units run in parallel and their results are merged in this order.
+    Each unit is fingerprinted by its CSV and sheets (--incremental); its
+    CSV / workbook are only read if it is not reused from the cache.
+    """
+    units = []
+    for period in PERIODS:
+        # 1. CSV vs Excel - COSTTYPE → ต้นทุน_กลุ่มธุรกิจ
+        # 2. CSV vs Excel - GLGROUP → หมวดบัญชี_กลุ่มธุรกิจ
+        for csv_type, sheet_key in [('COSTTYPE', 'cost_biz'), ('GLGROUP', 'gl_biz')]:
+            units.append(ReconUnit(
+                f"{period} {csv_type}", reconcile_csv_unit,
+                fingerprint=session.fingerprint([f'{csv_type}_{period}'], [(period, SHEETS[sheet_key])]),
+                load=partial(_csv_unit_args, session, csv_type, period, sheet_key)))
+        # 3-5. Cross-sheet, Column-Total, Alliance
+        units.append(ReconUnit(
+            f"{period} cross-sheet", reconcile_sheets_unit,
+            fingerprint=session.fingerprint(sheets=[(period, name) for name in SHEETS.values()]),
+            load=partial(_sheets_unit_args, session, period)))
+    return units
+
+
+def print_period_warnings(warnings: List[str]):
+    if warnings:
         print("\n⚠️  คำเตือนเรื่องงวดข้อมูล:")
-        for w in period_warnings:
+        for w in warnings:
             print(f"   - {w}")
         print("   กรุณาตรวจสอบว่าไฟล์ CSV และ Excel เป็นงวดเดียวกัน")
         print()
 
-    # Load Excel files
-    print("\nLoading Excel files...")
-    excel_readers = {}
 
-    for period in ['MTH', 'YTD']:
-        excel_path = str(excel_files[period])
-        print(f"  Reading {period}: {excel_files[period].name}")
-        wb = openpyxl.load_workbook(excel_path, data_only=True)
+def main():
+    args = parse_args()
+    try:
+        session = ReconSession.from_args(args, DATA_DIR, REPORT_DIR)
+    except ValueError:
+        print("❌ รูปแบบวันที่ไม่ถูกต้อง: {} (ใช้ YYYYMMDD)".format(args.date))
+        return
+
+    print("\n📅 วันที่ข้อมูล: {}".format(session.date_obj.strftime('%d/%m/%Y')))
+    print("🏢 บริษัท: {}".format(session.company))
 
-        for sheet_key, sheet_name in SHEETS.items():
-            ws = wb[sheet_name]
-            reader_key = f"{period}_{sheet_key}"
-            excel_readers[reader_key] = ExcelSheetReader(ws, sheet_name)
-            print(f"    -> Sheet '{sheet_name}': {ws.max_row} rows x {ws.max_column} cols")
+    # ตรวจว่าไฟล์มีอยู่จริง
+    for path in session.missing_files()[:1]:
+        print("❌ ไม่พบไฟล์: {}".format(path))
+        if 'Report' in str(path):
+            print("   กรุณา copy จาก report_generator/output/ มาไว้ใน report/")
+            print("   หรือระบุชื่อไฟล์ด้วย --excel-mth / --excel-ytd")
+        return
 
-        wb.close()
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    output_path = OUTPUT_DIR / 'reconciliation_report_{}.xlsx'.format(session.month)
+
+    # --incremental: files are read by the units that have to run, not up front
+    if not args.incremental:
+        # Load CSV files
+        print("\nLoading CSV files...")
+        for key, path in session.csv_files.items():
+            print(f"  Reading {key}: {path.name}")
+            print(f"    -> {len(session.csv(key))} rows loaded")
+
+        # Validate period
+        print_period_warnings(session.period_warnings())
+
+        # Load Excel files
+        print("\nLoading Excel files...")
+        for period, path in session.excel_files.items():
+            print(f"  Reading {period}: {path.name}")
+            for sheet_name in SHEETS.values():
+                ws = session.sheet(period, sheet_name)
+                print(f"    -> Sheet '{sheet_name}': {ws.max_row} rows x {ws.max_column} cols")
 
     # Run reconciliation
+    units = build_units(session)
+    started = time.perf_counter()
+    cache = ResultCache(OUTPUT_DIR / '.recon_cache' / f'nt_pl_{session.month}', reuse=args.incremental)
+    outcomes = run_units(units, args.workers, cache)
+    wall = time.perf_counter() - started
+    if args.incremental:
+        print_period_warnings(session.period_warnings(loaded_only=True))
     reconciler = PLReconciler()
-
-    for period in ['MTH', 'YTD']:
-        print(f"\n{'='*60}")
-        print(f"Running reconciliation for {period}...")
-        print(f"{'='*60}")
-
-        # 1. CSV vs Excel - COSTTYPE → ต้นทุน_กลุ่มธุรกิจ
-        cost_csv = csv_data[f'COSTTYPE_{period}']
-        cost_biz_reader = excel_readers[f'{period}_cost_biz']
-
-        reconciler.reconcile_csv_vs_excel_totals(
-            cost_csv, cost_biz_reader, 'COSTTYPE', period, 'ต้นทุน_กลุ่มธุรกิจ'
-        )
-        reconciler.reconcile_csv_vs_excel_by_bu(
-            cost_csv, cost_biz_reader, 'COSTTYPE', period, 'ต้นทุน_กลุ่มธุรกิจ'
-        )
-
-        # 2. CSV vs Excel - GLGROUP → หมวดบัญชี_กลุ่มธุรกิจ
-        gl_csv = csv_data[f'GLGROUP_{period}']
-        gl_biz_reader = excel_readers[f'{period}_gl_biz']
-
-        reconciler.reconcile_csv_vs_excel_totals(
-            gl_csv, gl_biz_reader, 'GLGROUP', period, 'หมวดบัญชี_กลุ่มธุรกิจ'
-        )
-        reconciler.reconcile_csv_vs_excel_by_bu(
-            gl_csv, gl_biz_reader, 'GLGROUP', period, 'หมวดบัญชี_กลุ่มธุรกิจ'
-        )
-
-        # 3. Cross-sheet consistency
-        levels = [
-            ('กลุ่มธุรกิจ', 'cost_biz', 'gl_biz'),
-            ('กลุ่มบริการ', 'cost_sg', 'gl_sg'),
-            ('บริการ', 'cost_svc', 'gl_svc'),
-        ]
-        for level_name, cost_key, gl_key in levels:
-            cost_r = excel_readers[f'{period}_{cost_key}']
-            gl_r = excel_readers[f'{period}_{gl_key}']
-            reconciler.reconcile_cross_sheet(cost_r, gl_r, period, level_name)
-
-        # 4. Column-Total: sum(BU columns) = รวมทั้งสิ้น
-        for sheet_key in ['cost_biz', 'gl_biz']:
-            reader = excel_readers[f'{period}_{sheet_key}']
-            reconciler.check_column_total(reader, period, SHEETS[sheet_key])
-
-        # 5. Alliance check on sheets that have it
-        for sheet_key in ['cost_biz', 'gl_biz', 'cost_sg', 'gl_sg']:
-            reader = excel_readers[f'{period}_{sheet_key}']
-            reconciler.check_alliance_consistency(reader, period, SHEETS[sheet_key])
+    reconciler.results = merge_results(outcomes)
+    print_unit_timings(outcomes, wall)
 
     # Print results
     summary = reconciler.print_results()
 
-    # Export to Excel
-    df_results = reconciler.to_dataframe()
-
-    with pd.ExcelWriter(str(output_path), engine='openpyxl') as writer:
-        # Summary sheet
-        summary_df = pd.DataFrame([{
-            'Total Checks': summary['total'],
-            'Passed': summary['passed'],
-            'Failed': summary['failed'],
-            'Pass Rate': f"{summary['passed']/summary['total']*100:.1f}%" if summary['total'] > 0 else 'N/A',
-            'Generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-        }])
-        summary_df.to_excel(writer, sheet_name='Summary', index=False)
-
-        # All results
-        df_results.to_excel(writer, sheet_name='All Checks', index=False)
-
-        # Failed only
-        df_failed = df_results[df_results['Status'] == 'FAIL']
-        if len(df_failed) > 0:
-            df_failed.to_excel(writer, sheet_name='Failed Checks', index=False)
-
-        # By category
-        for cat in df_results['Category'].unique():
-            cat_df = df_results[df_results['Category'] == cat]
-            safe_name = cat[:31].replace('/', '_').replace('\\', '_')
-            cat_df.to_excel(writer, sheet_name=safe_name, index=False)
+    # Export to Excel: Summary / All Checks / Failed Checks / one sheet per category
+    output_path = reconciler.results.export(output_path, {
+        'Total Checks': summary['total'],
+        'Passed': summary['passed'],
+        'Failed': summary['failed'],
+        'Pass Rate': f"{summary['passed']/summary['total']*100:.1f}%" if summary['total'] > 0 else 'N/A',
+        'Generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+    }, args.results_format, by_category=True)
 
     print(f"\nReport exported to: {output_path}")
     return reconciler
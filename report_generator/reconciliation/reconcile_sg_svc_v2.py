@@ -6,14 +6,19 @@ Fixed version: proper GROUP matching and dynamic product key row detection
 
 import re
 import pandas as pd
-import openpyxl
 import argparse
+import time
+from functools import partial
 from openpyxl.utils import get_column_letter
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
+from recon_core import (CSV_TYPES, PERIODS, CheckResult, CsvTotals, LabelIndex, ReconSession,
+                        EXPORT_FORMATS, ReconUnit, ResultCache, ResultStore, export_format, merge_results,
+                        print_unit_timings, run_units)
+
 # ==========================================
 # PATH CONFIGURATION
 # ==========================================
@@ -22,8 +27,6 @@ DATA_DIR = SCRIPT_DIR / 'data'
 REPORT_DIR = SCRIPT_DIR / 'report'
 OUTPUT_DIR = SCRIPT_DIR / 'output'
 
-TOLERANCE = 0.001  # ยอมรับผลต่างไม่เกิน 0.001 บาท (floating point)
-
 
 def parse_args():
     """Parse command line arguments"""
@@ -37,112 +40,15 @@ def parse_args():
                         help='ชื่อไฟล์ Excel report MTH (ถ้าไม่ระบุจะใช้ Report_{company}_{YYYYMM}.xlsx)')
     parser.add_argument('--excel-ytd', type=str, default=None,
                         help='ชื่อไฟล์ Excel report YTD (ถ้าไม่ระบุจะใช้ Report_{company}_YTD_{YYYYMM}.xlsx)')
+    parser.add_argument('--workers', '-j', type=int, default=None,
+                        help='จำนวน worker process (default: จำนวน CPU, 1 = ไม่ใช้ pool)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='ใช้ผลตรวจเดิมของ unit ที่ CSV / sheet ไม่เปลี่ยน (cache ที่ output/.recon_cache)')
+    parser.add_argument('--results-format', choices=EXPORT_FORMATS, type=export_format, default='xlsx',
+                        help='รูปแบบไฟล์ผลตรวจ (default: xlsx; csv / parquet เร็วกว่าสำหรับผลจำนวนมาก)')
     return parser.parse_args()
 
 
-def build_file_config(args):
-    """Build file paths from --date argument"""
-    try:
-        date_obj = datetime.strptime(args.date, '%Y%m%d')
-    except ValueError:
-        print("❌ รูปแบบวันที่ไม่ถูกต้อง: {} (ใช้ YYYYMMDD)".format(args.date))
-        return None
-
-    month = date_obj.strftime('%Y%m')
-    company = args.company
-
-    csv_filenames = {
-        'COSTTYPE_MTH': 'TRN_PL_COSTTYPE_{}_MTH_TABLE_{}.csv'.format(company, args.date),
-        'COSTTYPE_YTD': 'TRN_PL_COSTTYPE_{}_YTD_TABLE_{}.csv'.format(company, args.date),
-        'GLGROUP_MTH':  'TRN_PL_GLGROUP_{}_MTH_TABLE_{}.csv'.format(company, args.date),
-        'GLGROUP_YTD':  'TRN_PL_GLGROUP_{}_YTD_TABLE_{}.csv'.format(company, args.date),
-    }
-
-    excel_mth = args.excel_mth or 'Report_{}_{}.xlsx'.format(company, month)
-    excel_ytd = args.excel_ytd or 'Report_{}_YTD_{}.xlsx'.format(company, month)
-    excel_filenames = {'MTH': excel_mth, 'YTD': excel_ytd}
-
-    output_filename = 'reconciliation_sg_svc_v2_{}.xlsx'.format(month)
-
-    return {
-        'date_obj': date_obj,
-        'month': month,
-        'company': company,
-        'csv_filenames': csv_filenames,
-        'excel_filenames': excel_filenames,
-        'output_filename': output_filename,
-    }
-
-
-def validate_period(csv_data, excel_files, expected_month):
-    """Validate that CSV and Excel are for the same period"""
-    warnings = []
-
-    for key, df in csv_data.items():
-        if 'TIME_KEY' in df.columns:
-            time_keys = df['TIME_KEY'].astype(str).unique()
-            for tk in time_keys:
-                if not tk.startswith(expected_month):
-                    warnings.append("CSV {}: TIME_KEY={} ไม่ตรงกับงวด {}".format(
-                        key, tk, expected_month))
-                    break
-
-    for period, path in excel_files.items():
-        try:
-            wb = openpyxl.load_workbook(str(path), data_only=True, read_only=True)
-            ws = wb[wb.sheetnames[0]]
-            for row_idx in range(1, 10):
-                # Scan first few columns for period header
-                val = None
-                for col_idx in range(1, 6):
-                    cell_val = ws.cell(row=row_idx, column=col_idx).value
-                    if cell_val and 'ประจำเดือน' in str(cell_val):
-                        val = cell_val
-                        break
-                if val and 'ประจำเดือน' in str(val):
-                    header_text = str(val)
-                    if expected_month not in header_text:
-                        warnings.append("Excel {} header: '{}' - ตรวจสอบว่าตรงกับงวด {} หรือไม่".format(
-                            period, header_text.strip(), expected_month))
-                    break
-            wb.close()
-        except Exception:
-            pass
-
-    return warnings
-
-@dataclass
-class CheckResult:
-    category: str
-    check_name: str
-    source_label: str
-    source_value: float
-    target_label: str
-    target_value: float
-    tolerance: float = TOLERANCE
-
-    @property
-    def diff(self):
-        return self.source_value - self.target_value
-    @property
-    def passed(self):
-        return abs(self.diff) <= self.tolerance
-    @property
-    def status(self):
-        return "PASS" if self.passed else "FAIL"
-
-
-def read_csv_auto_encoding(filepath):
-    for enc in ['utf-8', 'cp874', 'tis-620', 'latin-1']:
-        try:
-            df = pd.read_csv(filepath, encoding=enc)
-            if 'TIME_KEY' in df.columns:
-                return df
-        except (UnicodeDecodeError, UnicodeError):
-            continue
-    raise ValueError("Cannot read {}".format(filepath))
-
-
 # ==========================================
 # Row/Column definitions with GROUP mapping
 # ==========================================
@@ -175,26 +81,25 @@ class SheetLayout:
     sg_row: int          # Row containing service group names
     data_start: int      # First data row (e.g., "1.รายได้")
     header_row: int      # Row containing "รายละเอียด"
+    labels: LabelIndex = field(default=None, repr=False)  # label → row, from data_start down
+
+    def find_row(self, keywords):
+        """First data row whose label contains every keyword (None if absent)"""
+        return self.labels.find(keywords)
 
 
 def detect_sheet_layout(ws):
     """Detect sheet layout dynamically by finding 'รายละเอียด' cell
 
+    `ws` is a recon_core SheetGrid (ReconSession.sheet / load_workbook_grids).
     Returns SheetLayout with all key positions.
     """
     # Scan first 15 rows × 10 cols for "รายละเอียด"
     label_col = 2     # default
     header_row = 6    # default
-    for row_idx in range(1, 16):
-        for col_idx in range(1, 11):
-            val = ws.cell(row=row_idx, column=col_idx).value
-            if val and 'รายละเอียด' in str(val):
-                label_col = col_idx
-                header_row = row_idx
-                break
-        else:
-            continue
-        break
+    found = ws.header_cell()
+    if found is not None:
+        header_row, label_col = found
 
     sg_row = header_row + 1
 
@@ -211,6 +116,7 @@ def detect_sheet_layout(ws):
         sg_row=sg_row,
         data_start=data_start,
         header_row=header_row,
+        labels=LabelIndex.from_sheet(ws, label_col, data_start),
     )
 
 
@@ -225,17 +131,6 @@ def find_data_start_row(ws, layout=None):
     return 10
 
 
-def find_row_index(ws, data_start, keywords, label_col=2):
-    for row_idx in range(data_start, ws.max_row + 1):
-        val = ws.cell(row=row_idx, column=label_col).value
-        if val is None:
-            continue
-        label = str(val).strip()
-        if all(kw in label for kw in keywords):
-            return row_idx
-    return None
-
-
 # ==========================================
 # Service Group Mapping
 # ==========================================
@@ -344,18 +239,18 @@ def build_product_column_map(ws, layout=None):
 # Reconcile Service Group Level
 # ==========================================
 
-def reconcile_service_group(csv_df, ws, csv_type, period_label, sheet_name, results, layout=None):
+def reconcile_service_group(csv_df, ws, csv_type, period_label, sheet_name, results, layout=None,
+                            totals=None):
+    """CSV vs Excel per SERVICE_GROUP column; `totals` (CsvTotals of csv_df) is built when omitted"""
     category = "CSV vs Excel by ServiceGroup ({}) - {}".format(period_label, sheet_name)
     checks = COSTTYPE_CHECKS if csv_type == 'COSTTYPE' else GLGROUP_CHECKS
 
     if layout is None:
         layout = detect_sheet_layout(ws)
-    data_start = layout.data_start
+    if totals is None:
+        totals = CsvTotals(csv_df)
     sg_col_map, sg_summary_map = build_sg_column_map(ws, layout)
 
-    csv_df = csv_df.copy()
-    csv_df['VALUE'] = csv_df['VALUE'].astype(float)
-
     unique_sgs = csv_df['SERVICE_GROUP'].unique()
     total_checks = 0
 
@@ -366,7 +261,7 @@ def reconcile_service_group(csv_df, ws, csv_type, period_label, sheet_name, resu
 
         for excel_kw, csv_group_prefix, desc in checks:
             # Find Excel row
-            excel_row = find_row_index(ws, data_start, excel_kw, layout.label_col)
+            excel_row = layout.find_row(excel_kw)
             if excel_row is None:
                 continue
 
@@ -392,12 +287,8 @@ def reconcile_service_group(csv_df, ws, csv_type, period_label, sheet_name, resu
                 if all_zero:
                     continue  # Skip - this row doesn't have SG breakdown
 
-            # Get CSV value (filter by GROUP prefix)
-            csv_filtered = csv_df[
-                (csv_df['SERVICE_GROUP'] == csv_sg) &
-                (csv_df['GROUP'].str.startswith(csv_group_prefix))
-            ]
-            csv_val = csv_filtered['VALUE'].sum() if len(csv_filtered) > 0 else 0.0
+            # Get CSV value (GROUP prefix × SERVICE_GROUP, pre-aggregated)
+            csv_val = totals.prefix_total(csv_group_prefix, 'SERVICE_GROUP', csv_sg)
 
             sg_label = csv_sg[:45]
             results.append(CheckResult(
@@ -417,13 +308,16 @@ def reconcile_service_group(csv_df, ws, csv_type, period_label, sheet_name, resu
 # Reconcile Product Level
 # ==========================================
 
-def reconcile_product(csv_df, ws, csv_type, period_label, sheet_name, results, layout=None):
+def reconcile_product(csv_df, ws, csv_type, period_label, sheet_name, results, layout=None,
+                      totals=None):
+    """CSV vs Excel per PRODUCT_KEY column; `totals` (CsvTotals of csv_df) is built when omitted"""
     category = "CSV vs Excel by Product ({}) - {}".format(period_label, sheet_name)
     checks = COSTTYPE_CHECKS if csv_type == 'COSTTYPE' else GLGROUP_CHECKS
 
     if layout is None:
         layout = detect_sheet_layout(ws)
-    data_start = layout.data_start
+    if totals is None:
+        totals = CsvTotals(csv_df)
     pk_col_map, pk_row = build_product_column_map(ws, layout)
 
     if len(pk_col_map) == 0:
@@ -431,7 +325,6 @@ def reconcile_product(csv_df, ws, csv_type, period_label, sheet_name, results, l
         return 0
 
     csv_df = csv_df.copy()
-    csv_df['VALUE'] = csv_df['VALUE'].astype(float)
     csv_df['PRODUCT_KEY'] = csv_df['PRODUCT_KEY'].astype(str).str.strip()
 
     # Get product names for labeling
@@ -449,7 +342,7 @@ def reconcile_product(csv_df, ws, csv_type, period_label, sheet_name, results, l
 
         for excel_kw, csv_group_prefix, desc in checks:
             # Find Excel row
-            excel_row = find_row_index(ws, data_start, excel_kw, layout.label_col)
+            excel_row = layout.find_row(excel_kw)
             if excel_row is None:
                 continue
 
@@ -469,12 +362,8 @@ def reconcile_product(csv_df, ws, csv_type, period_label, sheet_name, results, l
                 if all(v is None or v == 0 for v in sample_vals):
                     continue
 
-            # Get CSV value
-            csv_filtered = csv_df[
-                (csv_df['PRODUCT_KEY'] == csv_pk) &
-                (csv_df['GROUP'].str.startswith(csv_group_prefix))
-            ]
-            csv_val = csv_filtered['VALUE'].sum() if len(csv_filtered) > 0 else 0.0
+            # Get CSV value (GROUP prefix × PRODUCT_KEY, pre-aggregated)
+            csv_val = totals.prefix_total(csv_group_prefix, 'PRODUCT_KEY', csv_pk)
 
             product_name = pk_names.get(csv_pk, csv_pk)
             if len(product_name) > 25:
@@ -536,9 +425,90 @@ GLGROUP_DEP_SUBGROUPS = [
 ]
 
 
+# Row roles — each distinct (GROUP, SUB_GROUP) of a CSV gets one role;
+# EBIT / EBITDA = Σ weight × (Σ VALUE of the role)
+#   COSTTYPE: 01 revenue, 09 ผลตอบแทนฯ, 02/04/06 expense (SUB_GROUP 12/13 = depreciation),
+#             07 finance_operating, 10 other_expense
+#   GLGROUP:  01 revenue, 02 expense (SUB_GROUP 19 = finance_operating, 12/13 = depreciation)
+PL_ROLES = ['revenue', 'investment_income', 'expense', 'depreciation',
+            'finance_operating', 'other_expense', 'other']
+
+# role → (EBIT weight, EBITDA weight)
+PL_ROLE_WEIGHTS = {
+    'COSTTYPE': {
+        'revenue': (1, 1),
+        'investment_income': (0, 1),
+        'expense': (-1, -1),
+        'depreciation': (-1, 0),
+        'finance_operating': (-1, 0),
+        'other_expense': (0, -1),
+    },
+    'GLGROUP': {
+        'revenue': (1, 1),
+        'expense': (-1, -1),
+        'depreciation': (-1, 0),
+        'finance_operating': (0, 0),
+    },
+}
+
+
+def _pl_role(csv_type, group, sub_group):
+    """Role of one (GROUP, SUB_GROUP) pair (see PL_ROLES)"""
+    group = str(group)
+    if csv_type == 'COSTTYPE':
+        if group.startswith(tuple(COSTTYPE_EBIT_REVENUE)):
+            return 'revenue'
+        if group.startswith('09.'):
+            return 'investment_income'
+        if group.startswith(tuple(COSTTYPE_EBITDA_DEP_GROUPS)):
+            return 'depreciation' if sub_group in COSTTYPE_EBITDA_DEP_SUBGROUPS else 'expense'
+        if group.startswith('07.'):
+            return 'finance_operating'
+        if group.startswith('10.'):
+            return 'other_expense'
+        return 'other'
+    if group.startswith('01.'):
+        return 'revenue'
+    if group.startswith('02.'):
+        if sub_group == GLGROUP_FINANCE_OPERATING_SUBGROUP:
+            return 'finance_operating'
+        return 'depreciation' if sub_group in GLGROUP_DEP_SUBGROUPS else 'expense'
+    return 'other'
+
+
+def pl_roles(csv_df, csv_type):
+    """Categorical PL_ROLES per CSV row, classified once per distinct (GROUP, SUB_GROUP)"""
+    pairs = pd.MultiIndex.from_arrays([csv_df['GROUP'].astype(str), csv_df['SUB_GROUP'].fillna('')])
+    distinct = pairs.unique()
+    roles = pd.Series([_pl_role(csv_type, g, s) for g, s in distinct], index=distinct)
+    return pd.Categorical(roles.reindex(pairs).to_numpy(), categories=PL_ROLES)
+
+
+def calc_profit_by(csv_df, csv_type, key=None):
+    """EBIT / EBITDA from CSV data for every value of `key` in one grouped pass
+
+    key: 'SERVICE_GROUP', 'PRODUCT_KEY' (compared as stripped text) or None (whole CSV)
+    Returns DataFrame indexed by key value (None → single row 'total')
+    with columns EBIT, EBITDA.
+    """
+    if key is None:
+        keys = pd.Series('total', index=csv_df.index)
+    elif key == 'PRODUCT_KEY':
+        keys = csv_df[key].astype(str).str.strip()
+    else:
+        keys = csv_df[key]
+    role_sums = (
+        csv_df['VALUE'].astype(float)
+        .groupby([keys, pl_roles(csv_df, csv_type)], observed=False).sum()
+        .unstack(fill_value=0.0)
+    )
+    weights = pd.DataFrame(PL_ROLE_WEIGHTS[csv_type], index=['EBIT', 'EBITDA']).T
+    return role_sums[weights.index].dot(weights).astype(float)
+
+
 def _filter_df(csv_df, sg_filter=None, pk_filter=None):
     """Helper: filter DataFrame by SERVICE_GROUP and/or PRODUCT_KEY"""
-    df = csv_df.copy()
+    df = csv_df
     if sg_filter:
         df = df[df['SERVICE_GROUP'] == sg_filter]
     if pk_filter:
@@ -554,24 +524,9 @@ def calc_ebit_from_csv(csv_df, csv_type, sg_filter=None, pk_filter=None):
               = Revenue - Expense + FinanceOperating (add back finance from expense)
     """
     df = _filter_df(csv_df, sg_filter, pk_filter)
-
-    if csv_type == 'COSTTYPE':
-        revenue = df[df['GROUP'].apply(
-            lambda g: any(g.startswith(p) for p in COSTTYPE_EBIT_REVENUE)
-        )]['VALUE'].sum()
-        expense = df[df['GROUP'].apply(
-            lambda g: any(g.startswith(p) for p in COSTTYPE_EBIT_EXPENSE)
-        )]['VALUE'].sum()
-        return revenue - expense
-    else:
-        # GLGROUP: EBIT = Revenue(01) - Expense(02) + FinanceOperating(SUB_GROUP 19)
-        revenue = df[df['GROUP'].str.startswith('01.')]['VALUE'].sum()
-        expense = df[df['GROUP'].str.startswith('02.')]['VALUE'].sum()
-        finance_op = df[
-            df['GROUP'].str.startswith('02.') &
-            (df['SUB_GROUP'] == GLGROUP_FINANCE_OPERATING_SUBGROUP)
-        ]['VALUE'].sum()
-        return revenue - expense + finance_op
+    if df.empty:
+        return 0.0
+    return float(calc_profit_by(df, csv_type)['EBIT'].iloc[0])
 
 
 def calc_ebitda_from_csv(csv_df, csv_type, sg_filter=None, pk_filter=None):
@@ -581,44 +536,27 @@ def calc_ebitda_from_csv(csv_df, csv_type, sg_filter=None, pk_filter=None):
     GLGROUP:  EBIT + Depreciation(SUB_GROUP 12,13)
     """
     df = _filter_df(csv_df, sg_filter, pk_filter)
-
-    if csv_type == 'COSTTYPE':
-        revenue = df[df['GROUP'].apply(
-            lambda g: any(g.startswith(p) for p in COSTTYPE_EBITDA_REVENUE)
-        )]['VALUE'].sum()
-        expense = df[df['GROUP'].apply(
-            lambda g: any(g.startswith(p) for p in COSTTYPE_EBITDA_EXPENSE)
-        )]['VALUE'].sum()
-        depreciation = df[
-            df['GROUP'].apply(lambda g: any(g.startswith(p) for p in COSTTYPE_EBITDA_DEP_GROUPS)) &
-            df['SUB_GROUP'].isin(COSTTYPE_EBITDA_DEP_SUBGROUPS)
-        ]['VALUE'].sum()
-        return revenue - expense + depreciation
-    else:
-        # GLGROUP: EBITDA = EBIT + Depreciation(SUB_GROUP 12,13)
-        ebit = calc_ebit_from_csv(csv_df, csv_type, sg_filter, pk_filter)
-        depreciation = df[
-            df['GROUP'].str.startswith('02.') &
-            df['SUB_GROUP'].isin(GLGROUP_DEP_SUBGROUPS)
-        ]['VALUE'].sum()
-        return ebit + depreciation
+    if df.empty:
+        return 0.0
+    return float(calc_profit_by(df, csv_type)['EBITDA'].iloc[0])
 
 
-def reconcile_ebitda_sg(csv_df, ws, csv_type, period_label, sheet_name, results, layout=None):
-    """Reconcile EBITDA at Service Group level"""
+def reconcile_ebitda_sg(csv_df, ws, csv_type, period_label, sheet_name, results, layout=None,
+                        profit=None):
+    """Reconcile EBITDA at Service Group level (profit: calc_profit_by(..., 'SERVICE_GROUP'), computed if None)"""
     category = "EBITDA CSV vs Excel by ServiceGroup ({}) - {}".format(period_label, sheet_name)
 
     if layout is None:
         layout = detect_sheet_layout(ws)
     ebitda_kw = EBITDA_KEYWORDS_COSTTYPE if csv_type == 'COSTTYPE' else EBITDA_KEYWORDS_GLGROUP
-    ebitda_row = find_row_index(ws, layout.data_start, ebitda_kw, layout.label_col)
+    ebitda_row = layout.find_row(ebitda_kw)
     if ebitda_row is None:
         print("    Warning: EBITDA row not found in {}".format(sheet_name))
         return 0
 
     sg_col_map, sg_summary_map = build_sg_column_map(ws, layout)
-    csv_df = csv_df.copy()
-    csv_df['VALUE'] = csv_df['VALUE'].astype(float)
+    if profit is None:
+        profit = calc_profit_by(csv_df, csv_type, 'SERVICE_GROUP')
 
     unique_sgs = csv_df['SERVICE_GROUP'].unique()
     total_checks = 0
@@ -636,7 +574,7 @@ def reconcile_ebitda_sg(csv_df, ws, csv_type, period_label, sheet_name, results,
         except (ValueError, TypeError):
             continue
 
-        csv_ebitda = calc_ebitda_from_csv(csv_df, csv_type, sg_filter=csv_sg)
+        csv_ebitda = float(profit.at[csv_sg, 'EBITDA'])
         sg_label = csv_sg[:45]
         results.append(CheckResult(
             category=category,
@@ -651,14 +589,15 @@ def reconcile_ebitda_sg(csv_df, ws, csv_type, period_label, sheet_name, results,
     return total_checks
 
 
-def reconcile_ebitda_product(csv_df, ws, csv_type, period_label, sheet_name, results, layout=None):
-    """Reconcile EBITDA at Product level"""
+def reconcile_ebitda_product(csv_df, ws, csv_type, period_label, sheet_name, results, layout=None,
+                             profit=None):
+    """Reconcile EBITDA at Product level (profit: calc_profit_by(..., 'PRODUCT_KEY'), computed if None)"""
     category = "EBITDA CSV vs Excel by Product ({}) - {}".format(period_label, sheet_name)
 
     if layout is None:
         layout = detect_sheet_layout(ws)
     ebitda_kw = EBITDA_KEYWORDS_COSTTYPE if csv_type == 'COSTTYPE' else EBITDA_KEYWORDS_GLGROUP
-    ebitda_row = find_row_index(ws, layout.data_start, ebitda_kw, layout.label_col)
+    ebitda_row = layout.find_row(ebitda_kw)
     if ebitda_row is None:
         return 0
 
@@ -666,8 +605,10 @@ def reconcile_ebitda_product(csv_df, ws, csv_type, period_label, sheet_name, res
     if len(pk_col_map) == 0:
         return 0
 
+    if profit is None:
+        profit = calc_profit_by(csv_df, csv_type, 'PRODUCT_KEY')
+
     csv_df = csv_df.copy()
-    csv_df['VALUE'] = csv_df['VALUE'].astype(float)
     csv_df['PRODUCT_KEY'] = csv_df['PRODUCT_KEY'].astype(str).str.strip()
     pk_names = csv_df.drop_duplicates('PRODUCT_KEY').set_index('PRODUCT_KEY')['PRODUCT_NAME'].to_dict()
 
@@ -685,7 +626,7 @@ def reconcile_ebitda_product(csv_df, ws, csv_type, period_label, sheet_name, res
         except (ValueError, TypeError):
             continue
 
-        csv_ebitda = calc_ebitda_from_csv(csv_df, csv_type, pk_filter=csv_pk)
+        csv_ebitda = float(profit.at[csv_pk, 'EBITDA'])
         product_name = pk_names.get(csv_pk, csv_pk)
         if len(product_name) > 25:
             product_name = product_name[:25] + '..'
@@ -718,17 +659,16 @@ def _read_excel_cell_float(ws, row, col):
         return None
 
 
-def reconcile_ebit_sg(csv_df, ws, csv_type, period_label, sheet_name, results, layout=None):
-    """Reconcile EBIT at Service Group level"""
+def reconcile_ebit_sg(csv_df, ws, csv_type, period_label, sheet_name, results, layout=None,
+                      profit=None):
+    """Reconcile EBIT at Service Group level (profit: calc_profit_by(..., 'SERVICE_GROUP'), computed if None)"""
     category = "EBIT CSV vs Excel by ServiceGroup ({}) - {}".format(period_label, sheet_name)
 
     if layout is None:
         layout = detect_sheet_layout(ws)
-    lc = layout.label_col
-    ds = layout.data_start
 
     if csv_type == 'COSTTYPE':
-        ebit_row = find_row_index(ws, ds, EBIT_KEYWORDS_COSTTYPE, lc)
+        ebit_row = layout.find_row(EBIT_KEYWORDS_COSTTYPE)
         if ebit_row is None:
             print("    Warning: EBIT row not found in {}".format(sheet_name))
             return 0
@@ -736,15 +676,15 @@ def reconcile_ebit_sg(csv_df, ws, csv_type, period_label, sheet_name, results, l
         expense_no_fin_row = None
     else:
         ebit_row = None
-        revenue_row = find_row_index(ws, ds, ['รายได้รวม'], lc)
-        expense_no_fin_row = find_row_index(ws, ds, EBIT_KEYWORDS_GLGROUP, lc)
+        revenue_row = layout.find_row(['รายได้รวม'])
+        expense_no_fin_row = layout.find_row(EBIT_KEYWORDS_GLGROUP)
         if revenue_row is None or expense_no_fin_row is None:
             print("    Warning: Revenue/Expense row not found for EBIT calc in {}".format(sheet_name))
             return 0
 
     sg_col_map, sg_summary_map = build_sg_column_map(ws, layout)
-    csv_df = csv_df.copy()
-    csv_df['VALUE'] = csv_df['VALUE'].astype(float)
+    if profit is None:
+        profit = calc_profit_by(csv_df, csv_type, 'SERVICE_GROUP')
 
     unique_sgs = csv_df['SERVICE_GROUP'].unique()
     total_checks = 0
@@ -766,7 +706,7 @@ def reconcile_ebit_sg(csv_df, ws, csv_type, period_label, sheet_name, results, l
         if excel_val is None:
             continue
 
-        csv_ebit = calc_ebit_from_csv(csv_df, csv_type, sg_filter=csv_sg)
+        csv_ebit = float(profit.at[csv_sg, 'EBIT'])
         sg_label = csv_sg[:45]
         results.append(CheckResult(
             category=category,
@@ -781,25 +721,24 @@ def reconcile_ebit_sg(csv_df, ws, csv_type, period_label, sheet_name, results, l
     return total_checks
 
 
-def reconcile_ebit_product(csv_df, ws, csv_type, period_label, sheet_name, results, layout=None):
-    """Reconcile EBIT at Product level"""
+def reconcile_ebit_product(csv_df, ws, csv_type, period_label, sheet_name, results, layout=None,
+                           profit=None):
+    """Reconcile EBIT at Product level (profit: calc_profit_by(..., 'PRODUCT_KEY'), computed if None)"""
     category = "EBIT CSV vs Excel by Product ({}) - {}".format(period_label, sheet_name)
 
     if layout is None:
         layout = detect_sheet_layout(ws)
-    lc = layout.label_col
-    ds = layout.data_start
 
     if csv_type == 'COSTTYPE':
-        ebit_row = find_row_index(ws, ds, EBIT_KEYWORDS_COSTTYPE, lc)
+        ebit_row = layout.find_row(EBIT_KEYWORDS_COSTTYPE)
         if ebit_row is None:
             return 0
         revenue_row = None
         expense_no_fin_row = None
     else:
         ebit_row = None
-        revenue_row = find_row_index(ws, ds, ['รายได้รวม'], lc)
-        expense_no_fin_row = find_row_index(ws, ds, EBIT_KEYWORDS_GLGROUP, lc)
+        revenue_row = layout.find_row(['รายได้รวม'])
+        expense_no_fin_row = layout.find_row(EBIT_KEYWORDS_GLGROUP)
         if revenue_row is None or expense_no_fin_row is None:
             return 0
 
@@ -807,8 +746,10 @@ def reconcile_ebit_product(csv_df, ws, csv_type, period_label, sheet_name, resul
     if len(pk_col_map) == 0:
         return 0
 
+    if profit is None:
+        profit = calc_profit_by(csv_df, csv_type, 'PRODUCT_KEY')
+
     csv_df = csv_df.copy()
-    csv_df['VALUE'] = csv_df['VALUE'].astype(float)
     csv_df['PRODUCT_KEY'] = csv_df['PRODUCT_KEY'].astype(str).str.strip()
     pk_names = csv_df.drop_duplicates('PRODUCT_KEY').set_index('PRODUCT_KEY')['PRODUCT_NAME'].to_dict()
 
@@ -830,7 +771,7 @@ def reconcile_ebit_product(csv_df, ws, csv_type, period_label, sheet_name, resul
         if excel_val is None:
             continue
 
-        csv_ebit = calc_ebit_from_csv(csv_df, csv_type, pk_filter=csv_pk)
+        csv_ebit = float(profit.at[csv_pk, 'EBIT'])
         product_name = pk_names.get(csv_pk, csv_pk)
         if len(product_name) > 25:
             product_name = product_name[:25] + '..'
@@ -923,18 +864,12 @@ def reconcile_cross_column(ws, period_label, sheet_name, results, layout=None):
     if not summaries:
         return 0
 
-    data_start = find_data_start_row(ws, layout)
-    label_col = layout.label_col
     total_checks = 0
 
     # Ratio rows should not be summed across columns
     RATIO_KEYWORDS = ['สัดส่วน', 'อัตรา', '%', 'ร้อยละ']
 
-    for row_idx in range(data_start, ws.max_row + 1):
-        row_label_cell = ws.cell(row=row_idx, column=label_col).value
-        if row_label_cell is None:
-            continue
-        row_label = str(row_label_cell).strip()
+    for row_label, row_idx in layout.labels.items():
         if not row_label:
             continue
 
@@ -1057,7 +992,7 @@ def reconcile_column_total(ws, period_label, sheet_name, results, layout=None):
     total_checks = 0
 
     for keywords, desc in COLUMN_TOTAL_CHECKS:
-        row_idx = find_row_index(ws, layout.data_start, keywords, layout.label_col)
+        row_idx = layout.find_row(keywords)
         if row_idx is None:
             continue
 
@@ -1123,8 +1058,8 @@ def reconcile_cross_sheet_total(ws_cost, ws_gl, period_label, level, results,
 
     total_checks = 0
     for cost_kw, gl_kw, desc in cross_checks:
-        cost_row = find_row_index(ws_cost, layout_cost.data_start, cost_kw, layout_cost.label_col)
-        gl_row = find_row_index(ws_gl, layout_gl.data_start, gl_kw, layout_gl.label_col)
+        cost_row = layout_cost.find_row(cost_kw)
+        gl_row = layout_gl.find_row(gl_kw)
         if cost_row is None or gl_row is None:
             continue
 
@@ -1184,8 +1119,8 @@ def reconcile_cross_sheet_sg(ws_cost, ws_gl, period_label, results,
     total_checks = 0
 
     for cost_kw, gl_kw, desc in CROSS_SHEET_CHECKS_SG:
-        cost_row = find_row_index(ws_cost, layout_cost.data_start, cost_kw, layout_cost.label_col)
-        gl_row = find_row_index(ws_gl, layout_gl.data_start, gl_kw, layout_gl.label_col)
+        cost_row = layout_cost.find_row(cost_kw)
+        gl_row = layout_gl.find_row(gl_kw)
         if cost_row is None or gl_row is None:
             continue
 
@@ -1235,8 +1170,8 @@ def reconcile_cross_sheet_product(ws_cost, ws_gl, period_label, results,
     total_checks = 0
 
     for cost_kw, gl_kw, desc in CROSS_SHEET_CHECKS_SG:
-        cost_row = find_row_index(ws_cost, layout_cost.data_start, cost_kw, layout_cost.label_col)
-        gl_row = find_row_index(ws_gl, layout_gl.data_start, gl_kw, layout_gl.label_col)
+        cost_row = layout_cost.find_row(cost_kw)
+        gl_row = layout_gl.find_row(gl_kw)
         if cost_row is None or gl_row is None:
             continue
 
@@ -1269,161 +1204,197 @@ def reconcile_cross_sheet_product(ws_cost, ws_gl, period_label, results,
 # Main
 # ==========================================
 
-def main():
-    args = parse_args()
-    config = build_file_config(args)
-    if config is None:
-        return
+def reconcile_csv_unit(csv_df, totals, csv_type, period, sn_sg, sn_svc, wb, layouts):
+    """CSV vs Excel checks of one (period, CSV): SG sheet + product sheet"""
+    results = ResultStore()
+    csv_key = '{}_{}'.format(csv_type, period)
+    profit_sg = calc_profit_by(csv_df, csv_type, 'SERVICE_GROUP')
+    profit_pk = calc_profit_by(csv_df, csv_type, 'PRODUCT_KEY')
+    # Service Group
+    sn = sn_sg
+    ws = wb[sn]
+    layout = layouts[sn]
+    print("\n  SG: {} vs {}".format(csv_key, sn))
+    n = reconcile_service_group(csv_df, ws, csv_type, period, sn, results, layout, totals)
+    print("    -> {} checks".format(n))
+
+    # EBIT at Service Group level
+    print("\n  EBIT SG: {} vs {}".format(csv_key, sn))
+    n = reconcile_ebit_sg(csv_df, ws, csv_type, period, sn, results, layout, profit_sg)
+    print("    -> {} checks".format(n))
+
+    # EBITDA at Service Group level
+    print("\n  EBITDA SG: {} vs {}".format(csv_key, sn))
+    n = reconcile_ebitda_sg(csv_df, ws, csv_type, period, sn, results, layout, profit_sg)
+    print("    -> {} checks".format(n))
+
+    # Cross-column consistency (SG sheet)
+    print("\n  Cross-Column: {}".format(sn))
+    n = reconcile_cross_column(ws, period, sn, results, layout)
+    print("    -> {} checks".format(n))
+
+    # Product
+    sn = sn_svc
+    ws = wb[sn]
+    layout_svc = layouts[sn]
+    print("\n  Product: {} vs {}".format(csv_key, sn))
+    n = reconcile_product(csv_df, ws, csv_type, period, sn, results, layout_svc, totals)
+    print("    -> {} checks".format(n))
+
+    # EBIT at Product level
+    print("\n  EBIT Product: {} vs {}".format(csv_key, sn))
+    n = reconcile_ebit_product(csv_df, ws, csv_type, period, sn, results, layout_svc, profit_pk)
+    print("    -> {} checks".format(n))
+
+    # EBITDA at Product level
+    print("\n  EBITDA Product: {} vs {}".format(csv_key, sn))
+    n = reconcile_ebitda_product(csv_df, ws, csv_type, period, sn, results, layout_svc, profit_pk)
+    print("    -> {} checks".format(n))
+
+    # Cross-column consistency (Product sheet)
+    print("\n  Cross-Column: {}".format(sn))
+    n = reconcile_cross_column(ws, period, sn, results, layout_svc)
+    print("    -> {} checks".format(n))
+    return results
+
+
+def reconcile_sheets_unit(period, sheet_sg, sheet_svc, wb, layouts):
+    """Excel-only checks of one period: column totals and ต้นทุน vs หมวดบัญชี"""
+    results = ResultStore()
+
+    # Column-Total: sum(columns) = รวมทั้งสิ้น for each sheet
+    for csv_type in ['COSTTYPE', 'GLGROUP']:
+        for sheet_map in [sheet_sg, sheet_svc]:
+            sn = sheet_map[csv_type]
+            print("\n  Column-Total: {}".format(sn))
+            n = reconcile_column_total(wb[sn], period, sn, results, layouts[sn])
+            print("    -> {} checks".format(n))
 
-    date_obj = config['date_obj']
-    month = config['month']
+    # Cross-sheet Total: รวมทั้งสิ้น ต้นทุน vs หมวดบัญชี
+    for sheet_map, level in [(sheet_sg, 'กลุ่มบริการ'), (sheet_svc, 'บริการ')]:
+        sn_c, sn_g = sheet_map['COSTTYPE'], sheet_map['GLGROUP']
+        print("\n  Cross-sheet Total: ต้นทุน vs หมวดบัญชี {}".format(level))
+        n = reconcile_cross_sheet_total(wb[sn_c], wb[sn_g], period, level, results,
+                                        layouts[sn_c], layouts[sn_g])
+        print("    -> {} checks".format(n))
 
-    print("\n📅 วันที่ข้อมูล: {}".format(date_obj.strftime('%d/%m/%Y')))
-    print("🏢 บริษัท: {}".format(config['company']))
+    # Cross-sheet: ต้นทุน vs หมวดบัญชี (EBT + กำไรสุทธิ per SG/Product)
+    sn_c, sn_g = sheet_sg['COSTTYPE'], sheet_sg['GLGROUP']
+    print("\n  Cross-sheet SG: ต้นทุน vs หมวดบัญชี กลุ่มบริการ")
+    n = reconcile_cross_sheet_sg(wb[sn_c], wb[sn_g], period, results,
+                                 layouts[sn_c], layouts[sn_g])
+    print("    -> {} checks".format(n))
 
-    csv_files = {key: DATA_DIR / fname for key, fname in config['csv_filenames'].items()}
-    excel_files = {key: REPORT_DIR / fname for key, fname in config['excel_filenames'].items()}
+    sn_c, sn_g = sheet_svc['COSTTYPE'], sheet_svc['GLGROUP']
+    print("\n  Cross-sheet Product: ต้นทุน vs หมวดบัญชี บริการ")
+    n = reconcile_cross_sheet_product(wb[sn_c], wb[sn_g], period, results,
+                                      layouts[sn_c], layouts[sn_g])
+    print("    -> {} checks".format(n))
+    return results
 
-    # ตรวจว่าไฟล์มีอยู่จริง
-    for key, path in {**csv_files, **excel_files}.items():
-        if not path.exists():
-            print("❌ ไม่พบไฟล์: {}".format(path))
-            if 'Report' in str(path):
-                print("   กรุณา copy จาก report_generator/output/ มาไว้ใน report/")
-                print("   หรือระบุชื่อไฟล์ด้วย --excel-mth / --excel-ytd")
-            return
 
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    output_path = OUTPUT_DIR / config['output_filename']
-
-    sheet_sg = {'COSTTYPE': 'ต้นทุน_กลุ่มบริการ', 'GLGROUP': 'หมวดบัญชี_กลุ่มบริการ'}
-    sheet_svc = {'COSTTYPE': 'ต้นทุน_บริการ', 'GLGROUP': 'หมวดบัญชี_บริการ'}
-
-    # Load CSVs
-    print("\nLoading CSV files...")
-    csv_data = {}
-    for key, path in csv_files.items():
-        csv_data[key] = read_csv_auto_encoding(str(path))
-        csv_data[key]['VALUE'] = csv_data[key]['VALUE'].astype(float)
-        print("  {} -> {} rows".format(key, len(csv_data[key])))
-
-    # Validate period
-    period_warnings = validate_period(csv_data, excel_files, month)
-    if period_warnings:
-        print("\n⚠️  คำเตือนเรื่องงวดข้อมูล:")
-        for w in period_warnings:
-            print("   - {}".format(w))
-        print("   กรุณาตรวจสอบว่าไฟล์ CSV และ Excel เป็นงวดเดียวกัน")
-        print()
-
-    results = []
+SHEET_SG = {'COSTTYPE': 'ต้นทุน_กลุ่มบริการ', 'GLGROUP': 'หมวดบัญชี_กลุ่มบริการ'}
+SHEET_SVC = {'COSTTYPE': 'ต้นทุน_บริการ', 'GLGROUP': 'หมวดบัญชี_บริการ'}
 
-    for period in ['MTH', 'YTD']:
-        print("\n{}".format('=' * 60))
-        print("Reconciling {} - Service Group & Product level".format(period))
-        print('=' * 60)
 
-        wb = openpyxl.load_workbook(str(excel_files[period]), data_only=True)
+def _csv_unit_args(session: ReconSession, csv_type: str, period: str, sheets: Tuple[str, str]) -> tuple:
+    """reconcile_csv_unit arguments: grids + layout per sheet come from the session (read once)"""
+    csv_key = '{}_{}'.format(csv_type, period)
+    return (session.csv(csv_key), session.totals(csv_key), csv_type, period, *sheets,
+            {sn: session.sheet(period, sn) for sn in sheets},
+            {sn: session.layout(period, sn, detect_sheet_layout) for sn in sheets})
 
-        for csv_type in ['COSTTYPE', 'GLGROUP']:
-            csv_key = '{}_{}'.format(csv_type, period)
-            csv_df = csv_data[csv_key]
-
-            # Service Group
-            sn = sheet_sg[csv_type]
-            ws = wb[sn]
-            layout = detect_sheet_layout(ws)
-            print("\n  SG: {} vs {}".format(csv_key, sn))
-            n = reconcile_service_group(csv_df, ws, csv_type, period, sn, results, layout)
-            print("    -> {} checks".format(n))
 
-            # EBIT at Service Group level
-            print("\n  EBIT SG: {} vs {}".format(csv_key, sn))
-            n = reconcile_ebit_sg(csv_df, ws, csv_type, period, sn, results, layout)
-            print("    -> {} checks".format(n))
+def _sheets_unit_args(session: ReconSession, period: str, sheet_names: Tuple[str, ...]) -> tuple:
+    """reconcile_sheets_unit arguments"""
+    return (period, SHEET_SG, SHEET_SVC,
+            {sn: session.sheet(period, sn) for sn in sheet_names},
+            {sn: session.layout(period, sn, detect_sheet_layout) for sn in sheet_names})
 
-            # EBITDA at Service Group level
-            print("\n  EBITDA SG: {} vs {}".format(csv_key, sn))
-            n = reconcile_ebitda_sg(csv_df, ws, csv_type, period, sn, results, layout)
-            print("    -> {} checks".format(n))
-
-            # Cross-column consistency (SG sheet)
-            print("\n  Cross-Column: {}".format(sn))
-            n = reconcile_cross_column(ws, period, sn, results, layout)
-            print("    -> {} checks".format(n))
-
-            # Product
-            sn = sheet_svc[csv_type]
-            ws = wb[sn]
-            layout_svc = detect_sheet_layout(ws)
-            print("\n  Product: {} vs {}".format(csv_key, sn))
-            n = reconcile_product(csv_df, ws, csv_type, period, sn, results, layout_svc)
-            print("    -> {} checks".format(n))
 
-            # EBIT at Product level
-            print("\n  EBIT Product: {} vs {}".format(csv_key, sn))
-            n = reconcile_ebit_product(csv_df, ws, csv_type, period, sn, results, layout_svc)
-            print("    -> {} checks".format(n))
+def build_units(session: ReconSession) -> List[ReconUnit]:
+    """One unit per (period, CSV) and one per period for the sheet-only checks
 
-            # EBITDA at Product level
-            print("\n  EBITDA Product: {} vs {}".format(csv_key, sn))
-            n = reconcile_ebitda_product(csv_df, ws, csv_type, period, sn, results, layout_svc)
-            print("    -> {} checks".format(n))
+    Units run in parallel and their results are merged in this order.
+    Each unit is fingerprinted by its CSV and sheets (--incremental); its
+    CSV / workbook are only read if it is not reused from the cache.
+    """
+    units = []
+    sheet_names = (*SHEET_SG.values(), *SHEET_SVC.values())
+    for period in PERIODS:
+        for csv_type in CSV_TYPES:
+            csv_key = '{}_{}'.format(csv_type, period)
+            sheets = (SHEET_SG[csv_type], SHEET_SVC[csv_type])
+            units.append(ReconUnit(
+                '{} {}'.format(period, csv_type), reconcile_csv_unit,
+                fingerprint=session.fingerprint([csv_key], [(period, sn) for sn in sheets]),
+                load=partial(_csv_unit_args, session, csv_type, period, sheets)))
+        units.append(ReconUnit(
+            '{} cross-sheet'.format(period), reconcile_sheets_unit,
+            fingerprint=session.fingerprint(sheets=[(period, sn) for sn in sheet_names]),
+            load=partial(_sheets_unit_args, session, period, sheet_names)))
+    return units
+
+
+def print_period_warnings(warnings: List[str]):
+    if warnings:
+        print("\n⚠️  คำเตือนเรื่องงวดข้อมูล:")
+        for w in warnings:
+            print("   - {}".format(w))
+        print("   กรุณาตรวจสอบว่าไฟล์ CSV และ Excel เป็นงวดเดียวกัน")
+        print()
 
-            # Cross-column consistency (Product sheet)
-            print("\n  Cross-Column: {}".format(sn))
-            n = reconcile_cross_column(ws, period, sn, results, layout_svc)
-            print("    -> {} checks".format(n))
 
-        # Column-Total: sum(columns) = รวมทั้งสิ้น for each sheet
-        for csv_type in ['COSTTYPE', 'GLGROUP']:
-            for sheet_map in [sheet_sg, sheet_svc]:
-                sn = sheet_map[csv_type]
-                ws = wb[sn]
-                ly = detect_sheet_layout(ws)
-                print("\n  Column-Total: {}".format(sn))
-                n = reconcile_column_total(ws, period, sn, results, ly)
-                print("    -> {} checks".format(n))
-
-        # Cross-sheet Total: รวมทั้งสิ้น ต้นทุน vs หมวดบัญชี
-        for sheet_map, level in [(sheet_sg, 'กลุ่มบริการ'), (sheet_svc, 'บริการ')]:
-            ws_c = wb[sheet_map['COSTTYPE']]
-            ws_g = wb[sheet_map['GLGROUP']]
-            ly_c = detect_sheet_layout(ws_c)
-            ly_g = detect_sheet_layout(ws_g)
-            print("\n  Cross-sheet Total: ต้นทุน vs หมวดบัญชี {}".format(level))
-            n = reconcile_cross_sheet_total(ws_c, ws_g, period, level, results, ly_c, ly_g)
-            print("    -> {} checks".format(n))
+def main():
+    args = parse_args()
+    try:
+        session = ReconSession.from_args(args, DATA_DIR, REPORT_DIR)
+    except ValueError:
+        print("❌ รูปแบบวันที่ไม่ถูกต้อง: {} (ใช้ YYYYMMDD)".format(args.date))
+        return
 
-        # Cross-sheet: ต้นทุน vs หมวดบัญชี (EBT + กำไรสุทธิ per SG/Product)
-        ws_cost_sg = wb[sheet_sg['COSTTYPE']]
-        ws_gl_sg = wb[sheet_sg['GLGROUP']]
-        layout_cost_sg = detect_sheet_layout(ws_cost_sg)
-        layout_gl_sg = detect_sheet_layout(ws_gl_sg)
-        print("\n  Cross-sheet SG: ต้นทุน vs หมวดบัญชี กลุ่มบริการ")
-        n = reconcile_cross_sheet_sg(ws_cost_sg, ws_gl_sg, period, results,
-                                      layout_cost_sg, layout_gl_sg)
-        print("    -> {} checks".format(n))
+    print("\n📅 วันที่ข้อมูล: {}".format(session.date_obj.strftime('%d/%m/%Y')))
+    print("🏢 บริษัท: {}".format(session.company))
 
-        ws_cost_svc = wb[sheet_svc['COSTTYPE']]
-        ws_gl_svc = wb[sheet_svc['GLGROUP']]
-        layout_cost_svc = detect_sheet_layout(ws_cost_svc)
-        layout_gl_svc = detect_sheet_layout(ws_gl_svc)
-        print("\n  Cross-sheet Product: ต้นทุน vs หมวดบัญชี บริการ")
-        n = reconcile_cross_sheet_product(ws_cost_svc, ws_gl_svc, period, results,
-                                           layout_cost_svc, layout_gl_svc)
-        print("    -> {} checks".format(n))
+    # ตรวจว่าไฟล์มีอยู่จริง
+    for path in session.missing_files()[:1]:
+        print("❌ ไม่พบไฟล์: {}".format(path))
+        if 'Report' in str(path):
+            print("   กรุณา copy จาก report_generator/output/ มาไว้ใน report/")
+            print("   หรือระบุชื่อไฟล์ด้วย --excel-mth / --excel-ytd")
+        return
 
-        wb.close()
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    output_path = OUTPUT_DIR / 'reconciliation_sg_svc_v2_{}.xlsx'.format(session.month)
+
+    # --incremental: files are read by the units that have to run, not up front
+    if not args.incremental:
+        # Load CSVs
+        print("\nLoading CSV files...")
+        for key in session.csv_files:
+            print("  {} -> {} rows".format(key, len(session.csv(key))))
+
+        # Validate period
+        print_period_warnings(session.period_warnings())
+
+    units = build_units(session)
+    started = time.perf_counter()
+    cache = ResultCache(OUTPUT_DIR / '.recon_cache' / 'sg_svc_v2_{}'.format(session.month),
+                        reuse=args.incremental)
+    outcomes = run_units(units, args.workers, cache)
+    wall = time.perf_counter() - started
+    if args.incremental:
+        print_period_warnings(session.period_warnings(loaded_only=True))
+    results = merge_results(outcomes)
+    print_unit_timings(outcomes, wall)
 
     # Print results
-    passed = sum(1 for r in results if r.passed)
-    failed = sum(1 for r in results if not r.passed)
-    total = len(results)
+    summary = results.summary()
+    passed, failed, total = summary['passed'], summary['failed'], summary['total']
 
     # Print FAIL details
-    fail_results = [r for r in results if not r.passed]
-    if fail_results:
+    fail_results = results.failed()
+    if len(fail_results):
         print("\n{}".format('=' * 130))
         print("{:^130}".format("FAILED CHECKS DETAIL"))
         print('=' * 130)
@@ -1445,42 +1416,17 @@ def main():
 
     # Pass rate by category
     print("\n  Pass rate by category:")
-    cat_stats = {}
-    for r in results:
-        if r.category not in cat_stats:
-            cat_stats[r.category] = {'passed': 0, 'failed': 0}
-        if r.passed:
-            cat_stats[r.category]['passed'] += 1
-        else:
-            cat_stats[r.category]['failed'] += 1
-
-    for cat, stats in cat_stats.items():
-        total_cat = stats['passed'] + stats['failed']
-        pct = stats['passed'] / total_cat * 100 if total_cat > 0 else 0
-        print("    {} -> {}/{} ({:.1f}%)".format(cat[:70], stats['passed'], total_cat, pct))
+    for cat, cat_passed, _, cat_total, pct in results.summary_by_category().itertuples(index=False):
+        print("    {} -> {}/{} ({:.1f}%)".format(cat[:70], cat_passed, cat_total, pct))
 
     print('=' * 130)
 
     # Export
-    records = [{
-        'Category': r.category, 'Check': r.check_name,
-        'Source Label': r.source_label, 'Source Value': r.source_value,
-        'Target Label': r.target_label, 'Target Value': r.target_value,
-        'Difference': r.diff, 'Status': r.status,
-    } for r in results]
-
-    df_results = pd.DataFrame(records)
-    with pd.ExcelWriter(str(output_path), engine='openpyxl') as writer:
-        pd.DataFrame([{
-            'Total': total, 'Passed': passed, 'Failed': failed,
-            'Rate': "{:.1f}%".format(passed/total*100) if total > 0 else 'N/A',
-            'Generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-        }]).to_excel(writer, sheet_name='Summary', index=False)
-
-        df_results.to_excel(writer, sheet_name='All Checks', index=False)
-        df_failed = df_results[df_results['Status'] == 'FAIL']
-        if len(df_failed) > 0:
-            df_failed.to_excel(writer, sheet_name='Failed Checks', index=False)
+    output_path = results.export(output_path, {
+        'Total': total, 'Passed': passed, 'Failed': failed,
+        'Rate': "{:.1f}%".format(passed/total*100) if total > 0 else 'N/A',
+        'Generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+    }, args.results_format)
 
     print("\nExported to: {}".format(str(output_path)))
 
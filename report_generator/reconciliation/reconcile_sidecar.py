@@ -0,0 +1,187 @@
+"""
+NT P&L Reconciliation from Value Sidecars
+==========================================
+ตรวจกระทบยอด CSV กับค่าที่ report_generator เขียนลง Excel โดยใช้ sidecar
+(Report_NT_*.values.npz / .parquet ที่สร้างด้วย run_batch.py --value-sidecar npz)
+แทนการ parse xlsx — ไม่ต้องหา header 'รายละเอียด' / จับคู่ชื่อกลุ่มบริการ
+
+การตรวจสอบ:
+1. CSV vs Report: ทุก cell ของแถวข้อมูล (GROUP / SUB_GROUP) ในคอลัมน์
+   รวมทั้งสิ้น / กลุ่มธุรกิจ / กลุ่มบริการ / บริการ เทียบกับ Σ VALUE ของ CSV
+2. Spot check: สุ่ม cell จาก sidecar เทียบกับค่าในไฟล์ xlsx จริง
+   (--spot-check 0 = ไม่เปิด xlsx เลย)
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict
+
+import pandas as pd
+from openpyxl.utils import get_column_letter
+
+from recon_core import EXPORT_FORMATS, PERIODS, ReconSession, ResultStore, export_format
+from recon_core.value_sidecar import csv_expected, spot_check
+
+# ==========================================
+# PATH CONFIGURATION
+# ==========================================
+SCRIPT_DIR = Path(__file__).resolve().parent
+DATA_DIR = SCRIPT_DIR / 'data'
+REPORT_DIR = SCRIPT_DIR / 'report'
+OUTPUT_DIR = SCRIPT_DIR / 'output'
+
+# Sheet name prefix → CSV type
+SHEET_CSV_TYPES = {'ต้นทุน': 'COSTTYPE', 'หมวดบัญชี': 'GLGROUP'}
+
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(
+        description='NT P&L Reconciliation - CSV vs report value sidecar')
+    parser.add_argument('--date', type=str, required=True,
+                        help='วันที่ข้อมูล YYYYMMDD (เช่น 20260131)')
+    parser.add_argument('--company', type=str, default='NT',
+                        help='รหัสบริษัท (default: NT)')
+    parser.add_argument('--excel-mth', type=str, default=None,
+                        help='ชื่อไฟล์ Excel report MTH (sidecar อยู่ข้างไฟล์นี้)')
+    parser.add_argument('--excel-ytd', type=str, default=None,
+                        help='ชื่อไฟล์ Excel report YTD (sidecar อยู่ข้างไฟล์นี้)')
+    parser.add_argument('--spot-check', type=int, default=200,
+                        help='จำนวน cell ต่อ sheet ที่สุ่มเทียบกับ xlsx (default: 200, 0 = ไม่ตรวจ)')
+    parser.add_argument('--results-format', choices=EXPORT_FORMATS, type=export_format, default='xlsx',
+                        help='รูปแบบไฟล์ผลตรวจ (default: xlsx; csv / parquet เร็วกว่าสำหรับผลจำนวนมาก)')
+    return parser.parse_args()
+
+
+def load_product_service_groups() -> Dict[str, str]:
+    """PRODUCT_KEY → กลุ่มบริการ ตามการแยก SATELLITE ของ report_generator ({} ถ้าไม่มี config)"""
+    sys.path.insert(0, str(SCRIPT_DIR.parent))
+    try:
+        from config.satellite_config import get_satellite_product_keys
+    except ImportError:
+        return {}
+    return {key: sg for sg, keys in get_satellite_product_keys().items() for key in keys}
+
+
+def _column_name(cell) -> str:
+    if cell.col_type == 'grand_total':
+        return 'รวมทั้งสิ้น'
+    parts = [cell.bu, cell.service_group, cell.product_key if cell.col_type == 'product' else '']
+    return ' / '.join(p for p in parts if p)
+
+
+def sidecar_checks(cells: pd.DataFrame, csv_df: pd.DataFrame, csv_type: str, period: str,
+                   sheet_name: str, product_service_groups: Dict[str, str]) -> ResultStore:
+    """CSV vs Report checks for every comparable cell of one sheet"""
+    expected = csv_expected(cells, csv_df, product_service_groups)
+    judged = cells[expected.notna()]
+    category = f"CSV vs Report ({period}) - {sheet_name}"
+    results = ResultStore()
+    for cell, source in zip(judged.itertuples(), expected[judged.index]):
+        results.add(category, f"{cell.label.strip()} [{_column_name(cell)}]",
+                    f"CSV {csv_type} {period}", float(source),
+                    f"{sheet_name}!{get_column_letter(cell.xl_col)}{cell.xl_row}", float(cell.value))
+    return results
+
+
+def spot_check_results(cells: pd.DataFrame, grid, period: str, sheet_name: str,
+                       sample: int) -> ResultStore:
+    """Sampled sidecar cells vs the same cells read from the xlsx"""
+    checked = spot_check(cells, grid, sample)
+    category = f"Spot check ({period}) - {sheet_name}"
+    results = ResultStore()
+    for cell in checked.itertuples():
+        results.add(category, f"{cell.label.strip()} [{_column_name(cell)}]",
+                    'sidecar', float(cell.value),
+                    f"{sheet_name}!{get_column_letter(cell.xl_col)}{cell.xl_row}",
+                    float(cell.excel_value) if cell.excel_value == cell.excel_value else 0.0)
+    return results
+
+
+def print_summary(results: ResultStore) -> Dict[str, int]:
+    """Pass / fail per category, then every failed check"""
+    print(f"\n{'='*120}")
+    print(f"{'NT P&L Reconciliation (value sidecar)':^120}")
+    print(f"{'Generated: ' + datetime.now().strftime('%Y-%m-%d %H:%M:%S'):^120}")
+    print(f"{'='*120}")
+
+    for category, passed, failed, _, _ in results.summary_by_category().itertuples(index=False):
+        print(f"  {category:<70} {passed:>6} PASS  {failed:>6} FAIL")
+
+    failed = results.failed()
+    if len(failed):
+        print(f"\n--- Failed checks ---")
+        print(f"{'Check':<55} | {'Source':>18} | {'Target':>18} | {'Diff':>15}")
+        for r in failed:
+            print(f"{r.check_name[:55]:<55} | {r.source_value:>18,.2f} | {r.target_value:>18,.2f} | {r.diff:>15,.2f}")
+            print(f"  >>> {r.source_label} vs {r.target_label}")
+
+    summary = results.summary()
+    print(f"\n{'='*120}")
+    print(f"Summary: {summary['passed']} PASSED / {summary['failed']} FAILED / {summary['total']} Total checks")
+    print(f"{'='*120}\n")
+    return summary
+
+
+def main():
+    args = parse_args()
+    try:
+        session = ReconSession.from_args(args, DATA_DIR, REPORT_DIR)
+    except ValueError:
+        print("❌ รูปแบบวันที่ไม่ถูกต้อง: {} (ใช้ YYYYMMDD)".format(args.date))
+        return
+
+    print("\n📅 วันที่ข้อมูล: {}".format(session.date_obj.strftime('%d/%m/%Y')))
+    print("🏢 บริษัท: {}".format(session.company))
+
+    for path in [p for p in session.csv_files.values() if not p.exists()][:1]:
+        print("❌ ไม่พบไฟล์: {}".format(path))
+        return
+
+    product_service_groups = load_product_service_groups()
+    results = ResultStore()
+    started = time.perf_counter()
+    for period in PERIODS:
+        cells = session.value_sidecar(period)
+        if cells is None:
+            print("⚠️  ไม่พบ sidecar ของ {} — สร้างรายงานด้วย run_batch.py --value-sidecar npz".format(
+                session.excel_files[period].name))
+            continue
+        print(f"\n{period}: {len(cells):,} cells จาก sidecar ของ {session.excel_files[period].name}")
+        for sheet_name, sheet_cells in cells.groupby('sheet', sort=False):
+            csv_type = next((t for prefix, t in SHEET_CSV_TYPES.items() if sheet_name.startswith(prefix)), None)
+            if csv_type is None:
+                print(f"  ⚠️  ข้าม sheet '{sheet_name}' (ไม่ทราบประเภท CSV)")
+                continue
+            results.extend(sidecar_checks(sheet_cells, session.csv(f'{csv_type}_{period}'), csv_type,
+                                          period, sheet_name, product_service_groups))
+            if args.spot_check > 0:
+                results.extend(spot_check_results(sheet_cells, session.sheet(period, sheet_name),
+                                                  period, sheet_name, args.spot_check))
+    print(f"\n  ใช้เวลา {time.perf_counter() - started:.2f}s")
+
+    if not len(results):
+        print("❌ ไม่มีผลการตรวจ")
+        return
+
+    summary = print_summary(results)
+
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    output_path = OUTPUT_DIR / 'reconciliation_sidecar_{}.xlsx'.format(session.month)
+    output_path = results.export(output_path, {
+        'Total Checks': summary['total'],
+        'Passed': summary['passed'],
+        'Failed': summary['failed'],
+        'Pass Rate': f"{summary['passed']/summary['total']*100:.1f}%",
+        'Generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+    }, args.results_format)
+
+    print(f"Report exported to: {output_path}")
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,204 @@
+"""recon_core against the per-row / per-file code it replaced, on the fixture in tests/fixtures."""
+import sys
+from pathlib import Path
+
+import numpy as np
+import openpyxl
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from recon_core import (CheckResult, CsvTotals, LabelIndex, ReconSession, ReconUnit, ResultCache,  # noqa: E402
+                        ResultStore, load_sheet_grid, load_workbook_grids, merge_results, run_units)
+
+FIXTURES = Path(__file__).resolve().parent / 'fixtures'
+DATE = '20251031'
+
+
+@pytest.fixture
+def session(tmp_path):
+    return ReconSession(DATE, FIXTURES, tmp_path)
+
+
+@pytest.fixture
+def report_workbook(tmp_path):
+    """Report-shaped sheet: title rows, header, labels, numbers, text, gaps, trailing blank column"""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = 'ต้นทุน_กลุ่มบริการ'
+    ws['A1'] = 'รายงานผลดำเนินงาน ประจำเดือน ตุลาคม 2568'
+    ws['B4'], ws['C4'], ws['D4'] = 'รายละเอียด', 'รวมทั้งสิ้น', '1.1 กลุ่มบริการ A'
+    rows = [('1.รายได้', 1037.75, 500), ('  - รายได้ค่าบริการ', -20.5, None), (None, None, None),
+            ('2.ต้นทุนบริการ', '-', 0), ('หมายเหตุ', None, 'ข้อความ')]
+    for r, row in enumerate(rows, start=5):
+        for c, value in enumerate(row, start=2):
+            ws.cell(r, c, value)
+    ws.cell(8, 6).number_format = '0.00'  # styled but empty: not a used column
+    wb.create_sheet('หมวดบัญชี_กลุ่มบริการ')['B2'] = 1.5
+    path = tmp_path / 'Report_NT_202510.xlsx'
+    wb.save(path)
+    return path
+
+
+# --- CsvTotals ----------------------------------------------------------------
+
+@pytest.mark.parametrize('period', ['MTH', 'YTD'])
+def test_prefix_total_matches_row_filter(session, period):
+    df = session.csv('COSTTYPE_{}'.format(period))
+    totals = CsvTotals(df)
+    product_keys = df['PRODUCT_KEY'].astype(str).str.strip()
+
+    for prefix in ('01.', '02.', '0', '09.ผลตอบแทน', 'ต้นทุน', 'ไม่มี'):
+        in_group = df['GROUP'].str.startswith(prefix)
+        assert totals.prefix_total(prefix) == pytest.approx(df.loc[in_group, 'VALUE'].sum())
+        for sg in df['SERVICE_GROUP'].dropna().unique():
+            rows = df[(df['SERVICE_GROUP'] == sg) & in_group]
+            assert totals.prefix_total(prefix, 'SERVICE_GROUP', sg) == pytest.approx(rows['VALUE'].sum())
+        for pk in product_keys.unique():
+            rows = df[(product_keys == pk) & in_group]
+            assert totals.prefix_total(prefix, 'PRODUCT_KEY', pk) == pytest.approx(rows['VALUE'].sum())
+
+
+def test_by_matches_groupby(session):
+    df = session.csv('COSTTYPE_MTH')
+    expected = df.groupby(['GROUP', 'BU'])['VALUE'].sum().to_dict()
+    assert CsvTotals(df).by('BU') == pytest.approx(expected)
+    assert session.totals('COSTTYPE_MTH') is session.totals('COSTTYPE_MTH')
+
+
+# --- LabelIndex ---------------------------------------------------------------
+
+def test_label_index_first_match_in_sheet_order():
+    index = LabelIndex([('รวมรายได้', 5), ('รายได้ค่าบริการ', 6), ('รายได้', 7), ('รายได้', 8)])
+    assert index.find(['รายได้']) == 5
+    assert index.find(['รายได้', 'บริการ']) == 6
+    assert index.find(['รายได้', 'ไม่มี']) is None
+    assert index.find(['รายได้']) == 5  # cached
+    assert index.get(' รายได้ ') == 7
+    assert len(index) == 4
+
+
+def test_label_index_from_sheet(report_workbook):
+    grid = load_sheet_grid(report_workbook)
+    index = LabelIndex.from_sheet(grid, label_col=2, first_row=5)
+    assert index.items()[0] == ('1.รายได้', 5)
+    assert index.find(['รายได้ค่าบริการ']) == 6
+    assert index.get('หมายเหตุ') == 9
+
+
+# --- SheetGrid ----------------------------------------------------------------
+
+def test_sheet_grid_to_frame_matches_read_excel(report_workbook):
+    grids = load_workbook_grids(report_workbook)
+    assert list(grids) == ['ต้นทุน_กลุ่มบริการ', 'หมวดบัญชี_กลุ่มบริการ']
+    for name, grid in grids.items():
+        expected = pd.read_excel(report_workbook, sheet_name=name, header=None)
+        pd.testing.assert_frame_equal(grid.to_frame(), expected)
+
+
+def test_sheet_grid_worksheet_api(report_workbook):
+    grid = load_sheet_grid(report_workbook)
+    assert grid.header_cell() == (4, 2)
+    assert grid.cell(row=5, column=3).value == 1037.75
+    assert grid.cell(row=99, column=99).value is None
+    assert np.isnan(grid.numbers[7, 2])  # '-'
+    assert next(grid.iter_rows(min_row=5, max_row=5, min_col=2, max_col=4)) == ('1.รายได้', 1037.75, 500)
+
+
+# --- ResultStore --------------------------------------------------------------
+
+def _results() -> ResultStore:
+    store = ResultStore([CheckResult('A', 'a1', 'csv', 100.0, 'xlsx', 100.0005)])
+    store.add('B', 'b1', 'csv', 10.0, 'xlsx', 12.0)
+    store.add('A', 'a2', 'csv', 1.0, 'xlsx', 3.0)
+    store.add('B', 'b2', 'csv', 5.0, 'xlsx', 6.0, tolerance=2.0)
+    return store
+
+
+def test_result_store_pass_fail():
+    store = _results()
+    assert store.passed.tolist() == [True, False, False, True]
+    assert store.diff.tolist() == pytest.approx([-0.0005, -2.0, -2.0, -1.0])
+    assert store.summary() == {'passed': 2, 'failed': 2, 'total': 4}
+    assert [r.check_name for r in store.failed()] == ['b1', 'a2']
+    assert [r.status for r in store] == ['PASS', 'FAIL', 'FAIL', 'PASS']
+    assert list(store.frame()['Status']) == ['PASS', 'FAIL', 'FAIL', 'PASS']
+
+
+def test_result_store_summary_by_category():
+    table = _results().summary_by_category()
+    assert table['Category'].tolist() == ['A', 'B']  # first-seen order
+    assert table[['Passed', 'Failed', 'Total']].values.tolist() == [[1, 1, 2], [1, 1, 2]]
+    assert table['Pass Rate'].tolist() == [50.0, 50.0]
+
+
+def test_result_store_columns_round_trip():
+    store = _results()
+    reused = ResultStore.from_columns(store.columns(), reused=True)
+    assert list(reused) == list(store)
+    assert reused.n_reused == len(store)
+    assert list(reused.frame()['Reused']) == ['cached'] * len(store)
+    assert 'Reused' not in store.frame()
+
+
+# --- run_units + ResultCache --------------------------------------------------
+
+def _totals_unit(totals: CsvTotals, prefix: str) -> ResultStore:
+    print('checking', prefix)
+    store = ResultStore()
+    store.add('Totals', prefix, 'csv', totals.prefix_total(prefix), 'fixture', 0.0)
+    return store
+
+
+def _units(session: ReconSession, loads: list):
+    def load(key, prefix):
+        loads.append(key)
+        return session.totals(key), prefix
+    return [ReconUnit('{} {}'.format(key, prefix), _totals_unit,
+                      fingerprint=session.fingerprint([key]),
+                      load=lambda key=key, prefix=prefix: load(key, prefix))
+            for key in ('COSTTYPE_MTH', 'COSTTYPE_YTD') for prefix in ('01.', '02.')]
+
+
+def test_run_units_cache_round_trip(tmp_path, capsys):
+    cache = ResultCache(tmp_path / 'cache')
+    loads = []
+    first = run_units(_units(ReconSession(DATE, FIXTURES, tmp_path), loads), workers=1, cache=cache)
+    assert loads == ['COSTTYPE_MTH', 'COSTTYPE_MTH', 'COSTTYPE_YTD', 'COSTTYPE_YTD']
+    assert not any(o.reused for o in first)
+    assert 'checking 01.' in capsys.readouterr().out
+
+    # Same inputs: every unit reused, nothing loaded, output replayed
+    loads.clear()
+    session = ReconSession(DATE, FIXTURES, tmp_path)
+    second = run_units(_units(session, loads), workers=1, cache=cache)
+    assert loads == [] and not session._csv
+    assert all(o.reused for o in second)
+    assert list(merge_results(second)) == list(merge_results(first))
+    assert merge_results(second).n_reused == 4
+    assert 'checking 01.' in capsys.readouterr().out
+
+    # One unit's fingerprint changes: only that unit runs
+    units = _units(ReconSession(DATE, FIXTURES, tmp_path), loads)
+    units[2].fingerprint = 'changed'
+    third = run_units(units, workers=1, cache=cache)
+    assert loads == ['COSTTYPE_YTD']
+    assert [o.reused for o in third] == [True, True, False, True]
+
+    # reuse=False reruns everything and rewrites the cache
+    loads.clear()
+    rerun = run_units(_units(ReconSession(DATE, FIXTURES, tmp_path), loads), workers=1,
+                      cache=ResultCache(tmp_path / 'cache', reuse=False))
+    assert len(loads) == 4 and not any(o.reused for o in rerun)
+
+
+def test_period_warnings_loaded_only(session):
+    assert session.period_warnings(loaded_only=True) == []
+    session.csv('COSTTYPE_MTH')
+    assert session.period_warnings(loaded_only=True) == []
+    other_month = ReconSession('20250930', FIXTURES, FIXTURES)
+    other_month.csv_files['COSTTYPE_MTH'] = session.csv_files['COSTTYPE_MTH']
+    other_month.csv('COSTTYPE_MTH')
+    assert other_month.period_warnings(loaded_only=True) == [
+        'CSV COSTTYPE_MTH: TIME_KEY=202510 ไม่ตรงกับงวด 202509']
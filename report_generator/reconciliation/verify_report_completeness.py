@@ -13,6 +13,9 @@ verify_report_completeness.py
 Current scope: ระดับ BU (BU_ONLY variants) ทั้ง COSTTYPE และ GLGROUP
 Future work: PD Group และ Product level (BU_SG, BU_SG_PRODUCT)
 
+text-report อ่านแบบ streaming ทีละบรรทัด (TextReport) — label เดิมถูก canonicalize
+ครั้งเดียว (memoized) และแต่ละมิติ (COSTTYPE / GLGROUP / ...) ตรวจพร้อมกันได้ด้วย --workers
+
 Usage:
     python verify_report_completeness.py --month 202603
     python verify_report_completeness.py --month 202603 --tolerance 1.0
@@ -20,12 +23,17 @@ Usage:
 
 import argparse
 import csv
+import io
+import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
-import openpyxl
+from recon_core import load_sheet_grid, parse_amount
 
 
 TOLERANCE_DEFAULT = 1.0  # บาท — text-report ปัดทศนิยม 2 ตำแหน่ง
@@ -38,6 +46,7 @@ _SUB_TEXT_RE = re.compile(r"^#\s*\d+\.\s*")
 _SUB_EXCEL_RE = re.compile(r"^\s*-\s*")
 
 
+@lru_cache(maxsize=None)
 def canonical_main(label: str) -> str:
     """
     Normalize main group labels from either text-report or Excel.
@@ -57,6 +66,7 @@ def canonical_main(label: str) -> str:
     return s
 
 
+@lru_cache(maxsize=None)
 def canonical_sub(label: str) -> str:
     """
     Text-report: '# 09.ค่าใช้จ่ายเกี่ยวกับการกำกับดูแลของ กสทช.' → core
@@ -74,74 +84,80 @@ def canonical_sub(label: str) -> str:
 
 def parse_thai_number(s: str) -> Optional[float]:
     """Text-report ใช้ trailing minus: '123.45-' = -123.45"""
-    if s is None:
-        return None
-    s = s.strip().replace(",", "")
-    if not s:
-        return None
-    if s.endswith("-"):
-        s = "-" + s[:-1]
-    try:
-        return float(s)
-    except ValueError:
-        return None
+    return parse_amount(s, parentheses=False)
 
 
 # ---------- Text-report parser ----------
 
-def parse_text_report(path: Path) -> Tuple[List[str], Dict[Tuple[str, str, str], float]]:
+TEXT_ENCODING = "tis-620"
+TEXT_HEADER_ROW = 4  # row 5: col 0=รายละเอียด, col 1=รวมทั้งสิ้น, col 2+ = BU names
+
+Key = Tuple[str, str, str]  # (main_core, sub_core, bu_name); sub_core = '' สำหรับ main-group row
+
+
+class TextReport:
+    """
+    Streaming reader of one text-report: iterating yields (key, value) per
+    non-empty BU cell, one line at a time (a key may repeat — callers sum).
+    bu_names is set once the header row has been read.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.bu_names: List[str] = []
+
+    def __iter__(self) -> Iterator[Tuple[Key, float]]:
+        with open(self.path, encoding=TEXT_ENCODING, errors="replace") as f:
+            rows = csv.reader(f, delimiter="\t")
+            header = next(islice(rows, TEXT_HEADER_ROW, None), None)
+            if header is None:
+                raise ValueError(f"text-report too short: {self.path}")
+
+            bu_cols: List[Tuple[int, str]] = []
+            for i in range(2, len(header)):
+                name = (header[i] or "").strip()
+                if name and name != "N/A":
+                    bu_cols.append((i, name))
+            self.bu_names = [n for _, n in bu_cols]
+
+            current_main = ""
+            for r in rows:
+                if not r or not (r[0] or "").strip():
+                    continue
+                label = r[0]
+                if label.strip().startswith("#"):
+                    sub_core = canonical_sub(label)
+                    main_core = current_main
+                else:
+                    main_core = canonical_main(label)
+                    current_main = main_core
+                    sub_core = ""  # main-group level
+
+                for col_idx, bu_name in bu_cols:
+                    if col_idx >= len(r):
+                        continue
+                    v = parse_thai_number(r[col_idx])
+                    if v is not None:
+                        yield (main_core, sub_core, bu_name), v
+
+
+def parse_text_report(path: Path) -> Tuple[List[str], Dict[Key, float]]:
     """
     Return:
         bu_names: list of BU column names
         data: {(main_core, sub_core, bu_name): value}
               - sub_core = '' สำหรับ main-group row (total)
     """
-    with open(path, encoding="tis-620", errors="replace") as f:
-        rows = list(csv.reader(f, delimiter="\t"))
-
-    if len(rows) < 5:
-        raise ValueError(f"text-report too short: {path}")
-
-    # Header row 5 (index 4): col 0=รายละเอียด, col 1=รวมทั้งสิ้น, col 2+ = BU names
-    header = rows[4]
-    bu_cols: List[Tuple[int, str]] = []
-    for i in range(2, len(header)):
-        name = (header[i] or "").strip()
-        if name and name != "N/A":
-            bu_cols.append((i, name))
-
-    data: Dict[Tuple[str, str, str], float] = {}
-    current_main = ""
-
-    for r in rows[5:]:
-        if not r or not (r[0] or "").strip():
-            continue
-        label = r[0]
-        stripped = label.strip()
-        is_sub = stripped.startswith("#")
-        if is_sub:
-            sub_core = canonical_sub(label)
-            main_core = current_main
-        else:
-            main_core = canonical_main(label)
-            current_main = main_core
-            sub_core = ""  # main-group level
-
-        for col_idx, bu_name in bu_cols:
-            if col_idx >= len(r):
-                continue
-            v = parse_thai_number(r[col_idx])
-            if v is None:
-                continue
-            key = (main_core, sub_core, bu_name)
-            data[key] = data.get(key, 0.0) + v
-
-    return [n for _, n in bu_cols], data
+    report = TextReport(path)
+    data: Dict[Key, float] = {}
+    for key, v in report:
+        data[key] = data.get(key, 0.0) + v
+    return report.bu_names, data
 
 
 # ---------- Excel parser (BU_ONLY variant) ----------
 
-def parse_excel_bu_only(path: Path) -> Tuple[List[str], Dict[Tuple[str, str, str], float]]:
+def parse_excel_bu_only(path: Path) -> Tuple[List[str], Dict[Key, float]]:
     """
     Layout: col A=label, col B=รวมทั้งสิ้น amount, col C=รวมทั้งสิ้น common size,
             col D,E = BU1 amount+cs, col F,G = BU2 amount+cs, ...
@@ -151,8 +167,8 @@ def parse_excel_bu_only(path: Path) -> Tuple[List[str], Dict[Tuple[str, str, str
     as text-report. For sub-items that have both level-1 parent and level-2 children
     (combined total + detail), level-2 values win (level-1 would double-count).
     """
-    wb = openpyxl.load_workbook(path, data_only=True)
-    ws = wb.active
+    # Values-only read of the active sheet (SheetGrid keeps ws.cell / max_row / max_column)
+    ws = load_sheet_grid(path)
 
     # Layout: col A=blank, col B=label, col C=grand total amount, col D=grand total CS,
     #         col E=BU1 amount, col F=BU1 CS, col G=BU2 amount, col H=BU2 CS, ...
@@ -208,7 +224,7 @@ def parse_excel_bu_only(path: Path) -> Tuple[List[str], Dict[Tuple[str, str, str
 
     # Pass 2: drop level-1 row if a level-2 exists for same (main, sub_core)
     has_level2 = {(m, s) for m, s, _, _, lvl in entries if lvl == 2}
-    data: Dict[Tuple[str, str, str], float] = {}
+    data: Dict[Key, float] = {}
     for m, s, bu, v, lvl in entries:
         if lvl == 1 and (m, s) in has_level2:
             continue
@@ -229,8 +245,8 @@ _SKIP_BU_MATCH = {"8.รายได้อื่น/ค่าใช้จ่า
 
 
 def compare(
-    text_data: Dict[Tuple[str, str, str], float],
-    excel_data: Dict[Tuple[str, str, str], float],
+    text_data: Dict[Key, float],
+    excel_data: Dict[Key, float],
     tolerance: float,
 ) -> Tuple[List, List]:
     """
@@ -238,8 +254,8 @@ def compare(
         missing: keys where text has non-zero value but Excel is absent/zero
         mismatch: keys where both sides have values but differ beyond tolerance
     """
-    missing: List[Tuple[Tuple[str, str, str], float]] = []
-    mismatch: List[Tuple[Tuple[str, str, str], float, float, float]] = []
+    missing: List[Tuple[Key, float]] = []
+    mismatch: List[Tuple[Key, float, float, float]] = []
 
     for k, tv in text_data.items():
         if abs(tv) < 1e-9:
@@ -282,17 +298,17 @@ def run_one(out, label: str, text_path: Optional[Path], excel_path: Path, tolera
     out.write(f"\n\n=== Dimension: {label} ===\n")
     if not text_path or not text_path.exists():
         out.write(f"  SKIP: text-report not found\n")
-        return 0, 0
+        return 0, 0, 0
     if not excel_path.exists():
         out.write(f"  SKIP: Excel not found at {excel_path}\n")
-        return 0, 0
+        return 0, 0, 0
     out.write(f"  Text-report: {text_path.name}\n  Excel:       {excel_path.name}\n")
     try:
         _, text_data = parse_text_report(text_path)
         _, excel_data = parse_excel_bu_only(excel_path)
     except Exception as e:
         out.write(f"  ERROR parsing: {e}\n")
-        return 0, 0
+        return 0, 0, 0
 
     missing, mismatch = compare(text_data, excel_data, tolerance)
     missing_subs = [(k, v) for k, v in missing if k[1]]       # sub-item level
@@ -323,6 +339,14 @@ def run_one(out, label: str, text_path: Optional[Path], excel_path: Path, tolera
     return len(missing_subs), len(missing_mains), len(mismatch)
 
 
+def verify_dimension(label: str, text_path: Optional[Path], excel_path: Path,
+                     tolerance: float) -> Tuple[str, Tuple[int, int, int]]:
+    """run_one() into a buffer — one process-pool task per text-report"""
+    out = io.StringIO()
+    counts = run_one(out, label, text_path, excel_path, tolerance)
+    return out.getvalue(), counts
+
+
 def main():
     ap = argparse.ArgumentParser(description="Verify report completeness vs text-report CSV")
     ap.add_argument("--month", required=True, help="YYYYMM (e.g. 202603)")
@@ -330,6 +354,8 @@ def main():
                     help=f"absolute tolerance in บาท (default {TOLERANCE_DEFAULT})")
     ap.add_argument("--period", default="YTD", choices=["YTD", "MTH"],
                     help="which Excel period to verify (default YTD — matches text-report)")
+    ap.add_argument("--workers", "-j", type=int, default=None,
+                    help="จำนวน text-report ที่ตรวจพร้อมกัน (default: จำนวน CPU, 1 = ทีละไฟล์)")
     args = ap.parse_args()
 
     script_dir = Path(__file__).resolve().parent
@@ -352,11 +378,21 @@ def main():
         total_main = 0
         total_mismatch = 0
 
-        for label, tp, ep in [
+        dimensions = [
             ("COSTTYPE (มิติประเภทต้นทุน)", text_cost, excel_cost),
             ("GLGROUP (มิติหมวดบัญชี)", text_gl, excel_gl),
-        ]:
-            s, m, mm = run_one(out, label, tp, ep, args.tolerance)
+        ]
+        tasks = [(label, tp, ep, args.tolerance) for label, tp, ep in dimensions]
+        workers = min(args.workers or os.cpu_count() or 1, len(tasks))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                verified = list(executor.map(verify_dimension, *zip(*tasks)))
+        else:
+            verified = [verify_dimension(*task) for task in tasks]
+
+        # Sections in dimension order, whichever finished first
+        for text, (s, m, mm) in verified:
+            out.write(text)
             total_sub += s
             total_main += m
             total_mismatch += mm
@@ -4,9 +4,12 @@ import argparse
 import pandas as pd
 import openpyxl
 from copy import copy
+from pathlib import Path
 
-# Configure basic logging for this script
-logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+from src.report_generator.core.value_sidecar import (
+    SIDECAR_FORMATS, concat_value_sidecars, find_sidecar, load_value_sidecar,
+    save_value_sidecar, sidecar_path,
+)
 
 # 1. หาตำแหน่งที่ตั้งจริงของไฟล์ script (report_concat.py) ในเครื่อง
 # ผลลัพธ์จะเป็น .../univer/report_generator
@@ -20,30 +23,9 @@ script_dir = os.path.dirname(os.path.abspath(__file__))
 #       ├── data/
 #       └── output/           (ต้องมีไฟล์ excel อยู่ในนี้) (ไฟล์ผลลัพธ์จะมาโผล่ที่นี่)
 
-input_dir = os.path.join(script_dir, 'output')
-output_dir = os.path.join(script_dir, 'output')
+DEFAULT_INPUT_DIR = os.path.join(script_dir, 'output')
+DEFAULT_OUTPUT_DIR = os.path.join(script_dir, 'output')
 
-# Parse command line arguments
-parser = argparse.ArgumentParser(description='Concatenate monthly reports')
-parser.add_argument('--month', type=str, help='Specific month to process (YYYYMM format, e.g., 202509)')
-args = parser.parse_args()
-
-# Debug: ปริ้นท์ออกมาดูว่า path ถูกต้องไหม
-logging.info(f"Script Location: {script_dir}")
-logging.info(f"Reading from:    {input_dir}")
-logging.info(f"Writing to:      {output_dir}")
-if args.month:
-    logging.info(f"Processing month: {args.month}")
-else:
-    logging.info("Processing all months found")
-logging.info("-" * 30)
-
-# ตรวจสอบว่ามี folder output หรือไม่ ถ้าไม่มีให้สร้าง
-if not os.path.exists(output_dir):
-    os.makedirs(output_dir)
-
-# 1. Get a list of all files in the input_dir (ดึงรายชื่อไฟล์ครั้งเดียว ใช้ได้ทั้ง 2 งาน)
-all_files = [f for f in os.listdir(input_dir) if os.path.isfile(os.path.join(input_dir, f))]
 
 def extract_months_from_files(files, report_type):
     """Extract unique YYYYMM values from file names"""
@@ -94,7 +76,8 @@ def copy_sheet_with_formatting(source_file_path, target_workbook, sheet_name):
     source_wb.close()
 
 
-def create_report(files_list, date_part, report_type, patterns, sheet_names_map):
+def create_report(files_list, date_part, report_type, patterns, sheet_names_map,
+                  input_dir=DEFAULT_INPUT_DIR, output_dir=DEFAULT_OUTPUT_DIR):
     """Create a combined report for a specific month and report type"""
     if report_type == 'MTH':
         output_filename = f"Report_NT_{date_part}.xlsx"
@@ -109,6 +92,10 @@ def create_report(files_list, date_part, report_type, patterns, sheet_names_map)
     default_sheet = output_wb['Sheet']
     output_wb.remove(default_sheet)
 
+    # Value sidecars of the copied variants (cell positions are unchanged by the copy)
+    sidecars = []
+    all_have_sidecar = True
+
     # Iterate through patterns
     for pattern in patterns:
         found_file = None
@@ -122,16 +109,39 @@ def create_report(files_list, date_part, report_type, patterns, sheet_names_map)
             sheet_name = sheet_names_map.get(pattern, pattern)
             copy_sheet_with_formatting(full_file_path, output_wb, sheet_name)
             logging.info(f"  - Copied '{found_file}' to sheet '{sheet_name}'")
+            variant_sidecar = find_sidecar(Path(full_file_path))
+            if variant_sidecar is None:
+                all_have_sidecar = False
+            else:
+                frame = load_value_sidecar(variant_sidecar)
+                frame['sheet'] = sheet_name
+                sidecars.append((variant_sidecar, frame))
         else:
             logging.warning(f"  - Warning: No file found for pattern '{pattern}' with date {date_part}")
 
     # Save
     output_wb.save(output_filepath)
     logging.info(f"Successfully created: {output_filepath}")
+    write_combined_sidecar(Path(output_filepath), sidecars if all_have_sidecar else [])
     return output_filepath
 
 
-logging.info("Starting Process...\n")
+def write_combined_sidecar(output_filepath, sidecars):
+    """Merge variant sidecars into one for the combined workbook (or drop a stale one)"""
+    for fmt in SIDECAR_FORMATS:
+        stale = sidecar_path(output_filepath, fmt)
+        if stale.exists():
+            stale.unlink()
+    if not sidecars:
+        return None
+    fmt = sidecars[0][0].suffix.lstrip('.')
+    path = save_value_sidecar(
+        concat_value_sidecars(frame for _, frame in sidecars),
+        sidecar_path(output_filepath, fmt)
+    )
+    logging.info(f"  - Value sidecar: {path.name}")
+    return path
+
 
 # Define filename patterns and sheet names
 file_patterns_mth = [
@@ -167,57 +177,118 @@ thai_sheet_names_map = {
     "PL_GLGROUP_YTD_BU_SG_PRODUCT": "หมวดบัญชี_บริการ"
 }
 
-# Filter files
-mth_files = sorted([f for f in all_files if 'MTH' in f and f.endswith('.xlsx')])
-ytd_files = sorted([f for f in all_files if 'YTD' in f and f.endswith('.xlsx')])
-
-# Extract available months
-mth_months = extract_months_from_files(mth_files, 'MTH')
-ytd_months = extract_months_from_files(ytd_files, 'YTD')
-
-logging.info(f"Found MTH months: {mth_months}")
-logging.info(f"Found YTD months: {ytd_months}")
-
-# Determine which months to process
-if args.month:
-    # Process only specified month
-    months_to_process_mth = [args.month] if args.month in mth_months else []
-    months_to_process_ytd = [args.month] if args.month in ytd_months else []
-
-    if not months_to_process_mth and not months_to_process_ytd:
-        logging.error(f"Month {args.month} not found in any files")
-        exit(1)
-else:
-    # Process all months found
-    months_to_process_mth = mth_months
-    months_to_process_ytd = ytd_months
-
-# ==========================================
-# PART 1: สร้างรายงานเดือน (MTH)
-# ==========================================
-logging.info("\n" + "="*40)
-logging.info("--- Processing MTH Reports ---")
-logging.info("="*40)
-
-if not months_to_process_mth:
-    logging.warning("No MTH months to process")
-else:
-    for month in months_to_process_mth:
-        create_report(mth_files, month, 'MTH', file_patterns_mth, thai_sheet_names_map)
-
-# ==========================================
-# PART 2: สร้างรายงานปี (YTD)
-# ==========================================
-logging.info("\n" + "="*40)
-logging.info("--- Processing YTD Reports ---")
-logging.info("="*40)
-
-if not months_to_process_ytd:
-    logging.warning("No YTD months to process")
-else:
-    for month in months_to_process_ytd:
-        create_report(ytd_files, month, 'YTD', file_patterns_ytd, thai_sheet_names_map)
-
-logging.info("\n" + "="*40)
-logging.info("All processes completed.")
-logging.info("="*40)
\ No newline at end of file
+def concat_reports(month=None, input_dir=DEFAULT_INPUT_DIR, output_dir=DEFAULT_OUTPUT_DIR):
+    """
+    Combine the individual PL_*.xlsx variants into Report_NT_*.xlsx workbooks
+
+    Args:
+        month: Specific month to process (YYYYMM), None = all months found
+        input_dir: Directory containing the individual reports
+        output_dir: Directory to write the combined reports
+
+    Returns:
+        List of created file paths
+
+    Raises:
+        ValueError: If month is given but no report file matches it
+    """
+    # Debug: ปริ้นท์ออกมาดูว่า path ถูกต้องไหม
+    logging.info(f"Reading from:    {input_dir}")
+    logging.info(f"Writing to:      {output_dir}")
+    if month:
+        logging.info(f"Processing month: {month}")
+    else:
+        logging.info("Processing all months found")
+    logging.info("-" * 30)
+
+    # ตรวจสอบว่ามี folder output หรือไม่ ถ้าไม่มีให้สร้าง
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    # Get a list of all files in the input_dir (ดึงรายชื่อไฟล์ครั้งเดียว ใช้ได้ทั้ง 2 งาน)
+    all_files = [f for f in os.listdir(input_dir) if os.path.isfile(os.path.join(input_dir, f))]
+
+    logging.info("Starting Process...\n")
+
+    # Filter files
+    mth_files = sorted([f for f in all_files if 'MTH' in f and f.endswith('.xlsx')])
+    ytd_files = sorted([f for f in all_files if 'YTD' in f and f.endswith('.xlsx')])
+
+    # Extract available months
+    mth_months = extract_months_from_files(mth_files, 'MTH')
+    ytd_months = extract_months_from_files(ytd_files, 'YTD')
+
+    logging.info(f"Found MTH months: {mth_months}")
+    logging.info(f"Found YTD months: {ytd_months}")
+
+    # Determine which months to process
+    if month:
+        # Process only specified month
+        months_to_process_mth = [month] if month in mth_months else []
+        months_to_process_ytd = [month] if month in ytd_months else []
+
+        if not months_to_process_mth and not months_to_process_ytd:
+            raise ValueError(f"Month {month} not found in any files")
+    else:
+        # Process all months found
+        months_to_process_mth = mth_months
+        months_to_process_ytd = ytd_months
+
+    # ==========================================
+    # PART 1: สร้างรายงานเดือน (MTH)
+    # ==========================================
+    logging.info("\n" + "="*40)
+    logging.info("--- Processing MTH Reports ---")
+    logging.info("="*40)
+
+    created = []
+    if not months_to_process_mth:
+        logging.warning("No MTH months to process")
+    else:
+        for date_part in months_to_process_mth:
+            created.append(create_report(mth_files, date_part, 'MTH', file_patterns_mth,
+                                         thai_sheet_names_map, input_dir, output_dir))
+
+    # ==========================================
+    # PART 2: สร้างรายงานปี (YTD)
+    # ==========================================
+    logging.info("\n" + "="*40)
+    logging.info("--- Processing YTD Reports ---")
+    logging.info("="*40)
+
+    if not months_to_process_ytd:
+        logging.warning("No YTD months to process")
+    else:
+        for date_part in months_to_process_ytd:
+            created.append(create_report(ytd_files, date_part, 'YTD', file_patterns_ytd,
+                                         thai_sheet_names_map, input_dir, output_dir))
+
+    logging.info("\n" + "="*40)
+    logging.info("All processes completed.")
+    logging.info("="*40)
+
+    return created
+
+
+def main():
+    """Main entry point"""
+    # Configure basic logging for this script
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description='Concatenate monthly reports')
+    parser.add_argument('--month', type=str, help='Specific month to process (YYYYMM format, e.g., 202509)')
+    args = parser.parse_args()
+
+    logging.info(f"Script Location: {script_dir}")
+
+    try:
+        concat_reports(month=args.month)
+    except ValueError as e:
+        logging.error(str(e))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,491 @@
+#!/usr/bin/env python3
+"""
+Univer Report Generator - Batch Runner
+
+สร้างรายงาน P&L ทุก variant (COSTTYPE/GLGROUP × MTH/YTD × BU_ONLY/BU_SG/BU_SG_PRODUCT)
+ในหนึ่ง process แทนการเรียก generate_report.py ทีละครั้งจาก run_reports.sh
+
+- CSV แต่ละไฟล์เป็นหนึ่งงานใน process pool: worker โหลดและ process ครั้งเดียว แล้วสร้างทุก detail level
+  (จำนวน worker = จำนวน CPU โดย default; process หลักไม่ถือ DataFrame)
+- รวมไฟล์ด้วย report_concat หลังสร้างรายงานเสร็จ
+- สรุปเวลาที่ใช้ต่อ variant และรายการที่ล้มเหลว
+- ข้าม variant ที่ input ไม่เปลี่ยน (ตรวจจาก build manifest ใน output/.manifest/)
+
+Usage:
+    # All months found in data/, both MTH and YTD
+    python run_batch.py
+
+    # Single month
+    python run_batch.py --month 202509
+
+    # Month range, YTD only
+    python run_batch.py --from-month 202501 --to-month 202509 --period YTD
+
+    # Subset of the variant matrix
+    python run_batch.py --month 202509 --report-type COSTTYPE --detail-level BU_ONLY BU_SG
+
+    # Regenerate everything / only variants affected by a config change
+    python run_batch.py --force
+    python run_batch.py --invalidate-config config/row_order_glgroup.py
+"""
+import os
+import re
+import sys
+import time
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from generate_report import find_csv_file, find_remark_file, _read_remark_file, default_output_path
+from report_concat import concat_reports
+from src.data_loader import CSVLoader, DataProcessor
+from src.report_generator import ReportBuilder, ReportConfig, ManifestStore
+
+logger = logging.getLogger(__name__)
+
+REPORT_TYPES = ('COSTTYPE', 'GLGROUP')
+PERIOD_TYPES = ('YTD', 'MTH')
+DETAIL_LEVELS = ('BU_SG_PRODUCT', 'BU_SG', 'BU_ONLY')
+
+_MONTH_PATTERN = re.compile(r'(\d{6})\d{2}')
+
+
+@dataclass
+class VariantResult:
+    """Outcome of generating one report variant"""
+    month: str
+    report_type: str
+    period_type: str
+    detail_level: str
+    csv_file: Optional[Path] = None
+    output_path: Optional[Path] = None
+    seconds: float = 0.0
+    error: Optional[str] = None
+    skipped: bool = False
+
+    @property
+    def name(self) -> str:
+        return f"{self.report_type}_{self.period_type}_{self.detail_level}_{self.month}"
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class BatchSummary:
+    """Summary of a batch run"""
+    results: List[VariantResult] = field(default_factory=list)
+    load_seconds: Dict[str, float] = field(default_factory=dict)
+    concat_outputs: List[str] = field(default_factory=list)
+    concat_errors: Dict[str, str] = field(default_factory=dict)  # month -> error
+    total_seconds: float = 0.0
+
+    @property
+    def failures(self) -> List[VariantResult]:
+        return [r for r in self.results if not r.ok]
+
+    @property
+    def skipped(self) -> List[VariantResult]:
+        return [r for r in self.results if r.skipped]
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures and not self.concat_errors
+
+    def format(self) -> str:
+        """Render the summary as a plain-text table"""
+        lines = [f"{'Variant':<45} {'Status':<8} {'Seconds':>8}"]
+        lines.append("-" * 63)
+        for r in sorted(self.results, key=lambda r: r.name):
+            status = "SKIPPED" if r.skipped else ("OK" if r.ok else "FAILED")
+            lines.append(f"{r.name:<45} {status:<8} {r.seconds:>8.2f}")
+        lines.append("-" * 63)
+        if self.load_seconds:
+            lines.append(f"CSV load time:   {sum(self.load_seconds.values()):.2f}s "
+                         f"({len(self.load_seconds)} files)")
+        generated = len(self.results) - len(self.failures) - len(self.skipped)
+        lines.append(f"Generated:       {generated}/{len(self.results)}")
+        if self.skipped:
+            lines.append(f"Up to date:      {len(self.skipped)} (skipped)")
+        if self.concat_outputs:
+            lines.append(f"Concatenated:    {len(self.concat_outputs)} files")
+        lines.append(f"Total time:      {self.total_seconds:.2f}s")
+        for r in self.failures:
+            lines.append(f"FAILED {r.name}: {r.error}")
+        for month, error in sorted(self.concat_errors.items()):
+            lines.append(f"FAILED concat {month}: {error}")
+        return "\n".join(lines)
+
+
+def available_months(data_dir: Path) -> List[str]:
+    """
+    Extract unique YYYYMM values from CSV file names in data_dir
+
+    Args:
+        data_dir: Directory containing CSV files (e.g., TRN_PL_..._20251031.csv)
+
+    Returns:
+        Sorted list of months (YYYYMM)
+    """
+    months = set()
+    for csv_path in Path(data_dir).glob('*.csv'):
+        match = _MONTH_PATTERN.search(csv_path.stem)
+        if match:
+            months.add(match.group(1))
+    return sorted(months)
+
+
+def select_months(
+    months: Sequence[str],
+    month: Optional[str] = None,
+    from_month: Optional[str] = None,
+    to_month: Optional[str] = None
+) -> List[str]:
+    """Filter available months by a single month or an inclusive range"""
+    if month:
+        return [m for m in months if m == month]
+    return [
+        m for m in months
+        if (not from_month or m >= from_month) and (not to_month or m <= to_month)
+    ]
+
+
+def _init_worker(log_level: int) -> None:
+    """Process pool initializer - keep worker logging quiet unless verbose"""
+    logging.getLogger().setLevel(log_level)
+
+
+def _generate_variant(
+    df,
+    csv_path: Path,
+    remark_content: str,
+    output_dir: Path,
+    month: str,
+    report_type: str,
+    period_type: str,
+    detail_level: str,
+    prune_zero_activity: bool = False,
+    value_sidecar: Optional[str] = None
+) -> VariantResult:
+    """Generate one report variant from an already processed dataframe"""
+    result = VariantResult(month, report_type, period_type, detail_level, csv_file=csv_path)
+    start = time.perf_counter()
+    try:
+        config = ReportConfig(
+            report_type=report_type,
+            period_type=period_type,
+            detail_level=detail_level,
+            prune_zero_activity=prune_zero_activity,
+            value_sidecar=value_sidecar
+        )
+        output_path = default_output_path(df, output_dir, report_type, period_type, detail_level)
+        result.output_path = ReportBuilder(config).generate_report(df, output_path, remark_content)
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def _generate_csv(
+    csv_path: Path,
+    remark_path: Optional[Path],
+    encoding: str,
+    output_dir: Path,
+    month: str,
+    report_type: str,
+    period_type: str,
+    detail_levels: Sequence[str],
+    prune_zero_activity: bool = False,
+    value_sidecar: Optional[str] = None
+) -> Tuple[Optional[float], List[VariantResult]]:
+    """
+    Load and process one CSV, then generate its detail levels one after another
+
+    Runs in a pool worker: only paths go in and results come out, so the
+    dataframe is never pickled and lives in one process at a time.
+
+    Returns:
+        (CSV load seconds or None if loading failed, one result per detail level)
+    """
+    try:
+        load_start = time.perf_counter()
+        df = DataProcessor().process_data(CSVLoader(encoding=encoding).load_csv(csv_path))
+        load_seconds = time.perf_counter() - load_start
+        remark_content = _read_remark_file(remark_path) if remark_path else ""
+    except Exception as e:
+        return None, [
+            VariantResult(month, report_type, period_type, detail_level,
+                          csv_file=csv_path, error=f"{type(e).__name__}: {e}")
+            for detail_level in detail_levels
+        ]
+
+    logger.info(f"📄 {csv_path.name}: {len(df):,} rows → {len(detail_levels)} variants")
+    return load_seconds, [
+        _generate_variant(df, csv_path, remark_content, output_dir,
+                          month, report_type, period_type, detail_level,
+                          prune_zero_activity, value_sidecar)
+        for detail_level in detail_levels
+    ]
+
+
+def _combined_report_name(period_type: str, month: str) -> str:
+    """File name written by report_concat for a period/month"""
+    if period_type == 'MTH':
+        return f"Report_NT_{month}.xlsx"
+    return f"Report_NT_YTD_{month}.xlsx"
+
+
+def _record_result(
+    manifest_store: ManifestStore,
+    result: VariantResult,
+    config: ReportConfig,
+    fingerprint: Dict
+) -> None:
+    """Write the build manifest of a successfully generated variant"""
+    if result.ok and result.output_path is not None:
+        manifest_store.record(result.csv_file, config, fingerprint, result.output_path)
+
+
+def _collect_csv(
+    summary: BatchSummary,
+    manifest_store: ManifestStore,
+    csv_path: Path,
+    outcome: Tuple[Optional[float], List[VariantResult]],
+    pending: List[Tuple[str, ReportConfig, Dict]],
+    log: bool = False
+) -> None:
+    """Add the outcome of _generate_csv to the summary and record manifests"""
+    load_seconds, results = outcome
+    if load_seconds is not None:
+        summary.load_seconds[csv_path.name] = load_seconds
+    for result, (_, config, fingerprint) in zip(results, pending):
+        if log:
+            status = "✅" if result.ok else "❌"
+            logger.info(f"{status} {result.name} ({result.seconds:.2f}s)")
+        _record_result(manifest_store, result, config, fingerprint)
+        summary.results.append(result)
+
+
+def run_batch(
+    months: Sequence[str],
+    report_types: Sequence[str] = REPORT_TYPES,
+    period_types: Sequence[str] = PERIOD_TYPES,
+    detail_levels: Sequence[str] = DETAIL_LEVELS,
+    data_dir: Path = Path('data'),
+    output_dir: Path = Path('output'),
+    encoding: str = 'tis-620',
+    workers: Optional[int] = None,
+    concat: bool = True,
+    worker_log_level: int = logging.WARNING,
+    force: bool = False,
+    invalidate_config: Sequence[Path] = (),
+    prune_zero_activity: bool = False,
+    value_sidecar: Optional[str] = None
+) -> BatchSummary:
+    """
+    Generate every variant of the matrix for the given months
+
+    Each (month, report type, period) CSV is one pool task: the worker loads
+    and processes it once, then generates its detail levels. The parent only
+    passes paths, so memory stays near one CSV per worker for any month range.
+    Variants whose build manifest matches the current inputs are skipped
+    (the CSV is not loaded at all if every detail level is up to date).
+
+    Args:
+        months: Months to process (YYYYMM)
+        report_types: Report types (COSTTYPE, GLGROUP)
+        period_types: Period types (MTH, YTD)
+        detail_levels: Detail levels (BU_ONLY, BU_SG, BU_SG_PRODUCT)
+        data_dir: Directory containing CSV and remark files
+        output_dir: Directory for generated reports
+        encoding: CSV encoding
+        workers: Process pool size (default: CPU count, 1 = run in-process)
+        concat: Run report_concat after generating
+        worker_log_level: Logging level inside worker processes
+        force: Regenerate even if up to date
+        invalidate_config: Config files whose dependent manifests are dropped first
+        prune_zero_activity: Drop all-zero product columns / detail rows
+        value_sidecar: Save written cells next to each report ('npz' / 'parquet');
+            report_concat merges them for the combined workbooks
+
+    Returns:
+        BatchSummary with per-variant timings and failures
+    """
+    batch_start = time.perf_counter()
+    summary = BatchSummary()
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+
+    manifest_store = ManifestStore(output_dir)
+    if invalidate_config:
+        removed = manifest_store.invalidate_config(invalidate_config)
+        logger.info(f"🗑️  Invalidated {len(removed)} manifests for {', '.join(map(str, invalidate_config))}")
+
+    executor = None
+    if workers > 1:
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(worker_log_level,)
+        )
+
+    futures = {}
+    try:
+        for month in months:
+            for report_type in report_types:
+                for period_type in period_types:
+                    try:
+                        csv_path = find_csv_file(Path(data_dir), report_type, period_type, month)
+                        remark_path = find_remark_file(csv_path)
+                    except Exception as e:
+                        for detail_level in detail_levels:
+                            summary.results.append(VariantResult(
+                                month, report_type, period_type, detail_level,
+                                error=f"{type(e).__name__}: {e}"
+                            ))
+                        continue
+
+                    # Check build manifests before loading the CSV
+                    pending = []
+                    for detail_level in detail_levels:
+                        config = ReportConfig(
+                            report_type=report_type,
+                            period_type=period_type,
+                            detail_level=detail_level,
+                            prune_zero_activity=prune_zero_activity,
+                            value_sidecar=value_sidecar
+                        )
+                        fingerprint = manifest_store.fingerprint(csv_path, remark_path, config, encoding)
+                        up_to_date, recorded_output = manifest_store.is_up_to_date(
+                            csv_path, config, fingerprint
+                        )
+                        if up_to_date and not force:
+                            summary.results.append(VariantResult(
+                                month, report_type, period_type, detail_level,
+                                csv_file=csv_path, output_path=recorded_output, skipped=True
+                            ))
+                        else:
+                            pending.append((detail_level, config, fingerprint))
+
+                    if not pending:
+                        logger.info(f"⏭️  {csv_path.name}: all variants up to date")
+                        continue
+
+                    args = (csv_path, remark_path, encoding, output_dir,
+                            month, report_type, period_type,
+                            [detail_level for detail_level, _, _ in pending],
+                            prune_zero_activity, value_sidecar)
+                    if executor is None:
+                        _collect_csv(summary, manifest_store, csv_path, _generate_csv(*args), pending)
+                    else:
+                        futures[executor.submit(_generate_csv, *args)] = (csv_path, pending)
+
+        for future in as_completed(futures):
+            csv_path, pending = futures[future]
+            _collect_csv(summary, manifest_store, csv_path, future.result(), pending, log=True)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    # Re-concatenate a selected month only when one of its variants was regenerated
+    # or one of its combined files is missing
+    for month in (months if concat else []):
+        month_ok = [r for r in summary.results if r.month == month and r.ok]
+        generated = any(not r.skipped for r in month_ok)
+        combined_missing = any(
+            not (output_dir / _combined_report_name(r.period_type, month)).exists()
+            for r in month_ok
+        )
+        if not month_ok or not (generated or combined_missing or force):
+            continue
+        try:
+            summary.concat_outputs.extend(
+                concat_reports(month=month, input_dir=str(output_dir), output_dir=str(output_dir))
+            )
+        except Exception as e:
+            summary.concat_errors[month] = f"{type(e).__name__}: {e}"
+
+    summary.total_seconds = time.perf_counter() - batch_start
+    return summary
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description='Univer Report Generator - Batch generate all report variants',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('--month', '-m', help='Single month to process (YYYYMM)')
+    parser.add_argument('--from-month', help='First month of range (YYYYMM, inclusive)')
+    parser.add_argument('--to-month', help='Last month of range (YYYYMM, inclusive)')
+    parser.add_argument('--report-type', '-t', nargs='+', choices=REPORT_TYPES,
+                        default=list(REPORT_TYPES), help='Report types (default: all)')
+    parser.add_argument('--period', '-p', nargs='+', type=str.upper, choices=PERIOD_TYPES,
+                        default=list(PERIOD_TYPES), help='Period types (default: all)')
+    parser.add_argument('--detail-level', '-d', nargs='+', choices=DETAIL_LEVELS,
+                        default=list(DETAIL_LEVELS), help='Detail levels (default: all)')
+    parser.add_argument('--data-dir', type=Path, default=Path('data'),
+                        help='Data directory (default: data/)')
+    parser.add_argument('--output-dir', type=Path, default=Path('output'),
+                        help='Output directory (default: output/)')
+    parser.add_argument('--encoding', default='tis-620', help='CSV encoding (default: tis-620)')
+    parser.add_argument('--workers', '-j', type=int,
+                        help='Number of worker processes (default: CPU count, 1 = no pool)')
+    parser.add_argument('--no-concat', action='store_true', help='Skip report_concat step')
+    parser.add_argument('--prune-zero', action='store_true',
+                        help='Drop all-zero product columns and detail rows (listed in remarks)')
+    parser.add_argument('--value-sidecar', choices=['npz', 'parquet'],
+                        help='Also save written cells next to each report (for reconciliation)')
+    parser.add_argument('--force', action='store_true',
+                        help='Regenerate all variants even if up to date')
+    parser.add_argument('--invalidate-config', nargs='+', type=Path, default=[],
+                        metavar='CONFIG_FILE',
+                        help='Regenerate only variants depending on these config files '
+                             '(e.g., config/row_order.py)')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Verbose worker output')
+
+    args = parser.parse_args()
+
+    logging.info("=" * 70)
+    logging.info("📊 Univer Report Generator - Batch")
+    logging.info("=" * 70)
+
+    months = select_months(available_months(args.data_dir), args.month,
+                           args.from_month, args.to_month)
+    if not months:
+        logging.error(f"❌ Error: No matching CSV months found in {args.data_dir}")
+        return 1
+    logging.info(f"📅 Months: {', '.join(months)}")
+
+    summary = run_batch(
+        months,
+        report_types=args.report_type,
+        period_types=args.period,
+        detail_levels=args.detail_level,
+        data_dir=args.data_dir,
+        output_dir=args.output_dir,
+        encoding=args.encoding,
+        workers=args.workers,
+        concat=not args.no_concat,
+        worker_log_level=logging.INFO if args.verbose else logging.WARNING,
+        force=args.force,
+        invalidate_config=args.invalidate_config,
+        prune_zero_activity=args.prune_zero,
+        value_sidecar=args.value_sidecar
+    )
+
+    logging.info("\n" + summary.format())
+    return 0 if summary.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,6 +6,10 @@
 #   ./run_reports.sh 202509       - Month 202509, both MTH and YTD
 #   ./run_reports.sh "" YTD       - All months, YTD only
 #   ./run_reports.sh 202509 MTH   - Month 202509, MTH only
+#
+# All variants are generated by run_batch.py in a single Python process
+# (each CSV is loaded once, variants run in a process pool), followed by
+# report_concat. Extra options: python3 run_batch.py --help
 
 # Parse arguments
 MONTH_FILTER="$1"
@@ -17,97 +21,29 @@ if [ -n "$PERIOD_FILTER" ] && [ "$PERIOD_FILTER" != "MTH" ] && [ "$PERIOD_FILTER
     exit 1
 fi
 
-# Function to extract unique months from CSV files
-get_available_months() {
-    local months=$(ls data/*.csv 2>/dev/null | grep -oE '[0-9]{8}' | cut -c1-6 | sort -u)
-    echo "$months"
-}
-
-# Function to generate reports for a specific month
-generate_reports_for_month() {
-    local month=$1
-    local period_filter=$2
-
-    echo ""
-    echo "=========================================="
-    echo "Processing Month: $month"
-    if [ -n "$period_filter" ]; then
-        echo "Period: $period_filter only"
-    else
-        echo "Period: Both MTH and YTD"
-    fi
-    echo "=========================================="
-
-    # --- YTD Period ---
-    if [ -z "$period_filter" ] || [ "$period_filter" = "YTD" ]; then
-        echo "Processing YTD Reports..."
-        python3 generate_report.py --report-type COSTTYPE  --period YTD --month $month
-        python3 generate_report.py --report-type COSTTYPE  --period YTD --detail-level BU_SG --month $month
-        python3 generate_report.py --report-type COSTTYPE  --period YTD --detail-level BU_ONLY --month $month
-
-        python3 generate_report.py --report-type GLGROUP  --period YTD --month $month
-        python3 generate_report.py --report-type GLGROUP  --period YTD --detail-level BU_SG --month $month
-        python3 generate_report.py --report-type GLGROUP  --period YTD --detail-level BU_ONLY --month $month
-    fi
-
-    # --- MTH Period ---
-    if [ -z "$period_filter" ] || [ "$period_filter" = "MTH" ]; then
-        echo "Processing MTH Reports..."
-        python3 generate_report.py --report-type COSTTYPE  --period MTH --month $month
-        python3 generate_report.py --report-type COSTTYPE  --period MTH --detail-level BU_SG --month $month
-        python3 generate_report.py --report-type COSTTYPE  --period MTH --detail-level BU_ONLY --month $month
-
-        python3 generate_report.py --report-type GLGROUP  --period MTH --month $month
-        python3 generate_report.py --report-type GLGROUP  --period MTH --detail-level BU_SG --month $month
-        python3 generate_report.py --report-type GLGROUP  --period MTH --detail-level BU_ONLY --month $month
-    fi
-
-    echo "✓ Completed reports for month $month"
-}
-
-# Main execution
+BATCH_ARGS=()
 if [ -n "$MONTH_FILTER" ]; then
-    # Specific month provided
     echo "--- Starting Report Generation for Month: $MONTH_FILTER ---"
-    if [ -n "$PERIOD_FILTER" ]; then
-        echo "Period Filter: $PERIOD_FILTER"
-    fi
-    generate_reports_for_month "$MONTH_FILTER" "$PERIOD_FILTER"
+    BATCH_ARGS+=(--month "$MONTH_FILTER")
 else
-    # No month specified - process all months
     echo "--- Starting Report Generation for ALL months ---"
-    if [ -n "$PERIOD_FILTER" ]; then
-        echo "Period Filter: $PERIOD_FILTER"
-    fi
-
-    months=$(get_available_months)
-
-    if [ -z "$months" ]; then
-        echo "❌ Error: No CSV files found in data/ directory"
-        exit 1
-    fi
-
-    echo "Found months: $months"
-    echo ""
+fi
 
-    for month in $months; do
-        generate_reports_for_month "$month" "$PERIOD_FILTER"
-    done
+if [ -n "$PERIOD_FILTER" ]; then
+    echo "Period Filter: $PERIOD_FILTER"
+    BATCH_ARGS+=(--period "$PERIOD_FILTER")
 fi
 
-echo ""
-echo "--- Individual Report Files Generated Successfully ---"
+python3 run_batch.py "${BATCH_ARGS[@]}"
+EXIT_CODE=$?
 
-# --- Concatenate Reports ---
 echo ""
-echo "--- Starting Report Concatenation ---"
-if [ -n "$MONTH_FILTER" ]; then
-    python3 report_concat.py --month $MONTH_FILTER
+echo "==================================================="
+if [ $EXIT_CODE -eq 0 ]; then
+    echo "--- All Reports Completed Successfully ---"
 else
-    python3 report_concat.py
+    echo "❌ Report generation finished with failures (exit code $EXIT_CODE)"
 fi
-
-echo ""
 echo "==================================================="
-echo "--- All Reports Completed Successfully ---"
-echo "==================================================="
\ No newline at end of file
+
+exit $EXIT_CODE
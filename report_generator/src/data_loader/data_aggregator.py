@@ -1,6 +1,7 @@
 """
 Data Aggregator - Aggregate CSV data by GROUP/SUB_GROUP
 """
+import numpy as np
 import pandas as pd
 from typing import Dict, List, Optional, Tuple
 import logging
@@ -289,6 +290,29 @@ class DataAggregator:
         if "ค่าใช้จ่ายตอบแทนแรงงาน" in row_label:
             logger.info(f"get_row_data: '{row_label}' → GROUP={group}, SUB_GROUP={sub_group}, main_group={main_group_label}")
 
+        return self.get_row_data_by_group(group, sub_group, bu_list, service_group_dict)
+
+    def get_row_data_by_group(
+        self,
+        group: Optional[str],
+        sub_group,
+        bu_list: List[str],
+        service_group_dict: Dict[str, List[str]]
+    ) -> Dict[str, float]:
+        """
+        Get all column values for an already resolved GROUP/SUB_GROUP
+
+        Args:
+            group: GROUP value (None returns empty dict)
+            sub_group: SUB_GROUP value, list of SUB_GROUPs, or None for whole GROUP
+            bu_list: List of BUs
+            service_group_dict: Dict mapping BU to list of service groups
+
+        Returns:
+            Dict mapping column identifiers to values
+        """
+        result = {}
+
         if group is None:
             return result
 
@@ -900,25 +924,29 @@ class DataAggregator:
         numerator_dict: Dict[str, float],
         denominator_dict: Dict[str, float]
     ) -> Dict[str, float]:
-        """Calculate ratio, handling division by zero"""
-        result = {}
+        """
+        Calculate ratio for every key of numerator_dict as one vector division
 
+        Keys whose denominator is zero (|d| < 1e-9) map to None.
+        """
         # Handle None inputs
-        if numerator_dict is None:
-            numerator_dict = {}
+        if not numerator_dict:
+            return {}
         if denominator_dict is None:
             denominator_dict = {}
 
-        for key in numerator_dict:
-            numerator = numerator_dict.get(key, 0)
-            denominator = denominator_dict.get(key, 0)
+        keys = list(numerator_dict)
+        numerators = np.array([numerator_dict[key] for key in keys], dtype=float)
+        denominators = np.array([denominator_dict.get(key, 0) for key in keys], dtype=float)
 
-            if abs(denominator) < 1e-9:  # Division by zero
-                result[key] = None  # Will be displayed as blank or #DIV/0!
-            else:
-                result[key] = numerator / denominator
+        valid = np.abs(denominators) >= 1e-9
+        ratios = np.divide(numerators, denominators, out=np.zeros_like(numerators), where=valid)
 
-        return result
+        # Division by zero -> None (will be displayed as blank or #DIV/0!)
+        return {
+            key: (ratio if ok else None)
+            for key, ratio, ok in zip(keys, ratios.tolist(), valid.tolist())
+        }
 
     def calculate_product_value(
         self,
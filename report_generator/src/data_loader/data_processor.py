@@ -10,6 +10,8 @@ logger = logging.getLogger(__name__)
 
 import re
 
+from ..recon_shared import normalize_bu_name
+
 
 class DataProcessor:
     """Process and aggregate P&L data"""
@@ -49,36 +51,7 @@ class DataProcessor:
 
         return result if result else [s]
 
-    @staticmethod
-    def _normalize_bu_name(bu: str) -> str:
-        """
-        Normalize BU name to always have leading zero (01., 02., etc.)
-
-        This ensures consistent key generation across all components.
-
-        Args:
-            bu: BU name (e.g., '1.กลุ่มธุรกิจ...' or '01.กลุ่มธุรกิจ...')
-
-        Returns:
-            Normalized BU name with leading zero (e.g., '01.กลุ่มธุรกิจ...')
-
-        Examples:
-            '1.กลุ่มธุรกิจ HARD INFRASTRUCTURE' -> '01.กลุ่มธุรกิจ HARD INFRASTRUCTURE'
-            '01.กลุ่มธุรกิจ HARD INFRASTRUCTURE' -> '01.กลุ่มธุรกิจ HARD INFRASTRUCTURE'
-            'nan' -> 'nan' (unchanged)
-        """
-        if not bu or bu == 'nan' or (isinstance(bu, float) and pd.isna(bu)):
-            return bu
-
-        bu = str(bu).strip()
-
-        # Check if starts with single digit + dot (e.g., "1.", "2.")
-        if len(bu) >= 2 and bu[0].isdigit() and bu[1] == '.':
-            # Add leading zero
-            return '0' + bu
-
-        # Already has leading zero or different format
-        return bu
+    _normalize_bu_name = staticmethod(normalize_bu_name)
 
     def __init__(self):
         """Initialize data processor"""
@@ -0,0 +1,116 @@
+"""
+Recon Shared
+The parts of report_generator that reconciliation reads back, with no
+dependencies beyond numpy / pandas
+
+- Value sidecar files (see report_generator/core/value_sidecar.py): file
+  naming, field types, save / load
+- normalize_bu_name: the BU key rule of DataProcessor
+
+reconciliation/recon_core imports this module alone (not the src.report_generator
+or src.data_loader packages), so checking a sidecar does not load the generator.
+"""
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+SIDECAR_FORMATS = ('npz', 'parquet')
+
+TEXT_FIELDS = (
+    'sheet', 'row_key', 'label', 'row_kind', 'group', 'sub_groups', 'service_group_filter',
+    'col_type', 'bu', 'service_group', 'product_key',
+)
+INT_FIELDS = ('xl_row', 'xl_col')
+FLOAT_FIELDS = ('value',)
+BOOL_FIELDS = ('is_percentage',)
+FIELDS = (*TEXT_FIELDS, *INT_FIELDS, *FLOAT_FIELDS, *BOOL_FIELDS)
+
+
+def sidecar_path(workbook_path: Path, fmt: str = 'npz') -> Path:
+    """Sidecar file of a workbook: Report.xlsx -> Report.values.npz"""
+    if fmt not in SIDECAR_FORMATS:
+        raise ValueError(f"Unknown sidecar format {fmt!r} (expected one of {SIDECAR_FORMATS})")
+    workbook_path = Path(workbook_path)
+    return workbook_path.with_name(f"{workbook_path.stem}.values.{fmt}")
+
+
+def find_sidecar(workbook_path: Path) -> Optional[Path]:
+    """Existing sidecar of a workbook (any format), None if there is none"""
+    for fmt in SIDECAR_FORMATS:
+        path = sidecar_path(workbook_path, fmt)
+        if path.exists():
+            return path
+    return None
+
+
+def typed_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    for name in TEXT_FIELDS:
+        frame[name] = frame[name].astype(object).where(frame[name].notna(), '').astype(str)
+    for name in INT_FIELDS:
+        frame[name] = frame[name].astype(np.int32)
+    for name in FLOAT_FIELDS:
+        frame[name] = frame[name].astype(np.float64)
+    for name in BOOL_FIELDS:
+        frame[name] = frame[name].astype(bool)
+    return frame
+
+
+def save_value_sidecar(frame: pd.DataFrame, path: Path) -> Path:
+    """Write a sidecar table; the format follows the file suffix (.npz / .parquet)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    frame = frame[list(FIELDS)]
+    if path.suffix == '.parquet':
+        frame.to_parquet(path, index=False)  # ImportError without pyarrow / fastparquet
+    else:
+        arrays = {}
+        for name in FIELDS:
+            column = frame[name].to_numpy()
+            arrays[name] = column.astype(str) if name in TEXT_FIELDS else column
+        np.savez_compressed(path, **arrays)
+    return path
+
+
+def load_value_sidecar(path: Path) -> pd.DataFrame:
+    """Read a sidecar written by ValueSidecar.save() / save_value_sidecar()"""
+    path = Path(path)
+    if path.suffix == '.parquet':
+        frame = pd.read_parquet(path)
+    else:
+        with np.load(path, allow_pickle=False) as npz:
+            frame = pd.DataFrame({name: npz[name] for name in npz.files})
+    return typed_frame(frame)
+
+
+def normalize_bu_name(bu: str) -> str:
+    """
+    Normalize BU name to always have leading zero (01., 02., etc.)
+
+    This ensures consistent key generation across all components
+    (the report's BU keys; reconciliation joins CSV rows on the same rule).
+
+    Args:
+        bu: BU name (e.g., '1.กลุ่มธุรกิจ...' or '01.กลุ่มธุรกิจ...')
+
+    Returns:
+        Normalized BU name with leading zero (e.g., '01.กลุ่มธุรกิจ...')
+
+    Examples:
+        '1.กลุ่มธุรกิจ HARD INFRASTRUCTURE' -> '01.กลุ่มธุรกิจ HARD INFRASTRUCTURE'
+        '01.กลุ่มธุรกิจ HARD INFRASTRUCTURE' -> '01.กลุ่มธุรกิจ HARD INFRASTRUCTURE'
+        'nan' -> 'nan' (unchanged)
+    """
+    if not bu or bu == 'nan' or (isinstance(bu, float) and pd.isna(bu)):
+        return bu
+
+    bu = str(bu).strip()
+
+    # Check if starts with single digit + dot (e.g., "1.", "2.")
+    if len(bu) >= 2 and bu[0].isdigit() and bu[1] == '.':
+        # Add leading zero
+        return '0' + bu
+
+    # Already has leading zero or different format
+    return bu
@@ -31,6 +31,7 @@ from .core.config import (
     DetailLevel
 )
 from .core.report_builder import ReportBuilder
+from .core.manifest import ManifestStore
 
 __version__ = '2.0.0'
 __author__ = 'NT P&L Report Team'
@@ -41,4 +42,5 @@ __all__ = [
     'ReportType',
     'PeriodType',
     'DetailLevel',
+    'ManifestStore',
 ]
@@ -4,11 +4,13 @@ Core module - Report configuration and builder
 
 from .config import ReportConfig, ReportType, PeriodType, DetailLevel
 from .report_builder import ReportBuilder
+from .manifest import ManifestStore
 
 __all__ = [
     'ReportConfig',
     'ReportType',
     'PeriodType',
     'DetailLevel',
-    'ReportBuilder'
+    'ReportBuilder',
+    'ManifestStore'
 ]
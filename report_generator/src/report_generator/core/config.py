@@ -40,6 +40,13 @@ class ReportConfig:
         include_sg_total: Include Service Group total columns
         include_products: Include product-level columns
         
+        prune_zero_activity: Drop all-zero product columns and detail rows
+            (listed in the remarks section)
+        prune_tolerance: Values with |value| <= tolerance count as zero
+        
+        value_sidecar: Also save every written data cell next to the workbook
+            ('npz' or 'parquet', None = off - see core.value_sidecar)
+        
         show_info_box: Show info box at top right
         show_remarks: Show remarks section at bottom
         
@@ -63,6 +70,13 @@ class ReportConfig:
     include_products: bool = True
     include_common_size: Optional[bool] = None  # None = auto-detect from detail_level
     
+    # Zero-activity pruning (opt-in)
+    prune_zero_activity: bool = False
+    prune_tolerance: float = 1e-6
+    
+    # Written-value sidecar for reconciliation (opt-in)
+    value_sidecar: Optional[str] = None
+    
     # Display settings
     show_info_box: bool = True
     show_remarks: bool = True
@@ -112,6 +126,9 @@ class ReportConfig:
         if isinstance(self.detail_level, str):
             self.detail_level = DetailLevel(self.detail_level)
         
+        if self.value_sidecar is not None and self.value_sidecar not in ('npz', 'parquet'):
+            raise ValueError(f"value_sidecar must be 'npz', 'parquet' or None, got {self.value_sidecar!r}")
+        
         # Adjust flags based on detail level
         if self.detail_level == DetailLevel.BU_ONLY:
             self.include_sg_total = False
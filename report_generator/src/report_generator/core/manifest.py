@@ -0,0 +1,285 @@
+"""
+Build Manifest
+Record the inputs of each generated report so unchanged variants can be skipped
+
+Each output workbook gets a JSON manifest in <output_dir>/.manifest/ containing:
+- checksum of the input CSV and remark file
+- checksums of the config modules the variant depends on
+- code version (package version + hash of the generator source)
+- report options (ReportConfig + encoding)
+
+A variant is up to date when its output file exists and a freshly computed
+fingerprint equals the recorded one (same idea as `make`).
+"""
+from pathlib import Path
+from functools import lru_cache
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+import hashlib
+import json
+import logging
+
+from .config import ReportConfig, ReportType
+from .value_sidecar import sidecar_path
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_DIR = '.manifest'
+
+# report_generator/ (project root) - parents: core, report_generator, src
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+CONFIG_DIR = PROJECT_ROOT / 'config'
+
+# Source trees whose content defines the code version
+CODE_DIRS = (
+    PROJECT_ROOT / 'src' / 'report_generator',
+    PROJECT_ROOT / 'src' / 'data_loader',
+)
+
+# Config modules used by every variant
+SHARED_CONFIG_FILES = ('data_mapping.py', 'report_config.py', 'satellite_config.py')
+
+# Config modules used only by one report type
+REPORT_TYPE_CONFIG_FILES = {
+    ReportType.COSTTYPE: ('row_order.py',),
+    ReportType.GLGROUP: ('row_order_glgroup.py', 'data_mapping_glgroup.py'),
+}
+
+# Config modules used only when Common Size columns are enabled
+COMMON_SIZE_CONFIG_FILES = ('common_size_rows.py',)
+
+
+def file_sha256(path: Path) -> str:
+    """
+    Compute SHA-256 of a file (cached by path, size and mtime)
+
+    Args:
+        path: File path
+
+    Returns:
+        Hex digest
+    """
+    path = Path(path).resolve()
+    stat = path.stat()
+    return _cached_sha256(str(path), stat.st_size, stat.st_mtime_ns)
+
+
+@lru_cache(maxsize=256)
+def _cached_sha256(path: str, size: int, mtime_ns: int) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=1)
+def code_version() -> str:
+    """
+    Get code version: package version + short hash of generator source files
+
+    Returns:
+        Version string (e.g., '2.0.0+1a2b3c4d5e6f')
+    """
+    from .. import __version__
+
+    digest = hashlib.sha256()
+    for code_dir in CODE_DIRS:
+        for source in sorted(code_dir.rglob('*.py')):
+            digest.update(source.relative_to(PROJECT_ROOT).as_posix().encode('utf-8'))
+            digest.update(source.read_bytes())
+    return f"{__version__}+{digest.hexdigest()[:12]}"
+
+
+def config_dependencies(config: ReportConfig) -> List[str]:
+    """
+    Get config module file names a report variant depends on
+
+    Args:
+        config: ReportConfig instance
+
+    Returns:
+        Sorted list of file names in config/
+    """
+    files = set(SHARED_CONFIG_FILES)
+    files.update(REPORT_TYPE_CONFIG_FILES.get(config.report_type, ()))
+    if config.include_common_size:
+        files.update(COMMON_SIZE_CONFIG_FILES)
+    return sorted(files)
+
+
+class ManifestStore:
+    """
+    Read/write build manifests for report outputs
+
+    Usage:
+        store = ManifestStore(output_dir)
+        fingerprint = store.fingerprint(csv_path, remark_path, config, encoding)
+        if not force and store.is_up_to_date(csv_path, config, fingerprint):
+            ...  # skip
+        ...  # generate report
+        store.record(csv_path, config, fingerprint, output_path)
+    """
+
+    def __init__(self, output_dir: Path):
+        """
+        Initialize manifest store
+
+        Args:
+            output_dir: Report output directory (manifests go to output_dir/.manifest)
+        """
+        self.output_dir = Path(output_dir)
+        self.manifest_dir = self.output_dir / MANIFEST_DIR
+
+    def manifest_path(self, csv_path: Path, config: ReportConfig) -> Path:
+        """
+        Get manifest file path for a (CSV, variant) pair
+
+        The name is derived from the inputs (not the output file name) so a
+        variant can be checked before the CSV is loaded.
+        """
+        variant = f"{config.report_type.value}_{config.period_type.value}_{config.detail_level.value}"
+        return self.manifest_dir / f"{Path(csv_path).stem}__{variant}.json"
+
+    def fingerprint(
+        self,
+        csv_path: Path,
+        remark_path: Optional[Path],
+        config: ReportConfig,
+        encoding: str
+    ) -> Dict:
+        """
+        Compute the input fingerprint of a report variant
+
+        Args:
+            csv_path: Input CSV file
+            remark_path: Remark file (None if no remark)
+            config: ReportConfig instance
+            encoding: CSV encoding
+
+        Returns:
+            Fingerprint dictionary (JSON-serializable)
+        """
+        options = config.to_dict()
+        options.update({
+            'include_bu_total': config.include_bu_total,
+            'include_sg_total': config.include_sg_total,
+            'include_products': config.include_products,
+            'include_common_size': config.include_common_size,
+            'prune_zero_activity': config.prune_zero_activity,
+            'prune_tolerance': config.prune_tolerance,
+            'value_sidecar': config.value_sidecar,
+            'show_info_box': config.show_info_box,
+            'show_remarks': config.show_remarks,
+            'encoding': encoding,
+        })
+
+        return {
+            'csv': {'name': Path(csv_path).name, 'sha256': file_sha256(csv_path)},
+            'remark': (
+                {'name': Path(remark_path).name, 'sha256': file_sha256(remark_path)}
+                if remark_path else None
+            ),
+            'config': {
+                name: file_sha256(CONFIG_DIR / name)
+                for name in config_dependencies(config)
+                if (CONFIG_DIR / name).exists()
+            },
+            'code_version': code_version(),
+            'options': options,
+        }
+
+    def load(self, csv_path: Path, config: ReportConfig) -> Optional[Dict]:
+        """Load recorded manifest, None if missing or unreadable"""
+        path = self.manifest_path(csv_path, config)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable manifest {path.name}: {e}")
+            return None
+
+    def is_up_to_date(
+        self,
+        csv_path: Path,
+        config: ReportConfig,
+        fingerprint: Dict
+    ) -> Tuple[bool, Optional[Path]]:
+        """
+        Check whether a variant's output matches the current inputs
+
+        Returns:
+            Tuple of (up_to_date, recorded output path)
+        """
+        manifest = self.load(csv_path, config)
+        if manifest is None:
+            return False, None
+
+        output_path = Path(manifest.get('output', ''))
+        if not output_path.is_absolute():
+            output_path = self.output_dir / output_path
+        if not output_path.exists():
+            return False, output_path
+        if config.value_sidecar and not sidecar_path(output_path, config.value_sidecar).exists():
+            return False, output_path
+
+        return manifest.get('fingerprint') == fingerprint, output_path
+
+    def record(
+        self,
+        csv_path: Path,
+        config: ReportConfig,
+        fingerprint: Dict,
+        output_path: Path
+    ) -> Path:
+        """
+        Write manifest for a generated output
+
+        Returns:
+            Manifest file path
+        """
+        output_path = Path(output_path)
+        try:
+            output_ref = str(output_path.resolve().relative_to(self.output_dir.resolve()))
+        except ValueError:
+            output_ref = str(output_path.resolve())
+
+        path = self.manifest_path(csv_path, config)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        manifest = {
+            'output': output_ref,
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'fingerprint': fingerprint,
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        return path
+
+    def invalidate_config(self, config_files: Sequence[Path]) -> List[Path]:
+        """
+        Remove manifests of variants that depend on the given config files
+
+        Args:
+            config_files: Config module paths or names (e.g., 'config/row_order.py')
+
+        Returns:
+            List of removed manifest paths
+        """
+        names = {Path(f).name for f in config_files}
+        removed = []
+        if not self.manifest_dir.exists():
+            return removed
+
+        for path in sorted(self.manifest_dir.glob('*.json')):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+                depends_on = manifest.get('fingerprint', {}).get('config', {})
+            except (OSError, ValueError):
+                depends_on = names  # unreadable manifest - drop it as well
+            if names & set(depends_on):
+                path.unlink()
+                removed.append(path)
+        return removed
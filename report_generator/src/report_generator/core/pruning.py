@@ -0,0 +1,178 @@
+"""
+Zero-Activity Pruning
+Drop product columns and detail rows that have no activity in the period
+
+Opt-in via ReportConfig.prune_zero_activity. Activity is read from the
+DataAggregator product lookup (GROUP → SUB_GROUP → BU → SG → PRODUCT_KEY),
+so no extra pass over the CSV is needed:
+- Product column: pruned when every value of (BU, SG, PRODUCT_KEY) is zero
+- Detail row: pruned when it is a non-bold level >= 1 data row and every
+  value of its GROUP/SUB_GROUP is zero
+
+Totals, calculated rows, ratio rows and section headers are never pruned.
+Header merges follow the remaining columns; SG total columns always stay.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Tuple
+import logging
+
+from ..columns.base_column_builder import ColumnDef
+from ..rows.report_plan import ReportPlan, RowPlan, RowKind
+from src.data_loader import DataAggregator
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PruneResult:
+    """Columns and rows removed by ZeroActivityPruner"""
+    columns: List[ColumnDef] = field(default_factory=list)
+    rows: List[RowPlan] = field(default_factory=list)
+
+    @property
+    def row_indices(self) -> FrozenSet[int]:
+        """Plan indices of pruned rows"""
+        return frozenset(row.index for row in self.rows)
+
+    def is_empty(self) -> bool:
+        """True if nothing was pruned"""
+        return not self.columns and not self.rows
+
+    def remark_lines(self) -> List[str]:
+        """
+        Describe pruned items for the remarks section
+
+        Returns:
+            List of remark lines (empty if nothing was pruned)
+        """
+        if self.is_empty():
+            return []
+
+        lines = ["ไม่แสดงรายการที่ไม่มีความเคลื่อนไหวในงวด (ค่าเป็นศูนย์ทั้งหมด):"]
+
+        # Products grouped per BU / SG to keep the list short
+        by_sg: Dict[Tuple[str, str], List[str]] = {}
+        for col in self.columns:
+            name = f"{col.product_key} {col.product_name}" if col.product_name else str(col.product_key)
+            by_sg.setdefault((col.bu, col.service_group), []).append(name.strip())
+        for (bu, sg), products in by_sg.items():
+            lines.append(f"- บริการ ({bu} / {sg}): {', '.join(products)}")
+
+        if self.rows:
+            labels = [f"{row.main_group} > {row.label.strip()}" if row.main_group else row.label.strip()
+                      for row in self.rows]
+            lines.append(f"- แถว: {', '.join(labels)}")
+
+        return lines
+
+
+class ZeroActivityPruner:
+    """
+    Find all-zero product columns and detail rows using the aggregator
+
+    Usage:
+        pruner = ZeroActivityPruner(aggregator, tolerance=config.prune_tolerance)
+        columns, result = pruner.prune_columns(columns)
+        result.rows = pruner.prune_rows(plan)
+    """
+
+    def __init__(self, aggregator: DataAggregator, tolerance: float = 1e-6):
+        """
+        Initialize pruner
+
+        Args:
+            aggregator: DataAggregator built from the report data
+            tolerance: Values with |value| <= tolerance count as zero
+        """
+        self.aggregator = aggregator
+        self.tolerance = tolerance
+        self._product_activity, self._group_activity = self._build_activity()
+
+    def _build_activity(self) -> Tuple[Dict[Tuple[str, str, str], float], Dict[Tuple[str, str], float]]:
+        """
+        Max |value| per (BU, SG, PRODUCT_KEY) and per (GROUP, SUB_GROUP)
+
+        Returns:
+            Tuple of (product activity, group activity)
+        """
+        product_activity: Dict[Tuple[str, str, str], float] = {}
+        group_activity: Dict[Tuple[str, str], float] = {}
+
+        for group, sub_dict in self.aggregator.lookup_with_products.items():
+            for sub_key, bu_dict in sub_dict.items():
+                group_max = group_activity.get((group, sub_key), 0.0)
+                for bu, sg_dict in bu_dict.items():
+                    for sg, products in sg_dict.items():
+                        for product_key, value in products.items():
+                            magnitude = abs(value) if value == value else 0.0  # NaN -> 0
+                            key = (bu, sg, product_key)
+                            if magnitude > product_activity.get(key, 0.0):
+                                product_activity[key] = magnitude
+                            if magnitude > group_max:
+                                group_max = magnitude
+                group_activity[(group, sub_key)] = group_max
+
+        return product_activity, group_activity
+
+    def is_zero_product(self, col: ColumnDef) -> bool:
+        """True if every value of this product column is zero"""
+        key = (col.bu, col.service_group, str(col.product_key))
+        return self._product_activity.get(key, 0.0) <= self.tolerance
+
+    def is_zero_row(self, row: RowPlan) -> bool:
+        """True if the row's GROUP/SUB_GROUP has no non-zero value"""
+        if row.group is None:
+            return False
+        if row.sub_groups:
+            sub_keys = row.sub_groups
+        else:
+            sub_keys = [sub for (group, sub) in self._group_activity if group == row.group]
+        return all(
+            self._group_activity.get((row.group, sub), 0.0) <= self.tolerance
+            for sub in sub_keys
+        )
+
+    def prune_columns(self, columns: List[ColumnDef]) -> Tuple[List[ColumnDef], List[ColumnDef]]:
+        """
+        Remove all-zero product columns
+
+        Args:
+            columns: Column structure from the column builder
+
+        Returns:
+            Tuple of (kept columns, pruned product columns)
+        """
+        kept, pruned = [], []
+        for col in columns:
+            if col.col_type == 'product' and self.is_zero_product(col):
+                pruned.append(col)
+            else:
+                kept.append(col)
+
+        if pruned:
+            logger.info(f"Pruned {len(pruned)} zero-activity product columns")
+        return kept, pruned
+
+    def prune_rows(self, plan: ReportPlan) -> List[RowPlan]:
+        """
+        Find all-zero detail rows
+
+        Only non-bold data rows below a section (level >= 1) are candidates.
+
+        Args:
+            plan: Compiled report plan
+
+        Returns:
+            List of pruned rows (in plan order)
+        """
+        pruned = [
+            row for row in plan.rows
+            if row.kind == RowKind.DATA
+            and row.level >= 1
+            and not row.is_bold
+            and self.is_zero_row(row)
+        ]
+
+        if pruned:
+            logger.info(f"Pruned {len(pruned)} zero-activity detail rows")
+        return pruned
@@ -13,6 +13,9 @@ from ..columns.bu_only_builder import BUOnlyBuilder
 from ..columns.bu_sg_builder import BUSGBuilder
 from ..columns.bu_sg_product_builder import BUSGProductBuilder
 from ..rows.row_builder import RowBuilder
+from ..rows.report_plan import compile_report_plan
+from .pruning import PruneResult, ZeroActivityPruner
+from .value_sidecar import SIDECAR_FORMATS, ValueSidecar, sidecar_path
 from ..writers.header_writer import HeaderWriter
 from ..writers.column_header_writer import ColumnHeaderWriter
 from ..writers.data_writer import DataWriter
@@ -62,6 +65,9 @@ class ReportBuilder:
         self.data_writer = DataWriter(config, self.formatter)
         self.remark_writer = RemarkWriter(config, self.formatter)
         
+        # Items removed by zero-activity pruning in the last generate_report()
+        self.prune_result = PruneResult()
+        
         logger.info(f"ReportBuilder initialized: {config.detail_level.value}")
     
     def _get_column_builder(self):
@@ -100,9 +106,9 @@ class ReportBuilder:
         columns = self.column_builder.build_columns(data)
         logger.info(f"Built {len(columns)} columns")
         
-        logger.info("Building row structure...")
-        rows = self.row_builder.build_rows()
-        logger.info(f"Built {len(rows)} rows")
+        logger.info("Compiling row plan...")
+        plan = compile_report_plan(self.config)
+        logger.info(f"Row plan: {len(plan.rows)} rows")
         
         # 2. Create workbook
         wb = Workbook()
@@ -112,6 +118,18 @@ class ReportBuilder:
         # 3. Create aggregator
         aggregator = DataAggregator(data)
         
+        # Optional: drop zero-activity product columns / detail rows
+        self.prune_result = PruneResult()
+        if self.config.prune_zero_activity:
+            pruner = ZeroActivityPruner(aggregator, self.config.prune_tolerance)
+            columns, self.prune_result.columns = pruner.prune_columns(columns)
+            self.prune_result.rows = pruner.prune_rows(plan)
+            remark_lines = self.prune_result.remark_lines()
+            if remark_lines:
+                remark_content = "\n".join(
+                    part for part in (remark_content.strip(), "\n".join(remark_lines)) if part
+                )
+        
         # 4. Write content
         logger.info("Writing header...")
         self.header_writer.write(ws, data)
@@ -120,7 +138,10 @@ class ReportBuilder:
         self.column_header_writer.write(ws, columns)
         
         logger.info("Writing data rows...")
-        last_row = self.data_writer.write(ws, data, aggregator, columns, rows)
+        sidecar = ValueSidecar(sheet=ws.title) if self.config.value_sidecar else None
+        last_row = self.data_writer.write(
+            ws, data, aggregator, columns, plan, self.prune_result.row_indices, sidecar
+        )
         
         logger.info("Writing remarks...")
         self.remark_writer.write(ws, remark_content, last_row + 2)
@@ -135,6 +156,15 @@ class ReportBuilder:
         wb.save(output_path)
         
         logger.info(f"Report saved to: {output_path}")
+        
+        # 7. Optional: written values next to the workbook (for reconciliation);
+        #    a sidecar left from an earlier build of this file no longer matches it
+        written = sidecar.save(output_path, self.config.value_sidecar) if sidecar is not None else None
+        for fmt in SIDECAR_FORMATS:
+            stale = sidecar_path(output_path, fmt)
+            if stale != written and stale.exists():
+                stale.unlink()
+        
         return output_path
     
     def _apply_final_formatting(self, ws, columns):
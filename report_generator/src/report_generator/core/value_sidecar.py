@@ -0,0 +1,106 @@
+"""
+Value Sidecar
+Record every data cell DataWriter writes and save it next to the workbook
+
+Reconciliation otherwise has to reverse-engineer the generated Excel (find the
+'รายละเอียด' header, match service-group headers, detect product-key rows).
+The sidecar keeps, per written cell:
+- sheet, xl_row, xl_col: cell position (1-indexed, as in Excel)
+- row_key, label, row_kind: the ReportPlan row (storage_key / label / kind)
+- group, sub_groups, service_group_filter: CSV selection of DATA rows
+  (sub_groups joined with '|', '' = whole GROUP)
+- col_type, bu, service_group, product_key: the ColumnDef
+- value, is_percentage
+
+Text fields use '' for "not applicable". Files (naming, field types and
+save / load live in src/recon_shared.py, which reconciliation imports too):
+- <workbook stem>.values.npz      one array per field (np.load, no pickle)
+- <workbook stem>.values.parquet  same table (needs pyarrow)
+
+Usage:
+    sidecar = ValueSidecar(sheet=ws.title)
+    data_writer.write(..., sidecar=sidecar)
+    sidecar.save(output_path, 'npz')
+    frame = load_value_sidecar(sidecar_path(output_path, 'npz'))
+"""
+from pathlib import Path
+from typing import Iterable, List
+import logging
+
+import pandas as pd
+
+from ...recon_shared import (  # noqa: F401 - re-exported
+    FIELDS, SIDECAR_FORMATS, find_sidecar, load_value_sidecar, save_value_sidecar, sidecar_path,
+    typed_frame,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _text(value) -> str:
+    return '' if value is None else str(value)
+
+
+class ValueSidecar:
+    """Collect written data cells of one sheet (see module docstring for the fields)"""
+
+    def __init__(self, sheet: str = ''):
+        self.sheet = sheet
+        self._rows: List[tuple] = []
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(self, row, col, xl_row: int, xl_col: int, value, is_percentage: bool = False):
+        """
+        Record one cell
+
+        Args:
+            row: RowPlan of the cell
+            col: ColumnDef of the cell
+            xl_row, xl_col: 1-indexed cell position
+            value: Value written (None = blank cell, not recorded)
+            is_percentage: Cell is formatted as a percentage
+        """
+        if value is None:
+            return
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            return
+        self._rows.append((
+            self.sheet,
+            row.storage_key,
+            row.label,
+            row.kind,
+            _text(row.group),
+            '|'.join(row.sub_groups),
+            _text(row.service_group_filter),
+            col.col_type,
+            _text(col.bu),
+            _text(col.service_group),
+            _text(col.product_key),
+            xl_row,
+            xl_col,
+            number,
+            bool(is_percentage),
+        ))
+
+    def to_frame(self) -> pd.DataFrame:
+        """Recorded cells as a DataFrame (columns = FIELDS)"""
+        return typed_frame(pd.DataFrame.from_records(self._rows, columns=list(FIELDS)))
+
+    def save(self, workbook_path: Path, fmt: str = 'npz') -> Path:
+        """Write the sidecar next to `workbook_path`; return the sidecar path"""
+        path = sidecar_path(workbook_path, fmt)
+        save_value_sidecar(self.to_frame(), path)
+        logger.info(f"Value sidecar saved: {path.name} ({len(self):,} cells)")
+        return path
+
+
+def concat_value_sidecars(frames: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """Stack sidecars of several sheets (e.g. the variants of a combined workbook)"""
+    frames = list(frames)
+    if not frames:
+        return typed_frame(pd.DataFrame(columns=list(FIELDS)))
+    return pd.concat(frames, ignore_index=True)
@@ -4,5 +4,14 @@ Build row structures and calculate row values
 """
 
 from .row_builder import RowBuilder, RowDef
+from .report_plan import ReportPlan, RowPlan, RowKind, ColumnMask, compile_report_plan
 
-__all__ = ['RowBuilder', 'RowDef']
+__all__ = [
+    'RowBuilder',
+    'RowDef',
+    'ReportPlan',
+    'RowPlan',
+    'RowKind',
+    'ColumnMask',
+    'compile_report_plan',
+]
@@ -0,0 +1,302 @@
+"""
+Report Plan
+Compile the row structure of a report once into an immutable, serializable plan
+
+The plan resolves everything DataWriter previously re-derived from label text
+on every run (and partly on every cell):
+- row kind (data / calculated / ratio / skip / blank)
+- GROUP, SUB_GROUP list and SERVICE_GROUP filter for data rows
+- calculation node (calculation type, GLGROUP formula or ratio type)
+- all_row_data storage key (main_group|label, previous|label, label)
+- style (bold, background color, percentage format)
+- column mask (tax / net profit rows show only the grand total)
+
+Plans are cached per (report type, detail level, common size, header color).
+
+Usage:
+    plan = compile_report_plan(config)
+    for row in plan.rows:
+        ...
+    json_text = plan.to_json()
+    same_plan = ReportPlan.from_json(json_text)
+"""
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+from typing import Dict, Optional, Tuple, Union
+import json
+import logging
+
+from .row_builder import RowBuilder
+
+logger = logging.getLogger(__name__)
+
+
+class RowKind:
+    """Row kinds in a compiled plan"""
+    BLANK = "blank"              # Empty spacer row
+    SKIP = "skip"                # Header row without data cells
+    RATIO = "ratio"              # สัดส่วนต่อรายได้ (context-dependent ratio)
+    CALCULATED = "calculated"    # Formula row
+    DATA = "data"                # Row read from CSV by GROUP/SUB_GROUP
+
+
+class ColumnMask:
+    """Which data columns of a row receive values"""
+    ALL = "all"
+    GRAND_TOTAL_ONLY = "grand_total_only"   # Others are grayed out
+
+
+# Row without data cells (section title of the ratio block)
+SKIP_CALCULATION_LABEL = "คำนวณสัดส่วนต้นทุนบริการต่อรายได้"
+
+# Ratio rows and the ratio type selected by the row above them
+RATIO_ROW_MARKER = "สัดส่วนต่อรายได้"
+RATIO_TYPES = {
+    "     1. ต้นทุนบริการรวม": "total_service_cost_ratio",
+    "     2. ต้นทุนบริการ - ค่าเสื่อมราคาฯ": "service_cost_no_depreciation_ratio",
+    "     3. ต้นทุนบริการ - ไม่รวมค่าใช้จ่ายบุคลากรและค่าเสื่อมราคาฯ": "service_cost_no_personnel_depreciation_ratio",
+}
+DEFAULT_RATIO_TYPE = "total_service_cost_ratio"
+
+# Rows shown only in GRAND_TOTAL (and its Common Size)
+TAX_ROW_COSTTYPE = "13.ภาษีเงินได้นิติบุคคล"
+TAX_ROW_GLGROUP_MARKER = "4.ภาษีเงินได้นิติบุคคล"
+NET_PROFIT_ROW_GLGROUP_MARKER = "5.กำไร(ขาดทุน) สุทธิ"
+
+# COSTTYPE net profit: None values outside GRAND_TOTAL get gray background
+NET_PROFIT_ROW_COSTTYPE = "14.กำไร(ขาดทุน) สุทธิ (12) - (13)"
+
+
+@dataclass(frozen=True)
+class RowPlan:
+    """
+    Compiled row
+
+    Attributes:
+        index: Position in the row order (0-based)
+        level: Indentation level
+        label: Row label text
+        kind: RowKind value
+        storage_key: Key of this row in DataWriter's all_row_data
+        main_group: Label of the current level-0 row (context)
+        previous_label: Label of the previous non-empty row
+        group: GROUP for data rows
+        sub_groups: SUB_GROUP values for data rows (empty = whole GROUP)
+        service_group_filter: SERVICE_GROUP filter (GLGROUP detail rows)
+        calc: Calculation type / formula / ratio type
+        is_bold: Bold text
+        color: Background color (hex without #)
+        is_percentage: Format data cells as percentage
+        column_mask: ColumnMask value
+        gray_none: Gray out None values outside GRAND_TOTAL
+        common_size: Row gets Common Size values
+    """
+    index: int
+    level: int
+    label: str
+    kind: str
+    storage_key: str
+    main_group: Optional[str] = None
+    previous_label: Optional[str] = None
+    group: Optional[str] = None
+    sub_groups: Tuple[str, ...] = ()
+    service_group_filter: Optional[str] = None
+    calc: Optional[str] = None
+    is_bold: bool = False
+    color: Optional[str] = None
+    is_percentage: bool = False
+    column_mask: str = ColumnMask.ALL
+    gray_none: bool = False
+    common_size: bool = False
+
+    @property
+    def sub_group_arg(self) -> Union[None, str, list]:
+        """SUB_GROUP in the form DataAggregator lookups expect (None, str or list)"""
+        if not self.sub_groups:
+            return None
+        if len(self.sub_groups) == 1:
+            return self.sub_groups[0]
+        return list(self.sub_groups)
+
+
+@dataclass(frozen=True)
+class ReportPlan:
+    """Compiled plan for one report type / detail level"""
+    report_type: str
+    detail_level: str
+    include_common_size: bool
+    rows: Tuple[RowPlan, ...]
+
+    def to_dict(self) -> Dict:
+        """Convert to a JSON-serializable dictionary"""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ReportPlan':
+        """Create plan from dictionary (inverse of to_dict)"""
+        rows = tuple(
+            RowPlan(**{**row, 'sub_groups': tuple(row.get('sub_groups', ()))})
+            for row in data['rows']
+        )
+        return cls(
+            report_type=data['report_type'],
+            detail_level=data['detail_level'],
+            include_common_size=data['include_common_size'],
+            rows=rows
+        )
+
+    def to_json(self) -> str:
+        """Serialize plan to JSON"""
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+
+    @classmethod
+    def from_json(cls, text: str) -> 'ReportPlan':
+        """Load plan from JSON"""
+        return cls.from_dict(json.loads(text))
+
+
+def compile_report_plan(config) -> ReportPlan:
+    """
+    Get the compiled plan for a report configuration (cached)
+
+    Args:
+        config: ReportConfig instance
+
+    Returns:
+        ReportPlan
+    """
+    return _compile_report_plan(
+        config.report_type.value,
+        config.detail_level.value,
+        bool(config.include_common_size),
+        config.row_colors.get('section_header', 'F8CBAD')
+    )
+
+
+@lru_cache(maxsize=32)
+def _compile_report_plan(
+    report_type: str,
+    detail_level: str,
+    include_common_size: bool,
+    section_header_color: str
+) -> ReportPlan:
+    from ..core.config import ReportConfig
+    from config.common_size_rows import should_have_common_size
+
+    config = ReportConfig(
+        report_type=report_type,
+        period_type="MTH",
+        detail_level=detail_level,
+        include_common_size=include_common_size
+    )
+    config.row_colors = {**config.row_colors, 'section_header': section_header_color}
+    row_defs = RowBuilder(config).build_rows()
+    is_glgroup = (report_type == "GLGROUP")
+
+    rows = []
+    main_group = None
+    previous_label = None
+
+    for index, row_def in enumerate(row_defs):
+        label = row_def.label
+
+        # Update main group context (empty level-0 rows reset it too)
+        if row_def.level == 0:
+            main_group = label
+
+        if not label:
+            rows.append(RowPlan(index=index, level=row_def.level, label=label,
+                                kind=RowKind.BLANK, storage_key=""))
+            continue
+
+        group = None
+        sub_groups: Tuple[str, ...] = ()
+        service_group_filter = None
+        calc = None
+
+        if label == SKIP_CALCULATION_LABEL:
+            kind = RowKind.SKIP
+        elif RATIO_ROW_MARKER in label:
+            kind = RowKind.RATIO
+            calc = RATIO_TYPES.get(previous_label, DEFAULT_RATIO_TYPE)
+        elif is_glgroup:
+            from config.data_mapping_glgroup import (
+                get_group_sub_group_glgroup,
+                is_calculated_row_glgroup
+            )
+            if is_calculated_row_glgroup(label):
+                kind = RowKind.CALCULATED
+                calc = row_def.formula
+            else:
+                kind = RowKind.DATA
+                mapping = get_group_sub_group_glgroup(label) or (None, None)
+                group = mapping[0] if len(mapping) > 0 else None
+                sub_groups = _as_tuple(mapping[1] if len(mapping) > 1 else None)
+                service_group_filter = mapping[2] if len(mapping) > 2 else None
+        else:
+            from config.data_mapping import (
+                get_group_sub_group,
+                is_calculated_row,
+                get_calculation_type
+            )
+            if is_calculated_row(label):
+                kind = RowKind.CALCULATED
+                calc = get_calculation_type(label)
+            else:
+                kind = RowKind.DATA
+                group, sub_group = get_group_sub_group(label, main_group)
+                sub_groups = _as_tuple(sub_group)
+
+        # all_row_data storage key
+        # Ratio rows share a label, so they are keyed by the row above;
+        # sub-items (level >= 1) are keyed by their main group
+        if kind == RowKind.RATIO and previous_label:
+            storage_key = f"{previous_label}|{label}"
+        elif row_def.level >= 1 and main_group:
+            storage_key = f"{main_group}|{label}"
+        else:
+            storage_key = label
+
+        grand_total_only = (
+            label == TAX_ROW_COSTTYPE
+            or TAX_ROW_GLGROUP_MARKER in label
+            or (NET_PROFIT_ROW_GLGROUP_MARKER in label and "(" in label)
+        )
+
+        rows.append(RowPlan(
+            index=index,
+            level=row_def.level,
+            label=label,
+            kind=kind,
+            storage_key=storage_key,
+            main_group=main_group,
+            previous_label=previous_label,
+            group=group,
+            sub_groups=sub_groups,
+            service_group_filter=service_group_filter,
+            calc=calc,
+            is_bold=row_def.is_bold,
+            color=row_def.color,
+            is_percentage=("สัดส่วน" in label),
+            column_mask=ColumnMask.GRAND_TOTAL_ONLY if grand_total_only else ColumnMask.ALL,
+            gray_none=(label == NET_PROFIT_ROW_COSTTYPE),
+            common_size=include_common_size and should_have_common_size(label, report_type)
+        ))
+        previous_label = label
+
+    logger.info(f"Compiled report plan: {report_type}/{detail_level} ({len(rows)} rows)")
+    return ReportPlan(
+        report_type=report_type,
+        detail_level=detail_level,
+        include_common_size=include_common_size,
+        rows=tuple(rows)
+    )
+
+
+def _as_tuple(sub_group) -> Tuple[str, ...]:
+    """Normalize SUB_GROUP mapping value (None / str / list) to a tuple"""
+    if sub_group is None:
+        return ()
+    if isinstance(sub_group, (list, tuple)):
+        return tuple(sub_group)
+    return (sub_group,)
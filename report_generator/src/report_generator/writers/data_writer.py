@@ -9,21 +9,35 @@ This is the most complex module - handles:
 - Context-aware ratio calculations (3 types)
 - Product-level calculations
 - Formatting based on row type
+
+Row semantics (kind, GROUP/SUB_GROUP, calculation, storage key, style,
+column mask) come from the compiled ReportPlan, so no label text is
+inspected while writing cells.
 """
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, FrozenSet, Optional, Tuple
+import numpy as np
 import pandas as pd
 from ..columns.base_column_builder import ColumnDef
-from ..rows.row_builder import RowDef
+from ..rows.report_plan import ReportPlan, RowPlan, RowKind, ColumnMask
+from ..core.value_sidecar import ValueSidecar
 from src.data_loader import DataAggregator
-from config.data_mapping import get_group_sub_group, is_calculated_row
-from config.common_size_rows import should_have_common_size
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Denominators smaller than this are treated as zero (cell left blank)
+ZERO_TOLERANCE = 1e-9
+
 
 class DataWriter:
     """Write all data rows"""
+
+    # Ratio type -> numerator row label (denominator is always "รายได้บริการ")
+    RATIO_NUMERATOR_LABELS = {
+        "total_service_cost_ratio": "     1. ต้นทุนบริการรวม",
+        "service_cost_no_depreciation_ratio": "     2. ต้นทุนบริการ - ค่าเสื่อมราคาฯ",
+        "service_cost_no_personnel_depreciation_ratio": "     3. ต้นทุนบริการ - ไม่รวมค่าใช้จ่ายบุคลากรและค่าเสื่อมราคาฯ",
+    }
     
     def __init__(self, config, formatter):
         """
@@ -42,7 +56,9 @@ class DataWriter:
         data: pd.DataFrame,
         aggregator: DataAggregator,
         columns: List[ColumnDef],
-        rows: List[RowDef]
+        plan: ReportPlan,
+        skip_rows: FrozenSet[int] = frozenset(),
+        sidecar: Optional[ValueSidecar] = None
     ) -> int:
         """
         Write all data rows
@@ -52,7 +68,11 @@ class DataWriter:
             data: Input dataframe
             aggregator: DataAggregator instance
             columns: List of ColumnDef
-            rows: List of RowDef
+            plan: Compiled ReportPlan (see rows.report_plan)
+            skip_rows: Plan indices not written (zero-activity pruning);
+                they are still computed in Pass 1 for calculated rows
+            sidecar: If given, every value written is also recorded there
+                (see core.value_sidecar)
         
         Returns:
             Next available row index
@@ -60,8 +80,6 @@ class DataWriter:
         start_row = self.config.start_row + self.config.header_rows
         start_col = self.config.start_col
         
-        current_row = start_row
-        
         # Build BU list and service group dict
         from src.data_loader import DataProcessor
         data_processor = DataProcessor()
@@ -70,178 +88,172 @@ class DataWriter:
         for bu in bu_list:
             service_group_dict[bu] = data_processor.get_unique_service_groups(data, bu)
         
+        is_glgroup = (plan.report_type == "GLGROUP")
+
         # Store all row data for calculated rows
         all_row_data = {}
         
-        # Track current main group context
-        current_main_group_label = None
-        previous_label = None
-        
         # ========================================
         # PASS 1: Build all_row_data dictionary
         # ========================================
         logger.info("Pass 1: Building all row data for Common Size calculation...")
-        for row_def in rows:
-            label = row_def.label
-            
-            # Update main group context
-            if row_def.level == 0:
-                current_main_group_label = label
-                logger.debug(f"Updated main_group_label to: {current_main_group_label}")
-            
-            # Skip empty rows
-            if not label:
+        for row in plan.rows:
+            if row.kind == RowKind.BLANK:
                 continue
-            
-            # Debug: Log expense sub-item processing
-            if row_def.level == 1 and "ค่าใช้จ่ายตอบแทนแรงงาน" in label:
-                logger.info(f"Processing '{label}' under main_group='{current_main_group_label}'")
-            
-            # Get row data - detect report type
-            is_ratio_row = (label == "สัดส่วนต่อรายได้" or "สัดส่วนต่อรายได้" in label)
-            skip_calculation = (label == "คำนวณสัดส่วนต้นทุนบริการต่อรายได้")
-            
-            # Detect report type
-            is_glgroup = (self.config.report_type.value == "GLGROUP")
-            
-            if skip_calculation:
-                row_data = {}
-            elif is_ratio_row:
-                # Context-aware ratio calculation (COSTTYPE only)
-                ratio_type = self._get_ratio_type(previous_label)
-                row_data = aggregator._calculate_ratio_by_type(
-                    ratio_type,
-                    all_row_data,
-                    bu_list,
-                    service_group_dict
-                )
-            elif is_glgroup:
-                # GLGROUP methods
-                from config.data_mapping_glgroup import is_calculated_row_glgroup
-                is_calc = is_calculated_row_glgroup(label)
-                if is_calc:
-                    row_data = aggregator.calculate_summary_row_glgroup(
-                        label,
-                        bu_list,
-                        service_group_dict,
-                        all_row_data
-                    )
-                else:
-                    row_data = aggregator.get_row_data_glgroup(
-                        label,
-                        bu_list,
-                        service_group_dict
-                    )
-            elif is_calculated_row(label):
-                # Calculated row (COSTTYPE)
-                row_data = aggregator.calculate_summary_row(
-                    label,
-                    bu_list,
-                    service_group_dict,
-                    all_row_data
-                )
-            else:
-                # Regular data row (COSTTYPE)
-                row_data = aggregator.get_row_data(
-                    label,
-                    current_main_group_label,
-                    bu_list,
-                    service_group_dict
-                )
-            
-            # Store row data
-            # For ratio rows, use previous_label to create unique composite key
-            # (since multiple ratio rows share the same label under different parents)
-            if is_ratio_row and previous_label:
-                storage_key = f"{previous_label}|{label}"
-                all_row_data[storage_key] = row_data
-            # For sub-items (level >= 1), use main_group composite key
-            elif row_def.level >= 1 and current_main_group_label:
-                storage_key = f"{current_main_group_label}|{label}"
-                all_row_data[storage_key] = row_data
-            else:
-                all_row_data[label] = row_data
-            previous_label = label
+            all_row_data[row.storage_key] = self._build_row_data(
+                row,
+                aggregator,
+                all_row_data,
+                bu_list,
+                service_group_dict,
+                is_glgroup
+            )
         
         logger.info(f"Pass 1 complete: Built {len(all_row_data)} rows of data")
+
+        # Column vectors used by whole-row Common Size / ratio calculations
+        data_columns = [c for c in columns if c.col_type != 'label']
+        column_flags = self._column_flags(data_columns)
+        common_size_keys = self._common_size_keys(data_columns)
+        revenue_vector = self._total_revenue_vector(all_row_data, common_size_keys)
+        product_columns = [
+            (idx, f"{col.bu}_{col.service_group}_{col.product_key}")
+            for idx, col in enumerate(data_columns)
+            if col.col_type == 'product'
+        ]
         
         # ========================================
         # PASS 2: Write all rows to Excel
         # ========================================
         logger.info("Pass 2: Writing data to Excel...")
         current_row = start_row
-        current_main_group_label = None
-        previous_label = None
         
         # Write each row
-        for row_def in rows:
-            label = row_def.label
-            
-            # Update main group context
-            if row_def.level == 0:
-                current_main_group_label = label
-            
+        for row in plan.rows:
+            # Pruned rows take no space
+            if row.index in skip_rows:
+                continue
+
             # Handle empty rows
-            if not label:
+            if row.kind == RowKind.BLANK:
                 current_row += 1
                 continue
             
             # Write label cell
             self._write_label_cell(
                 ws,
-                label,
-                row_def,
+                row.label,
+                row,
                 current_row,
                 start_col
             )
             
             # Get row data from pre-built all_row_data (Pass 1)
-            # Detect ratio row
-            is_ratio_row_pass2 = ("สัดส่วนต่อรายได้" in label)
-
-            # For ratio rows, use previous_label to lookup composite key
-            if is_ratio_row_pass2 and previous_label:
-                lookup_key = f"{previous_label}|{label}"
-                row_data = all_row_data.get(lookup_key, {})
-            # For sub-items (level >= 1), use main_group composite key
-            elif row_def.level >= 1 and current_main_group_label:
-                lookup_key = f"{current_main_group_label}|{label}"
-                row_data = all_row_data.get(lookup_key, {})
-            else:
-                row_data = all_row_data.get(label, {})
-            
-            # Detect skip calculation and ratio row
-            skip_calculation = (label == "คำนวณสัดส่วนต้นทุนบริการต่อรายได้")
-            is_ratio_row = ("สัดส่วนต่อรายได้" in label)
+            row_data = all_row_data.get(row.storage_key, {})
             
             # Write data cells (skip if skip_calculation)
-            if not skip_calculation:
+            if row.kind != RowKind.SKIP:
+                # Whole-row vector calculations (Common Size, product ratios)
+                precomputed = self._calculate_common_size_row(
+                    row, row_data, common_size_keys, revenue_vector
+                )
+                if row.kind == RowKind.RATIO and not is_glgroup and product_columns:
+                    precomputed.update(self._calculate_product_ratio_row(
+                        row.calc, product_columns, all_row_data
+                    ))
+
                 self._write_data_cells(
                     ws,
-                    columns,
+                    data_columns,
+                    column_flags,
                     row_data,
-                    row_def,
-                    label,
-                    is_ratio_row,
+                    row,
                     current_row,
                     start_col,
                     aggregator,
                     all_row_data,
-                    current_main_group_label,
-                    previous_label
+                    is_glgroup,
+                    precomputed,
+                    sidecar
                 )
             
-            previous_label = label
             current_row += 1
         
-        logger.info(f"Wrote {len([r for r in rows if r.label])} data rows")
+        written = [r for r in plan.rows if r.kind != RowKind.BLANK and r.index not in skip_rows]
+        logger.info(f"Wrote {len(written)} data rows")
         return current_row
+
+    def _build_row_data(
+        self,
+        row: RowPlan,
+        aggregator: DataAggregator,
+        all_row_data: Dict,
+        bu_list: List[str],
+        service_group_dict: Dict[str, List[str]],
+        is_glgroup: bool
+    ) -> Dict[str, float]:
+        """
+        Get row data for one plan row (Pass 1)
+
+        Args:
+            row: Compiled row
+            aggregator: DataAggregator
+            all_row_data: Rows built so far (for calculated rows)
+            bu_list: List of BUs
+            service_group_dict: Dict mapping BU to list of service groups
+            is_glgroup: GLGROUP report
+
+        Returns:
+            Dict mapping column identifiers to values
+        """
+        if row.kind == RowKind.SKIP:
+            return {}
+
+        if row.kind == RowKind.RATIO:
+            # Context-aware ratio calculation (COSTTYPE only)
+            return aggregator._calculate_ratio_by_type(
+                row.calc,
+                all_row_data,
+                bu_list,
+                service_group_dict
+            )
+
+        if is_glgroup:
+            if row.kind == RowKind.CALCULATED:
+                return aggregator.calculate_summary_row_glgroup(
+                    row.label,
+                    bu_list,
+                    service_group_dict,
+                    all_row_data
+                )
+            return aggregator.get_row_data_glgroup(
+                row.label,
+                bu_list,
+                service_group_dict
+            )
+
+        if row.kind == RowKind.CALCULATED:
+            # Calculated row (COSTTYPE)
+            return aggregator.calculate_summary_row(
+                row.label,
+                bu_list,
+                service_group_dict,
+                all_row_data
+            )
+
+        # Regular data row (COSTTYPE) - GROUP/SUB_GROUP resolved by the plan
+        return aggregator.get_row_data_by_group(
+            row.group,
+            row.sub_group_arg,
+            bu_list,
+            service_group_dict
+        )
     
     def _write_label_cell(
         self,
         ws,
         label: str,
-        row_def: RowDef,
+        row: RowPlan,
         row_index: int,
         start_col: int
     ):
@@ -251,143 +263,111 @@ class DataWriter:
         self.formatter.format_label_cell(
             cell,
             label,
-            is_bold=row_def.is_bold,
-            bg_color=row_def.color
+            is_bold=row.is_bold,
+            bg_color=row.color
         )
+
+    @staticmethod
+    def _column_flags(data_columns: List[ColumnDef]) -> List[Tuple[bool, bool, bool]]:
+        """
+        Resolve per-column flags once per report
+
+        Returns:
+            List of (is_grand_total, shown_in_grand_total_only_rows, is_common_size)
+            aligned with data_columns
+        """
+        return [
+            (
+                col.col_type == 'grand_total',
+                col.col_type == 'grand_total' or (col.col_type == 'common_size' and col.bu is None),
+                col.col_type == 'common_size',
+            )
+            for col in data_columns
+        ]
     
     def _write_data_cells(
         self,
         ws,
-        columns: List[ColumnDef],
+        data_columns: List[ColumnDef],
+        column_flags: List[Tuple[bool, bool, bool]],
         row_data: Dict[str, float],
-        row_def: RowDef,
-        label: str,
-        is_ratio_row: bool,
+        row: RowPlan,
         row_index: int,
         start_col: int,
         aggregator: DataAggregator,
         all_row_data: Dict,
-        current_main_group_label: str,
-        previous_label: str
+        is_glgroup: bool,
+        precomputed: Optional[Dict[int, Optional[float]]] = None,
+        sidecar: Optional[ValueSidecar] = None
     ):
-        """Write all data cells for this row"""
-        
-        # Skip label column
-        data_columns = [c for c in columns if c.col_type != 'label']
+        """
+        Write all data cells for this row
 
-        # CRITICAL: Row 13 (COSTTYPE) - only show in GRAND_TOTAL column
-        is_tax_row_costtype = (label == "13.ภาษีเงินได้นิติบุคคล")
-        
-        # GLGROUP special rows
-        is_tax_row_glgroup = ("4.ภาษีเงินได้นิติบุคคล" in label)
-        is_net_profit_row_glgroup = ("5.กำไร(ขาดทุน) สุทธิ" in label and "(" in label)
+        precomputed maps data column index -> value for cells already
+        calculated as a whole row (Common Size and product ratio columns).
+        sidecar records each written value (grayed-out cells are not values).
+        """
+        precomputed = precomputed or {}
+
+        # Tax / net profit rows - only GRAND_TOTAL and its Common Size (col.bu = None)
+        grand_total_only = (row.column_mask == ColumnMask.GRAND_TOTAL_ONLY)
+        gray_none_color = self.config.row_colors.get('gray_none', 'A6A6A6')
         
         for idx, col in enumerate(data_columns):
             col_index = start_col + idx + 1  # +1 for label column
+            is_grand_total, shown_in_grand_total_only, is_common_size = column_flags[idx]
+            cell = ws.cell(row=row_index + 1, column=col_index + 1)
 
-            # Tax row COSTTYPE - only show GRAND_TOTAL and its Common Size (col.bu = None)
-            if is_tax_row_costtype:
-                if col.col_type == 'grand_total':
-                    # Allow grand_total to proceed normally
-                    pass
-                elif col.col_type == 'common_size' and col.bu is None:
-                    # Allow grand total's common size to proceed normally
-                    pass
-                else:
-                    # Gray out all other columns (including BU-specific common sizes)
-                    cell = ws.cell(row=row_index + 1, column=col_index + 1)
-                    self.formatter.format_data_cell(
-                        cell,
-                        value=None,
-                        is_bold=row_def.is_bold,
-                        bg_color='A6A6A6',
-                        is_percentage=False
-                    )
-                    continue
-            
-            # Tax row GLGROUP - only show GRAND_TOTAL and its Common Size (col.bu = None)
-            if is_tax_row_glgroup:
-                if col.col_type == 'grand_total':
-                    # Allow grand_total to proceed normally
-                    pass
-                elif col.col_type == 'common_size' and col.bu is None:
-                    # Allow grand total's common size to proceed normally
-                    pass
-                else:
-                    # Gray out all other columns (including BU-specific common sizes)
-                    cell = ws.cell(row=row_index + 1, column=col_index + 1)
-                    self.formatter.format_data_cell(
-                        cell,
-                        value=None,
-                        is_bold=row_def.is_bold,
-                        bg_color='A6A6A6',
-                        is_percentage=False
-                    )
-                    continue
-            
-            # Net Profit row GLGROUP - only show GRAND_TOTAL and its Common Size (col.bu = None)
-            if is_net_profit_row_glgroup:
-                if col.col_type == 'grand_total':
-                    # Allow grand_total to proceed normally
-                    pass
-                elif col.col_type == 'common_size' and col.bu is None:
-                    # Allow grand total's common size to proceed normally
-                    pass
-                else:
-                    # Gray out all other columns (including BU-specific common sizes)
-                    cell = ws.cell(row=row_index + 1, column=col_index + 1)
-                    self.formatter.format_data_cell(
-                        cell,
-                        value=None,
-                        is_bold=row_def.is_bold,
-                        bg_color='A6A6A6',
-                        is_percentage=False
-                    )
-                    continue
+            if grand_total_only and not shown_in_grand_total_only:
+                # Gray out all other columns (including BU-specific common sizes)
+                self.formatter.format_data_cell(
+                    cell,
+                    value=None,
+                    is_bold=row.is_bold,
+                    bg_color='A6A6A6',
+                    is_percentage=False
+                )
+                continue
             
             # Get value for this cell
-            value = self._get_cell_value(
-                col,
-                row_data,
-                label,
-                is_ratio_row,
-                aggregator,
-                all_row_data,
-                current_main_group_label,
-                previous_label
-            )
-            
-            # Write cell
-            cell = ws.cell(row=row_index + 1, column=col_index + 1)
-            
-            # Determine if percentage
-            is_percentage = "สัดส่วน" in label or col.col_type == 'common_size'
+            if idx in precomputed:
+                value = precomputed[idx]
+            else:
+                value = self._get_cell_value(
+                    col,
+                    row_data,
+                    row,
+                    aggregator,
+                    all_row_data,
+                    is_glgroup
+                )
             
             # Special handling for None values in specific rows
-            bg_color = row_def.color
-            if (value is None and 
-                col.col_type != 'grand_total' and 
-                label == "14.กำไร(ขาดทุน) สุทธิ (12) - (13)"):
-                bg_color = self.config.row_colors.get('gray_none', 'A6A6A6')
+            bg_color = row.color
+            if value is None and row.gray_none and not is_grand_total:
+                bg_color = gray_none_color
             
             self.formatter.format_data_cell(
                 cell,
                 value,
-                is_bold=row_def.is_bold,
+                is_bold=row.is_bold,
                 bg_color=bg_color,
-                is_percentage=is_percentage
+                is_percentage=row.is_percentage or is_common_size
             )
+            if sidecar is not None:
+                sidecar.add(
+                    row, col, row_index + 1, col_index + 1, value,
+                    is_percentage=row.is_percentage or is_common_size
+                )
     
     def _get_cell_value(
         self,
         col: ColumnDef,
         row_data: Dict[str, float],
-        label: str,
-        is_ratio_row: bool,
+        row: RowPlan,
         aggregator: DataAggregator,
         all_row_data: Dict,
-        current_main_group_label: str,
-        previous_label: str
+        is_glgroup: bool
     ) -> Optional[float]:
         """
         Get value for a specific cell
@@ -395,12 +375,10 @@ class DataWriter:
         Args:
             col: Column definition
             row_data: Row data from aggregator
-            label: Row label
-            is_ratio_row: Whether this is ratio row
+            row: Compiled row
             aggregator: DataAggregator
             all_row_data: All row data (for product calculations)
-            current_main_group_label: Main group context
-            previous_label: Previous row label
+            is_glgroup: GLGROUP report
 
         Returns:
             Cell value or None
@@ -411,9 +389,6 @@ class DataWriter:
 
         col_type = col.col_type
 
-        # Detect report type
-        is_glgroup = (self.config.report_type.value == "GLGROUP")
-
         if col_type == 'grand_total':
             return row_data.get('GRAND_TOTAL', 0)
 
@@ -422,8 +397,8 @@ class DataWriter:
             return row_data.get(key, 0)
         
         elif col_type == 'common_size':
-            # Common Size column - calculate percentage of รายได้รวม
-            return self._calculate_common_size(col, row_data, all_row_data, label)
+            # Common Size column - calculated per row in _calculate_common_size_row
+            return None
 
         elif col_type == 'satellite_summary':
             # NEW: Handle SATELLITE summary column
@@ -434,17 +409,13 @@ class DataWriter:
                 return row_data.get(summary_key, 0)
 
             # Fallback: use _get_satellite_summary_value (for rows not in row_data)
-            value = self._get_satellite_summary_value(
+            return self._get_satellite_summary_value(
                 col,
-                label,
+                row,
                 aggregator,
                 all_row_data,
-                current_main_group_label
+                is_glgroup
             )
-            # Debug logging for ratio rows
-            if "สัดส่วน" in label or "ต้นทุนบริการรวม" in label:
-                logger.debug(f"satellite_summary for '{label}': {value}")
-            return value
 
         elif col_type == 'sg_total' or col_type == 'sg':
             # GLGROUP uses SG_TOTAL_{bu}_{sg}, COSTTYPE uses {bu}_{sg}
@@ -459,19 +430,15 @@ class DataWriter:
                 return self._get_product_value_glgroup(
                     col,
                     row_data,
-                    label,
-                    is_ratio_row,
+                    row,
                     all_row_data
                 )
             else:
                 return self._get_product_value(
                     col,
-                    label,
-                    is_ratio_row,
+                    row,
                     aggregator,
-                    all_row_data,
-                    current_main_group_label,
-                    previous_label
+                    all_row_data
                 )
 
         return None
@@ -479,78 +446,62 @@ class DataWriter:
     def _get_product_value(
         self,
         col: ColumnDef,
-        label: str,
-        is_ratio_row: bool,
+        row: RowPlan,
         aggregator: DataAggregator,
-        all_row_data: Dict,
-        current_main_group_label: str,
-        previous_label: str
+        all_row_data: Dict
     ) -> Optional[float]:
         """
         Get product-level value
         
-        For ratio rows: Calculate ratio for this specific product
-        For other rows: Use aggregator.calculate_product_value()
+        For ratio rows: Calculated per row in _calculate_product_ratio_row
+        For data rows: Lookup by the plan's GROUP/SUB_GROUP
+        For calculated rows: Use aggregator.calculate_product_value()
         
         Args:
             col: Column definition
-            label: Row label
-            is_ratio_row: Whether this is ratio row
+            row: Compiled row
             aggregator: DataAggregator
             all_row_data: All row data
-            current_main_group_label: Main group context
-            previous_label: Previous row label
         
         Returns:
             Product value or None
         """
-        product_key_str = f"{col.bu}_{col.service_group}_{col.product_key}"
-        
-        if is_ratio_row:
-            # Calculate ratio for this specific product
-            ratio_type = self._get_ratio_type(previous_label)
-
-            if ratio_type == "total_service_cost_ratio":
-                service_revenue = (all_row_data.get("รายได้บริการ") or {}).get(product_key_str, 0)
-                total_cost = (all_row_data.get("     1. ต้นทุนบริการรวม") or {}).get(product_key_str, 0)
-                return total_cost / service_revenue if abs(service_revenue) >= 1e-9 else None
-
-            elif ratio_type == "service_cost_no_depreciation_ratio":
-                service_revenue = (all_row_data.get("รายได้บริการ") or {}).get(product_key_str, 0)
-                cost_no_dep = (all_row_data.get("     2. ต้นทุนบริการ - ค่าเสื่อมราคาฯ") or {}).get(product_key_str, 0)
-                return cost_no_dep / service_revenue if abs(service_revenue) >= 1e-9 else None
+        if row.kind == RowKind.RATIO:
+            # Ratio rows are calculated per row in _calculate_product_ratio_row
+            return None
 
-            elif ratio_type == "service_cost_no_personnel_depreciation_ratio":
-                service_revenue = (all_row_data.get("รายได้บริการ") or {}).get(product_key_str, 0)
-                cost_no_pers_dep = (all_row_data.get("     3. ต้นทุนบริการ - ไม่รวมค่าใช้จ่ายบุคลากรและค่าเสื่อมราคาฯ") or {}).get(product_key_str, 0)
-                return cost_no_pers_dep / service_revenue if abs(service_revenue) >= 1e-9 else None
+        product_key_str = f"{col.bu}_{col.service_group}_{col.product_key}"
 
-            return None
-        
+        if row.kind == RowKind.DATA:
+            value = (
+                aggregator.get_value_by_product(
+                    row.group, row.sub_group_arg, col.bu, col.service_group, col.product_key
+                )
+                if row.group else 0
+            )
         else:
-            # Regular product value
             value = aggregator.calculate_product_value(
-                label,
+                row.label,
                 col.bu,
                 col.service_group,
                 col.product_key,
                 all_row_data,
-                current_main_group_label
+                row.main_group
             )
-            
-            # Store product-level value for calculated rows
-            if label not in all_row_data:
-                all_row_data[label] = {}
-            all_row_data[label][product_key_str] = value
-            
-            return value
+        
+        # Store product-level value for calculated rows
+        label = row.label
+        if label not in all_row_data:
+            all_row_data[label] = {}
+        all_row_data[label][product_key_str] = value
+        
+        return value
     
     def _get_product_value_glgroup(
         self,
         col: ColumnDef,
         row_data: Dict[str, float],
-        label: str,
-        is_ratio_row: bool,
+        row: RowPlan,
         all_row_data: Dict
     ) -> Optional[float]:
         """
@@ -562,14 +513,14 @@ class DataWriter:
         Args:
             col: Column definition
             row_data: Row data from aggregator (for current row)
-            label: Row label
-            is_ratio_row: Whether this is ratio row
+            row: Compiled row
             all_row_data: All row data (for calculated rows)
         
         Returns:
             Product value or None
         """
         product_key_str = f"PRODUCT_{col.bu}_{col.service_group}_{col.product_key}"
+        label = row.label
         
         # ALWAYS try to get from row_data first (works for both regular and calculated rows)
         # Because calculate_summary_row_glgroup() already computed product-level values
@@ -584,13 +535,11 @@ class DataWriter:
             return value
         
         # Fallback: Check if this is a calculated row that needs recalculation
-        from config.data_mapping_glgroup import is_calculated_row_glgroup
-        
-        if is_calculated_row_glgroup(label):
+        if row.kind == RowKind.CALCULATED:
             # For calculated rows that don't have value in row_data,
             # try to calculate from component rows
             return self._calculate_product_value_glgroup(
-                col, label, all_row_data
+                col, row.calc, all_row_data
             )
         else:
             # Regular data row - get from row_data (default 0 if not found)
@@ -606,10 +555,10 @@ class DataWriter:
     def _get_satellite_summary_value(
         self,
         col: ColumnDef,
-        label: str,
+        row: RowPlan,
         aggregator: DataAggregator,
         all_row_data: Dict,
-        current_main_group_label: str
+        is_glgroup: bool
     ) -> Optional[float]:
         """
         Get value for SATELLITE summary column (sum of 4.5.1 + 4.5.2)
@@ -618,43 +567,28 @@ class DataWriter:
 
         Args:
             col: Column definition
-            label: Row label
+            row: Compiled row
             aggregator: DataAggregator
             all_row_data: All row data (for calculated rows)
-            current_main_group_label: Main group context
+            is_glgroup: GLGROUP report
 
         Returns:
             Sum of SATELLITE service groups
         """
-        import sys
-        from pathlib import Path
-
-        # Add config path
-        sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
-        from config.data_mapping import get_group_sub_group, is_calculated_row
-        from config.satellite_config import get_satellite_service_group_names
-
-        # Check report type first
-        from config.report_config import ReportType
-        # Handle both enum and string types
-        if isinstance(self.config.report_type, str):
-            is_glgroup = self.config.report_type == "GLGROUP"
-        else:
-            is_glgroup = self.config.report_type == ReportType.GLGROUP
+        from config.satellite_config import SATELLITE_SUMMARY_ID
+        summary_key = f"{col.bu}_{SATELLITE_SUMMARY_ID}"
+        label = row.label
 
         if is_glgroup:
             # GLGROUP - ALWAYS use all_row_data (all GLGROUP rows are aggregated)
-            from config.satellite_config import SATELLITE_SUMMARY_ID
-            summary_key = f"{col.bu}_{SATELLITE_SUMMARY_ID}"
-
             # Use flexible lookup with main_group context
             if label in all_row_data:
                 row_dict = all_row_data[label]
             else:
                 row_dict = {}
                 # Try exact composite key first (main_group|label)
-                if current_main_group_label:
-                    exact_key = f"{current_main_group_label}|{label}"
+                if row.main_group:
+                    exact_key = f"{row.main_group}|{label}"
                     if exact_key in all_row_data:
                         row_dict = all_row_data[exact_key]
 
@@ -669,44 +603,36 @@ class DataWriter:
             if value is None:
                 return 0
             return value
-        else:
-            # COSTTYPE - check if calculated or data row
-            calculated = is_calculated_row(label)
-
-            if calculated:
-                # Calculated row - use satellite summary key directly
-                from config.satellite_config import SATELLITE_SUMMARY_ID
-                summary_key = f"{col.bu}_{SATELLITE_SUMMARY_ID}"
-
-                # Use flexible lookup to handle composite keys
-                # Try direct key first
-                if label in all_row_data:
-                    row_dict = all_row_data[label]
-                else:
-                    # Try composite keys (main_group|label)
-                    row_dict = {}
-                    for storage_key in all_row_data:
-                        if storage_key.endswith(f"|{label}"):
-                            row_dict = all_row_data[storage_key]
-                            break
+        elif row.kind != RowKind.DATA:
+            # COSTTYPE calculated / ratio row - use satellite summary key directly
+            # Use flexible lookup to handle composite keys
+            # Try direct key first
+            if label in all_row_data:
+                row_dict = all_row_data[label]
+            else:
+                # Try composite keys (main_group|label)
+                row_dict = {}
+                for storage_key in all_row_data:
+                    if storage_key.endswith(f"|{label}"):
+                        row_dict = all_row_data[storage_key]
+                        break
 
-                value = row_dict.get(summary_key, 0)
+            value = row_dict.get(summary_key, 0)
 
-                # Handle None values
-                if value is None:
-                    return 0
-                return value
-            else:
-                # Data row - use aggregator
-                group, sub_group = get_group_sub_group(label, current_main_group_label)
-                if group:
-                    return aggregator.get_satellite_summary(group, sub_group, col.bu)
+            # Handle None values
+            if value is None:
                 return 0
+            return value
+        else:
+            # COSTTYPE data row - use aggregator
+            if row.group:
+                return aggregator.get_satellite_summary(row.group, row.sub_group_arg, col.bu)
+            return 0
 
     def _calculate_product_value_glgroup(
         self,
         col: ColumnDef,
-        label: str,
+        formula: Optional[str],
         all_row_data: Dict
     ) -> Optional[float]:
         """
@@ -714,23 +640,14 @@ class DataWriter:
         
         Args:
             col: Column definition
-            label: Row label (calculated row)
+            formula: Row formula from the plan (ROW_ORDER_GLGROUP)
             all_row_data: All row data
         
         Returns:
             Calculated value or 0
         """
-        from config.row_order_glgroup import ROW_ORDER_GLGROUP
-        
         product_key_str = f"PRODUCT_{col.bu}_{col.service_group}_{col.product_key}"
         
-        # Find formula for this row
-        formula = None
-        for level, row_label, is_calc, calc_formula, is_bold in ROW_ORDER_GLGROUP:
-            if row_label == label and is_calc:
-                formula = calc_formula
-                break
-        
         if not formula:
             return 0
         
@@ -842,96 +759,135 @@ class DataWriter:
                 total += row_data.get(product_key_str, 0)
         return total
     
-    def _get_ratio_type(self, previous_label: str) -> str:
+    def _common_size_keys(self, data_columns: List[ColumnDef]) -> List[Tuple[int, str]]:
         """
-        Determine ratio calculation type based on previous row
-        
-        Args:
-            previous_label: Previous row label
-        
-        Returns:
-            Ratio type string
+        Get (data column index, row_data key) for each Common Size column
+
+        Grand total Common Size (col.bu = None) reads GRAND_TOTAL,
+        BU Common Size reads BU_TOTAL_{bu}.
         """
-        if previous_label == "     1. ต้นทุนบริการรวม":
-            return "total_service_cost_ratio"
-        elif previous_label == "     2. ต้นทุนบริการ - ค่าเสื่อมราคาฯ":
-            return "service_cost_no_depreciation_ratio"
-        elif previous_label == "     3. ต้นทุนบริการ - ไม่รวมค่าใช้จ่ายบุคลากรและค่าเสื่อมราคาฯ":
-            return "service_cost_no_personnel_depreciation_ratio"
-        return "total_service_cost_ratio"  # Default
-    
-    def _calculate_common_size(self, col: ColumnDef, row_data: Dict[str, float], all_row_data: Dict, label: str) -> Optional[float]:
+        return [
+            (idx, 'GRAND_TOTAL' if col.bu is None else f'BU_TOTAL_{col.bu}')
+            for idx, col in enumerate(data_columns)
+            if col.col_type == 'common_size'
+        ]
+
+    def _total_revenue_vector(
+        self,
+        all_row_data: Dict,
+        common_size_keys: List[Tuple[int, str]]
+    ) -> Optional[np.ndarray]:
         """
-        Calculate Common Size (percentage of รายได้รวม)
+        Build รายได้รวม vector aligned with the Common Size columns
 
         Args:
-            col: Column definition
-            row_data: Current row data
-            all_row_data: All row data
-            label: Row label
+            all_row_data: All row data (Pass 1)
+            common_size_keys: Output of _common_size_keys
 
         Returns:
-            Common size value (as decimal, e.g., 0.42 for 42%) or None
+            Revenue array, or None if there are no Common Size columns or no revenue row
         """
-        # Don't calculate common size for "สัดส่วนต่อรายได้" rows
-        if "สัดส่วนต่อรายได้" in label:
+        if not common_size_keys:
             return None
-        
-        # CRITICAL: Rows 4 & 5 (GLGROUP ONLY) - Common Size ONLY in Grand Total column
-        # For product keys (BU-specific columns), return None
-        # IMPORTANT: Only apply this rule for GLGROUP reports!
-        is_glgroup = (self.config.report_type.value == "GLGROUP")
-        
-        if is_glgroup:
-            is_tax_row_glgroup = ("4.ภาษีเงินได้นิติบุคคล" in label)
-            is_net_profit_row_glgroup = ("5.กำไร(ขาดทุน) สุทธิ" in label and "(" in label)
-            
-            if (is_tax_row_glgroup or is_net_profit_row_glgroup) and col.bu is not None:
-                # This is a product key column (not Grand Total) - don't calculate common size
-                return None
-        
+
         # Get รายได้รวม (total revenue) - try both COSTTYPE and GLGROUP labels
         total_revenue_labels = [
             "รายได้รวม",      # COSTTYPE and GLGROUP (preferred)
             "1 รวมรายได้",    # GLGROUP alternative
         ]
-        
+
         total_revenue_data = None
         for rev_label in total_revenue_labels:
             if rev_label in all_row_data:
                 total_revenue_data = all_row_data[rev_label]
                 break
-        
+
         if not total_revenue_data:
-            # If no total revenue data found yet, return None
-            # This will happen for rows before "รายได้รวม" row
             return None
-        
-        # Get current row value based on column type
-        if col.bu is None:
-            # Grand total common size
-            current_value = row_data.get('GRAND_TOTAL', 0) if row_data else 0
-            total_revenue = total_revenue_data.get('GRAND_TOTAL', 0)
-        else:
-            # BU-specific common size
-            current_value = row_data.get(f'BU_TOTAL_{col.bu}', 0) if row_data else 0
-            total_revenue = total_revenue_data.get(f'BU_TOTAL_{col.bu}', 0)
-        
-        # Handle None values (convert to 0)
-        if current_value is None:
-            current_value = 0
-        if total_revenue is None:
-            total_revenue = 0
-        
-        # Calculate percentage
-        if abs(total_revenue) < 1e-9:  # Avoid division by zero
-            return None
-        
-        # Return percentage (will be formatted as % by Excel)
-        result = current_value / total_revenue
-        
-        # Return None for zero values (will display as blank)
-        if abs(result) < 1e-9:
-            return None
-        
+
+        return self._row_vector(total_revenue_data, [key for _, key in common_size_keys])
+
+    @staticmethod
+    def _row_vector(row_data: Optional[Dict[str, float]], keys: List[str]) -> np.ndarray:
+        """Gather row_data values for keys into a float array (missing/None -> 0)"""
+        row_data = row_data or {}
+        return np.array([row_data.get(key) or 0 for key in keys], dtype=float)
+
+    @staticmethod
+    def _safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+        """Element-wise division; NaN where |denominator| < ZERO_TOLERANCE"""
+        result = np.full(numerator.shape, np.nan)
+        np.divide(numerator, denominator, out=result, where=np.abs(denominator) >= ZERO_TOLERANCE)
         return result
+
+    def _calculate_common_size_row(
+        self,
+        row: RowPlan,
+        row_data: Dict[str, float],
+        common_size_keys: List[Tuple[int, str]],
+        revenue_vector: Optional[np.ndarray]
+    ) -> Dict[int, Optional[float]]:
+        """
+        Calculate Common Size (percentage of รายได้รวม) for all Common Size columns of a row
+
+        Args:
+            row: Compiled row
+            row_data: Current row data
+            common_size_keys: Output of _common_size_keys
+            revenue_vector: Output of _total_revenue_vector
+
+        Returns:
+            Dict of data column index -> value (as decimal, e.g., 0.42 for 42%) or None
+        """
+        if not common_size_keys:
+            return {}
+
+        blank = {idx: None for idx, _ in common_size_keys}
+        if revenue_vector is None or not row.common_size:
+            return blank
+
+        current = self._row_vector(row_data, [key for _, key in common_size_keys])
+        result = self._safe_divide(current, revenue_vector)
+
+        # Return None for zero / undefined values (will display as blank)
+        blank_mask = np.isnan(result) | (np.abs(result) < ZERO_TOLERANCE)
+
+        # CRITICAL: Tax / net profit rows - Common Size ONLY in Grand Total column
+        if row.column_mask == ColumnMask.GRAND_TOTAL_ONLY:
+            blank_mask |= np.array([key != 'GRAND_TOTAL' for _, key in common_size_keys])
+
+        return {
+            idx: (None if is_blank else value)
+            for (idx, _), value, is_blank in zip(common_size_keys, result.tolist(), blank_mask.tolist())
+        }
+
+    def _calculate_product_ratio_row(
+        self,
+        ratio_type: str,
+        product_columns: List[Tuple[int, str]],
+        all_row_data: Dict
+    ) -> Dict[int, Optional[float]]:
+        """
+        Calculate a COSTTYPE ratio row (cost / รายได้บริการ) for all product columns
+
+        Args:
+            ratio_type: Ratio type from the plan (selects the cost row)
+            product_columns: List of (data column index, product key string)
+            all_row_data: All row data (product values stored during Pass 2)
+
+        Returns:
+            Dict of data column index -> ratio or None (revenue is zero)
+        """
+        numerator_label = self.RATIO_NUMERATOR_LABELS.get(ratio_type)
+        if numerator_label is None:
+            return {idx: None for idx, _ in product_columns}
+
+        keys = [key for _, key in product_columns]
+        service_revenue = self._row_vector(all_row_data.get("รายได้บริการ"), keys)
+        cost = self._row_vector(all_row_data.get(numerator_label), keys)
+        ratios = self._safe_divide(cost, service_revenue)
+
+        return {
+            idx: (None if np.isnan(value) else value)
+            for (idx, _), value in zip(product_columns, ratios.tolist())
+        }